@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, Response
 
-from app.api.v1.endpoints import tos, privacy, extract, summary, crawl, textmining, wordfrequency, company_info, documents
+from app.api.v1.endpoints import tos, privacy, legal, extract, summary, crawl, textmining, wordfrequency, company_info, documents
 from app.core.auth import get_api_key
 
 # Main API router with authentication
 api_router = APIRouter(dependencies=[Depends(get_api_key)])
 api_router.include_router(tos.router, tags=["legal"])
 api_router.include_router(privacy.router, tags=["legal"])
+api_router.include_router(legal.router, tags=["legal"])
 api_router.include_router(extract.router, tags=["content"])
 api_router.include_router(summary.router, tags=["content"])
 api_router.include_router(crawl.router, tags=["crawl"])
@@ -14,7 +14,9 @@ import time
 import aiohttp
 import tldextract
 
+from app.core.browser import CONSISTENT_USER_AGENT
 from app.models.company_info import CompanyInfoRequest, CompanyInfoResponse
+from app.core.store_pages import store_app_info
 
 # Suppress XML parsed-as-HTML warnings
 warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
@@ -25,9 +27,6 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Define consistent user agent
-CONSISTENT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-
 def get_base_url(url: str) -> str:
     """Extract the base URL from a given URL."""
     parsed = urlparse(url)
@@ -820,6 +819,13 @@ async def extract_company_info(url: str) -> tuple:
         url = sanitize_url(url)
         if not url:
             return "Unknown", "https://www.google.com/s2/favicons?domain=unknown.com&sz=128", False, "Invalid URL"
+
+        # Store listings: the app's own name and icon, not "Apple" / "Google"
+        store_info = await store_app_info(url)
+        if store_info and store_info["name"]:
+            logger.info(f"Using store listing name: {store_info['name']}")
+            logo_url = store_info["icon_url"] or logo_url
+            return store_info["name"], logo_url, True, "Successfully extracted company information from store listing"
         
         # Extract domain after validation
         try:
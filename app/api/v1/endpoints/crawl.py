@@ -2,7 +2,6 @@ from fastapi import APIRouter, Response, HTTPException, status, Depends, Header,
 import logging
 import asyncio
 from urllib.parse import urlparse
-import requests
 import random
 from typing import Dict, Optional, Tuple, Any, Union, List, Literal
 import string
@@ -19,7 +18,9 @@ from app.api.v1.endpoints.summary import generate_summary_response
 from app.api.v1.endpoints.wordfrequency import analyze_word_freq_endpoint, analyze_text_frequency
 from app.api.v1.endpoints.textmining import analyze_text as analyze_text_mining, perform_text_mining
 from app.api.v1.endpoints.company_info import extract_company_info, extract_company_name_from_domain, get_company_info
+from app.core.conditional_fetch import record_analyzed, revalidate, text_fingerprint
 from app.core.config import settings
+from app.core.http_client import get_http_client
 
 from app.models.summary import SummaryRequest
 from app.models.extract import ExtractRequest, ExtractResponse
@@ -135,6 +136,9 @@ async def save_document_to_db(
     Returns:
         String ID of created/existing document or None if operation fails.
     """
+    # Fingerprint the text as extracted, so it matches what the pipeline computes
+    content_fingerprint = text_fingerprint(document_content)
+    
     # Handle binary content - sanitize before saving to prevent UTF-8 errors
     document_content = sanitize_text_for_db(document_content)
     
@@ -230,6 +234,7 @@ async def save_document_to_db(
             "hundred_word_summary": analysis.get('hundred_word_summary', ''),
             "word_frequencies": serializable_word_freqs,
             "text_mining_metrics": serializable_text_mining,
+            "content_fingerprint": content_fingerprint,
             "updated_at": datetime.now()
         }
         
@@ -270,6 +275,9 @@ async def save_document_to_db(
             
         logger.info(f"Document {'updated' if existing_doc else 'saved'} in Firestore with ID: {document_id}")
         
+        # Keep the validators of the version just analysed, for conditional reanalysis
+        await record_analyzed(retrieved_url)
+        
         # Update the last_updated timestamp in stats collection
         from app.crud.stats import stats_crud
         await stats_crud.update_last_updated()
@@ -343,13 +351,13 @@ async def crawl_tos(request: CrawlTosRequest) -> CrawlTosResponse:
         # FIRST: Check if document with THIS EXACT URL already exists in database
         # We only check by original URL and do it ONCE at the beginning
         try:
-            existing_doc = get_document_by_url(request.url, "tos")
+            existing_doc = await document_crud.get_by_url_and_type(request.url, "tos")
             if existing_doc:
                 logger.info(f"Document for URL {request.url} already exists in database with ID {existing_doc['id']}. Returning existing document.")
                 is_existing_document = True  # Set flag for existing document
                 
-                # Update views count for the existing document - increment_views is async
-                await increment_views(existing_doc['id'])
+                # Update views count for the existing document
+                await document_crud.increment_views(existing_doc['id'])
                 
                 # Create a new response object with success=False
                 response = CrawlTosResponse(
@@ -525,6 +533,12 @@ async def crawl_tos(request: CrawlTosRequest) -> CrawlTosResponse:
                     
                     return response
                 
+        # A document already analysed from this same text needs no new analysis
+        unchanged_doc = await find_unchanged_document(request.url, "tos", extracted_text)
+        if unchanged_doc:
+            await record_analyzed(tos_url)
+            return await keep_existing_analysis(response, unchanged_doc, "same_text")
+        
         # Extract company name and logo URL right after content extraction
         # This way we can include the company name in the summary process
         parsed_url = urlparse(request.url)
@@ -561,7 +575,7 @@ async def crawl_tos(request: CrawlTosRequest) -> CrawlTosResponse:
                     try:
                         logo_url = f"https://www.google.com/s2/favicons?domain={domain}&sz=128"
                         # Test if logo exists with a head request
-                        response_head = requests.head(logo_url, timeout=5)
+                        response_head = await get_http_client().head(logo_url, timeout=5)
                         if response_head.status_code != 200:
                             logo_url = get_default_logo_url(request.url)
                     except Exception as e:
@@ -756,13 +770,13 @@ async def crawl_pp(request: CrawlPrivacyRequest) -> CrawlPrivacyResponse:
         # FIRST: Check if document with THIS EXACT URL already exists in database
         # We only check by original URL and do it ONCE at the beginning
         try:
-            existing_doc = get_document_by_url(request.url, "pp")
+            existing_doc = await document_crud.get_by_url_and_type(request.url, "pp")
             if existing_doc:
                 logger.info(f"Document for URL {request.url} already exists in database with ID {existing_doc['id']}. Returning existing document.")
                 is_existing_document = True  # Set flag for existing document
                 
-                # Update views count for the existing document - increment_views is async
-                await increment_views(existing_doc['id'])
+                # Update views count for the existing document
+                await document_crud.increment_views(existing_doc['id'])
                 
                 # Create a new response object with success=False
                 response = CrawlPrivacyResponse(
@@ -938,6 +952,12 @@ async def crawl_pp(request: CrawlPrivacyRequest) -> CrawlPrivacyResponse:
                     
                     return response
                 
+        # A document already analysed from this same text needs no new analysis
+        unchanged_doc = await find_unchanged_document(request.url, "pp", extracted_text)
+        if unchanged_doc:
+            await record_analyzed(pp_url)
+            return await keep_existing_analysis(response, unchanged_doc, "same_text")
+        
         # Extract company name and logo URL right after content extraction
         # This way we can include the company name in the summary process
         parsed_url = urlparse(request.url)
@@ -974,7 +994,7 @@ async def crawl_pp(request: CrawlPrivacyRequest) -> CrawlPrivacyResponse:
                     try:
                         logo_url = f"https://www.google.com/s2/favicons?domain={domain}&sz=128"
                         # Test if logo exists with a head request
-                        response_head = requests.head(logo_url, timeout=5)
+                        response_head = await get_http_client().head(logo_url, timeout=5)
                         if response_head.status_code != 200:
                             logo_url = get_default_logo_url(request.url)
                     except Exception as e:
@@ -1645,6 +1665,62 @@ def sanitize_text_for_db(text: str) -> str:
     
     return sanitized 
 
+def fill_response_from_document(response, document: Dict[str, Any]):
+    """Copy a stored document's existing analysis into a reanalysis response."""
+    word_freq_data = document.get('word_frequencies') or []
+    if isinstance(word_freq_data, str):
+        word_freq_data = json.loads(word_freq_data or '[]')
+    tm_data = document.get('text_mining_metrics') or {}
+    if isinstance(tm_data, str):
+        tm_data = json.loads(tm_data or '{}')
+
+    response.document_id = document.get('id')
+    response.company_name = document.get('company_name', '')
+    response.logo_url = document.get('logo_url') or get_default_logo_url(document.get('url'))
+    response.one_sentence_summary = document.get('one_sentence_summary', '')
+    response.hundred_word_summary = document.get('hundred_word_summary', '')
+    response.views = document.get('views', 0)
+    try:
+        response.word_frequencies = [
+            WordFrequency(
+                word=item.get('word', ''),
+                count=item.get('count', 0),
+                percentage=item.get('percentage', 0.0)
+            )
+            for item in word_freq_data
+        ]
+        if tm_data:
+            response.text_mining = TextMiningResults(**tm_data)
+    except Exception as e:
+        logger.warning(f"Error parsing stored analysis of document {document.get('id')}: {e}")
+
+async def keep_existing_analysis(response, document: Dict[str, Any], reason: str):
+    """Answer with a document's stored analysis when its source hasn't changed, bumping updated_at."""
+    logger.info(f"Document {document.get('id')} unchanged ({reason}); keeping its analysis")
+    await document_crud.touch(document['id'])
+    fill_response_from_document(response, document)
+    response.success = True
+    response.message = f"Document unchanged since last analysis ({reason}); existing analysis kept"
+    return response
+
+async def find_unchanged_document(original_url: str, document_type: str, extracted_text: str) -> Optional[Dict[str, Any]]:
+    """The stored document for original_url if it was analysed from the same text, else None."""
+    existing_doc = await document_crud.get_by_url_and_type(original_url, document_type)
+    if existing_doc and existing_doc.get('content_fingerprint') == text_fingerprint(extracted_text):
+        return existing_doc
+    return None
+
+async def document_unchanged(request, document: Dict[str, Any], extraction_url: str) -> Optional[str]:
+    """
+    Why the document at extraction_url needs no reanalysis ("not_modified" or
+    "same_content"), or None if it must be re-extracted. Only the stored
+    retrieved URL is revalidated, and never when the request forces it.
+    """
+    if request.force or (request.url and request.url != document.get('retrieved_url')):
+        return None
+    revalidation = await revalidate(extraction_url)
+    return revalidation.reason if revalidation.unchanged else None
+
 @router.post("/reanalyze-tos", response_model=ReanalyzeTosResponse)
 async def reanalyze_tos(request: ReanalyzeTosRequest) -> ReanalyzeTosResponse:
     """
@@ -1707,6 +1783,11 @@ async def reanalyze_tos(request: ReanalyzeTosRequest) -> ReanalyzeTosResponse:
             response.message = "Document doesn't have a retrieved URL and no new URL was provided"
             return response
         
+        # Skip extraction and analysis if the page hasn't changed since it was analysed
+        unchanged_reason = await document_unchanged(request, document, extraction_url)
+        if unchanged_reason:
+            return await keep_existing_analysis(response, document, unchanged_reason)
+        
         # Extract text from the URL
         logger.info(f"Extracting text from URL: {extraction_url}")
         try:
@@ -1731,6 +1812,11 @@ async def reanalyze_tos(request: ReanalyzeTosRequest) -> ReanalyzeTosResponse:
             response.message = "Failed to extract valid text from the document URL"
             return response
         
+        # Same text as last time: the stored analysis still holds
+        if not request.force and document.get('content_fingerprint') == text_fingerprint(extracted_text):
+            await record_analyzed(extraction_url)
+            return await keep_existing_analysis(response, document, "same_text")
+        
         # Perform parallel analysis
         logger.info("Starting analysis of extracted text")
         analysis = await perform_parallel_analysis(extraction_url, extracted_text, 'tos')
@@ -1785,7 +1871,8 @@ async def reanalyze_tos(request: ReanalyzeTosRequest) -> ReanalyzeTosResponse:
             "one_sentence_summary": analysis.get('one_sentence_summary', ''),
             "hundred_word_summary": analysis.get('hundred_word_summary', ''),
             "word_frequencies": serializable_word_freqs,
-            "text_mining_metrics": serializable_text_mining
+            "text_mining_metrics": serializable_text_mining,
+            "content_fingerprint": text_fingerprint(extracted_text)
         }
         
         # If a new URL was provided, update the retrieved_url in the document
@@ -1798,6 +1885,7 @@ async def reanalyze_tos(request: ReanalyzeTosRequest) -> ReanalyzeTosResponse:
             updated_doc = await document_crud.update_document_analysis(request.document_id, update_data)
             
             if updated_doc:
+                await record_analyzed(extraction_url)
                 response.success = True
                 response.message = "Document successfully reanalyzed and updated"
                 response.document_id = request.document_id
@@ -1910,6 +1998,11 @@ async def reanalyze_pp(request: ReanalyzePrivacyRequest) -> ReanalyzePrivacyResp
             response.message = "Document doesn't have a retrieved URL and no new URL was provided"
             return response
         
+        # Skip extraction and analysis if the page hasn't changed since it was analysed
+        unchanged_reason = await document_unchanged(request, document, extraction_url)
+        if unchanged_reason:
+            return await keep_existing_analysis(response, document, unchanged_reason)
+        
         # Extract text from the URL
         logger.info(f"Extracting text from URL: {extraction_url}")
         try:
@@ -1934,6 +2027,11 @@ async def reanalyze_pp(request: ReanalyzePrivacyRequest) -> ReanalyzePrivacyResp
             response.message = "Failed to extract valid text from the document URL"
             return response
         
+        # Same text as last time: the stored analysis still holds
+        if not request.force and document.get('content_fingerprint') == text_fingerprint(extracted_text):
+            await record_analyzed(extraction_url)
+            return await keep_existing_analysis(response, document, "same_text")
+        
         # Perform parallel analysis
         logger.info("Starting analysis of extracted text")
         analysis = await perform_parallel_analysis(extraction_url, extracted_text, 'pp')
@@ -1988,7 +2086,8 @@ async def reanalyze_pp(request: ReanalyzePrivacyRequest) -> ReanalyzePrivacyResp
             "one_sentence_summary": analysis.get('one_sentence_summary', ''),
             "hundred_word_summary": analysis.get('hundred_word_summary', ''),
             "word_frequencies": serializable_word_freqs,
-            "text_mining_metrics": serializable_text_mining
+            "text_mining_metrics": serializable_text_mining,
+            "content_fingerprint": text_fingerprint(extracted_text)
         }
         
         # If a new URL was provided, update the retrieved_url in the document
@@ -2001,6 +2100,7 @@ async def reanalyze_pp(request: ReanalyzePrivacyRequest) -> ReanalyzePrivacyResp
             updated_doc = await document_crud.update_document_analysis(request.document_id, update_data)
             
             if updated_doc:
+                await record_analyzed(extraction_url)
                 response.success = True
                 response.message = "Document successfully reanalyzed and updated"
                 response.document_id = request.document_id
@@ -2296,6 +2396,19 @@ async def process_submission(submission_id: str, request: URLSubmissionRequest):
                     logger.info(f"Updated submission {submission_id} status to failed - bot verification detected")
                     return
             
+            # A document already analysed from this same text needs no new analysis
+            unchanged_doc = await find_unchanged_document(url, document_type, extracted_text)
+            if unchanged_doc:
+                logger.info(f"Submission {submission_id}: document {unchanged_doc['id']} unchanged, keeping its analysis")
+                await document_crud.touch(unchanged_doc['id'])
+                await record_analyzed(extraction_url)
+                await submission_crud.update_submission_status(
+                    id=submission_id,
+                    status="success",
+                    document_id=unchanged_doc['id']
+                )
+                return
+            
             # Extract company info
             parsed_url = urlparse(url)
             domain = parsed_url.netloc
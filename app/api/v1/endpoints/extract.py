@@ -7,19 +7,27 @@ import hashlib
 import random
 import logging
 import asyncio
-import requests
-import concurrent.futures
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
 from fastapi import APIRouter, Response
 from functools import lru_cache
-from playwright.async_api import async_playwright, Playwright, Browser, BrowserContext
 import os
 import sys
-import brotli
 
 # Fixed version with improved resource management and error handling
 
+from app.core.browser import (
+    CONSISTENT_USER_AGENT,
+    PlaywrightManager,
+    browser_pool,
+    navigate_page,
+    wait_for_page_ready,
+)
+from app.core.conditional_fetch import mark_browser_extracted, remember_fetch
+from app.core.config import settings
+from app.core.discovery_planner import discovery_budget
+from app.core.http_client import fetch, get_http_client
+from app.core.memory_cache import MemoryCache
 from app.models.extract import ExtractRequest, ExtractResponse
 from app.models.tos import ToSRequest
 from app.models.privacy import PrivacyRequest
@@ -31,279 +39,24 @@ warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Define consistent user agent
-CONSISTENT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-
-# PlaywrightManager singleton for headful browser reuse
-
-
-class PlaywrightManager:
-    def __init__(self, max_instances: int = 3):
-        self.playwright: Playwright | None = None
-        self.browser: Browser | None = None
-        self.context: BrowserContext | None = None
-        self.semaphore = asyncio.Semaphore(max_instances)
-        self.active_pages = set()  # Track active pages to ensure cleanup
-        self.last_cleanup = time.time()
-        self.cleanup_interval = 300  # Clean unused tabs every 5 minutes
-        self.startup_complete = False
-        self.startup_failure = None
-
-    async def startup(self):
-        """Start the browser with improved error handling for containerized environments"""
-        # Don't try to start if we've already failed
-        if self.startup_failure:
-            logger.warning(f"Not attempting browser startup due to previous failure: {self.startup_failure}")
-            raise RuntimeError(f"Browser startup previously failed: {self.startup_failure}")
-        
-        logger.info("Launching Playwright browser...")
-        try:
-            # Get Chrome executable path from environment if provided
-            chrome_path = os.environ.get("CHROME_PATH", None)
-            logger.info(f"Using Chrome executable path: {chrome_path if chrome_path else 'Default'}")
-            
-            # Start the Playwright process
-            logger.info("Attempting to start Playwright process...")
-            self.playwright = await async_playwright().start()
-            logger.info("Playwright process started successfully")
-            
-            # Browser launch arguments for containerized environment
-            browser_args = [
-                "--disable-blink-features=AutomationControlled",
-                "--no-sandbox",                        # Required in containerized environments
-                "--disable-dev-shm-usage",            # Overcome limited resource in containers
-                "--disable-gpu",                       # Disable GPU acceleration
-                "--disable-setuid-sandbox",            # Additional sandbox protection
-                "--single-process",                    # Use single process (helpful in containers)
-                "--ignore-certificate-errors",         # Ignore SSL issues
-                "--disable-accelerated-2d-canvas",     # Disable canvas acceleration 
-                "--disable-accelerated-video-decode",  # Disable video acceleration
-                "--disable-web-security"               # Disable web security for testing
-            ]
-            
-            # Log browser launch details
-            logger.info(f"Launching browser with args: {browser_args}")
-            
-            # ---> ADDED: More logging around browser launch
-            logger.info("Attempting to launch browser...")
-            # Launch the browser with appropriate arguments
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=browser_args,
-                executable_path=chrome_path,
-                timeout=60000,  # 60 second timeout for browser launch
-            )
-            logger.info("Browser launched successfully")
-            
-            # Create a new browser context
-            # ---> ADDED: More logging around context creation
-            logger.info("Attempting to create browser context...")
-            self.context = await self.browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                ignore_https_errors=True,
-                locale="en-US",
-                timezone_id="America/New_York",
-                user_agent=CONSISTENT_USER_AGENT
-            )
-            logger.info("Browser context created successfully")
-            
-            # Inject minimal stealth script
-            # ---> ADDED: More logging around init script
-            logger.info("Attempting to add init script...")
-            await self.context.add_init_script(
-                """
-            () => {
-                Object.defineProperty(navigator, 'webdriver', { get: () => false });
-                Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-                Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
-            }
-            """
-            )
-            logger.info("Stealth script injected successfully")
-            
-            # Create test page to verify everything is working
-            # ---> ADDED: More logging around test page
-            logger.info("Attempting to create test page...")
-            test_page = await self.context.new_page()
-            logger.info("Test page created. Attempting to navigate...")
-            await test_page.goto("about:blank")
-            logger.info("Test page navigation successful. Attempting to close...")
-            await test_page.close()
-            logger.info("Test page created and closed successfully")
-
-            # --- MODIFICATION START ---
-            # Close the initial non-headless browser context and browser after the check
-            logger.info("Closing initial non-headless browser after startup check...")
-            if self.context:
-                await self.context.close()
-                self.context = None
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
-            logger.info("Initial non-headless browser closed.")
-
-            # Now, re-launch the browser in headless mode for actual use
-            logger.info("Re-launching browser in headless mode for operational use...")
-            self.browser = await self.playwright.chromium.launch(
-                headless=True, # Use headless=True now
-                args=browser_args,
-                executable_path=chrome_path,
-                timeout=60000,
-            )
-            logger.info("Headless browser launched successfully.")
-
-            # Re-create the browser context for headless operation
-            logger.info("Attempting to create headless browser context...")
-            self.context = await self.browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                ignore_https_errors=True,
-                locale="en-US",
-                timezone_id="America/New_York",
-                user_agent=CONSISTENT_USER_AGENT
-            )
-            logger.info("Headless browser context created successfully.")
-
-            # Re-apply the init script to the new headless context
-            logger.info("Attempting to add init script to headless context...")
-            await self.context.add_init_script(
-                """
-            () => {
-                Object.defineProperty(navigator, 'webdriver', { get: () => false });
-                Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-                Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
-            }
-            """
-            )
-            logger.info("Stealth script injected into headless context successfully.")
-            # --- MODIFICATION END ---
-            
-            # Mark startup as complete
-            self.startup_complete = True
-            logger.info("PlaywrightManager ready and operational (headless)")
-            return True
-            
-        except Exception as e:
-            # ---> MODIFIED: Log the full traceback for startup errors
-            logger.error(f"Error during browser startup: {str(e)}", exc_info=True) # Add exc_info=True
-            self.startup_failure = str(e)
-            # Try to clean up any partial initialization
-            await self._cleanup_on_failure()
-            raise
-
-    async def _cleanup_on_failure(self):
-        """Clean up resources after a failed startup"""
-        logger.info("Cleaning up after failed browser startup")
-        try:
-            if self.context:
-                await self.context.close()
-                self.context = None
-                
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
-                
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
-        except Exception as e:
-            logger.error(f"Error during cleanup after failed startup: {str(e)}")
-
-    async def get_page(self):
-        """Get a new browser page with semaphore control and fallback mechanism"""
-        if not self.startup_complete:
-            logger.error("Cannot get page - browser not initialized")
-            raise RuntimeError("Browser not initialized")
-            
-        await self.semaphore.acquire()
-        try:
-            page = await self.context.new_page()
-            self.active_pages.add(page)
-            
-            # Check if we need to clean up unused tabs
-            current_time = time.time()
-            if current_time - self.last_cleanup > self.cleanup_interval:
-                await self.cleanup_stale_pages()
-                
-            return page
-        except Exception as e:
-            # Release semaphore on error
-            self.semaphore.release()
-            logger.error(f"Error getting browser page: {str(e)}")
-            raise
-
-    async def release_page(self, page):
-        """Release a page back to the pool"""
-        try:
-            if page in self.active_pages:
-                self.active_pages.remove(page)
-            await page.close()
-        except Exception as e:
-            logger.error(f"Error closing page: {str(e)}")
-        finally:
-            self.semaphore.release()
-
-    async def cleanup_stale_pages(self):
-        """Close any stale pages that might have been left open"""
-        try:
-            logger.info(
-                f"Checking for stale browser pages. Active pages count: {len(self.active_pages)}"
-            )
-            if self.context:
-                pages = self.context.pages
-                for page in pages:
-                    if page not in self.active_pages:
-                        logger.info("Closing stale browser page")
-                        try:
-                            await page.close()
-                        except Exception as e:
-                            logger.warning(f"Error closing stale page: {str(e)}")
-            self.last_cleanup = time.time()
-        except Exception as e:
-            logger.error(f"Error during stale page cleanup: {str(e)}")
-
-    async def shutdown(self):
-        """Shut down the browser"""
-        logger.info("Shutting down Playwright browser...")
-        try:
-            # Close all active pages first
-            for page in list(self.active_pages):
-                try:
-                    await page.close()
-                except Exception as e:
-                    logger.warning(f"Error closing page during shutdown: {str(e)}")
-            self.active_pages.clear()
-
-            if self.context:
-                await self.context.close()
-                self.context = None
-                
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
-                
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
-                
-            self.startup_complete = False
-            logger.info("PlaywrightManager shut down.")
-        except Exception as e:
-            logger.error(f"Error during browser shutdown: {str(e)}")
-
-
-# Instantiate and plan to call startup/shutdown in app main
-auth_manager = PlaywrightManager()
+# Shared browser pool lives in app.core.browser so discovery endpoints can use it
+# without importing this module; the old name is kept for existing callers.
+auth_manager = browser_pool
 
 # Cache and settings
-CACHE = {}
-CACHE_TTL = 3600
-MAX_CACHE_SIZE = 500
+extract_cache = MemoryCache(
+    "extract",
+    ttl=settings.EXTRACT_CACHE_TTL,
+    max_bytes=settings.EXTRACT_CACHE_MAX_BYTES,
+    max_entries=settings.EXTRACT_CACHE_MAX_ENTRIES,
+    shared=True,
+)
 STANDARD_TIMEOUT = 15
 URL_DISCOVERY_TIMEOUT = 12
+URL_DISCOVERY_GRACE = 5
 MIN_CONTENT_LENGTH = 100
 MAX_PDF_PAGES = 30
 PDF_CHUNK = 5
-executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
 
 # Replace random user agent function with consistent one
 def get_user_agent():
@@ -328,18 +81,12 @@ def sanitize_url(url: str) -> str:
 # Cache helpers
 
 
-def get_from_cache(key: str):
-    entry = CACHE.get(key)
-    if entry and time.time() < entry["expires"]:
-        return entry["value"]
-    return None
+async def get_from_cache(key: str):
+    return await extract_cache.aget(key)
 
 
 def add_to_cache(key: str, value: dict):
-    if len(CACHE) >= MAX_CACHE_SIZE:
-        oldest = sorted(CACHE.items(), key=lambda kv: kv[1]["expires"])[0][0]
-        del CACHE[oldest]
-    CACHE[key] = {"value": value, "expires": time.time() + CACHE_TTL}
+    extract_cache.put(key, value)
 
 
 # PDF detection & extraction
@@ -498,13 +245,10 @@ def extract_content_from_soup(soup: BeautifulSoup) -> str:
     logger.info(f"Final cleaned content length: {len(cleaned_content)} characters")
     return cleaned_content
 
-def fetch_text(url):
+async def fetch_text(url):
     """ Fetch all <p> text from url """
     try:
-        res = requests.get(url, headers={
-            "User-Agent": CONSISTENT_USER_AGENT,
-            "Accept-Language": "en-US,en;q=0.9"
-        })
+        res = await get_http_client().get(url)
         soup = BeautifulSoup(res.text, 'html.parser')
         return soup.get_text(separator=' ', strip=True)
     except Exception as e:
@@ -609,95 +353,115 @@ def is_likely_bot_page(text: str) -> bool:
     return False
 
 
+# Single fetch shared by the HTTP extractors
+
+
+class FetchedPage:
+    """
+    One HTTP response, downloaded once and handed to each extractor of the
+    ladder in turn (PDF, standard HTML, simple fetch) so none of them has
+    to download the URL again.
+    """
+
+    def __init__(self, url, final_url, status_code, headers, content, encoding, elapsed_ms):
+        self.url = url
+        self.final_url = final_url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content  # body bytes, gzip/deflate/Brotli already undone by httpx
+        self.encoding = encoding  # charset from Content-Type, may be None
+        self.elapsed_ms = elapsed_ms
+        self._text = None
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def content_type(self):
+        return self.headers.get("Content-Type", "").lower()
+
+    @property
+    def text(self):
+        """Body decoded as UTF-8 (invalid bytes replaced), decoded once."""
+        if self._text is None:
+            self._text = self.content.decode("utf-8", errors="replace")
+        return self._text
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise Exception(f"HTTP {self.status_code} for {self.final_url}")
+
+
+async def fetch_page(url: str) -> FetchedPage:
+    """
+    Download url once, with browser-like headers. Raises on network errors;
+    HTTP error statuses are returned for the extractors to reject.
+    """
+    headers = {
+        "User-Agent": CONSISTENT_USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,application/pdf,image/avif,image/webp,image/apng,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-User": "?1",
+        "Cache-Control": "max-age=0",
+    }
+
+    logger.info(f"Fetching {url} with User-Agent: {headers['User-Agent']}")
+    started = time.monotonic()
+    resp, content_bytes = await fetch(url, headers=headers, timeout=STANDARD_TIMEOUT)
+    elapsed_ms = (time.monotonic() - started) * 1000
+
+    logger.info(f"Fetched {url} -> {resp.status_code} ({len(content_bytes)} bytes) in {elapsed_ms:.0f}ms")
+    logger.debug(f"Response Headers for {url}: {resp.headers}")
+
+    return FetchedPage(
+        url=url,
+        final_url=str(resp.url),
+        status_code=resp.status_code,
+        headers=resp.headers,
+        content=content_bytes,
+        encoding=resp.charset_encoding,
+        elapsed_ms=elapsed_ms,
+    )
+
+
 # Standard HTML extraction
 
 
 async def extract_standard_html(
-    url: str, doc_type: str, ret_url: str
+    url: str, doc_type: str, ret_url: str, page: FetchedPage = None
 ) -> ExtractResponse:
     try:
-        # Enhanced browser-like headers with consistent user agent
-        headers = {
-            "User-Agent": CONSISTENT_USER_AGENT,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "Cache-Control": "max-age=0",
-        }
-
-        # Log the headers we're using
-        logger.info(
-            f"Attempting standard extraction for URL: {url} with User-Agent: {headers['User-Agent']}"
-        )
+        if page is None:
+            page = await fetch_page(url)
+        page.raise_for_status()
+        logger.info(f"Attempting standard extraction for URL: {url}")
 
-        loop = asyncio.get_event_loop()
-
-        # Use retry strategy with exponential backoff
-        max_retries = 3
-        retry_delay = 1.0
-
-        for retry in range(max_retries):
-            try:
-                fut = loop.run_in_executor(
-                    None,
-                    lambda: requests.get(
-                        url,
-                        headers=headers,
-                        timeout=STANDARD_TIMEOUT,
-                        allow_redirects=True,
-                    ),
-                )
-                resp = await asyncio.wait_for(fut, timeout=STANDARD_TIMEOUT + 1)
-                resp.raise_for_status()
-                break  # Success, exit retry loop
-            except Exception as e:
-                if retry == max_retries - 1:  # Last retry
-                    raise
-                logger.warning(
-                    f"Extraction attempt {retry+1} failed: {str(e)}. Retrying in {retry_delay}s..."
-                )
-                await asyncio.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-
-        # Log response details AFTER successful request
-        logger.info(f"Standard request successful for {url}.")
-        logger.debug(f"Response Headers for {url}: {resp.headers}")
-        logger.debug(f"Requests detected encoding for {url}: {resp.encoding}")
-        
         # IMPROVED ENCODING HANDLING
-        # Get content bytes from response
-        content_bytes = resp.content
-        
-        # Handle Brotli-compressed responses explicitly
-        if resp.headers.get("Content-Encoding", "").lower() == "br":
-            try:
-                content_bytes = brotli.decompress(content_bytes)
-                logger.info("Decompressed Brotli content successfully")
-            except Exception as e:
-                logger.warning(f"Failed to decompress Brotli content: {e}")
+        content_bytes = page.content
         
         # Try to detect encoding from headers first
-        content_type = resp.headers.get('Content-Type', '')
+        content_type = page.headers.get('Content-Type', '')
         encoding_match = re.search(r'charset=([^ ;]+)', content_type)
         detected_encoding = encoding_match.group(1) if encoding_match else None
         
-        # If no encoding in headers, use what requests detected, with fallbacks
+        # If no encoding in headers, use what the response declared, with fallbacks
         if not detected_encoding:
-            detected_encoding = resp.encoding if resp.encoding else 'utf-8'
+            detected_encoding = page.encoding if page.encoding else 'utf-8'
         
         # Log detailed encoding information
-        logger.info(f"Detected encoding for {url}: headers={detected_encoding}, requests={resp.encoding}")
+        logger.info(f"Detected encoding for {url}: headers={detected_encoding}, response={page.encoding}")
         
         # Always try UTF-8 first for best compatibility
         try:
             # First try UTF-8 regardless of detected encoding
-            html_content = content_bytes.decode('utf-8', errors='replace')
+            html_content = page.text
             logger.info(f"Successfully decoded content using UTF-8")
         except Exception as e:
             logger.warning(f"UTF-8 decoding failed, trying detected encoding: {detected_encoding}")
@@ -848,48 +612,21 @@ async def extract_standard_html(
 # PDF extraction
 
 
-async def extract_pdf(url: str, doc_type: str, ret_url: str) -> ExtractResponse:
+async def extract_pdf(
+    url: str, doc_type: str, ret_url: str, page: FetchedPage = None
+) -> ExtractResponse:
     try:
-        # Enhanced browser-like headers with consistent user agent
-        headers = {
-            "User-Agent": CONSISTENT_USER_AGENT,
-            "Accept": "application/pdf,*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Cache-Control": "max-age=0",
-        }
-
-        logger.info(
-            f"Attempting PDF extraction for: {url} with User-Agent: {headers['User-Agent']}"
-        )
-
-        # Use retry strategy with exponential backoff
-        max_retries = 3
-        retry_delay = 1.0
-
-        for retry in range(max_retries):
-            try:
-                resp = requests.get(
-                    url, headers=headers, timeout=STANDARD_TIMEOUT, allow_redirects=True
-                )
-                resp.raise_for_status()
-                break  # Success, exit retry loop
-            except Exception as e:
-                if retry == max_retries - 1:  # Last retry
-                    raise
-                logger.warning(
-                    f"PDF download attempt {retry+1} failed: {str(e)}. Retrying in {retry_delay}s..."
-                )
-                await asyncio.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
+        if page is None:
+            page = await fetch_page(url)
+        page.raise_for_status()
+        logger.info(f"Attempting PDF extraction for: {url}")
 
         # Check if content type is PDF
-        content_type = resp.headers.get("Content-Type", "").lower()
+        content_type = page.content_type
         if not ("application/pdf" in content_type or is_pdf_url(url)):
             raise Exception(f"Not a PDF document. Content-Type: {content_type}")
 
-        text = extract_text_from_pdf(resp.content)
+        text = extract_text_from_pdf(page.content)
         if len(text) < MIN_CONTENT_LENGTH:
             raise Exception("PDF content too small")
 
@@ -910,6 +647,151 @@ async def extract_pdf(url: str, doc_type: str, ret_url: str) -> ExtractResponse:
 # Playwright extraction
 
 
+ACCEPT_BUTTON_SELECTORS = [
+    'button:has-text("Accept")',
+    'button:has-text("I Agree")',
+    'button:has-text("Agree")',
+    'button:has-text("Continue")',
+    'a:has-text("Accept")',
+    'a:has-text("I Agree")',
+    '[class*="accept"]:visible',
+    '[class*="agree"]:visible',
+    '[id*="accept"]:visible',
+    '[id*="agree"]:visible',
+]
+
+
+async def prepare_page_paced(page, url: str):
+    """Navigate and wait for content with generous timeouts and fixed pauses."""
+    # Improved navigation options with extended timeout for complex pages
+    logger.info(f"Navigating to URL with Playwright: {url}")
+    try:
+        await navigate_page(
+            page,
+            url, 
+            wait_until="networkidle", 
+            timeout=90000  # 90 seconds timeout for slow-loading pages
+        )
+    except Exception as nav_err:
+        # If networkidle fails, try with domcontentloaded which is less strict
+        logger.warning(f"Navigation with networkidle failed: {nav_err}, trying with domcontentloaded")
+        await navigate_page(
+            page,
+            url, 
+            wait_until="domcontentloaded", 
+            timeout=45000
+        )
+    
+    # Wait a bit longer for any remaining content to load
+    await asyncio.sleep(3)
+    
+    # Enhanced wait for content to stabilize - wait for core content elements
+    try:
+        # Wait for common content containers
+        for selector in [
+            "main", "article", "#content", ".content", "#main", ".main",
+            "[class*='terms']", "[class*='privacy']", "[class*='policy']",
+            "div > p", "div > h1", "div > h2"
+        ]:
+            try:
+                # Only wait 1s per selector to avoid long delays
+                await page.wait_for_selector(selector, timeout=1000)
+                logger.info(f"Found content selector: {selector}")
+                break
+            except:
+                continue
+    except Exception as wait_err:
+        logger.warning(f"Wait for content elements timed out: {wait_err}")
+    
+    # Try to click "Accept" or "I Agree" buttons if present (common on legal pages)
+    for selector in ACCEPT_BUTTON_SELECTORS:
+        try:
+            if await page.locator(selector).count() > 0:
+                logger.info(f"Clicking {selector} button")
+                await page.locator(selector).first.click()
+                await asyncio.sleep(1)  # Wait for any post-click changes
+        except Exception as accept_error:
+            logger.debug(f"Error clicking {selector}: {str(accept_error)}")
+    
+    # NEW: Intelligent scrolling to reveal dynamically loaded content
+    # This greatly improves extraction for lazy-loaded content
+    try:
+        logger.info("Performing intelligent scroll to reveal all content")
+        # Initial scroll to bottom to trigger any lazy loading
+        await page.evaluate("""
+            window.scrollTo({
+                top: document.body.scrollHeight,
+                behavior: 'smooth'
+            });
+        """)
+        await asyncio.sleep(1.5)  # Wait for any lazy content to load
+        
+        # Scroll back to top
+        await page.evaluate("window.scrollTo(0, 0);")
+        await asyncio.sleep(0.5)
+        
+        # More thorough scrolling - scroll down in chunks
+        height = await page.evaluate("document.body.scrollHeight")
+        view_port_height = await page.evaluate("window.innerHeight")
+        
+        if height > view_port_height:
+            steps = min(10, max(3, int(height / view_port_height)))  # At least 3, at most 10 steps
+            logger.info(f"Scrolling page in {steps} steps to reveal all content")
+            
+            for i in range(steps):
+                position = int((i + 1) * height / steps)
+                await page.evaluate(f"window.scrollTo(0, {position})")
+                await asyncio.sleep(0.5)  # Brief pause at each scroll position
+        
+        # Final pause after scrolling to ensure all content is loaded
+        await asyncio.sleep(2)
+    except Exception as scroll_err:
+        logger.warning(f"Error during intelligent scrolling: {str(scroll_err)}")
+
+
+async def prepare_page_fast(page, url: str) -> bool:
+    """
+    Fast readiness mode: navigate to DOMContentLoaded, then wait only as long
+    as the DOM keeps changing (wait_for_page_ready) instead of fixed sleeps,
+    all within BROWSER_READY_BUDGET_MS. Returns False if the budget ran out
+    before the page settled.
+    """
+    deadline = time.monotonic() + settings.BROWSER_READY_BUDGET_MS / 1000
+
+    def remaining_ms():
+        return max(0, (deadline - time.monotonic()) * 1000)
+
+    logger.info(f"Navigating to URL with Playwright (fast readiness): {url}")
+    await navigate_page(page, url, wait_until="domcontentloaded", timeout=max(remaining_ms(), 1000))
+    ready = await wait_for_page_ready(page, budget_ms=remaining_ms())
+
+    # Dismiss consent/accept overlays without pausing after each click
+    for selector in ACCEPT_BUTTON_SELECTORS:
+        if remaining_ms() <= 0:
+            break
+        try:
+            locator = page.locator(selector)
+            if await locator.count() > 0:
+                logger.info(f"Clicking {selector} button")
+                await locator.first.click(timeout=min(1000, max(remaining_ms(), 1)))
+                break
+        except Exception as accept_error:
+            logger.debug(f"Error clicking {selector}: {str(accept_error)}")
+
+    # One jump to the bottom triggers lazy loading; wait for it to settle
+    try:
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        ready = await wait_for_page_ready(page, budget_ms=remaining_ms())
+    except Exception as scroll_err:
+        logger.warning(f"Error during fast scroll: {str(scroll_err)}")
+
+    logger.info(
+        f"Fast readiness for {url}: settled={ready.get('settled')} "
+        f"text={ready.get('textLength')} chars, {remaining_ms():.0f}ms of budget left"
+    )
+    return bool(ready.get("settled"))
+
+
 async def extract_with_playwright(
     url: str, doc_type: str, ret_url: str
 ) -> ExtractResponse:
@@ -919,106 +801,21 @@ async def extract_with_playwright(
         logger.info(f"Starting Playwright extraction for URL: {url}")
         
         # Ensure the browser is initialized
-        if not auth_manager.startup_complete or not auth_manager.context:
+        if not auth_manager.is_ready():
             logger.error("Playwright browser not initialized, cannot extract content")
             raise Exception("Playwright browser not available")
         
-        # Get a browser page
+        # Get a browser page (resource blocking follows EXTRACT_BLOCK_RESOURCES)
         page = await auth_manager.get_page()
         
-        # Improved navigation options with extended timeout for complex pages
-        logger.info(f"Navigating to URL with Playwright: {url}")
-        try:
-            await page.goto(
-                url, 
-                wait_until="networkidle", 
-                timeout=90000  # 90 seconds timeout for slow-loading pages
-            )
-        except Exception as nav_err:
-            # If networkidle fails, try with domcontentloaded which is less strict
-            logger.warning(f"Navigation with networkidle failed: {nav_err}, trying with domcontentloaded")
-            await page.goto(
-                url, 
-                wait_until="domcontentloaded", 
-                timeout=45000
-            )
-        
-        # Wait a bit longer for any remaining content to load
-        await asyncio.sleep(3)
-        
-        # Enhanced wait for content to stabilize - wait for core content elements
-        try:
-            # Wait for common content containers
-            for selector in [
-                "main", "article", "#content", ".content", "#main", ".main",
-                "[class*='terms']", "[class*='privacy']", "[class*='policy']",
-                "div > p", "div > h1", "div > h2"
-            ]:
-                try:
-                    # Only wait 1s per selector to avoid long delays
-                    await page.wait_for_selector(selector, timeout=1000)
-                    logger.info(f"Found content selector: {selector}")
-                    break
-                except:
-                    continue
-        except Exception as wait_err:
-            logger.warning(f"Wait for content elements timed out: {wait_err}")
-        
-        # Try to click "Accept" or "I Agree" buttons if present (common on legal pages)
-        for selector in [
-            'button:has-text("Accept")',
-            'button:has-text("I Agree")',
-            'button:has-text("Agree")',
-            'button:has-text("Continue")',
-            'a:has-text("Accept")',
-            'a:has-text("I Agree")',
-            '[class*="accept"]:visible',
-            '[class*="agree"]:visible',
-            '[id*="accept"]:visible',
-            '[id*="agree"]:visible',
-        ]:
-            try:
-                if await page.locator(selector).count() > 0:
-                    logger.info(f"Clicking {selector} button")
-                    await page.locator(selector).first.click()
-                    await asyncio.sleep(1)  # Wait for any post-click changes
-            except Exception as accept_error:
-                logger.debug(f"Error clicking {selector}: {str(accept_error)}")
-        
-        # NEW: Intelligent scrolling to reveal dynamically loaded content
-        # This greatly improves extraction for lazy-loaded content
-        try:
-            logger.info("Performing intelligent scroll to reveal all content")
-            # Initial scroll to bottom to trigger any lazy loading
-            await page.evaluate("""
-                window.scrollTo({
-                    top: document.body.scrollHeight,
-                    behavior: 'smooth'
-                });
-            """)
-            await asyncio.sleep(1.5)  # Wait for any lazy content to load
-            
-            # Scroll back to top
-            await page.evaluate("window.scrollTo(0, 0);")
-            await asyncio.sleep(0.5)
-            
-            # More thorough scrolling - scroll down in chunks
-            height = await page.evaluate("document.body.scrollHeight")
-            view_port_height = await page.evaluate("window.innerHeight")
-            
-            if height > view_port_height:
-                steps = min(10, max(3, int(height / view_port_height)))  # At least 3, at most 10 steps
-                logger.info(f"Scrolling page in {steps} steps to reveal all content")
-                
-                for i in range(steps):
-                    position = int((i + 1) * height / steps)
-                    await page.evaluate(f"window.scrollTo(0, {position})")
-                    await asyncio.sleep(0.5)  # Brief pause at each scroll position
-            
-            # Final pause after scrolling to ensure all content is loaded
-            await asyncio.sleep(2)
-        except Exception as scroll_err:
-            logger.warning(f"Error during intelligent scrolling: {str(scroll_err)}")
+        # Load the page and let it settle before reading the content
+        prepare_started = time.monotonic()
+        if settings.BROWSER_FAST_READINESS:
+            settled = await prepare_page_fast(page, url)
+            auth_manager.ready_stats.record("fast", (time.monotonic() - prepare_started) * 1000, settled)
+        else:
+            await prepare_page_paced(page, url)
+            auth_manager.ready_stats.record("paced", (time.monotonic() - prepare_started) * 1000)
 
         # Get content - enhanced with multiple extraction methods
         html = await page.content()
@@ -1163,48 +960,18 @@ async def extract_with_playwright(
 
 
 # Simple extraction using fetch_text
-async def extract_with_simple_fetch(url: str, doc_type: str, ret_url: str) -> ExtractResponse:
+async def extract_with_simple_fetch(
+    url: str, doc_type: str, ret_url: str, page: FetchedPage = None
+) -> ExtractResponse:
     """Extract content using simple fetch_text method as an intermediate step."""
     try:
+        if page is None:
+            page = await fetch_page(url)
+        page.raise_for_status()
         logger.info(f"Attempting simple fetch extraction for: {url}")
 
-        headers = {
-            "User-Agent": CONSISTENT_USER_AGENT,
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br", # Ensure 'br' is accepted
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8" # Added Accept header
-        }
-
-        # Run requests.get in a thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        resp = await loop.run_in_executor(
-            executor,
-            lambda: requests.get(url, headers=headers, timeout=STANDARD_TIMEOUT, allow_redirects=True)
-        )
-        resp.raise_for_status() # Check for HTTP errors
-
-        # --- Added Brotli Decompression Logic ---
-        content_bytes = resp.content
-        if resp.headers.get("Content-Encoding", "").lower() == "br":
-            try:
-                logger.info("Brotli encoding detected in simple fetch, decompressing...")
-                content_bytes = brotli.decompress(content_bytes)
-                logger.info("Decompressed Brotli content successfully for simple fetch")
-            except Exception as e:
-                logger.warning(f"Failed to decompress Brotli content in simple fetch: {e}")
-        # --- End Brotli Logic ---
-
-        # Decode content - prioritize UTF-8
-        try:
-            html_content = content_bytes.decode('utf-8', errors='replace')
-        except Exception:
-            # Fallback using detected encoding or default
-            detected_encoding = resp.encoding if resp.encoding else 'utf-8'
-            logger.warning(f"UTF-8 decoding failed in simple fetch, trying {detected_encoding}")
-            html_content = content_bytes.decode(detected_encoding, errors='replace')
-
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Parse with BeautifulSoup (page.text is the UTF-8 decode the standard extractor used)
+        soup = BeautifulSoup(page.text, 'html.parser')
         text = soup.get_text(separator=' ', strip=True)
 
         # Log the result for debugging
@@ -1255,7 +1022,7 @@ async def extract_text(request: ExtractRequest, response: Response) -> ExtractRe
 
     doc_type = request.document_type or "tos"
     cache_key = f"{url}:{doc_type}"
-    cached = get_from_cache(cache_key)
+    cached = await get_from_cache(cache_key)
     if cached:
         return ExtractResponse(**cached)
 
@@ -1291,61 +1058,62 @@ async def extract_text(request: ExtractRequest, response: Response) -> ExtractRe
             req = ToSRequest(url=url) if doc_type == "tos" else PrivacyRequest(url=url)
             finder = find_tos if doc_type == "tos" else find_privacy_policy
             try:
-                resp = await asyncio.wait_for(
-                    finder(req), timeout=URL_DISCOVERY_TIMEOUT
-                )
+                # The planner returns its best answer at the budget; the hard
+                # timeout only covers teardown overrunning it
+                with discovery_budget(URL_DISCOVERY_TIMEOUT):
+                    resp = await asyncio.wait_for(
+                        finder(req), timeout=URL_DISCOVERY_TIMEOUT + URL_DISCOVERY_GRACE
+                    )
                 doc_url = resp.tos_url if doc_type == "tos" else resp.pp_url
                 if doc_url:
                     url = doc_url
                     logger.info(f"Found document URL: {url}")
             except asyncio.TimeoutError:
                 logger.warning(
-                    f"Document finder timed out after {URL_DISCOVERY_TIMEOUT}s"
+                    f"Document finder timed out after {URL_DISCOVERY_TIMEOUT + URL_DISCOVERY_GRACE}s"
                 )
             except Exception as e:
                 logger.warning(f"Document finder failed: {str(e)}")
 
     # SEQUENTIAL EXTRACTION APPROACH
-    # First, check if it's a PDF and use PDF extractor if it is
-    if is_pdf_url(url):
-        logger.info(f"Detected PDF URL, attempting PDF extraction for {url}")
-        try:
-            pdf_result = await extract_pdf(url, doc_type, url)
-            if pdf_result.success:
-                add_to_cache(cache_key, pdf_result.dict())
-                return pdf_result
-        except Exception as e:
-            logger.warning(f"PDF extraction failed: {str(e)}")
-            # Continue to other methods if PDF extraction fails
-    
-    # Next, try standard HTML extraction with BeautifulSoup first
-    logger.info(f"Attempting standard HTML extraction first for {url}")
-    try:
-        standard_result = await extract_standard_html(url, doc_type, url)
-        if standard_result.success:
-            add_to_cache(cache_key, standard_result.dict())
-            return standard_result
-    except Exception as e:
-        logger.warning(f"Standard HTML extraction failed: {str(e)}")
-        # If standard extraction fails, we'll try simple fetch method next
-    
-    # Try simple fetch extraction before Playwright
-    logger.info(f"Standard extraction failed, attempting simple fetch extraction for {url}")
+    # Download once; every HTTP extractor parses the same response
+    page = None
     try:
-        simple_fetch_result = await extract_with_simple_fetch(url, doc_type, url)
-        if simple_fetch_result.success:
-            add_to_cache(cache_key, simple_fetch_result.dict())
-            return simple_fetch_result
+        page = await fetch_page(url)
     except Exception as e:
-        logger.warning(f"Simple fetch extraction failed: {str(e)}")
-        # If simple fetch extraction fails, we'll try Playwright
-    
-    # Only try Playwright if both standard and simple fetch extraction failed
-    logger.info(f"Simple fetch extraction failed, attempting Playwright extraction for {url}")
-    if auth_manager.startup_complete and auth_manager.context:
+        logger.warning(f"Fetching {url} failed, going straight to the browser: {str(e)}")
+
+    if page is not None:
+        is_pdf = "application/pdf" in page.content_type
+        ladder = []
+        # PDFs (by URL or by Content-Type) go to the PDF extractor first
+        if is_pdf or is_pdf_url(url):
+            ladder.append(("PDF", extract_pdf))
+        # A PDF body is no use to the HTML parsers
+        if not is_pdf:
+            ladder.append(("Standard HTML", extract_standard_html))
+            ladder.append(("Simple fetch", extract_with_simple_fetch))
+
+        for name, extractor in ladder:
+            logger.info(f"Attempting {name} extraction for {url}")
+            try:
+                result = await extractor(url, doc_type, url, page=page)
+                if result.success:
+                    # This response is what gets analysed: keep its validators
+                    remember_fetch([page.url, page.final_url], page.headers, page.content)
+                    add_to_cache(cache_key, result.dict())
+                    return result
+            except Exception as e:
+                logger.warning(f"{name} extraction failed: {str(e)}")
+
+    # Only try Playwright if the HTTP extractors all failed
+    logger.info(f"HTTP extraction failed, attempting Playwright extraction for {url}")
+    if auth_manager.is_ready():
         try:
             playwright_result = await extract_with_playwright(url, doc_type, url)
             if playwright_result.success:
+                # The rendered text isn't what HTTP returns, so no validators describe it
+                mark_browser_extracted([url])
                 add_to_cache(cache_key, playwright_result.dict())
                 return playwright_result
         except Exception as e:
@@ -0,0 +1,505 @@
+"""
+Combined Terms of Service + Privacy Policy discovery.
+
+The landing page is loaded once and a single link snapshot is scored for both
+documents. Anything the snapshot can't place with confidence falls back to the
+full single-document pipeline in tos.py / privacy.py.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from urllib.parse import urlparse
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.browser import browser_pool
+from app.core.config import settings
+from app.core.discovery_cache import invalidate_discovery, registered_domain
+from app.core.discovery_history import load_domain_history
+from app.core.http_discovery import discovery_stats, fetch_static_links, probe_paths
+from app.core.link_snapshot import take_link_snapshot
+from app.core.sitemap_discovery import find_sitemap_candidates, sitemap_link_entries
+from app.core.store_pages import developer_site, store_app_info
+from app.models.legal import LegalRequest, LegalResponse
+from app.models.privacy import PrivacyRequest
+from app.models.tos import ToSRequest
+from app.api.v1.endpoints.privacy import PRIVACY_PATH_PATTERNS, find_privacy_policy, score_privacy_links
+from app.api.v1.endpoints.tos import (
+    TOS_PATH_PATTERNS,
+    find_tos,
+    is_app_store_url,
+    is_likely_user_generated_content,
+    is_play_store_url,
+    is_store_domain_link,
+    navigate_with_retry,
+    sanitize_url,
+    score_tos_links,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Snapshot candidates scoring at least this much are accepted as-is
+# (for both scorers this means the link text itself names the document)
+TOS_SNAPSHOT_MIN_SCORE = 90
+PP_SNAPSHOT_MIN_SCORE = 90
+
+# score_privacy_link's own cut-off for a usable candidate
+PP_CANDIDATE_MIN_SCORE = 30
+
+# Cheap content check for probed paths: words expected in the page title,
+# and phrases expected in the body
+PROBE_TITLE_WORDS = {
+    "tos": ("terms", "conditions", "agreement", "legal"),
+    "pp": ("privacy", "data policy", "data protection"),
+}
+PROBE_BODY_MARKERS = {
+    "tos": (
+        "terms of service", "terms of use", "terms and conditions", "conditions of use",
+        "user agreement", "these terms", "agree to", "governing law",
+    ),
+    "pp": (
+        "privacy policy", "privacy notice", "privacy statement", "personal information",
+        "personal data", "information we collect", "data protection", "cookies",
+    ),
+}
+
+TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.S)
+
+
+def score_legal_links(links, page_url):
+    """
+    Score one link snapshot for both documents.
+
+    Returns {"tos": [...], "pp": [...]}, each a list of
+    {"href", "text", "score"} dicts sorted best first.
+    """
+    base_domain = urlparse(page_url).netloc
+
+    # Store pages link to Apple/Google's own legal pages, never the app's
+    links = [link for link in links if not is_store_domain_link(link.get("href", ""), base_domain)]
+
+    tos_candidates = []
+    pp_candidates = []
+    for link, tos_score, pp_score in zip(links, score_tos_links(links), score_privacy_links(links)):
+        href = link.get("href", "")
+        text = link.get("text", "")
+
+        if tos_score > 0 and not is_likely_user_generated_content(href):
+            tos_candidates.append({"href": href, "text": text, "score": tos_score})
+
+        if pp_score > PP_CANDIDATE_MIN_SCORE:
+            pp_candidates.append({"href": href, "text": text, "score": pp_score})
+
+    tos_candidates.sort(key=lambda x: x["score"], reverse=True)
+    pp_candidates.sort(key=lambda x: x["score"], reverse=True)
+    return {"tos": tos_candidates, "pp": pp_candidates}
+
+
+async def scan_legal_links(page, links=None):
+    """
+    Score a link snapshot of the loaded page for ToS and privacy.
+    The snapshot is taken here unless the caller already has one.
+    """
+    if links is None:
+        links = await take_link_snapshot(page)
+    scan = score_legal_links(links, page.url)
+    logger.info(
+        f"Link snapshot of {page.url}: {len(links)} links, "
+        f"{len(scan['tos'])} ToS and {len(scan['pp'])} privacy candidates"
+    )
+    return scan
+
+
+def best_candidate(candidates, min_score=0):
+    """Return the href of the top candidate if it scores at least min_score."""
+    if candidates and candidates[0]["score"] >= min_score:
+        return candidates[0]["href"]
+    return None
+
+
+def probe_content_check(doc_type):
+    """
+    Build the content check for a probed page: the title names the document
+    and the body has at least one marker phrase, or the body has three.
+    """
+    title_words = PROBE_TITLE_WORDS[doc_type]
+    markers = PROBE_BODY_MARKERS[doc_type]
+
+    def check(html):
+        hits = sum(1 for marker in markers if marker in html)
+        title_match = TITLE_PATTERN.search(html)
+        title = title_match.group(1) if title_match else ""
+        if any(word in title for word in title_words):
+            return hits >= 1
+        return hits >= 3
+
+    return check
+
+
+async def probe_legal_paths(url, doc_type):
+    """Probe the conventional ToS or privacy paths on url's host."""
+    paths = TOS_PATH_PATTERNS if doc_type == "tos" else PRIVACY_PATH_PATTERNS
+    return await probe_paths(url, paths, probe_content_check(doc_type))
+
+
+async def sitemap_scan_legal_links(url, doc_types):
+    """
+    Sitemap stage: score the URLs in url's sitemaps that match the ToS and/or
+    privacy path patterns. Returns a scan shaped like score_legal_links'.
+    """
+    patterns = []
+    for doc_type in doc_types:
+        patterns += TOS_PATH_PATTERNS if doc_type == "tos" else PRIVACY_PATH_PATTERNS
+    urls = await find_sitemap_candidates(url, patterns)
+    return score_legal_links(sitemap_link_entries(urls), url)
+
+
+async def late_sitemap_result(task):
+    """
+    Result of a sitemap stage the other HTTP stages are done waiting for:
+    given at most SITEMAP_LATE_WAIT more, else None.
+    """
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), settings.SITEMAP_LATE_WAIT)
+    except asyncio.TimeoutError:
+        logger.info("Sitemap stage still running after the other HTTP stages missed; not waiting")
+        return None
+
+
+def http_min_score(doc_type):
+    """Confidence a static-HTML candidate needs before the browser is skipped."""
+    if doc_type == "tos":
+        return settings.HTTP_DISCOVERY_TOS_MIN_SCORE
+    return settings.HTTP_DISCOVERY_PP_MIN_SCORE
+
+
+async def http_scan_legal_links(url):
+    """
+    HTTP tier: fetch the landing page without a browser and score its links.
+    Returns (scan, reason); scan is None when the page needs the browser.
+    """
+    final_url, links, reason = await fetch_static_links(url)
+    if reason:
+        return None, reason
+    return score_legal_links(links, final_url), None
+
+
+def pick_http_candidate(scan, doc_type):
+    """
+    Best candidate from an HTTP scan if it clears the tier's threshold.
+    Returns (url, reason) where reason explains a miss.
+    """
+    candidates = scan[doc_type]
+    found = best_candidate(candidates, http_min_score(doc_type))
+    if found:
+        return found, None
+    return None, "below_threshold" if candidates else "no_candidate"
+
+
+async def http_first_discovery(url, doc_type):
+    """
+    Try to find one document ("tos" or "pp") without a browser. The landing
+    page fetch, the well-known path probes and the sitemap stage run
+    concurrently, and the first confident answer wins. Once the others have
+    missed, the sitemap stage gets SITEMAP_LATE_WAIT more before the caller
+    falls through to the browser.
+
+    Returns (url, method_used), or (None, None) so the caller continues with
+    the browser. Every call is counted in discovery_stats.
+    """
+    if not settings.HTTP_DISCOVERY_ENABLED:
+        return None, None
+    if is_app_store_url(url) or is_play_store_url(url):
+        discovery_stats.record(doc_type, "browser", "store_page")
+        return None, None
+
+    tasks = {asyncio.create_task(http_scan_legal_links(url)): "http_link_scan"}
+    if settings.HTTP_PROBE_ENABLED:
+        tasks[asyncio.create_task(probe_legal_paths(url, doc_type))] = "path_probe"
+    if settings.SITEMAP_DISCOVERY_ENABLED:
+        tasks[asyncio.create_task(sitemap_scan_legal_links(url, [doc_type]))] = "sitemap"
+
+    found = method = None
+    reason = None
+    pending = set(tasks)
+    late_deadline = None
+    try:
+        while pending and not found:
+            timeout = None
+            if all(tasks[task] == "sitemap" for task in pending):
+                late_deadline = late_deadline or time.monotonic() + settings.SITEMAP_LATE_WAIT
+                timeout = max(late_deadline - time.monotonic(), 0)
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.info(f"Sitemap stage for {url} still running after the other HTTP stages missed; not waiting")
+                break
+            for task in done:
+                if tasks[task] == "path_probe":
+                    probed = task.result()
+                    if probed and not found:
+                        found, method = probed, "path_probe"
+                elif tasks[task] == "sitemap":
+                    listed, _ = pick_http_candidate(task.result(), doc_type)
+                    if listed and not found:
+                        found, method = listed, "sitemap"
+                else:
+                    scan, reason = task.result()
+                    if scan and not found:
+                        link, reason = pick_http_candidate(scan, doc_type)
+                        if link:
+                            found, method = link, "http_link_scan"
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if found:
+        logger.info(f"HTTP tier found {doc_type} for {url} without a browser ({method}): {found}")
+        discovery_stats.record(doc_type, "http", method)
+        return found, method
+
+    logger.info(f"HTTP tier could not place {doc_type} for {url} ({reason}), using browser")
+    discovery_stats.record(doc_type, "browser", reason)
+    return None, None
+
+
+async def discover_legal_links(url):
+    """
+    Lease one page, navigate to url once and scan it.
+    Returns the scan dict, or None if the page couldn't be loaded.
+    """
+    lease = None
+    try:
+        lease = await browser_pool.acquire_lease("legal")
+        page = lease.page
+        page.set_default_timeout(15000)
+
+        success, _, _ = await navigate_with_retry(page, url)
+        if not success:
+            logger.warning(f"Could not load {url} for combined link scan")
+            return None
+
+        return await scan_legal_links(page)
+    except Exception as e:
+        logger.error(f"Error during combined link scan of {url}: {e}")
+        return None
+    finally:
+        await browser_pool.release_lease(lease)
+
+
+@router.post("/legal", response_model=LegalResponse)
+async def find_legal_documents(request: LegalRequest) -> LegalResponse:
+    """
+    Find both the Terms of Service and Privacy Policy URLs for a website
+    from a single page load.
+    """
+    logger.info(f"Finding ToS and privacy policy for URL: {request.url}")
+    url = sanitize_url(request.url)
+    if not url:
+        return LegalResponse(url=request.url, success=False, message="Invalid URL")
+
+    pp_url = pp_method = None
+    tos_url = tos_method = None
+    scan_url = url
+
+    # Store listings only link the privacy policy; the ToS lives on the
+    # developer's site, so scan that instead
+    if is_app_store_url(url) or is_play_store_url(url):
+        logger.info(f"Detected App/Play Store URL: {url}")
+        store_info = await store_app_info(url)
+        if store_info and store_info["privacy_url"]:
+            pp_url, pp_method = store_info["privacy_url"], f"{store_info['store']}_detection"
+        else:
+            pp_response = await find_privacy_policy(PrivacyRequest(url=url))
+            if not pp_response.pp_url:
+                return LegalResponse(
+                    url=url,
+                    success=False,
+                    message="Could not find Privacy Policy for App/Play Store URL",
+                    pp_method_used=pp_response.method_used,
+                )
+            pp_url, pp_method = pp_response.pp_url, pp_response.method_used
+        # The developer's own site, where their Terms live
+        scan_url = developer_site(store_info) or developer_site({"privacy_url": pp_url})
+
+    # Static HTML first, with the path probes and the sitemap stage running
+    # alongside the fetch; the browser only loads the page if something is
+    # still missing
+    if settings.HTTP_DISCOVERY_ENABLED:
+        wanted = ["tos"] if pp_url else ["tos", "pp"]
+        probes = {}
+        if settings.HTTP_PROBE_ENABLED:
+            probes = {doc_type: asyncio.create_task(probe_legal_paths(scan_url, doc_type)) for doc_type in wanted}
+        sitemap_task = None
+        if settings.SITEMAP_DISCOVERY_ENABLED:
+            sitemap_task = asyncio.create_task(sitemap_scan_legal_links(scan_url, wanted))
+        sitemap_tasks = [sitemap_task] if sitemap_task else []
+        try:
+            http_scan, reason = await http_scan_legal_links(scan_url)
+            for doc_type in wanted:
+                found, method, miss_reason = None, None, reason
+                if http_scan:
+                    found, miss_reason = pick_http_candidate(http_scan, doc_type)
+                    method = "http_link_scan"
+                if not found and doc_type in probes:
+                    found, method = await probes[doc_type], "path_probe"
+                if not found and sitemap_task:
+                    sitemap_scan = await late_sitemap_result(sitemap_task)
+                    if sitemap_scan is None:
+                        # Out of time: the browser takes over for every document
+                        sitemap_task = None
+                    else:
+                        found, _ = pick_http_candidate(sitemap_scan, doc_type)
+                        method = "sitemap"
+                if found:
+                    discovery_stats.record(doc_type, "http", method)
+                    if doc_type == "tos":
+                        tos_url, tos_method = found, method
+                    else:
+                        pp_url, pp_method = found, method
+                else:
+                    discovery_stats.record(doc_type, "browser", miss_reason)
+        finally:
+            for task in probes.values():
+                task.cancel()
+            for task in sitemap_tasks:
+                task.cancel()
+
+    scan = None
+    if not (tos_url and pp_url):
+        scan = await discover_legal_links(scan_url)
+    if scan:
+        if not tos_url:
+            tos_url = best_candidate(scan["tos"], TOS_SNAPSHOT_MIN_SCORE)
+            if tos_url:
+                tos_method = "combined_link_snapshot"
+        if not pp_url:
+            pp_url = best_candidate(scan["pp"], PP_SNAPSHOT_MIN_SCORE)
+            if pp_url:
+                pp_method = "combined_link_snapshot"
+
+    # Whatever the snapshot couldn't place goes through its own pipeline
+    fallbacks = {}
+    if not tos_url:
+        fallbacks["tos"] = find_tos(ToSRequest(url=scan_url))
+    if not pp_url:
+        fallbacks["pp"] = find_privacy_policy(PrivacyRequest(url=url))
+    if fallbacks:
+        logger.info(f"Falling back to full discovery for: {', '.join(fallbacks)}")
+        results = dict(zip(fallbacks, await asyncio.gather(*fallbacks.values())))
+        if "tos" in results:
+            tos_url, tos_method = results["tos"].tos_url, results["tos"].method_used
+        if "pp" in results:
+            pp_url, pp_method = results["pp"].pp_url, results["pp"].method_used
+
+    if tos_url and pp_url:
+        message = "Terms of Service and Privacy Policy found"
+    elif tos_url:
+        message = "Terms of Service found; could not find Privacy Policy"
+    elif pp_url:
+        message = "Privacy Policy found; could not find Terms of Service"
+    else:
+        message = "Could not find Terms of Service or Privacy Policy"
+
+    return LegalResponse(
+        url=url,
+        tos_url=tos_url,
+        pp_url=pp_url,
+        success=bool(tos_url or pp_url),
+        message=message,
+        tos_method_used=tos_method,
+        pp_method_used=pp_method,
+    )
+
+
+@router.delete("/legal/cache", response_model=dict)
+async def invalidate_discovery_cache(
+    domain: str = Query(..., description="Site URL or host whose cached discovery results should be dropped"),
+    document_type: Optional[str] = Query(None, description="'tos' or 'pp'; both when omitted"),
+):
+    """
+    Drop cached ToS / privacy discovery results for a domain so the next
+    request runs the full pipeline again.
+    """
+    if document_type and document_type not in ("tos", "pp"):
+        raise HTTPException(status_code=400, detail="document_type must be 'tos' or 'pp'")
+
+    try:
+        registered, removed = await invalidate_discovery(domain, document_type)
+    except Exception as e:
+        logger.error(f"Could not invalidate discovery cache for {domain}: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+    if not registered:
+        raise HTTPException(status_code=400, detail=f"Cannot derive a registered domain from '{domain}'")
+
+    return {
+        "success": True,
+        "domain": registered,
+        "document_type": document_type,
+        "removed": removed,
+        "message": f"Removed {removed} cached discovery result(s) for {registered}",
+    }
+
+
+# The planner-run strategies of discover_tos, in default priority order. The
+# history also covers the tiers in front of them (http_tier, navigation,
+# search_after_navigation_failure), which are skipped rather than reordered.
+TOS_STRATEGY_NAMES = [
+    "user_customer_terms",
+    "js_link_scanning",
+    "text_matching",
+    "search_engine",
+    "landing_page_analysis",
+    "via_privacy_policy",
+]
+
+# The recorded steps of discover_privacy_policy, in the order they run. Its
+# steps' results are combined rather than raced, so the history only skips
+# deferred steps (and searches first for sites that never load); it never
+# reorders them.
+PP_STEP_NAMES = [
+    "http_tier",
+    "user_customer_terms",
+    "js_link_scanning",
+    "text_matching",
+    "search_engine",
+]
+
+
+@router.get("/legal/strategies", response_model=dict)
+async def get_learned_strategies(
+    domain: str = Query(..., description="Site URL or host to show the learned discovery ordering for"),
+    document_type: str = Query("tos", description="'tos' or 'pp'"),
+):
+    """
+    Show the discovery strategy ordering learned for a domain: which
+    strategies will be tried first, which are deferred after recent
+    failures, and the recorded attempts, hits and latency of each.
+    Privacy steps keep their fixed order; deferred ones are skipped.
+    """
+    if document_type not in ("tos", "pp"):
+        raise HTTPException(status_code=400, detail="document_type must be 'tos' or 'pp'")
+
+    target = domain if "://" in domain else f"https://{domain}"
+    registered = registered_domain(target)
+    if not registered:
+        raise HTTPException(status_code=400, detail=f"Cannot derive a registered domain from '{domain}'")
+
+    history = await load_domain_history(target, document_type)
+    if document_type == "tos":
+        described = history.describe(TOS_STRATEGY_NAMES)
+    else:
+        described = history.describe(PP_STEP_NAMES)
+        described["order"] = [name for name in PP_STEP_NAMES if not history.should_defer(name)]
+    return {
+        "domain": registered,
+        "document_type": document_type,
+        "has_history": bool(history.records),
+        **described,
+    }
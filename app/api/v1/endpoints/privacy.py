@@ -10,6 +10,19 @@ import time
 from fastapi import APIRouter, HTTPException
 from playwright.async_api import async_playwright, Page
 
+from app.core.browser import CONSISTENT_USER_AGENT, browser_pool, navigate_page, wait_for_page_ready
+from app.core.config import settings
+from app.core.discovery_cache import lookup_discovery, store_discovery
+from app.core.discovery_history import DomainHistory, load_domain_history
+from app.core.link_matcher import PhraseMatcher, PriorityMatcher
+from app.core.link_snapshot import (
+    links_in_footer,
+    take_link_snapshot,
+    weighted_link_score,
+)
+from app.core.page_verification import page_verifier, score_privacy_page
+from app.core.search_cache import search_cache
+from app.core.store_pages import store_app_info
 from app.models.privacy import PrivacyRequest, PrivacyResponse
 
 async def click_and_wait_for_navigation(page, element, timeout=2000):
@@ -42,9 +55,6 @@ router = APIRouter()
 
 logger = logging.getLogger(__name__)
 
-# Define consistent user agent
-CONSISTENT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-
 # Function to get a consistent user agent
 def get_user_agent():
     """
@@ -172,6 +182,19 @@ user_customer_terms = [
     "customer data",
 ]
 
+# Common URL path patterns for privacy policies (probed by the HTTP tier)
+PRIVACY_PATH_PATTERNS = [
+    r"/privacy",
+    r"/privacy-policy",
+    r"/privacy-notice",
+    r"/privacy-statement",
+    r"/legal/privacy",
+    r"/legal/privacy-policy",
+    r"/policies/privacy",
+    r"/about/privacy",
+    r"/data-policy",
+]
+
 # Define dynamic scoring weights for link evaluation
 LINK_EVALUATION_WEIGHTS = {
     "text_match": 0.5,
@@ -311,30 +334,30 @@ def normalize_domain(url):
         return url  # Return original URL if parsing fails
 
 
-async def find_user_customer_privacy_links(page):
+async def find_user_customer_privacy_links(page, links=None):
     """
     Find user or customer-specific privacy links with highest priority
     """
     try:
         print("🔍🔍🔍 SUPREME PRIORITY CHECK: Looking for user/customer privacy links...")
-        # Use a targeted CSS selector just for user/customer privacy links
-        user_customer_links = await page.query_selector_all(
-            'a[href*="user-privacy"], a[href*="user_privacy"], ' + 
-            'a[href*="user"][href*="privacy"], a[href*="customer-privacy"], ' + 
-            'a[href*="customer_privacy"], a[href*="customer"][href*="privacy"]'
-        )
+        if links is None:
+            links = await take_link_snapshot(page)
         
-        if user_customer_links and len(user_customer_links) > 0:
+        # Same hrefs the old user/customer privacy CSS selector matched
+        user_customer_links = []
+        for link in links:
+            raw_href = link.get("rawHref", "")
+            if any(p in raw_href for p in ("user-privacy", "user_privacy", "customer-privacy", "customer_privacy")) or \
+               ("privacy" in raw_href and ("user" in raw_href or "customer" in raw_href)):
+                user_customer_links.append(link)
+        
+        if user_customer_links:
             print(f"✅ Found {len(user_customer_links)} potential user/customer specific privacy links")
             for i, link in enumerate(user_customer_links[:3]):
-                href = await link.get_attribute('href')
-                text = await link.text_content()
-                print(f"  Link #{i+1}: {text} - {href}")
+                print(f"  Link #{i+1}: {link['text']} - {link['href']}")
                 
             # Use the first link
-            first_link = user_customer_links[0]
-            href = await first_link.get_attribute('href')
-            return href
+            return user_customer_links[0]["href"]
     except Exception as e:
         print(f"Error in find_user_customer_privacy_links: {e}")
     
@@ -745,12 +768,45 @@ async def extract_play_store_privacy_link(page):
 async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
     """
     Find the Privacy Policy URL for a given website.
+    Answers from the per-domain discovery cache when it can.
+    """
+    url = sanitize_url(request.url.strip())
+    if url:
+        cached = await lookup_discovery(url, "pp")
+        if cached:
+            return PrivacyResponse(
+                url=request.url.strip(),
+                pp_url=cached["url"],
+                success=bool(cached["url"]),
+                message=(
+                    "Privacy Policy found (cached)" if cached["url"]
+                    else "Could not find Privacy Policy (cached result)"
+                ),
+                method_used=f"cached_{cached['method_used']}"
+            )
+    
+    history = await load_domain_history(url, "pp") if url else None
+    response = await discover_privacy_policy(request, history)
+    if url:
+        await history.save()
+        await store_discovery(url, "pp", response.pp_url, response.method_used)
+    return response
+
+
+async def discover_privacy_policy(request: PrivacyRequest, history: Optional[DomainHistory] = None) -> PrivacyResponse:
     """
+    Run the full Privacy Policy discovery pipeline, bypassing the cache.
+    The steps run in a fixed order and their results are combined, so a
+    DomainHistory is used to skip steps that keep failing for the domain
+    (and to search first when its landing page never loads); each attempt
+    is recorded.
+    """
+    if history is None:
+        history = DomainHistory(None, "pp")
     logger.info(f"Processing request for URL: {request.url}")
     start_time = time.time()
     
-    playwright = None
-    browser = None
+    lease = None
     browser_context = None
     page = None
     
@@ -773,12 +829,59 @@ async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
         parsed_url = urlparse(sanitized_url)
         domain = parsed_url.netloc.lower()
 
-        # Try to setup browser for more detailed search
-        playwright = await async_playwright().start()
-        browser, browser_context, page, _ = await setup_browser(playwright)
+        # Store listings link the developer's policy in their static HTML
+        store_info = await store_app_info(sanitized_url)
+        if store_info and store_info["privacy_url"]:
+            store_name = "Google Play Store" if store_info["store"] == "play_store" else "Apple App Store"
+            return PrivacyResponse(
+                url=url,
+                pp_url=store_info["privacy_url"],
+                success=True,
+                message=f"Found privacy policy link in {store_name} (no browser needed)",
+                method_used=f"{store_info['store']}_detection"
+            )
+
+        # Static sites: find the link in the server-rendered HTML without a browser
+        from app.api.v1.endpoints.legal import http_first_discovery
+        http_pp_url = None
+        if history.should_defer("http_tier"):
+            logger.info(f"Skipping HTTP tier: it has not worked for {history.domain} recently")
+        else:
+            http_started = time.monotonic()
+            http_pp_url, http_method = await http_first_discovery(sanitized_url, "pp")
+            if settings.HTTP_DISCOVERY_ENABLED:
+                history.record("http_tier", (time.monotonic() - http_started) * 1000, bool(http_pp_url))
+        if http_pp_url:
+            return PrivacyResponse(
+                url=url,
+                pp_url=http_pp_url,
+                success=True,
+                message="Privacy Policy found over plain HTTP (no browser needed)",
+                method_used=http_method
+            )
+
+        # Lease an isolated context from the shared browser pool
+        lease = await browser_pool.acquire_lease("privacy")
+        browser_context, page = lease.context, lease.page
+        page.set_default_timeout(1000)
+        
+        # Sites whose landing page never loads but are found by search: search first
+        if history.should_defer("navigation") and history.hits("search_after_navigation_failure"):
+            logger.info(f"Landing page of {history.domain} has not loaded recently, searching first")
+            search_url, search_engine = await navigation_failure_search(domain.replace("www.", ""), page)
+            if search_url:
+                return PrivacyResponse(
+                    url=url,
+                    pp_url=search_url,
+                    success=True,
+                    message=f"Privacy Policy found via {search_engine} search (learned shortcut)",
+                    method_used=f"{search_engine.lower()}_search_fallback"
+                )
         
         # Navigate to the URL - notice we don't exit but continue with recovery methods
+        nav_started = time.monotonic()
         success, _, _ = await navigate_with_retry(page, sanitized_url)
+        history.record("navigation", (time.monotonic() - nav_started) * 1000, success)
         if not success:
             logger.warning(f"Main site navigation had issues, but trying to analyze current page...")
             
@@ -807,46 +910,20 @@ async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
                 # Extract clean domain name for search
                 domain_name = domain.replace("www.", "")
                 
-                # Try duckduckgo search first
-                logger.info(f"Trying DuckDuckGo search fallback for {domain_name}")
-                duck_result = await duckduckgo_search_fallback(domain_name, page)
-                
-                if duck_result:
-                    logger.info(f"Found privacy policy via DuckDuckGo search: {duck_result}")
-                    return PrivacyResponse(
-                        url=url,
-                        pp_url=duck_result,
-                        success=True,
-                        message="Privacy Policy found via DuckDuckGo search (after navigation issues)",
-                        method_used="duckduckgo_search_fallback"
-                    )
-                
-                # Try Yahoo search next
-                logger.info(f"Trying Yahoo search fallback for {domain_name}")
-                yahoo_result = await yahoo_search_fallback(domain_name, page)
-                
-                if yahoo_result:
-                    logger.info(f"Found privacy policy via Yahoo search: {yahoo_result}")
-                    return PrivacyResponse(
-                        url=url,
-                        pp_url=yahoo_result,
-                        success=True,
-                        message="Privacy Policy found via Yahoo search (after navigation issues)",
-                        method_used="yahoo_search_fallback"
-                    )
-                
-                # Try Bing search as last resort
-                logger.info(f"Trying Bing search fallback for {domain_name}")
-                bing_result = await bing_search_fallback(domain_name, page)
+                search_started = time.monotonic()
+                search_url, search_engine = await navigation_failure_search(domain_name, page)
+                history.record(
+                    "search_after_navigation_failure", (time.monotonic() - search_started) * 1000, bool(search_url)
+                )
                 
-                if bing_result:
-                    logger.info(f"Found privacy policy via Bing search: {bing_result}")
+                if search_url:
+                    logger.info(f"Found privacy policy via {search_engine} search: {search_url}")
                     return PrivacyResponse(
                         url=url,
-                        pp_url=bing_result,
+                        pp_url=search_url,
                         success=True,
-                        message="Privacy Policy found via Bing search (after navigation issues)",
-                        method_used="bing_search_fallback"
+                        message=f"Privacy Policy found via {search_engine} search (after navigation issues)",
+                        method_used=f"{search_engine.lower()}_search_fallback"
                     )
                 
                 # All search methods failed, return failure
@@ -894,8 +971,13 @@ async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
                 method_used="app_store_detection"
             )
 
+        # One link snapshot of the landing page for the link-scoring steps below
+        landing_links = await take_link_snapshot(page)
+
         # Check for user/customer privacy links with highest priority
-        user_privacy_link = await find_user_customer_privacy_links(page)
+        step_started = time.monotonic()
+        user_privacy_link = await find_user_customer_privacy_links(page, landing_links)
+        history.record("user_customer_terms", (time.monotonic() - step_started) * 1000, bool(user_privacy_link))
         if user_privacy_link:
             print(f"\n\n⭐⭐⭐ HIGHEST PRIORITY SUCCESS: Found user/customer privacy link: {user_privacy_link}")
             return PrivacyResponse(
@@ -912,57 +994,67 @@ async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
         high_score_footer_link = None  # Initialize high_score_footer_link to None
 
         # 1. JavaScript method - Highest priority
-        print("Trying find_all_links_js approach...")
-        try:
-            js_result, page, js_unverified = await find_privacy_links_js(page, browser_context, None)
-            if js_result:
-                all_links.append(js_result)
-                method_sources.append((js_result, "javascript"))
-
-                # Track if this is a high-scoring footer link
-                try:
-                    # Check if this looks like a privacy notice from the title
-                    await page.goto(js_result, timeout=3000, wait_until="domcontentloaded")
-                    page_title = await page.title()
-                    title_lower = page_title.lower()
-
-                    # If the title contains key privacy terms, mark it as a
-                    # high-score footer link
-                    if ('privacy notice' in title_lower or
-                        'privacy policy' in title_lower or
-                        'privacy statement' in title_lower):
-                        print(f"✅ Found high-score footer link with privacy-related title: {js_result}")
-                        high_score_footer_link = js_result
-                except Exception as e:
-                    print(f"Error checking footer link title: {e}")
-
-        except Exception as e:
-            print(f"Error in JavaScript method: {e}")
-
-        # 2. Scroll method - Second highest priority
-        print("Trying smooth_scroll_and_click approach...")
-        try:
-            scroll_result, page, scroll_unverified = await smooth_scroll_and_click_privacy(page, browser_context, js_unverified if 'js_unverified' in locals() else None)
-            if scroll_result:
-                all_links.append(scroll_result)
-                method_sources.append((scroll_result, "scroll"))
-
-                # If no high-score footer link yet, check this one
-                if not high_score_footer_link:
+        if history.should_defer("js_link_scanning"):
+            logger.info(f"Skipping JavaScript link scan: it has not worked for {history.domain} recently")
+        else:
+            print("Trying find_all_links_js approach...")
+            try:
+                step_started = time.monotonic()
+                js_result, page, js_unverified = await find_privacy_links_js(page, browser_context, None, landing_links)
+                history.record("js_link_scanning", (time.monotonic() - step_started) * 1000, bool(js_result))
+                if js_result:
+                    all_links.append(js_result)
+                    method_sources.append((js_result, "javascript"))
+
+                    # Track if this is a high-scoring footer link
                     try:
-                        await page.goto(scroll_result, timeout=3000, wait_until="domcontentloaded")
+                        # Check if this looks like a privacy notice from the title
+                        await page.goto(js_result, timeout=3000, wait_until="domcontentloaded")
                         page_title = await page.title()
                         title_lower = page_title.lower()
 
+                        # If the title contains key privacy terms, mark it as a
+                        # high-score footer link
                         if ('privacy notice' in title_lower or
                             'privacy policy' in title_lower or
                             'privacy statement' in title_lower):
-                            print(f"✅ Found high-score scroll link with privacy-related title: {scroll_result}")
-                            high_score_footer_link = scroll_result
+                            print(f"✅ Found high-score footer link with privacy-related title: {js_result}")
+                            high_score_footer_link = js_result
                     except Exception as e:
-                        print(f"Error checking scroll link title: {e}")
-        except Exception as e:
-            print(f"Error in scroll method: {e}")
+                        print(f"Error checking footer link title: {e}")
+
+            except Exception as e:
+                print(f"Error in JavaScript method: {e}")
+
+        # 2. Scroll method - Second highest priority
+        if history.should_defer("text_matching"):
+            logger.info(f"Skipping scroll/text matching: it has not worked for {history.domain} recently")
+        else:
+            print("Trying smooth_scroll_and_click approach...")
+            try:
+                step_started = time.monotonic()
+                scroll_result, page, scroll_unverified = await smooth_scroll_and_click_privacy(page, browser_context, js_unverified if 'js_unverified' in locals() else None)
+                history.record("text_matching", (time.monotonic() - step_started) * 1000, bool(scroll_result))
+                if scroll_result:
+                    all_links.append(scroll_result)
+                    method_sources.append((scroll_result, "scroll"))
+
+                    # If no high-score footer link yet, check this one
+                    if not high_score_footer_link:
+                        try:
+                            await page.goto(scroll_result, timeout=3000, wait_until="domcontentloaded")
+                            page_title = await page.title()
+                            title_lower = page_title.lower()
+
+                            if ('privacy notice' in title_lower or
+                                'privacy policy' in title_lower or
+                                'privacy statement' in title_lower):
+                                print(f"✅ Found high-score scroll link with privacy-related title: {scroll_result}")
+                                high_score_footer_link = scroll_result
+                        except Exception as e:
+                            print(f"Error checking scroll link title: {e}")
+            except Exception as e:
+                print(f"Error in scroll method: {e}")
 
         # If we have a high-score footer link with privacy-related title, check if it's a user or customer one first
         if high_score_footer_link:
@@ -1017,38 +1109,43 @@ async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
         # Store search results
         search_results = []
         
-        # Try Bing search
-        try:
-            print("Trying Bing search fallback...")
-            bing_result = await bing_search_fallback(domain, page)
-            if bing_result:
-                search_results.append(bing_result)
-                all_links.append(bing_result)
-                method_sources.append((bing_result, "Bing"))
-        except Exception as e:
-            print(f"Error with Bing search: {e}")
+        if history.should_defer("search_engine"):
+            logger.info(f"Skipping search engines: they have not worked for {history.domain} recently")
+        else:
+            # Try Bing search
+            search_started = time.monotonic()
+            try:
+                print("Trying Bing search fallback...")
+                bing_result = await bing_search_fallback(domain, page)
+                if bing_result:
+                    search_results.append(bing_result)
+                    all_links.append(bing_result)
+                    method_sources.append((bing_result, "Bing"))
+            except Exception as e:
+                print(f"Error with Bing search: {e}")
         
-        # Try Yahoo search
-        try:
-            print("Trying Yahoo search fallback...")
-            yahoo_result = await yahoo_search_fallback(domain, page)
-            if yahoo_result:
-                search_results.append(yahoo_result)
-                all_links.append(yahoo_result)
-                method_sources.append((yahoo_result, "Yahoo"))
-        except Exception as e:
-            print(f"Error with Yahoo search: {e}")
+            # Try Yahoo search
+            try:
+                print("Trying Yahoo search fallback...")
+                yahoo_result = await yahoo_search_fallback(domain, page)
+                if yahoo_result:
+                    search_results.append(yahoo_result)
+                    all_links.append(yahoo_result)
+                    method_sources.append((yahoo_result, "Yahoo"))
+            except Exception as e:
+                print(f"Error with Yahoo search: {e}")
         
-        # Try DuckDuckGo search
-        try:
-            print("Trying DuckDuckGo search fallback...")
-            ddg_result = await duckduckgo_search_fallback(domain, page)
-            if ddg_result:
-                search_results.append(ddg_result)
-                all_links.append(ddg_result)
-                method_sources.append((ddg_result, "DuckDuckGo"))
-        except Exception as e:
-            print(f"Error with DuckDuckGo search: {e}")
+            # Try DuckDuckGo search
+            try:
+                print("Trying DuckDuckGo search fallback...")
+                ddg_result = await duckduckgo_search_fallback(domain, page)
+                if ddg_result:
+                    search_results.append(ddg_result)
+                    all_links.append(ddg_result)
+                    method_sources.append((ddg_result, "DuckDuckGo"))
+            except Exception as e:
+                print(f"Error with DuckDuckGo search: {e}")
+            history.record("search_engine", (time.monotonic() - search_started) * 1000, bool(search_results))
 
         # Add a special priority check for footer links from the main domain
         # This ensures footer links from the main domain get highest priority
@@ -1301,6 +1398,10 @@ async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
         unique_sources = [src for i, src in enumerate(
             unique_sources) if unique_links[i] in unique_links]
 
+        # Verify every candidate in one concurrent HTTP round; the browser
+        # only opens the ones whose static HTML is a JS shell
+        http_verdicts = await page_verifier.verify_many(unique_links, "pp")
+
         # === HIGHEST PRIORITY: user/customer privacy links ===
         # Check for user/customer privacy terms in URL or title and return immediately if found
         user_customer_terms = [
@@ -1310,6 +1411,16 @@ async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
         for link in unique_links:
             link_lower = link.lower()
             if any(term in link_lower for term in user_customer_terms):
+                if http_verdicts.get(link) is not None:
+                    # The page loaded over HTTP; the link itself names a user/customer policy
+                    print(f"🚀 Returning user/customer privacy link immediately: {link}")
+                    return PrivacyResponse(
+                        url=url,
+                        pp_url=link,
+                        success=True,
+                        message="Found User/Customer Privacy Policy (highest priority)",
+                        method_used="user_customer_privacy"
+                    )
                 try:
                     await page.goto(link, timeout=1000, wait_until="domcontentloaded")
                     title = await page.title()
@@ -1333,9 +1444,11 @@ async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
         for link, src in zip(unique_links, unique_sources):
             try:
                 print(f"Verifying link: {link} (source: {src})")
-                await page.goto(link, timeout=1000, wait_until="domcontentloaded")
-                await page.wait_for_timeout(1000)
-                verification = await verify_is_privacy_page(page)
+                verification = http_verdicts.get(link)
+                if verification is None:
+                    await page.goto(link, timeout=1000, wait_until="domcontentloaded")
+                    await page.wait_for_timeout(1000)
+                    verification = await verify_is_privacy_page(page)
                 score = verification.get("confidence", 0)
                 is_privacy = verification.get("isPrivacyPage", False)
                 
@@ -1623,33 +1736,8 @@ async def find_privacy_policy(request: PrivacyRequest) -> PrivacyResponse:
         print(f"Error during browser automation: {e}")
         return handle_error(url, None, str(e))
     finally:
-        # Always close the browser resources to prevent leaks
-        try:
-            if page:
-                try:
-                    await page.close()
-                except Exception as e:
-                    print(f"Error closing page: {e}")
-                    
-            if browser_context:
-                try:
-                    await browser_context.close()
-                except Exception as e:
-                    print(f"Error closing browser context: {e}")
-                    
-            if browser:
-                try:
-                    await browser.close()
-                except Exception as e:
-                    print(f"Error closing browser: {e}")
-                    
-            if playwright:
-                try:
-                    await playwright.stop()
-                except Exception as e:
-                    print(f"Error stopping playwright: {e}")
-        except Exception as cleanup_error:
-            print(f"Error during browser cleanup: {cleanup_error}")
+        # Closing the leased context also closes every page opened in it
+        await browser_pool.release_lease(lease)
 
 
 async def setup_browser(playwright=None):
@@ -1681,7 +1769,7 @@ async def setup_browser(playwright=None):
                 "--disable-features=site-per-process",  # For memory optimization
             ],
             chromium_sandbox=False,
-            slow_mo=10,  # Significantly reduced delay for better performance
+            slow_mo=0 if settings.BROWSER_FAST_READINESS else 10,  # Significantly reduced delay for better performance
         )
 
         # Create context with optimized settings
@@ -1732,6 +1820,24 @@ async def setup_browser(playwright=None):
         raise
 
 
+async def navigation_failure_search(domain_name, page):
+    """
+    DuckDuckGo, then Yahoo, then Bing for the domain's privacy policy.
+    Returns (url, engine name) from the first engine that finds one, else
+    (None, None).
+    """
+    for engine, search in (
+        ("DuckDuckGo", duckduckgo_search_fallback),
+        ("Yahoo", yahoo_search_fallback),
+        ("Bing", bing_search_fallback),
+    ):
+        logger.info(f"Trying {engine} search fallback for {domain_name}")
+        result = await search(domain_name, page)
+        if result:
+            return result, engine
+    return None, None
+
+
 async def navigate_with_retry(page, url, max_retries=2):
     """Navigate to URL with optimized retry logic."""
     for attempt in range(max_retries):
@@ -1745,7 +1851,7 @@ async def navigate_with_retry(page, url, max_retries=2):
             print(f"Navigation attempt {attempt+1}/{max_retries} to {url}")
 
             # Optimized navigation strategy with shorter timeout
-            response = await page.goto(url, timeout=5000, wait_until="domcontentloaded")
+            response = await navigate_page(page, url, timeout=5000, wait_until="domcontentloaded")
 
             # Quick check for anti-bot measures
             is_anti_bot, patterns = await detect_anti_bot_patterns(page)
@@ -1810,14 +1916,287 @@ async def detect_anti_bot_patterns(page):
         return False, []
 
 
-async def find_privacy_links_js(page, context, unverified_result=None):
-    """Optimized JavaScript-based privacy policy link finder with anti-bot protection handling."""
+# Privacy patterns a candidate link's text or URL must contain
+PRIVACY_LINK_PATTERNS = [
+    "privacy policy", "privacy notice", "privacy statement",
+    "data policy", "privacy", "data protection", "personal data",
+    "data processing", "gdpr", "ccpa",
+]
+
+# User/customer patterns (high priority)
+USER_CUSTOMER_PRIVACY_PATTERNS = [
+    "user privacy", "customer privacy", "user data", "customer data",
+    "user rights", "customer rights", "user information", "customer information",
+]
+
+
+# Phrases score_privacy_link looks for in link text and in the URL
+PRIVACY_TEXT_MATCHER = PhraseMatcher(
+    PRIVACY_LINK_PATTERNS + USER_CUSTOMER_PRIVACY_PATTERNS + [
+        "customer",
+        "customer privacy notice",
+        "data privacy",
+        "statement",
+        "user",
+        "user privacy notice",
+        "user privacy policy",
+    ]
+)
+PRIVACY_HREF_MATCHER = PhraseMatcher(
+    PRIVACY_LINK_PATTERNS + USER_CUSTOMER_PRIVACY_PATTERNS + [
+        "/datapolicy",
+        "/datapolicy/",
+        "/legal/",
+        "/privacy",
+        "/privacy/",
+        "customer",
+        "customer-privacy",
+        "customer-privacy-notice",
+        "customer_privacy",
+        "customer_privacy_notice",
+        "data-privacy",
+        "data_privacy",
+        "privacy-notice",
+        "privacy-policy",
+        "privacy-statement",
+        "privacy_notice",
+        "privacy_policy",
+        "privacy_statement",
+        "user",
+        "user-privacy",
+        "user-privacy-notice",
+        "user-privacy-policy",
+        "user_privacy",
+        "user_privacy_notice",
+        "user_privacy_policy",
+    ]
+)
+PRIVACY_CANDIDATE_PATTERNS = frozenset(PRIVACY_LINK_PATTERNS + USER_CUSTOMER_PRIVACY_PATTERNS)
+PRIVACY_TEXT_PRIORITY = PriorityMatcher(exactMatchPriorities, partialMatchPriorities)
+
+
+def _privacy_link_score(text, text_found, href_found, in_footer):
+    if not (text_found or href_found):
+        return 0
+    if PRIVACY_CANDIDATE_PATTERNS.isdisjoint(text_found) and PRIVACY_CANDIDATE_PATTERNS.isdisjoint(href_found):
+        return 0
+
+    score = 0
+
+    # Text matching - user/customer notices first
+    if text in ("user privacy notice", "user privacy policy"):
+        score += 250
+    elif "user privacy notice" in text_found:
+        score += 240
+    elif "user privacy policy" in text_found:
+        score += 230
+    elif "user privacy" in text_found:
+        score += 220
+    elif text in ("customer privacy notice", "customer privacy policy"):
+        score += 210
+    elif "customer privacy notice" in text_found:
+        score += 200
+    elif "customer privacy" in text_found:
+        score += 190
+    elif "user" in text_found and "privacy policy" in text_found:
+        score += 180
+    elif "customer" in text_found and "privacy policy" in text_found:
+        score += 170
+    elif text in ("privacy policy", "privacy notice"):
+        score += 120
+    elif "privacy policy" in text_found or "privacy notice" in text_found:
+        score += 110
+    elif "privacy" in text_found and "statement" in text_found:
+        score += 105
+    elif "data policy" in text_found:
+        score += 100
+    elif "privacy" in text_found:
+        score += 90
+    elif text in ("data protection", "data privacy"):
+        score += 80
+    elif "data protection" in text_found or "data privacy" in text_found:
+        score += 70
+
+    # URL matching - user/customer paths first
+    if "user-privacy-notice" in href_found or "user_privacy_notice" in href_found:
+        score += 120
+    elif "user-privacy-policy" in href_found or "user_privacy_policy" in href_found:
+        score += 110
+    elif "user-privacy" in href_found or "user_privacy" in href_found:
+        score += 100
+    elif "customer-privacy-notice" in href_found or "customer_privacy_notice" in href_found:
+        score += 95
+    elif "customer-privacy" in href_found or "customer_privacy" in href_found:
+        score += 90
+    elif "user" in href_found and "privacy" in href_found:
+        score += 85
+    elif "customer" in href_found and "privacy" in href_found:
+        score += 80
+    elif any(p in href_found for p in ("privacy-policy", "privacy-notice", "privacy_policy", "privacy_notice")):
+        score += 70
+    elif "privacy-statement" in href_found or "privacy_statement" in href_found:
+        score += 65
+    elif "data-privacy" in href_found or "data_privacy" in href_found:
+        score += 65
+    elif "/privacy/" in href_found or "/datapolicy/" in href_found:
+        score += 60
+    elif "/privacy" in href_found or "/datapolicy" in href_found:
+        score += 55
+    elif "gdpr" in href_found or "ccpa" in href_found:
+        score += 50
+
+    # Boost for links in the page footer or with legal in the path
+    if in_footer:
+        score += 20
+    if "/legal/" in href_found:
+        score += 15
+
+    return score
+
+
+def score_privacy_link(href, text, in_footer=False):
+    """
+    Score how likely a link is to be the privacy policy. Python port of the
+    scoring in find_privacy_links_js. Returns 0 for links that don't mention
+    any privacy pattern.
+    """
+    text = (text or "").strip().lower()
+    return _privacy_link_score(
+        text,
+        PRIVACY_TEXT_MATCHER.find(text),
+        PRIVACY_HREF_MATCHER.find((href or "").lower()),
+        in_footer,
+    )
+
+
+def score_privacy_links(links):
+    """
+    score_privacy_link for every snapshot entry, matching all texts and all
+    hrefs in one scan each; links that match nothing score 0 without any
+    per-link work.
+    """
+    texts = [(link.get("text") or "").strip().lower() for link in links]
+    text_found = PRIVACY_TEXT_MATCHER.find_many(texts)
+    href_found = PRIVACY_HREF_MATCHER.find_many([(link.get("href") or "").lower() for link in links])
+    scores = [0] * len(links)
+    for index in text_found.keys() | href_found.keys():
+        scores[index] = _privacy_link_score(
+            texts[index],
+            text_found.get(index, frozenset()),
+            href_found.get(index, frozenset()),
+            links[index].get("inFooterArea", False),
+        )
+    return scores
+
+
+def score_privacy_footer_link(href, text):
+    """
+    Score used on anti-bot pages, where only the footer is trusted. User and
+    customer notices get a very large boost; standard privacy wording is only
+    scored when no user/customer match was found. Returns None for links that
+    don't look privacy-related at all.
+    """
+    text = (text or "").strip().lower()
+    href = (href or "").lower()
+
+    if not (
+        "privacy" in text or "data" in text or "personal information" in text
+        or "privacy" in href or "data-policy" in href
+    ):
+        return None
+
+    score = 0
+
+    # Check for user/customer patterns FIRST - absolute highest priority
+    if text in ("user privacy notice", "user privacy policy"):
+        score += 500
+    elif "user privacy notice" in text or "user privacy policy" in text:
+        score += 450
+    elif text in ("customer privacy notice", "customer privacy policy"):
+        score += 400
+    elif "customer privacy notice" in text or "customer privacy policy" in text:
+        score += 350
+    elif "user privacy" in text or "user data" in text:
+        score += 300
+    elif "customer privacy" in text or "customer data" in text:
+        score += 250
+    elif "user" in text and "privacy" in text:
+        score += 200
+    elif "customer" in text and "privacy" in text:
+        score += 180
+
+    # URL-based user/customer scoring - extreme priority
+    if "user-privacy" in href or "user_privacy" in href:
+        score += 300
+    elif "customer-privacy" in href or "customer_privacy" in href:
+        score += 250
+    elif "user" in href and "privacy" in href:
+        score += 200
+    elif "customer" in href and "privacy" in href:
+        score += 180
+
+    # Only check standard patterns if no user/customer match was found
+    if score == 0:
+        if text in ("privacy notice", "privacy policy"):
+            score += 200
+        elif "privacy notice" in text or "privacy policy" in text:
+            score += 180
+        elif "privacy statement" in text:
+            score += 160
+        elif "data privacy" in text:
+            score += 150
+        elif "privacy" in text:
+            score += 140
+        elif "data policy" in text:
+            score += 130
+        elif "data protection" in text:
+            score += 120
+
+        if "privacy-policy" in href or "privacy_policy" in href:
+            score += 50
+        elif "privacy-notice" in href or "privacy_notice" in href:
+            score += 48
+        elif "privacy" in href:
+            score += 45
+        elif "data-policy" in href:
+            score += 40
+        elif "data-protection" in href:
+            score += 30
+
+    return score
+
+
+def weighted_privacy_link_score(link):
+    """
+    LINK_EVALUATION_WEIGHTS score for a snapshot entry, combining
+    exactMatchPriorities/partialMatchPriorities, the URL part of
+    score_privacy_link, footer context and position. Used to break ties
+    between equal link scores.
+    """
+    text_score = PRIVACY_TEXT_PRIORITY.priority(link.get("text"))
+    url_score = score_privacy_link(link.get("href", ""), "")
+    return weighted_link_score(link, text_score, url_score, LINK_EVALUATION_WEIGHTS)
+
+
+async def find_privacy_links_js(page, context, unverified_result=None, links=None):
+    """
+    Score the page's links as privacy policy candidates (from a link snapshot,
+    taken here unless the caller passes one), then open and check the best one.
+    Handles anti-bot pages by trusting footer links only.
+    """
     print("\n=== Starting find_privacy_links_js ===")
     print("Searching for privacy policy links using JavaScript...")
 
     try:
-        # Shorter wait for page loading
-        await page.wait_for_timeout(1500)
+        if links is None:
+            # Shorter wait for page loading
+            if settings.BROWSER_FAST_READINESS:
+                await wait_for_page_ready(page)
+            else:
+                await page.wait_for_timeout(1500)
+            snapshot = await take_link_snapshot(page)
+        else:
+            snapshot = links
 
         # First check if we're on an anti-bot page
         is_anti_bot = await page.evaluate(
@@ -1835,90 +2214,16 @@ async def find_privacy_links_js(page, context, unverified_result=None):
             print(
                 "Detected anti-bot protection, looking for footer links specifically..."
             )
-            # On anti-bot pages, specifically target footer links which are
-            # often still accessible
-            footer_links = await page.evaluate(
-                """() => {
-                // Look for footer elements, which often contain Privacy links
-                const footers = [
-                    document.querySelector('footer'),
-                    document.querySelector('.footer'),
-                    document.querySelector('#footer'),
-                    document.querySelector('[class*="footer"]'),
-                    document.querySelector('[id*="footer"]'),
-                ];
-
-                const footer = footers.find(f => f !== null);
-                if (!footer) return [];
-
-                // Get all links in the footer and score them
-                return Array.from(document.querySelectorAll('a[href]'))
-                    .filter(a => {
-                        // General filtering
-                        if (!a.href || !a.textContent) return false;
-                        if (a.href.startsWith('javascript:') || a.href.startsWith('mailto:')) return false;
-
-                        const text = a.textContent.trim().toLowerCase();
-                        const href = a.href.toLowerCase();
-
-                        // Look for privacy-related links
-                        return text.includes('privacy') ||
-                               text.includes('data') ||
-                               text.includes('personal information') ||
-                               href.includes('privacy') ||
-                               href.includes('data-policy');
-                    })
-                    .map(a => {
-                        const text = a.textContent.trim().toLowerCase();
-                        const href = a.href.toLowerCase();
-
-                        // Score the link - Enhanced scoring for important titles - MASSIVELY BOOSTED for user/customer terms
-                        let score = 0;
-
-                        // Check for user/customer patterns FIRST - absolute highest priority
-                        if (text === 'user privacy notice' || text === 'user privacy policy') score += 500; // MASSIVE boost
-                        else if (text.includes('user privacy notice') || text.includes('user privacy policy')) score += 450; // MASSIVE boost
-                        else if (text === 'customer privacy notice' || text === 'customer privacy policy') score += 400; // MASSIVE boost
-                        else if (text.includes('customer privacy notice') || text.includes('customer privacy policy')) score += 350; // MASSIVE boost
-                        else if (text.includes('user privacy') || text.includes('user data')) score += 300; // MASSIVE boost
-                        else if (text.includes('customer privacy') || text.includes('customer data')) score += 250; // MASSIVE boost
-                        else if (text.includes('user') && text.includes('privacy')) score += 200; // MASSIVE boost
-                        else if (text.includes('customer') && text.includes('privacy')) score += 180; // MASSIVE boost
-
-                        // URL-based user/customer scoring - extreme priority
-                        if (href.includes('user-privacy') || href.includes('user_privacy')) score += 300; // MASSIVE boost
-                        else if (href.includes('customer-privacy') || href.includes('customer_privacy')) score += 250; // MASSIVE boost
-                        else if (href.includes('user') && href.includes('privacy')) score += 200; // MASSIVE boost
-                        else if (href.includes('customer') && href.includes('privacy')) score += 180; // MASSIVE boost
-
-                        // Only check standard patterns if no user/customer match was found
-                        if (score === 0) {
-                            // Exact title matches get highest priority (unchanged from before)
-                            if (text === 'privacy notice' || text === 'privacy policy') score += 200;
-                            else if (text.includes('privacy notice') || text.includes('privacy policy')) score += 180;
-                            else if (text.includes('privacy statement')) score += 160;
-                            else if (text.includes('data privacy')) score += 150;
-                            else if (text.includes('privacy')) score += 140;
-                            else if (text.includes('data policy')) score += 130;
-                            else if (text.includes('data protection')) score += 120;
-
-                            // URL scoring (unchanged from before)
-                            if (href.includes('privacy-policy') || href.includes('privacy_policy')) score += 50;
-                            else if (href.includes('privacy-notice') || href.includes('privacy_notice')) score += 48;
-                            else if (href.includes('privacy')) score += 45;
-                            else if (href.includes('data-policy')) score += 40;
-                            else if (href.includes('data-protection')) score += 30;
-                        }
-
-                        return {
-                            text: a.textContent.trim(),
-                            href: a.href,
-                            score: score
-                        };
-                    })
-                    .sort((a, b) => b.score - a.score);
-            }"""
-            )
+            # On anti-bot pages, footer links are often still accessible
+            footer_links = []
+            if links_in_footer(snapshot, privacy=True):
+                for link in snapshot:
+                    if not link.get("text"):
+                        continue
+                    score = score_privacy_footer_link(link["href"], link["text"])
+                    if score is not None:
+                        footer_links.append({"text": link["text"], "href": link["href"], "score": score})
+                footer_links.sort(key=lambda x: x["score"], reverse=True)
 
             if footer_links and len(footer_links) > 0:
                 print(
@@ -1935,152 +2240,27 @@ async def find_privacy_links_js(page, context, unverified_result=None):
                 return best_link, page, best_link
 
         # Get the base domain for validation
-        base_domain = await page.evaluate(
-            """() => {
-            try {
-                return new URL(window.location.href).hostname;
-            } catch (e) {
-                return '';
-            }
-        }"""
-        )
+        base_domain = urlparse(page.url).hostname or ""
 
         print(f"Base domain: {base_domain}")
 
-        # Enhanced link detection script - specifically targeting common
-        # Privacy Policy links at bottom of page
-        links = await page.evaluate(
-            """(baseDomain) => {
-            // Get all footer sections (most Privacy links are in footers)
-            const footerSelectors = [
-                'footer', '.footer', '#footer', '[class*="footer"]', '[id*="footer"]',
-                '.legal', '#legal', '.bottom', '.links', '.nav-bottom', '.site-info'
-            ];
-
-            // Get all links that might be Privacy Policy links
-            let allLinks = [];
-
-            // First check footer areas
-            for (const selector of footerSelectors) {
-                const container = document.querySelector(selector);
-                if (container) {
-                    const links = Array.from(container.querySelectorAll('a[href]'));
-                    allLinks = [...allLinks, ...links];
-                }
-            }
+        # Most Privacy links are in footers; use the whole page only if no
+        # footer links exist
+        candidates = links_in_footer(snapshot, privacy=True) or snapshot
 
-            // If no links found in footers, check the entire page
-            if (allLinks.length === 0) {
-                allLinks = Array.from(document.querySelectorAll('a[href]'));
-            }
-
-            // Privacy patterns to look for
-            const privacyPatterns = [
-                'privacy policy', 'privacy notice', 'privacy statement',
-                'data policy', 'privacy', 'data protection', 'personal data',
-                'data processing', 'gdpr', 'ccpa'
-            ];
-            
-            // User/customer patterns (high priority)
-            const userCustomerPatterns = [
-                'user privacy', 'customer privacy', 'user data', 'customer data',
-                'user rights', 'customer rights', 'user information', 'customer information'
-            ];
-
-            // Score and filter links
-            const scoredLinks = allLinks
-                .filter(link => {
-                    // Basic filtering
-                    if (!link.href || !link.textContent) return false;
-
-                    // Skip javascript, mail links
-                    if (link.href.startsWith('javascript:') ||
-                        link.href.startsWith('mailto:') ||
-                        link.href.startsWith('tel:')) return false;
-
-                    const text = link.textContent.trim().toLowerCase();
-                    const href = link.href.toLowerCase();
-
-                    // Include if text or URL contains any of our terms
-                    return privacyPatterns.some(term => text.includes(term) || href.includes(term)) ||
-                           userCustomerPatterns.some(term => text.includes(term) || href.includes(term));
-                })
-                .map(link => {
-                    const text = link.textContent.trim().toLowerCase();
-                    const href = link.href.toLowerCase();
-
-                    // Score the link
-                    let score = 0;
-
-                    // Text matching - ENHANCED with user/customer priority
-                    if (text === 'user privacy notice' || text === 'user privacy policy') score += 250;  // Absolute highest priority
-                    else if (text.includes('user privacy notice')) score += 240;  // Nearly as high
-                    else if (text.includes('user privacy policy')) score += 230;  // Almost as high
-                    else if (text.includes('user privacy')) score += 220;  // User privacy is top priority
-                    else if (text === 'customer privacy notice' || text === 'customer privacy policy') score += 210; // Almost as high
-                    else if (text.includes('customer privacy notice')) score += 200;  // Very high priority
-                    else if (text.includes('customer privacy')) score += 190;  // Customer privacy is high priority
-                    else if (text.includes('user') && text.includes('privacy policy')) score += 180;  // Very high priority
-                    else if (text.includes('customer') && text.includes('privacy policy')) score += 170;  // Very high priority
-                    else if (text === 'privacy policy' || text === 'privacy notice') score += 120;  // Increased from 100
-                    else if (text.includes('privacy policy') || text.includes('privacy notice')) score += 110;  // Increased from 90
-                    else if (text.includes('privacy') && text.includes('statement')) score += 105;  // Increased from 85
-                    else if (text.includes('data policy') || text.includes('privacy policy')) score += 100;  // Increased from 80
-                    else if (text.includes('privacy')) score += 90;  // Increased from 70
-                    else if (text === 'data protection' || text === 'data privacy') score += 80;  // Increased from 60
-                    else if (text.includes('data protection') || text.includes('data privacy')) score += 70;  // Increased from 50
-                    
-                    // Add user/customer bonuses separately if not already caught above
-                    if (!score >= 170 && text.includes('user')) score += 80;  // Increased from 60
-                    if (!score >= 170 && text.includes('customer')) score += 70;  // Increased from 50
-
-                    // URL matching - ENHANCED with user/customer priority
-                    if (href.includes('user-privacy-notice') || href.includes('user_privacy_notice')) score += 120;  // New highest URL priority
-                    else if (href.includes('user-privacy-policy') || href.includes('user_privacy_policy')) score += 110;  // New very high priority
-                    else if (href.includes('user-privacy') || href.includes('user_privacy')) score += 100;  // Increased from 80
-                    else if (href.includes('customer-privacy-notice') || href.includes('customer_privacy_notice')) score += 95;  // New high priority
-                    else if (href.includes('customer-privacy') || href.includes('customer_privacy')) score += 90;  // Increased from 75
-                    else if (href.includes('user') && href.includes('privacy')) score += 85;  // Increased from 70
-                    else if (href.includes('customer') && href.includes('privacy')) score += 80;  // Increased from 65
-                    else if (href.includes('privacy-policy') ||
-                        href.includes('privacy-notice') ||
-                        href.includes('privacy_policy') ||
-                        href.includes('privacy_notice')) score += 70;  // Increased from 50
-                    else if (href.includes('privacy-statement') ||
-                             href.includes('privacy_statement')) score += 65;  // Increased from 45
-                    else if (href.includes('data-privacy') ||
-                             href.includes('data_privacy')) score += 65;  // Increased from 45
-                    else if (href.includes('/privacy/') ||
-                             href.includes('/datapolicy/')) score += 60;  // Increased from 40
-                    else if (href.includes('/privacy') ||
-                             href.includes('/datapolicy')) score += 55;  // Increased from 35
-                    else if (href.includes('gdpr') ||
-                             href.includes('ccpa')) score += 50;  // Increased from 30
-                    
-                    // Add user/customer URL bonuses separately if not already caught
-                    if (!score >= 140 && href.includes('user')) score += 50;  // Increased from 30
-                    if (!score >= 140 && href.includes('customer')) score += 45;  // Increased from 25
-
-                    // Add boost for links in the page footer or with legal in the path
-                    const isInFooter = footerSelectors.some(sel =>
-                        link.closest(sel) !== null);
-
-                    if (isInFooter) score += 20;
-                    if (href.includes('/legal/')) score += 15;
-
-                    return {
-                        text: text,
-                        href: href,
-                        score: score
-                    };
+        links = []
+        for link, score in zip(candidates, score_privacy_links(candidates)):
+            if not link.get("text"):
+                continue
+            if score > 30:  # Only include higher scored links
+                links.append({
+                    "text": link["text"].lower(),
+                    "href": link["href"],
+                    "score": score,
+                    "weighted": weighted_privacy_link_score(link),
                 })
-                .filter(item => item.score > 30) // Only include higher scored links
-                .sort((a, b) => b.score - a.score);
+        links.sort(key=lambda x: (x["score"], x["weighted"]), reverse=True)
 
-            return scoredLinks;
-        }""",
-            base_domain,
-        )
 
         # No links found
         if not links or len(links) == 0:
@@ -2289,170 +2469,126 @@ async def smooth_scroll_and_click_privacy(
     return None, current_page, unverified_result
 
 
-async def find_matching_privacy_link(page, context, unverified_result=None):
-    """Find and click on privacy-related links with optimized performance."""
+async def open_snapshot_link(page, href, timeout=2500):
+    """Navigate to a snapshot link's href; True if the page loaded."""
     try:
-        # Use a more targeted selector with significantly enhanced user/customer terms priority
-        links = await page.query_selector_all(
-            'footer a, .footer a, #footer a, a[href*="user-privacy"], a[href*="user_privacy"], ' +
-            'a[href*="user"][href*="privacy"], a[href*="customer-privacy"], a[href*="customer_privacy"], ' +
-            'a[href*="customer"][href*="privacy"], a[href*="privacy"], a[href*="user"], a[href*="customer"], ' +
-            'a[href*="datapolicy"], a[href*="data-policy"]'
-        )
+        response = await navigate_page(page, href, timeout=timeout, wait_until="domcontentloaded")
+        return bool(response and response.ok)
+    except Exception as e:
+        print(f"Navigation error: {str(e)}")
+        return False
 
-        # First pass: Look for "User Privacy" or "Privacy Notice" links specifically
-        # With SIGNIFICANTLY ENHANCED priority for user/customer terms
-        for link in links:
-            try:
-                text = await link.text_content()
-                if not text:
-                    continue
-                text = text.lower().strip()
-                href = await link.get_attribute("href")
-                if not href:
-                    continue
 
-                # Score the link text for user/customer priority - ENHANCED SCORING
-                user_customer_score = 0
-                
-                # === DIRECT TEXT MATCHES - HIGHEST PRIORITY ===
-                # Direct match for "User Privacy Notice" gets ABSOLUTE HIGHEST priority
-                if text == "user privacy notice":
-                    user_customer_score = 1000  # Absolute highest priority
-                    print(f"⭐⭐⭐ Found EXACT 'user privacy notice' link text: {text} - ABSOLUTE HIGHEST PRIORITY")
-                elif text == "user privacy policy":
-                    user_customer_score = 950  # Almost absolute highest
-                    print(f"⭐⭐⭐ Found EXACT 'user privacy policy' link text: {text} - NEAR HIGHEST PRIORITY")
-                elif text == "customer privacy notice":
-                    user_customer_score = 900  # Extremely high priority
-                    print(f"⭐⭐ Found EXACT 'customer privacy notice' link text: {text} - EXTREMELY HIGH PRIORITY")
-                elif text == "customer privacy policy":
-                    user_customer_score = 850  # Very high priority
-                    print(f"⭐⭐ Found EXACT 'customer privacy policy' link text: {text} - VERY HIGH PRIORITY")
-                # === PARTIAL TEXT MATCHES - HIGH PRIORITY ===
-                elif "user privacy notice" in text:
-                    user_customer_score = 800  # Top tier priority
-                    print(f"⭐⭐ Found 'user privacy notice' in link text: {text} - TOP TIER PRIORITY")
-                elif "user privacy policy" in text:
-                    user_customer_score = 750  # High priority
-                    print(f"⭐⭐ Found 'user privacy policy' in link text: {text} - HIGH PRIORITY")
-                elif "customer privacy notice" in text:
-                    user_customer_score = 700  # High priority
-                    print(f"⭐⭐ Found 'customer privacy notice' in link text: {text} - HIGH PRIORITY")
-                elif "customer privacy policy" in text:
-                    user_customer_score = 650  # High priority
-                    print(f"⭐ Found 'customer privacy policy' in link text: {text} - HIGH PRIORITY")
-                elif "user privacy" in text:
-                    user_customer_score = 600  # Good priority
-                    print(f"⭐ Found 'user privacy' in link text: {text} - GOOD PRIORITY")
-                elif "customer privacy" in text:
-                    user_customer_score = 550  # Good priority
-                    print(f"⭐ Found 'customer privacy' in link text: {text} - GOOD PRIORITY")
-                    
-                # === URL MATCHING - ADDITIONAL PRIORITY ===
-                # Also check URL for user/customer terms for additional score
-                href_lower = href.lower()
-                if "user-privacy" in href_lower or "user_privacy" in href_lower:
-                    user_customer_score += 200  # Big boost for user privacy in URL
-                    print(f"  + URL contains user-privacy: +200 points")
-                elif "customer-privacy" in href_lower or "customer_privacy" in href_lower:
-                    user_customer_score += 180  # Good boost for customer privacy in URL
-                    print(f"  + URL contains customer-privacy: +180 points")
-                elif "user" in href_lower and "privacy" in href_lower:
-                    user_customer_score += 150  # Decent boost for user + privacy in URL
-                    print(f"  + URL contains user and privacy: +150 points")
-                elif "customer" in href_lower and "privacy" in href_lower:
-                    user_customer_score += 130  # Smaller boost for customer + privacy in URL
-                    print(f"  + URL contains customer and privacy: +130 points")
-                    
-                # If this is a high-scoring user/customer link, try to navigate immediately
-                if user_customer_score >= 500:  # High enough to prioritize
-                    print(f"⭐ Prioritizing high-scoring user/customer link: {text} (Score: {user_customer_score})")
-                    try:
-                        success = await click_and_wait_for_navigation(page, link, timeout=3000)  # Reduced timeout for faster processing
-                        if success:
-                            return page.url, page, unverified_result or href  # Use href as unverified_result if none exists
-                    except Exception as e:
-                        print(f"Navigation error clicking high-priority user/customer link: {e}")
-                        # Still store this as unverified_result even if navigation fails
-                        if not unverified_result:
-                            unverified_result = href
-                
-                # STANDARD PRIVACY LINK MATCHING
-                # Direct match for "Privacy Notice" gets top standard priority
-                elif text == "privacy notice" or text == "privacy policy":
-                    print(f"Found exact privacy notice/policy link: {text}")
-                    try:
-                        success = await click_and_wait_for_navigation(page, link, timeout=2500) # Reduced timeout
-                        if success:
-                            return page.url, page, unverified_result
-                    except Exception as e:
-                        print(f"Navigation error clicking link: {e}")
-                        continue
-            except Exception as e:
-                print(f"Error processing link: {e}")
-                continue
+async def find_matching_privacy_link(page, context, unverified_result=None, links=None):
+    """Find and open privacy-related links from a link snapshot."""
+    try:
+        if links is None:
+            links = await take_link_snapshot(page)
 
-        # Second pass: Special handling for user privacy notice (high priority)
+        # Same candidates the old footer / privacy-href selector picked,
+        # with significantly enhanced user/customer terms priority
+        candidates = []
         for link in links:
-            try:
-                text = await link.text_content()
-                if not text:
-                    continue
-                text = text.lower().strip()
-                href = await link.get_attribute("href")
-                if not href:
-                    continue
-
-                # Check for high-priority user privacy links
-                if ("user privacy" in text or "user" in text and "privacy" in text) or \
-                   (href and ("user-privacy" in href.lower() or "user_privacy" in href.lower() or "user" in href.lower() and "privacy" in href.lower())):
-                    print(f"⭐ Found high-priority user privacy link: {text}")
-                    success = await click_and_wait_for_navigation(page, link, timeout=3000)
-                    if success:
-                        return page.url, page, unverified_result
-            except Exception as e:
+            text = link.get("text", "").lower().strip()
+            href = link.get("href", "")
+            raw_href = link.get("rawHref", "")
+            if not text or not href:
                 continue
+            if link.get("inFooterArea") or any(
+                p in raw_href for p in ("privacy", "user", "customer", "datapolicy", "data-policy")
+            ):
+                candidates.append((text, href))
 
-        # Third pass: Check for other privacy links
-        for link in links:
-            try:
-                text = await link.text_content()
-                if not text:
-                    continue
-                text = text.lower().strip()
-                href = await link.get_attribute("href")
-                if not href:
-                    continue
+        # First pass: Look for "User Privacy" or "Privacy Notice" links specifically
+        # With SIGNIFICANTLY ENHANCED priority for user/customer terms
+        for text, href in candidates:
+            # Score the link text for user/customer priority - ENHANCED SCORING
+            user_customer_score = 0
+            
+            # === DIRECT TEXT MATCHES - HIGHEST PRIORITY ===
+            if text == "user privacy notice":
+                user_customer_score = 1000  # Absolute highest priority
+            elif text == "user privacy policy":
+                user_customer_score = 950  # Almost absolute highest
+            elif text == "customer privacy notice":
+                user_customer_score = 900  # Extremely high priority
+            elif text == "customer privacy policy":
+                user_customer_score = 850  # Very high priority
+            # === PARTIAL TEXT MATCHES - HIGH PRIORITY ===
+            elif "user privacy notice" in text:
+                user_customer_score = 800  # Top tier priority
+            elif "user privacy policy" in text:
+                user_customer_score = 750  # High priority
+            elif "customer privacy notice" in text:
+                user_customer_score = 700  # High priority
+            elif "customer privacy policy" in text:
+                user_customer_score = 650  # High priority
+            elif "user privacy" in text:
+                user_customer_score = 600  # Good priority
+            elif "customer privacy" in text:
+                user_customer_score = 550  # Good priority
+                
+            # === URL MATCHING - ADDITIONAL PRIORITY ===
+            href_lower = href.lower()
+            if "user-privacy" in href_lower or "user_privacy" in href_lower:
+                user_customer_score += 200  # Big boost for user privacy in URL
+            elif "customer-privacy" in href_lower or "customer_privacy" in href_lower:
+                user_customer_score += 180  # Good boost for customer privacy in URL
+            elif "user" in href_lower and "privacy" in href_lower:
+                user_customer_score += 150  # Decent boost for user + privacy in URL
+            elif "customer" in href_lower and "privacy" in href_lower:
+                user_customer_score += 130  # Smaller boost for customer + privacy in URL
+                
+            # If this is a high-scoring user/customer link, try to navigate immediately
+            if user_customer_score >= 500:  # High enough to prioritize
+                print(f"⭐ Prioritizing high-scoring user/customer link: {text} (Score: {user_customer_score})")
+                if await open_snapshot_link(page, href, timeout=3000):
+                    return page.url, page, unverified_result or href  # Use href as unverified_result if none exists
+                # Still store this as unverified_result even if navigation fails
+                if not unverified_result:
+                    unverified_result = href
+            
+            # STANDARD PRIVACY LINK MATCHING
+            # Direct match for "Privacy Notice" gets top standard priority
+            elif text == "privacy notice" or text == "privacy policy":
+                print(f"Found exact privacy notice/policy link: {text}")
+                if await open_snapshot_link(page, href, timeout=2500):
+                    return page.url, page, unverified_result
 
-                # Simplified scoring for speed
-                score = 0
-                if "privacy policy" in text or "privacy notice" in text:
-                    score = 100
-                elif "privacy" in text:
-                    score = 80
-                elif "data policy" in text:
-                    score = 70
-                elif "data protection" in text:
-                    score = 50
-
-                # Additional URL scoring
-                if "/privacy-policy" in href or "/privacy_policy" in href:
-                    score += 50
-                elif "/privacy" in href or "/datapolicy" in href:
-                    score += 40
-                elif "/data-protection" in href or "/data_protection" in href:
-                    score += 30
-
-                if score > 50:  # High confidence match
-                    print(f"Found high confidence privacy link: {text} ({score})")
-                    success = await click_and_wait_for_navigation(
-                        page, link, timeout=2500
-                    )
-                    if success:
-                        return page.url, page, unverified_result
-            except Exception as e:
-                continue
+        # Second pass: Special handling for user privacy notice (high priority)
+        for text, href in candidates:
+            href_lower = href.lower()
+            if ("user privacy" in text or "user" in text and "privacy" in text) or \
+               ("user-privacy" in href_lower or "user_privacy" in href_lower or "user" in href_lower and "privacy" in href_lower):
+                print(f"⭐ Found high-priority user privacy link: {text}")
+                if await open_snapshot_link(page, href, timeout=3000):
+                    return page.url, page, unverified_result
+
+        # Third pass: Check for other privacy links
+        for text, href in candidates:
+            # Simplified scoring for speed
+            score = 0
+            if "privacy policy" in text or "privacy notice" in text:
+                score = 100
+            elif "privacy" in text:
+                score = 80
+            elif "data policy" in text:
+                score = 70
+            elif "data protection" in text:
+                score = 50
+
+            # Additional URL scoring
+            if "/privacy-policy" in href or "/privacy_policy" in href:
+                score += 50
+            elif "/privacy" in href or "/datapolicy" in href:
+                score += 40
+            elif "/data-protection" in href or "/data_protection" in href:
+                score += 30
+
+            if score > 50:  # High confidence match
+                print(f"Found high confidence privacy link: {text} ({score})")
+                if await open_snapshot_link(page, href, timeout=2500):
+                    return page.url, page, unverified_result
         return None, page, unverified_result
     except Exception as e:
         print(f"Error in find_matching_privacy_link: {e}")
@@ -2462,268 +2598,23 @@ async def find_matching_privacy_link(page, context, unverified_result=None):
 async def verify_is_privacy_page(page):
     """Verify if the current page is a privacy policy page."""
     try:
-        page_title = await page.title()
-        page_url = page.url
-
-        # Initial checks on title and URL
-        title_lower = page_title.lower()
-        url_lower = page_url.lower()
-
         print("🔍 Performing thorough privacy page verification...")
-        
-        # Check for user/customer privacy terms first - HIGHEST PRIORITY
-        user_customer_terms = await page.evaluate(
-            """() => {
-                const text = document.body.innerText.toLowerCase();
-                const url = window.location.href.toLowerCase();
-                const title = document.title.toLowerCase();
-                
-                // Create arrays to hold found terms
-                const foundUserTerms = [];
-                const foundCustomerTerms = [];
-                
-                // User terms in title/URL (supreme priority)
-                if (title.includes('user privacy notice') || title.includes('user privacy policy'))
-                    foundUserTerms.push('user privacy notice/policy in title');
-                else if (title.includes('user privacy'))
-                    foundUserTerms.push('user privacy in title');
-                else if (title.includes('user') && title.includes('privacy'))
-                    foundUserTerms.push('user + privacy in title');
-                
-                if (url.includes('user-privacy') || url.includes('user_privacy'))
-                    foundUserTerms.push('user-privacy in URL');
-                else if (url.includes('user') && url.includes('privacy'))
-                    foundUserTerms.push('user + privacy in URL');
-                
-                // Customer terms in title/URL (high priority)
-                if (title.includes('customer privacy notice') || title.includes('customer privacy policy'))
-                    foundCustomerTerms.push('customer privacy notice/policy in title');
-                else if (title.includes('customer privacy'))
-                    foundCustomerTerms.push('customer privacy in title');
-                else if (title.includes('customer') && title.includes('privacy'))
-                    foundCustomerTerms.push('customer + privacy in title');
-                
-                if (url.includes('customer-privacy') || url.includes('customer_privacy'))
-                    foundCustomerTerms.push('customer-privacy in URL');
-                else if (url.includes('customer') && url.includes('privacy'))
-                    foundCustomerTerms.push('customer + privacy in URL');
-                
-                // Check content for key phrases (good priority)
-                const userPhrases = [
-                    'user privacy rights',
-                    'user data collection',
-                    'user data processing',
-                    'user consent',
-                    'user preferences',
-                    'user information'
-                ];
-                
-                const customerPhrases = [
-                    'customer privacy rights',
-                    'customer data collection',
-                    'customer data processing',
-                    'customer consent',
-                    'customer preferences',
-                    'customer information'
-                ];
-                
-                // Check for user phrases
-                for (const phrase of userPhrases) {
-                    if (text.includes(phrase)) {
-                        foundUserTerms.push(phrase);
-                    }
-                }
-                
-                // Check for customer phrases
-                for (const phrase of customerPhrases) {
-                    if (text.includes(phrase)) {
-                        foundCustomerTerms.push(phrase);
-                    }
-                }
-                
-                return {
-                    userTerms: foundUserTerms,
-                    customerTerms: foundCustomerTerms,
-                    hasUserTerms: foundUserTerms.length > 0,
-                    hasCustomerTerms: foundCustomerTerms.length > 0
-                };
-            }"""
-        )
-        
-        # If we found user or customer terms, this is strong evidence
-        if user_customer_terms["hasUserTerms"] or user_customer_terms["hasCustomerTerms"]:
-            user_terms = user_customer_terms["userTerms"]
-            customer_terms = user_customer_terms["customerTerms"]
-            
-            # Log findings
-            if user_customer_terms["hasUserTerms"]:
-                print(f"✅ USER PRIVACY TERMS FOUND: {', '.join(user_terms)}")
-            if user_customer_terms["hasCustomerTerms"]:
-                print(f"✅ CUSTOMER PRIVACY TERMS FOUND: {', '.join(customer_terms)}")
-            
-            # Calculate a confidence score - user terms weighted higher
-            user_confidence = len(user_terms) * 25  # Each user term adds 25 confidence points
-            customer_confidence = len(customer_terms) * 20  # Each customer term adds 20 confidence points
-            
-            total_confidence = min(100, user_confidence + customer_confidence)  # Cap at 100
-            
-            return {
-                "isPrivacyPage": True,
-                "confidence": total_confidence,
-                "reason": "Contains user/customer privacy terms (highest priority)"
-            }
 
-        # Check if title contains strong privacy indicators
-        title_confidence = 0
-        is_privacy_title = False
-        
-        # Score the title - prioritize "Privacy Notice"
-        if 'privacy notice' in title_lower:
-            title_confidence = 90
-            is_privacy_title = True
-        elif 'privacy policy' in title_lower:
-            title_confidence = 85
-            is_privacy_title = True
-        elif 'privacy statement' in title_lower:
-            title_confidence = 80
-            is_privacy_title = True
-        elif 'privacy' in title_lower and any(word in title_lower for word in ['information', 'data', 'personal']):
-            title_confidence = 75
-            is_privacy_title = True
-        elif 'privacy' in title_lower:
-            title_confidence = 70
-            is_privacy_title = True
-        elif 'data protection' in title_lower:
-            title_confidence = 65
-            is_privacy_title = True
-        elif 'data policy' in title_lower:
-            title_confidence = 60
-            is_privacy_title = True
-        
-        # If title is very strong indicator, this is enough for a quick confirmation
-        if title_confidence >= 80:
-            return {
-                "isPrivacyPage": True,
-                "confidence": title_confidence,
-                "reason": f"Strong privacy indicator in title: '{page_title}'"
-            }
-        
-        # URL checks
-        url_confidence = 0
-        if 'privacy-notice' in url_lower or 'privacy_notice' in url_lower:
-            url_confidence = 60
-        elif 'privacy-policy' in url_lower or 'privacy_policy' in url_lower:
-            url_confidence = 55
-        elif 'privacy-statement' in url_lower or 'privacy_statement' in url_lower:
-            url_confidence = 50
-        elif 'privacy' in url_lower:
-            url_confidence = 45
-        elif 'data-protection' in url_lower or 'data_protection' in url_lower:
-            url_confidence = 40
-        elif 'data-policy' in url_lower or 'data_policy' in url_lower:
-            url_confidence = 35
-        
-        # Combined checks for early exit
-        if is_privacy_title and url_confidence >= 45:
-            combined_confidence = min(95, title_confidence + 10)  # Cap at 95
-            return {
-                "isPrivacyPage": True,
-                "confidence": combined_confidence,
-                "reason": f"Privacy in both title and URL: '{page_title}'"
-            }
-        
-        # Content checks
-        content_result = await page.evaluate(
-            """() => {
-                const text = document.body.innerText.toLowerCase();
-                
-                // Count privacy-related phrases
-                const phrases = [
-                    'information we collect', 'data we collect', 'personal information',
-                    'your rights', 'privacy rights', 'gdpr', 'ccpa', 'opt-out',
-                    'cookies', 'tracking technologies', 'third parties',
-                    'how we use', 'share your information', 'contact us',
-                    'data retention', 'policy updates', 'changes to this policy',
-                    'delete your data', 'access your data'
-                ];
-                
-                let phraseCount = 0;
-                for (const phrase of phrases) {
-                    if (text.includes(phrase)) {
-                        phraseCount++;
-                    }
-                }
-                
-                // Check for sections that would appear in a privacy policy
-                const hasSections = 
-                    /collection.*information/i.test(text) ||
-                    /use.*information/i.test(text) ||
-                    /sharing.*information/i.test(text) ||
-                    /cookies.*technologies/i.test(text) ||
-                    /your.*rights/i.test(text) ||
-                    /contact.*us/i.test(text);
-                
-                // Check length - privacy policies tend to be long
-                // but not too long (to avoid false positives from long pages)
-                const contentLength = text.length;
-                const isPrivacyLength = contentLength >= 2000 && contentLength <= 10000;
-                
-                return {
-                    phraseCount,
-                    hasSections,
-                    contentLength,
-                    isPrivacyLength
-                };
-            }"""
+        # Rendered title and text; the verdict is the same one page_verifier
+        # reaches from static HTML
+        content = await page.evaluate(
+            """() => ({ title: document.title, text: document.body.innerText })"""
         )
-        
-        # Build confidence from content
-        content_confidence = 0
-        
-        # Phrase-based scoring
-        if content_result["phraseCount"] >= 10:
-            content_confidence += 40
-        elif content_result["phraseCount"] >= 7:
-            content_confidence += 30
-        elif content_result["phraseCount"] >= 4:
-            content_confidence += 20
-        elif content_result["phraseCount"] >= 2:
-            content_confidence += 10
-        
-        # Structure scoring
-        if content_result["hasSections"]:
-            content_confidence += 15
-        
-        # Length scoring
-        if content_result["isPrivacyLength"]:
-            content_confidence += 10
-        
-        # Final decision - combine all factors
-        final_confidence = title_confidence + url_confidence * 0.5 + content_confidence * 0.7
-        final_confidence = min(100, final_confidence)  # Cap at 100
-        
-        is_privacy_page = False
-        reason = ""
-        
-        if final_confidence >= 70:
-            is_privacy_page = True
-            reason = "High confidence from multiple factors"
-        elif title_confidence >= 70:
-            is_privacy_page = True
-            reason = "High confidence from title"
-        elif title_confidence >= 50 and url_confidence >= 50:
-            is_privacy_page = True
-            reason = "Good confidence from title and URL"
-        elif content_confidence >= 50 and (title_confidence > 0 or url_confidence > 0):
-            is_privacy_page = True
-            reason = "Good confidence from content with title/URL indicators"
-        
-        return {
-            "isPrivacyPage": is_privacy_page,
-            "confidence": final_confidence,
-            "reason": reason
-        }
-        
+        verification = score_privacy_page(content["title"], page.url, content["text"])
+
+        # Log user/customer findings, the strongest evidence
+        if verification.get("userTerms"):
+            print(f"✅ USER PRIVACY TERMS FOUND: {', '.join(verification['userTerms'])}")
+        if verification.get("customerTerms"):
+            print(f"✅ CUSTOMER PRIVACY TERMS FOUND: {', '.join(verification['customerTerms'])}")
+
+        return verification
+
     except Exception as e:
         print(f"Error verifying privacy page: {e}")
         return {
@@ -2733,6 +2624,7 @@ async def verify_is_privacy_page(page):
         }
 
 
+@search_cache.cached("pp", "duckduckgo")
 async def duckduckgo_search_fallback(domain, page):
     """Search for privacy policy using DuckDuckGo Search with a lighter implementation."""
     try:
@@ -2837,6 +2729,7 @@ async def duckduckgo_search_fallback(domain, page):
         return None
 
 
+@search_cache.cached("pp", "yahoo")
 async def yahoo_search_fallback(domain, page):
     """Search for privacy policy using Yahoo Search."""
     try:
@@ -3005,6 +2898,7 @@ async def yahoo_search_fallback(domain, page):
         return None
 
 
+@search_cache.cached("pp", "bing")
 async def bing_search_fallback(domain, page):
     """Search for privacy policy using Bing Search."""
     try:
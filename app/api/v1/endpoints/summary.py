@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import os
 import re
@@ -7,6 +8,7 @@ import httpx
 from fastapi import APIRouter
 
 from app.core.config import settings
+from app.core.memory_cache import MemoryCache
 from app.models.summary import SummaryRequest, SummaryResponse
 
 logging.basicConfig(level=logging.INFO)
@@ -14,6 +16,14 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Raw LLM output per (provider, model, prompt); re-summarising unchanged text is wasted spend
+summary_cache = MemoryCache(
+    "summary",
+    ttl=settings.SUMMARY_CACHE_TTL,
+    max_bytes=settings.SUMMARY_CACHE_MAX_BYTES,
+    shared=True,
+)
+
 
 def clean_summary_text(text: str) -> str:
     """Remove formatting artifacts from LLM output."""
@@ -256,7 +266,11 @@ async def generate_summary_response(request: SummaryRequest) -> SummaryResponse:
 
         logger.info("Generating summary using provider '%s' and model '%s'", provider, model_name)
 
-        if provider == "google":
+        cache_key = (provider, model_name, hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        summary_text, error = await summary_cache.aget(cache_key), None
+        if summary_text is not None:
+            logger.info("Reusing cached summary for identical %s text", document_type)
+        elif provider == "google":
             summary_text, error = await call_google_summary(prompt, model_name)
         elif provider == "zai":
             summary_text, error = await call_zai_summary(prompt, model_name)
@@ -285,6 +299,7 @@ async def generate_summary_response(request: SummaryRequest) -> SummaryResponse:
             )
 
         hundred_word_summary, one_sentence_summary = extract_summaries(summary_text)
+        summary_cache.put(cache_key, summary_text)
 
         return SummaryResponse(
             url=base_url,
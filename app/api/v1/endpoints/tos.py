@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import random
 from urllib.parse import urlparse, urljoin, parse_qs
 import re
@@ -9,6 +11,27 @@ from playwright.async_api import async_playwright
 from typing import Optional, List
 import platform
 
+from app.core.browser import (
+    CONSISTENT_USER_AGENT,
+    STEALTH_INIT_SCRIPT,
+    browser_pool,
+    navigate_page,
+    wait_for_page_ready,
+)
+from app.core.config import settings
+from app.core.discovery_cache import lookup_discovery, store_discovery
+from app.core.discovery_history import DomainHistory, load_domain_history
+from app.core.discovery_planner import DiscoveryPlanner, Strategy
+from app.core.link_matcher import PhraseMatcher, PriorityMatcher
+from app.core.link_snapshot import (
+    links_in_footer,
+    links_near_phrase,
+    take_link_snapshot,
+    weighted_link_score,
+)
+from app.core.page_verification import page_verifier
+from app.core.search_cache import search_cache
+from app.core.store_pages import developer_site, store_app_info
 from app.models.tos import ToSRequest, ToSResponse
 from app.models.privacy import PrivacyRequest, PrivacyResponse
 from app.api.v1.endpoints.privacy import find_privacy_policy
@@ -18,9 +41,6 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Define consistent user agent
-CONSISTENT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-
 # Replace random user agent function with consistent one
 def get_user_agent():
     """
@@ -230,11 +250,53 @@ def is_likely_user_generated_content(url):
         logger.error(f"Error checking if URL is user content: {e}")
         return False
 
+# Success messages for the planner-run strategies in discover_tos
+STRATEGY_MESSAGES = {
+    "user_customer_terms": "User agreement/terms found with high priority",
+    "js_link_scanning": "Terms of Service found via JS-based link scanning",
+    "text_matching": "Terms of Service found via text match scanning",
+    "search_engine": "Terms of Service found via search",
+    "landing_page_analysis": "Terms of Service found via landing page analysis",
+    "via_privacy_policy": "Terms of Service found from privacy policy page",
+}
+
 @router.post("/tos", response_model=ToSResponse, status_code=status.HTTP_200_OK)
 async def find_tos(request: ToSRequest) -> ToSResponse:
     """
     Find the Terms of Service URL for a given website.
+    Answers from the per-domain discovery cache when it can.
+    """
+    url = sanitize_url(request.url)
+    if url:
+        cached = await lookup_discovery(url, "tos")
+        if cached:
+            return ToSResponse(
+                url=url,
+                tos_url=cached["url"],
+                success=bool(cached["url"]),
+                message=(
+                    "Terms of Service found (cached)" if cached["url"]
+                    else "Could not find Terms of Service (cached result)"
+                ),
+                method_used=f"cached_{cached['method_used']}"
+            )
+    
+    history = await load_domain_history(url, "tos") if url else None
+    response = await discover_tos(request, history)
+    if url:
+        await history.save()
+        await store_discovery(url, "tos", response.tos_url, response.method_used)
+    return response
+
+
+async def discover_tos(request: ToSRequest, history: Optional[DomainHistory] = None) -> ToSResponse:
     """
+    Run the full Terms of Service discovery pipeline, bypassing the cache.
+    With a DomainHistory, strategies are ordered (and whole tiers skipped)
+    from what worked for the domain before, and each attempt is recorded.
+    """
+    if history is None:
+        history = DomainHistory(None, "tos")
     logger.info(f"Finding ToS for URL: {request.url}")
     url = sanitize_url(request.url)
     
@@ -256,18 +318,19 @@ async def find_tos(request: ToSRequest) -> ToSResponse:
     if is_app:
         logger.info(f"Detected App/Play Store URL: {url}")
         
-        # First use privacy endpoint to get privacy policy URL
-        privacy_request = PrivacyRequest(url=url)
-        privacy_response = await find_privacy_policy(privacy_request)
+        # The listing names the developer's site; read it over HTTP first
+        base_url = developer_site(await store_app_info(url))
+        if not base_url:
+            # Otherwise use privacy endpoint to get privacy policy URL
+            privacy_request = PrivacyRequest(url=url)
+            privacy_response = await find_privacy_policy(privacy_request)
+            if privacy_response and privacy_response.pp_url:
+                # Extract base domain from privacy URL
+                logger.info(f"Found privacy policy from store: {privacy_response.pp_url}")
+                base_url = developer_site({"privacy_url": privacy_response.pp_url})
         
-        if privacy_response and privacy_response.pp_url:
-            # Extract base domain from privacy URL
-            logger.info(f"Found privacy policy from store: {privacy_response.pp_url}")
-            parsed_url = urlparse(privacy_response.pp_url)
-            
-            # Construct the base URL (scheme + domain)
-            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-            logger.info(f"Extracted base URL from privacy policy: {base_url}")
+        if base_url:
+            logger.info(f"Developer site for store listing: {base_url}")
             
             # Create a new request with the base URL
             base_request = ToSRequest(url=base_url)
@@ -304,272 +367,208 @@ async def find_tos(request: ToSRequest) -> ToSResponse:
                 method_used="app_store_no_privacy_policy"
             )
     
-    playwright = None
-    browser = None
+    # Static sites: find the link in the server-rendered HTML without a browser
+    from app.api.v1.endpoints.legal import http_first_discovery
+    http_tos_url = None
+    if history.should_defer("http_tier"):
+        logger.info(f"Skipping HTTP tier: it has not worked for {history.domain} recently")
+    else:
+        http_started = time.monotonic()
+        http_tos_url, http_method = await http_first_discovery(url, "tos")
+        if settings.HTTP_DISCOVERY_ENABLED:
+            history.record("http_tier", (time.monotonic() - http_started) * 1000, bool(http_tos_url))
+    if http_tos_url:
+        return ToSResponse(
+            url=url,
+            tos_url=http_tos_url,
+            success=True,
+            message="Terms of Service found over plain HTTP (no browser needed)",
+            method_used=http_method
+        )
+    
+    lease = None
     browser_context = None
     page = None
     
     try:
-        # Try to setup browser if needed for subsequent operations
-        playwright = await async_playwright().start()
-        browser, browser_context, page, _ = await setup_browser(playwright)
+        # Lease an isolated context from the shared browser pool
+        lease = await browser_pool.acquire_lease("tos")
+        browser_context, page = lease.context, lease.page
+        page.set_default_timeout(15000)
+        
+        search_query = tos_search_query(url)
+        
+        # Sites whose landing page never loads but are found by search: search first
+        if history.should_defer("navigation") and history.hits("search_after_navigation_failure"):
+            logger.info(f"Landing page of {history.domain} has not loaded recently, searching first")
+            search_url, search_engine = await navigation_failure_search(search_query, page)
+            if search_url:
+                return ToSResponse(
+                    url=url,
+                    tos_url=search_url,
+                    success=True,
+                    message=f"Terms of Service found via {SEARCH_ENGINE_NAMES[search_engine]} search (learned shortcut)",
+                    method_used=f"{search_engine}_search_fallback"
+                )
         
         # Navigate to the URL - notice we don't exit but continue with recovery methods
+        nav_started = time.monotonic()
         success, _, _ = await navigate_with_retry(page, url)
-        if not success:
-            logger.warning(f"Main site navigation had issues, but trying to analyze current page...")
-        
-        # We don't exit here with failure, we instead try other methods
-        # Try JS scanning approaches, then search engine fallbacks
-        
-        # First check for anti-bot patterns to log the reason
-        anti_bot_detected = await detect_anti_bot_patterns(page)
-        if anti_bot_detected:
-            logger.warning(f"Anti-bot protection detected. Will attempt search fallbacks.")
-        
-        # Try our search engine fallbacks instead of directly returning failure
-        unverified_result = None  # Will hold our best guess if we find one
-        
-        # Initialize a fresh page if possible for search fallbacks
-        try:
-            await page.close()
-            page = await browser_context.new_page()
-        except Exception as e:
-            logger.warning(f"Error creating new page for search fallbacks: {e}")
+        history.record("navigation", (time.monotonic() - nav_started) * 1000, success)
         
-        # Domain-focused search approach
-        try:
-            # Extract clean domain name for search
-            domain = normalize_domain(url)
-            domain_name = domain.replace("www.", "")
-            
-            # Construct a proper search query
-            search_query = f"{domain_name} terms of service, terms of use, user agreement, legal terms"
-            logger.info(f"Using search query: {search_query}")
+        if not success:
+            logger.warning(f"Main site navigation had issues, falling back to search engines...")
             
-            # Try duckduckgo search first
-            logger.info(f"Trying DuckDuckGo search fallback for {domain_name}")
-            duck_result = await duckduckgo_search_fallback(search_query, page)
+            # First check for anti-bot patterns to log the reason
+            anti_bot_detected, _ = await detect_anti_bot_patterns(page)
+            if anti_bot_detected:
+                logger.warning(f"Anti-bot protection detected. Will attempt search fallbacks.")
             
-            if duck_result:
-                logger.info(f"Found terms of service via DuckDuckGo search: {duck_result}")
-                return ToSResponse(
-                    url=url,
-                    tos_url=duck_result,
-                    success=True,
-                    message="Terms of Service found via DuckDuckGo search (after navigation issues)",
-                    method_used="duckduckgo_search_fallback"
+            # Initialize a fresh page if possible for search fallbacks
+            try:
+                await page.close()
+                page = await browser_context.new_page()
+            except Exception as e:
+                logger.warning(f"Error creating new page for search fallbacks: {e}")
+        
+            # Domain-focused search approach
+            try:
+                logger.info(f"Using search query: {search_query}")
+                search_started = time.monotonic()
+                search_url, search_engine = await navigation_failure_search(search_query, page)
+                history.record(
+                    "search_after_navigation_failure", (time.monotonic() - search_started) * 1000, bool(search_url)
                 )
+                
+                if search_url:
+                    logger.info(f"Found terms of service via {search_engine} search: {search_url}")
+                    return ToSResponse(
+                        url=url,
+                        tos_url=search_url,
+                        success=True,
+                        message=f"Terms of Service found via {SEARCH_ENGINE_NAMES[search_engine]} search (after navigation issues)",
+                        method_used=f"{search_engine}_search_fallback"
+                    )
             
-            # Try Yahoo search next
-            logger.info(f"Trying Yahoo search fallback for {domain_name}")
-            yahoo_result = await yahoo_search_fallback(search_query, page)
-            
-            if yahoo_result:
-                logger.info(f"Found terms of service via Yahoo search: {yahoo_result}")
+                # All search methods failed, return failure
+                logger.warning(f"All search fallbacks failed for {url}")
                 return ToSResponse(
                     url=url,
-                    tos_url=yahoo_result,
-                    success=True,
-                    message="Terms of Service found via Yahoo search (after navigation issues)",
-                    method_used="yahoo_search_fallback"
+                    tos_url=None,
+                    success=False,
+                    message="Navigation failed and all search fallbacks exhausted",
+                    method_used="all_search_failed"
                 )
             
-            # Try Bing search as last resort
-            logger.info(f"Trying Bing search fallback for {domain_name}")
-            bing_result = await bing_search_fallback(search_query, page)
-            
-            if bing_result:
-                logger.info(f"Found terms of service via Bing search: {bing_result}")
+            except Exception as e:
+                logger.error(f"Error during search fallbacks: {e}")
                 return ToSResponse(
                     url=url,
-                    tos_url=bing_result,
-                    success=True,
-                    message="Terms of Service found via Bing search (after navigation issues)",
-                    method_used="bing_search_fallback"
+                    tos_url=None,
+                    success=False,
+                    message=f"Navigation failed and search fallbacks encountered error: {str(e)}",
+                    method_used="search_fallback_error"
                 )
-            
-            # All search methods failed, return failure
-            logger.warning(f"All search fallbacks failed for {domain_name}")
-            return ToSResponse(
-                url=url,
-                tos_url=None,
-                success=False,
-                message="Navigation failed and all search fallbacks exhausted",
-                method_used="all_search_failed"
-            )
-            
-        except Exception as e:
-            logger.error(f"Error during search fallbacks: {e}")
-            return ToSResponse(
-                url=url,
-                tos_url=None,
-                success=False,
-                message=f"Navigation failed and search fallbacks encountered error: {str(e)}",
-                method_used="search_fallback_error"
-            )
         
         # Successfully navigated to the page, now analyze it for ToS links
         logger.info("Successfully navigated to page, analyzing...")
         
-        # Check if there are "user" or "customer" specific terms links that we should prioritize
-        try:
-            user_agreement_url = await find_user_customer_terms_links(page)
-            if user_agreement_url:
-                if is_likely_user_generated_content(user_agreement_url):
-                    logger.warning(f"Found user agreement URL appears to be user-generated content: {user_agreement_url}")
-                    # Don't return this result, continue to other methods
-                else:
-                    logger.info(f"Found high-priority user/customer terms: {user_agreement_url}")
-                    # Return immediately if found - priority link
-                    return ToSResponse(
-                        url=url,
-                        tos_url=user_agreement_url,
-                        success=True,
-                        message="User agreement/terms found with high priority",
-                        method_used="user_customer_terms"
-                    )
-        except Exception as e:
-            logger.error(f"Error finding user/customer terms: {e}")
-        
-        # Try more comprehensive link scanning
-        logger.info("Scanning for ToS links...")
-        unverified_result = None
-        
-        # Step a: Try JS-based scanning first (key change - prioritize JS methods)
-        try:
-            tos_url = await find_all_links_js(page, browser_context)
-            if tos_url:
-                if is_likely_user_generated_content(tos_url):
-                    logger.warning(f"Found ToS URL appears to be user-generated content: {tos_url}")
-                    # Save as unverified but continue looking for better results
-                    unverified_result = tos_url
-                else:
-                    logger.info(f"Found ToS via JS-based link scanning: {tos_url}")
-                    # Return as final result without further validation
-                    return ToSResponse(
-                        url=url,
-                        tos_url=tos_url,
-                        success=True,
-                        message="Terms of Service found via JS-based link scanning",
-                        method_used="js_link_scanning"
-                    )
-        except Exception as e:
-            logger.error(f"Error during JS-based link scanning: {e}")
-
-        # Step b: Try matching links based on text
-        try:
-            tos_url = await find_matching_link(page, browser_context, unverified_result)
-            if tos_url:
-                if is_likely_user_generated_content(tos_url):
-                    logger.warning(f"Found ToS URL appears to be user-generated content: {tos_url}")
-                    # Save as unverified but continue looking for better results
-                    if not unverified_result:
-                        unverified_result = tos_url
-                else:
-                    logger.info(f"Found ToS via text matching: {tos_url}")
-                    # Return as final result without further validation
-                    return ToSResponse(
-                        url=url,
-                        tos_url=tos_url,
-                        success=True,
-                        message="Terms of Service found via text match scanning",
-                        method_used="text_matching"
-                    )
-        except Exception as e:
-            logger.error(f"Error during text matching: {e}")
+        # One link snapshot of the landing page feeds every on-page step below.
+        # It's also scored for privacy so Step 4 doesn't re-run privacy discovery.
+        from app.api.v1.endpoints.legal import best_candidate, scan_legal_links
+        landing_links = await take_link_snapshot(page)
+        landing_scan = await scan_legal_links(page, landing_links)
         
-        # If navigation failed or no TOS found with direct methods, try search fallbacks
+        # The remaining strategies are scheduled by the discovery planner against
+        # the caller's deadline, in the priority order the chain always used.
+        # Snapshot-only and own-page strategies overlap with the page-bound ones.
         domain = normalize_domain(url)
-        logger.info(f"Trying search engine fallbacks for domain: {domain}")
-        
-        # Construct a proper search query
-        search_query = f"{domain} terms of service, terms of use, user agreement, legal terms"
-        logger.info(f"Using search query: {search_query}")
-        
-        # Use the standard search approach across search engines
-        try:
-            logger.info("Running standard search using search engines...")
-            tos_url, search_results, consensus_links = await standard_search_fallback(search_query, page)
-            
-            if tos_url:
-                # Validate the ToS URL isn't a user content page
-                if is_likely_user_generated_content(tos_url):
-                    logger.warning(f"Search result appears to be user-generated content: {tos_url}")
-                    # Continue to other methods
-                else:
-                    # Get engines used for better logging
-                    engines_found = list(search_results.keys())
-                    engines_msg = f"Found by search engines: {', '.join(engines_found)}" if engines_found else ""
-                    
-                    logger.info(f"Found ToS via search: {tos_url} {engines_msg}")
-                    # Return as final result without further validation
-                    return ToSResponse(
-                        url=url,
-                        tos_url=tos_url,
-                        success=True,
-                        message=f"Terms of Service found via search {engines_msg}",
-                        method_used="search_engine"
-                    )
-        except Exception as e:
-            logger.warning(f"Search failed: {e}")
+        search_engines_used = []
         
-        # Step 3: Try analysis of the landing page itself
-        try:
-            tos_url = await analyze_landing_page(page, browser_context, unverified_result)
-            if tos_url:
-                if is_likely_user_generated_content(tos_url):
-                    logger.warning(f"Found ToS URL appears to be user-generated content: {tos_url}")
-                    # Save as unverified but continue looking for better results
-                    if not unverified_result:
-                        unverified_result = tos_url
-                else:
-                    logger.info(f"Found ToS via landing page analysis: {tos_url}")
-                    return ToSResponse(
-                        url=url,
-                        tos_url=tos_url,
-                        success=True,
-                        message="Terms of Service found via landing page analysis",
-                        method_used="landing_page_analysis"
-                    )
-        except Exception as e:
-            logger.error(f"Error during landing page analysis: {e}")
-        
-        # Step 4: If a verified privacy policy page exists, try to find ToS from there
-        try:
-            privacy_request = PrivacyRequest(url=url)
-            privacy_response = await find_privacy_policy(privacy_request)
-            
-            if privacy_response and privacy_response.pp_url:
-                logger.info(f"Found privacy policy: {privacy_response.pp_url}. Checking for ToS link...")
-                
-                # Navigate to the privacy policy
-                pp_success, _, _ = await navigate_with_retry(page, privacy_response.pp_url)
-                
-                if pp_success:
-                    # Look for ToS link on the privacy policy page
-                    tos_url = await find_tos_via_privacy_policy(page, browser_context)
-                    
-                    if tos_url:
-                        if is_likely_user_generated_content(tos_url):
-                            logger.warning(f"ToS URL from privacy policy appears to be user content: {tos_url}")
-                            # Save as unverified but continue looking for better results
-                            if not unverified_result:
-                                unverified_result = tos_url
-                        else:
-                            logger.info(f"Found ToS via privacy policy: {tos_url}")
-                            return ToSResponse(
-                                url=url,
-                                tos_url=tos_url,
-                                success=True,
-                                message="Terms of Service found from privacy policy page",
-                                method_used="via_privacy_policy"
-                            )
-        except Exception as e:
-            logger.error(f"Error finding ToS via privacy policy: {e}")
+        def verified(tos_url, source):
+            """Pass tos_url through unless it looks like user content, which is only kept as a fallback."""
+            if tos_url and is_likely_user_generated_content(tos_url):
+                logger.warning(f"{source} result appears to be user-generated content: {tos_url}")
+                planner.offer(tos_url, source)
+                return None
+            return tos_url
+        
+        async def user_customer_terms():
+            # "user" or "customer" specific terms links take priority
+            return verified(await find_user_customer_terms_links(page, landing_links), "user_customer_terms")
+        
+        async def js_link_scanning():
+            tos_url, _, unverified = await find_all_links_js(page, browser_context, None, landing_links)
+            planner.offer(unverified, "js_link_scanning")
+            return verified(tos_url, "js_link_scanning")
+        
+        async def text_matching():
+            tos_url, _, unverified = await find_matching_link(page, browser_context, None, landing_links)
+            planner.offer(unverified, "text_matching")
+            return verified(tos_url, "text_matching")
+        
+        async def search_engine():
+            # Searches on a second page of this request's context so it can
+            # overlap with on-page work without taking another pool slot
+            logger.info(f"Running standard search using search engines for domain: {domain}")
+            search_page = await browser_context.new_page()
+            try:
+                tos_url, search_results, _ = await standard_search_fallback(search_query, search_page)
+            finally:
+                await close_extra_page(search_page)
+            search_engines_used.extend(search_results.keys())
+            if tos_url and is_likely_user_generated_content(tos_url):
+                logger.warning(f"Search result appears to be user-generated content: {tos_url}")
+                return None
+            return tos_url
+        
+        async def landing_page_analysis():
+            tos_url, _, unverified = await analyze_landing_page(page, browser_context, None, landing_links)
+            planner.offer(unverified, "landing_page_analysis")
+            return verified(tos_url, "landing_page_analysis")
+        
+        async def via_privacy_policy():
+            # Take the privacy policy link from the landing page snapshot and
+            # look for a ToS link on the privacy policy page
+            pp_url = best_candidate(landing_scan["pp"])
+            if not pp_url:
+                return None
+            logger.info(f"Found privacy policy link: {pp_url}. Checking for ToS link...")
+            pp_success, _, _ = await navigate_with_retry(page, pp_url)
+            if not pp_success:
+                return None
+            pp_scan = await scan_legal_links(page)
+            return best_candidate(pp_scan["tos"])
+        
+        planner = DiscoveryPlanner("tos", [
+            Strategy("user_customer_terms", user_customer_terms, default_ms=1500),
+            Strategy("js_link_scanning", js_link_scanning, default_ms=1200),
+            Strategy("text_matching", text_matching, uses_page=False, default_ms=50),
+            Strategy("search_engine", search_engine, uses_page=False, default_ms=12000),
+            Strategy("landing_page_analysis", landing_page_analysis, default_ms=4000),
+            Strategy("via_privacy_policy", via_privacy_policy, default_ms=6000),
+        ], history=history)
+        tos_url, method = await planner.run()
+        
+        if tos_url:
+            if method == "search_engine" and search_engines_used:
+                message = f"Terms of Service found via search (engines: {', '.join(search_engines_used)})"
+            else:
+                message = STRATEGY_MESSAGES[method]
+            if planner.timed_out:
+                message += " (best result before the discovery deadline)"
+            logger.info(f"Found ToS via {method}: {tos_url}")
+            return ToSResponse(
+                url=url,
+                tos_url=tos_url,
+                success=True,
+                message=message,
+                method_used=method
+            )
         
-        # Step 5: If we have an unverified result but no better options, return it
-        if unverified_result:
+        # If we have an unverified result but no better options, return it
+        if planner.fallback:
+            unverified_result = planner.fallback[0]
             logger.info(f"Using unverified ToS URL as fallback: {unverified_result}")
             return ToSResponse(
                 url=url,
@@ -579,6 +578,15 @@ async def find_tos(request: ToSRequest) -> ToSResponse:
                 method_used="unverified_result"
             )
         
+        if planner.timed_out:
+            return ToSResponse(
+                url=url,
+                tos_url=None,
+                success=False,
+                message="Could not find Terms of Service before the discovery deadline",
+                method_used="deadline_exceeded"
+            )
+        
         # All methods failed
         return ToSResponse(
             url=url,
@@ -604,33 +612,8 @@ async def find_tos(request: ToSRequest) -> ToSResponse:
             
         return handle_error(url, None, str(e))
     finally:
-        # Always ensure browser resources are cleaned up to prevent leaks
-        try:
-            if page:
-                try:
-                    await page.close()
-                except Exception as e:
-                    logger.error(f"Error closing page: {e}")
-                    
-            if browser_context:
-                try:
-                    await browser_context.close()
-                except Exception as e:
-                    logger.error(f"Error closing browser context: {e}")
-                    
-            if browser:
-                try:
-                    await browser.close()
-                except Exception as e:
-                    logger.error(f"Error closing browser: {e}")
-                    
-            if playwright:
-                try:
-                    await playwright.stop()
-                except Exception as e:
-                    logger.error(f"Error stopping playwright: {e}")
-        except Exception as cleanup_error:
-            logger.error(f"Error during browser cleanup: {cleanup_error}")
+        # Closing the leased context also closes every page opened in it
+        await browser_pool.release_lease(lease)
 
 
 async def setup_browser(playwright=None):
@@ -679,7 +662,7 @@ async def setup_browser(playwright=None):
                 headless=headless,
                 args=browser_args,
                 chromium_sandbox=False,
-                slow_mo=random.randint(10, 30),  # Randomized slight delay for more human-like behavior
+                slow_mo=0 if settings.BROWSER_FAST_READINESS else random.randint(10, 30),  # Randomized slight delay for more human-like behavior
             )
         except Exception as browser_launch_error:
             logger.error(f"Failed to launch browser: {browser_launch_error}")
@@ -710,70 +693,7 @@ async def setup_browser(playwright=None):
         )
 
         # Add comprehensive stealth script to override navigator properties
-        await context.add_init_script(
-            """
-            () => {
-                // Override webdriver property
-                Object.defineProperty(navigator, 'webdriver', { get: () => false });
-                
-                // Add fake plugins for more human-like fingerprint
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [
-                        {
-                            name: 'Chrome PDF Plugin',
-                            description: 'Portable Document Format',
-                            filename: 'internal-pdf-viewer',
-                            length: 1
-                        },
-                        {
-                            name: 'Chrome PDF Viewer',
-                            description: '',
-                            filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai',
-                            length: 1
-                        },
-                        {
-                            name: 'Native Client',
-                            description: '',
-                            filename: 'internal-nacl-plugin',
-                            length: 1
-                        }
-                    ]
-                });
-                
-                // Fix languages
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en']
-                });
-                
-                // Hide automation-related properties
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-                );
-                
-                // Add chrome object if not present
-                if (window.chrome === undefined) {
-                    window.chrome = {
-                        runtime: {},
-                        loadTimes: function() {},
-                        app: {},
-                        csi: function() {},
-                    };
-                }
-                
-                // Prevent iframe detection technique
-                try {
-                    Object.defineProperty(HTMLIFrameElement.prototype, 'contentWindow', {
-                        get: function() {
-                            return window;
-                        }
-                    });
-                } catch (e) {}
-            }
-            """
-        )
+        await context.add_init_script(STEALTH_INIT_SCRIPT)
 
         # Create a page
         page = await context.new_page()
@@ -832,10 +752,48 @@ async def setup_browser(playwright=None):
         raise
 
 
+async def navigate_fast(page, url, max_retries=2):
+    """
+    navigate_with_retry without pacing: DOMContentLoaded plus a mutation-quiescence
+    wait, bounded by BROWSER_READY_BUDGET_MS per attempt.
+    """
+    response = None
+    for attempt in range(max_retries):
+        try:
+            logger.info(f"Fast navigation attempt {attempt+1}/{max_retries} to {url}")
+            response = await navigate_page(
+                page, url, timeout=settings.BROWSER_READY_BUDGET_MS, wait_until="domcontentloaded"
+            )
+            await wait_for_page_ready(page)
+            
+            is_anti_bot, patterns = await detect_anti_bot_patterns(page)
+            if is_anti_bot:
+                if attempt < max_retries - 1:
+                    logger.warning(f"Detected anti-bot protection, retrying...")
+                    continue
+                logger.warning("All navigation attempts blocked by anti-bot protection")
+                return False, response, patterns
+            
+            if response and response.ok:
+                logger.info(f"Navigation successful: HTTP {response.status}")
+                return True, response, []
+            logger.warning(f"Received HTTP {response.status if response else 'no response'}")
+        except Exception as e:
+            logger.error(f"Navigation error: {e}")
+    
+    logger.warning("All navigation attempts failed")
+    return False, None, []
+
+
 async def navigate_with_retry(page, url, max_retries=2):
     """
     Navigate to URL with optimized retry logic and human-like behaviors to avoid bot detection.
+    With BROWSER_FAST_READINESS on, the human-like pauses are skipped and the
+    page is considered loaded once its DOM settles.
     """
+    if settings.BROWSER_FAST_READINESS:
+        return await navigate_fast(page, url, max_retries)
+    
     for attempt in range(max_retries):
         try:
             # Add varying delay between attempts to appear more human-like
@@ -858,7 +816,8 @@ async def navigate_with_retry(page, url, max_retries=2):
                     await page.wait_for_timeout(random.randint(200, 800))
 
             # Use a more human-like navigation approach
-            response = await page.goto(
+            response = await navigate_page(
+                page,
                 url, 
                 timeout=15000,  # Longer timeout like a human would have
                 wait_until=random.choice(["domcontentloaded", "networkidle"])  # Vary the navigation completion criteria
@@ -1160,161 +1119,196 @@ async def detect_anti_bot_patterns(page):
         return False, []
 
 
-async def find_all_links_js(page, context, unverified_result=None):
+# Link-text phrases and the score each one adds when present
+TOS_LINK_TEXT_SCORES = {
+    # Highest priority: exact matches for user/customer terms
+    "user agreement": 150,
+    "customer agreement": 150,
+    "user terms": 140,
+    "customer terms": 140,
+    "terms of use": 140,
+    "terms of service": 130,
+    "terms and conditions": 120,
+    "terms & conditions": 120,
+    "conditions of use": 110,
+    "legal terms": 100,
+    # Medium priority: partial matches
+    "terms": 90,
+    "legal": 80,
+    "agreement": 70,
+    "conditions": 60,
+}
+
+# URL patterns: each rule adds its score once if any of its patterns is in the href
+TOS_LINK_URL_RULES = [
+    (("terms-of-service", "tos"), 50),
+    (("terms-of-use", "tou"), 50),
+    (("terms-and-conditions",), 40),
+    (("legal/terms",), 40),
+    (("agreement",), 30),
+]
+
+TOS_LINK_TEXT_MATCHER = PhraseMatcher(TOS_LINK_TEXT_SCORES)
+TOS_LINK_URL_MATCHER = PhraseMatcher(pattern for patterns, _ in TOS_LINK_URL_RULES for pattern in patterns)
+TOS_LINK_URL_RULE_OF = {pattern: rule for rule, (patterns, _) in enumerate(TOS_LINK_URL_RULES) for pattern in patterns}
+TOS_TEXT_PRIORITY = PriorityMatcher(exactMatchPriorities, partialMatchPriorities)
+
+
+def _tos_link_score(text_found, href_found, is_footer):
+    if not text_found and not href_found:
+        return 0
+    score = sum(TOS_LINK_TEXT_SCORES[phrase] for phrase in text_found)
+    for rule in {TOS_LINK_URL_RULE_OF[pattern] for pattern in href_found}:
+        score += TOS_LINK_URL_RULES[rule][1]
+
+    # Boost score for footer links
+    if is_footer:
+        score *= 1.2  # 20% boost for footer links
+
+    return score
+
+
+def score_tos_link(href, text, is_footer=False):
+    """
+    Score how likely a link is to be the Terms of Service, from its text and URL.
+    Footer links get a 20% boost. A score of 0 means the link isn't a candidate.
+    """
+    return _tos_link_score(
+        TOS_LINK_TEXT_MATCHER.find((text or "").lower()),
+        TOS_LINK_URL_MATCHER.find((href or "").lower()),
+        is_footer,
+    )
+
+
+def score_tos_links(links, footer_boost=True):
+    """
+    score_tos_link for every snapshot entry, matching all texts and all
+    hrefs in one scan each; links that match nothing score 0 without any
+    per-link work. With footer_boost=False footer placement is ignored, as
+    when scoring links that are all in the footer.
+    """
+    text_found = TOS_LINK_TEXT_MATCHER.find_many([(link.get("text") or "").lower() for link in links])
+    href_found = TOS_LINK_URL_MATCHER.find_many([(link.get("href") or "").lower() for link in links])
+    scores = [0] * len(links)
+    for index in text_found.keys() | href_found.keys():
+        scores[index] = _tos_link_score(
+            text_found.get(index, ()),
+            href_found.get(index, ()),
+            footer_boost and links[index].get("isFooter", False),
+        )
+    return scores
+
+
+def weighted_tos_link_score(link):
+    """
+    LINK_EVALUATION_WEIGHTS score for a snapshot entry, combining
+    exactMatchPriorities/partialMatchPriorities, URL path specificity, footer
+    context and position. Used to break ties between equal link scores.
+    """
+    text_score = TOS_TEXT_PRIORITY.priority(link.get("text"))
+    url_score = score_tos_url_by_path_specificity(link.get("href", "")) / 3
+    return weighted_link_score(link, text_score, url_score, LINK_EVALUATION_WEIGHTS)
+
+
+def is_store_domain_link(href, base_domain, context=None):
+    """
+    True for Apple/Google links that should be ignored: links back to the
+    store when we came to a developer site from it, or any Apple/Google link
+    while on their own domains.
+    """
+    is_apple_domain = "apple.com" in base_domain
+    is_google_domain = "google.com" in base_domain or "play.google.com" in base_domain
+    
+    if isinstance(context, dict) and (context.get("came_from_app_store") or context.get("came_from_play_store")):
+        link_domain = urlparse(href).netloc
+        if (is_apple_domain or "apple.com" in link_domain) and context.get("came_from_app_store", False):
+            return True
+        if (is_google_domain or "google.com" in link_domain or "play.google.com" in link_domain) and context.get("came_from_play_store", False):
+            return True
+    
+    if is_apple_domain and "apple.com" in href:
+        return True
+    if is_google_domain and ("google.com" in href or "play.google.com" in href):
+        return True
+    return False
+
+
+async def prefer_verified_terms(ranked_urls):
+    """
+    Pick from ToS links ranked by score: the first of the top
+    PAGE_VERIFY_TOS_TOP_K whose page verifies as terms (one concurrent
+    page_verifier round), else the top link. The round is skipped for a
+    single candidate and cut off after PAGE_VERIFY_TOS_TIMEOUT.
+    """
+    top = ranked_urls[:settings.PAGE_VERIFY_TOS_TOP_K]
+    if len(top) < 2:
+        return top[0] if top else None
+    try:
+        verdicts = await asyncio.wait_for(
+            page_verifier.verify_many(top, "tos"), settings.PAGE_VERIFY_TOS_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        logger.info(f"ToS candidate verification timed out; keeping top link {top[0]}")
+        return top[0]
+    for url in top:
+        verdict = verdicts.get(url)
+        if verdict and verdict["isTermsPage"]:
+            if url != top[0]:
+                logger.info(f"Preferring verified ToS link {url} over top-scored {top[0]}")
+            return url
+    return top[0]
+
+
+async def find_all_links_js(page, context, unverified_result=None, links=None):
     """
-    Use JavaScript to extract all links from the page that might be ToS links.
-    Also detects if there's anti-bot protection.
+    Score every link on the page as a possible ToS link and return the best one.
+    Works from a link snapshot (taken here unless the caller passes one), and
+    looks at footer links first when anti-bot protection is detected.
     """
     try:
         print("\n=== Starting find_all_links_js ===")
-        print("Searching for all links using JavaScript...")
+        if links is None:
+            print("Taking link snapshot...")
+            links = await take_link_snapshot(page)
+        
         # Get the base domain for comparison
-        current_url = await page.evaluate("() => window.location.href")
-        parsed_url = urlparse(current_url)
-        base_domain = parsed_url.netloc
+        base_domain = urlparse(page.url).netloc
         print(f"Base domain: {base_domain}")
         
-        # Check if we're on Apple or Google domains
-        is_apple_domain = "apple.com" in base_domain
-        is_google_domain = "google.com" in base_domain or "play.google.com" in base_domain
-        
         # Anti-bot protection test
-        anti_bot = await detect_anti_bot_patterns(page)
-        
-        # If we're looking at a developer site that was navigated from an App/Play store
-        # and we detect anti-bot protection, we should check if the links found are from Apple/Google
-        # and filter them out if they are
-        # Make sure context is a dictionary before trying to access it
-        developer_site_from_store = False
-        came_from_app_store = False
-        came_from_play_store = False
-        
-        if isinstance(context, dict):
-            developer_site_from_store = context.get("came_from_app_store") or context.get("came_from_play_store")
-            came_from_app_store = context.get("came_from_app_store", False)
-            came_from_play_store = context.get("came_from_play_store", False)
+        anti_bot, _ = await detect_anti_bot_patterns(page)
         
         # Different approaches based on anti-bot presence
         if anti_bot:
             print("Detected anti-bot protection, looking for footer links specifically...")
             
             # With anti-bot, focus on footer links which are most likely to contain ToS
-            footer_links = await page.evaluate("""
-                () => {
-                    const footers = document.querySelectorAll('footer, [id*="foot"], [class*="foot"]');
-                    const links = [];
-                    
-                    footers.forEach(footer => {
-                        const footerLinks = footer.querySelectorAll('a[href]');
-                        footerLinks.forEach(link => {
-                            if (link.href && link.href.trim() !== '' && !link.href.startsWith('javascript:')) {
-                                // Get link text or closest heading
-                                let text = link.textContent.trim();
-                                if (!text) {
-                                    const closestHeading = link.closest('h1, h2, h3, h4, h5, h6');
-                                    if (closestHeading) {
-                                        text = closestHeading.textContent.trim();
-                                    }
-                                }
-                                
-                                links.push({
-                                    href: link.href,
-                                    text: text || "No text available"
-                                });
-                            }
-                        });
-                    });
-                    
-                    return links;
-                }
-            """)
-
-            if footer_links and len(footer_links) > 0:
+            footer_links = links_in_footer(links)
+            if footer_links:
                 print(f"Found {len(footer_links)} potential links in footer despite anti-bot protection")
                 
-                # Filter out links from Apple/Google domains if we're on a developer site navigated from store
                 filtered_links = []
-                for idx, link in enumerate(footer_links):
+                footer_scores = score_tos_links(footer_links, footer_boost=False)
+                for idx, (link, score) in enumerate(zip(footer_links, footer_scores)):
                     link_url = link.get('href', '')
                     link_text = link.get('text', '')
                     
-                    # Skip links from Apple/Google domains if we're on a developer site
-                    if developer_site_from_store:
-                        link_domain = urlparse(link_url).netloc
-                        if (is_apple_domain or "apple.com" in link_domain) and came_from_app_store:
-                            print(f"Skipping Apple domain link: {link_text} - {link_url}")
-                            continue
-                        if (is_google_domain or "google.com" in link_domain or "play.google.com" in link_domain) and came_from_play_store:
-                            print(f"Skipping Google domain link: {link_text} - {link_url}")
-                            continue
-                    
-                    # Always skip Apple/Google domains if we're on their domains
-                    if is_apple_domain and "apple.com" in link_url:
-                        print(f"Skipping Apple domain link (on Apple domain): {link_text} - {link_url}")
+                    # Skip Apple/Google links that aren't the app's own
+                    if is_store_domain_link(link_url, base_domain, context):
+                        print(f"Skipping Apple/Google domain link: {link_text} - {link_url}")
                         continue
-                    if is_google_domain and ("google.com" in link_url or "play.google.com" in link_url):
-                        print(f"Skipping Google domain link (on Google domain): {link_text} - {link_url}")
-                        continue
-                    
-                    # Calculate a score based on how likely this is a ToS link
-                    score = 0
-                    link_text_lower = link_text.lower()
-                    link_url_lower = link_url.lower()
-                    
-                    # Highest priority: exact matches for user/customer terms
-                    if "user agreement" in link_text_lower:
-                        score += 150
-                    if "customer agreement" in link_text_lower:
-                        score += 150
-                    if "user terms" in link_text_lower:
-                        score += 140
-                    if "customer terms" in link_text_lower:
-                        score += 140
-                    if "terms of use" in link_text_lower:
-                        score += 140
-                    if "terms of service" in link_text_lower:
-                        score += 130
-                    if "terms and conditions" in link_text_lower:
-                        score += 120
-                    if "terms & conditions" in link_text_lower:
-                        score += 120
-                    if "conditions of use" in link_text_lower:
-                        score += 110
-                    if "legal terms" in link_text_lower:
-                        score += 100
-                    
-                    # Medium priority: partial matches
-                    if "terms" in link_text_lower:
-                        score += 90
-                    if "legal" in link_text_lower:
-                        score += 80
-                    if "agreement" in link_text_lower:
-                        score += 70
-                    if "conditions" in link_text_lower:
-                        score += 60
-                    
-                    # URL patterns
-                    if "terms-of-service" in link_url_lower or "tos" in link_url_lower:
-                        score += 50
-                    if "terms-of-use" in link_url_lower or "tou" in link_url_lower:
-                        score += 50
-                    if "terms-and-conditions" in link_url_lower:
-                        score += 40
-                    if "legal/terms" in link_url_lower:
-                        score += 40
-                    if "agreement" in link_url_lower:
-                        score += 30
                     
                     # If this is a good candidate, add it to our filtered list
                     if score > 0:
                         filtered_links.append({
                             "link": link,
-                            "score": score
+                            "score": score,
+                            "weighted": weighted_tos_link_score(link)
                         })
                         print(f"Footer link #{idx+1}: {link_text} - {link_url} (Score: {score})")
                 
                 # Sort by score (highest first)
-                filtered_links.sort(key=lambda x: x["score"], reverse=True)
+                filtered_links.sort(key=lambda x: (x["score"], x["weighted"]), reverse=True)
                 
                 # If we found good candidates
                 if filtered_links:
@@ -1323,139 +1317,47 @@ async def find_all_links_js(page, context, unverified_result=None):
                     
                     if best_score >= 100:
                         print(f"✅ Found high-score footer link with ToS-related title: {best_link['href']}")
-                        return best_link['href'], page, unverified_result
-                    elif filtered_links and len(filtered_links) > 0:
+                    else:
                         # Return the best link we found, even if score isn't super high
                         print(f"👍 Found potential footer link: {best_link['href']} (Score: {best_score})")
-                        return best_link['href'], page, unverified_result
+                    return best_link['href'], page, unverified_result
                 else:
                     print("No relevant links found in footer")
             else:
                 print("No footer links found")
         
-        # If no anti-bot or no good footer links found, try standard method
-        links_data = await page.evaluate("""
-            () => {
-                // Get all links on the page
-                const allLinks = Array.from(document.querySelectorAll('a[href]'));
-                const links = [];
-                
-                allLinks.forEach(link => {
-                    if (link.href && link.href.trim() !== '' && 
-                        !link.href.startsWith('javascript:') && 
-                        !link.href.includes('mailto:') &&
-                        !link.href.includes('tel:')) {
-                        
-                        // Get link text
-                        let text = link.textContent.trim();
-                        if (!text) {
-                            // If no text, check for aria-label or title
-                            text = link.getAttribute('aria-label') || link.getAttribute('title') || '';
-                        }
-                        
-                        links.push({
-                            href: link.href,
-                    text: text,
-                            isFooter: !!link.closest('footer, [id*="foot"], [class*="foot"]')
-                        });
-                    }
-                });
-                
-                return links;
-            }
-        """)
-        
-        if not links_data or len(links_data) == 0:
+        # If no anti-bot or no good footer links found, score every link
+        if not links:
             print("No relevant links found using JavaScript method")
             return None, page, unverified_result
 
         # Extract all links with a relevant name or URL
         relevant_links = []
         
-        for link_data in links_data:
+        # Relevance scores for every link, from one matcher scan
+        link_scores = score_tos_links(links)
+        for link_data, score in zip(links, link_scores):
             href = link_data.get('href', '')
             text = link_data.get('text', '').lower()
-            is_footer = link_data.get('isFooter', False)
-            
-            # Skip links from Apple/Google domains if we're on a developer site
-            if developer_site_from_store:
-                link_domain = urlparse(href).netloc
-                if (is_apple_domain or "apple.com" in link_domain) and came_from_app_store:
-                    continue
-                if (is_google_domain or "google.com" in link_domain or "play.google.com" in link_domain) and came_from_play_store:
-                    continue
             
-            # Always skip Apple/Google domains if we're on their domains
-            if is_apple_domain and "apple.com" in href:
-                continue
-            if is_google_domain and ("google.com" in href or "play.google.com" in href):
+            # Skip Apple/Google links that aren't the app's own
+            if is_store_domain_link(href, base_domain, context):
                 continue
             
-            # Calculate relevance score
-            score = 0
-            
-            # Highest priority: exact matches for user/customer terms
-            if "user agreement" in text:
-                score += 150
-            if "customer agreement" in text:
-                score += 150
-            if "user terms" in text:
-                score += 140
-            if "customer terms" in text:
-                score += 140
-            if "terms of use" in text:
-                score += 140
-            if "terms of service" in text:
-                score += 130
-            if "terms and conditions" in text:
-                score += 120
-            if "terms & conditions" in text:
-                score += 120
-            if "conditions of use" in text:
-                score += 110
-            if "legal terms" in text:
-                score += 100
-            
-            # Medium priority: partial matches
-            if "terms" in text:
-                score += 90
-            if "legal" in text:
-                score += 80
-            if "agreement" in text:
-                score += 70
-            if "conditions" in text:
-                score += 60
-            
-            # URL patterns
-            href_lower = href.lower()
-            if "terms-of-service" in href_lower or "tos" in href_lower:
-                score += 50
-            if "terms-of-use" in href_lower or "tou" in href_lower:
-                score += 50
-            if "terms-and-conditions" in href_lower:
-                score += 40
-            if "legal/terms" in href_lower:
-                score += 40
-            if "agreement" in href_lower:
-                score += 30
-            
-            # Boost score for footer links
-            if is_footer:
-                score *= 1.2  # 20% boost for footer links
-            
             if score > 0:
                 relevant_links.append({
                     "href": href,
                     "text": text,
-                    "score": score
+                    "score": score,
+                    "weighted": weighted_tos_link_score(link_data)
                 })
         
         # Sort by score (highest first)
-        relevant_links.sort(key=lambda x: x["score"], reverse=True)
+        relevant_links.sort(key=lambda x: (x["score"], x["weighted"]), reverse=True)
         
         # Return the highest scoring link
-        if relevant_links and len(relevant_links) > 0:
-            best_link = relevant_links[0]["href"]
+        if relevant_links:
+            best_link = await prefer_verified_terms([link["href"] for link in relevant_links])
             print(f"Found best ToS link via JavaScript: {best_link} (Score: {relevant_links[0]['score']})")
             return best_link, page, unverified_result
         
@@ -1468,53 +1370,50 @@ async def find_all_links_js(page, context, unverified_result=None):
         return None, page, unverified_result
 
 
-async def find_matching_link(page, context, unverified_result=None):
+async def find_matching_link(page, context, unverified_result=None, links=None):
     """Find and extract terms-related links without navigation."""
     try:
-        # Use a more targeted selector for performance
-        links = await page.query_selector_all(
-            'footer a, .footer a, #footer a, a[href*="terms"], a[href*="tos"], a[href*="legal"]'
-        )
+        if links is None:
+            links = await take_link_snapshot(page)
 
         scored_links = []
         for link in links:
-            try:
-                text = await link.text_content()
-                if not text:
-                    continue
-                text = text.lower().strip()
-                href = await link.get_attribute("href")
-                if not href:
-                    continue
-
-                # Simplified scoring for speed
-                score = 0
-                if "terms of service" in text or "terms of use" in text:
-                    score = 100
-                elif "terms" in text:
-                    score = 80
-                elif "tos" in text:
-                    score = 70
-                elif "legal" in text:
-                    score = 50
-
-                # Additional URL scoring
-                if "/terms-of-service" in href or "/terms_of_service" in href:
-                    score += 50
-                elif "/terms" in href or "/tos" in href:
-                    score += 40
-                elif "/legal" in href:
-                    score += 30
+            text = link.get("text", "").lower()
+            href = link.get("href", "")
+            if not text or not href:
+                continue
 
-                if score > 50:  # High confidence match
-                    print(f"Found high confidence link: {text} ({score})")
-                    scored_links.append((href, score, text))
-            except Exception as e:
+            # Same candidates the old 'footer a, a[href*="terms"], ...' selector picked
+            href_lower = href.lower()
+            if not (link.get("isFooter") or "terms" in href_lower or "tos" in href_lower or "legal" in href_lower):
                 continue
+
+            # Simplified scoring for speed
+            score = 0
+            if "terms of service" in text or "terms of use" in text:
+                score = 100
+            elif "terms" in text:
+                score = 80
+            elif "tos" in text:
+                score = 70
+            elif "legal" in text:
+                score = 50
+
+            # Additional URL scoring
+            if "/terms-of-service" in href or "/terms_of_service" in href:
+                score += 50
+            elif "/terms" in href or "/tos" in href:
+                score += 40
+            elif "/legal" in href:
+                score += 30
+
+            if score > 50:  # High confidence match
+                print(f"Found high confidence link: {text} ({score})")
+                scored_links.append((href, score, text, weighted_tos_link_score(link)))
                 
         # If we found high-confidence links, return the best one without navigation
         if scored_links:
-            scored_links.sort(key=lambda x: x[1], reverse=True)
+            scored_links.sort(key=lambda x: (x[1], x[3]), reverse=True)
             best_link = scored_links[0][0]
             print(f"Returning best link without navigation: {best_link} (Score: {scored_links[0][1]})")
             return best_link, page, unverified_result
@@ -2149,7 +2048,7 @@ async def smooth_scroll_and_click(
         return None, page, unverified_result
 
 
-async def analyze_landing_page(page, context, unverified_result=None):
+async def analyze_landing_page(page, context, unverified_result=None, links=None):
     """
     Analyze landing page content to detect mentions of terms of service.
     Sometimes pages mention terms in the content but don't have direct links.
@@ -2157,516 +2056,129 @@ async def analyze_landing_page(page, context, unverified_result=None):
     print("\n=== Starting landing page analysis ===")
 
     try:
-        # Look for text patterns that might indicate terms of service info
-        terms_mentions = await page.evaluate(
-            """() => {
-            // Get page text
-            const pageText = document.body.innerText.toLowerCase();
-            
-            // Look for terms-related phrases
-            const termsPhases = [
-                'terms of service',
-                'terms of use',
-                'terms and conditions',
-                'user agreement',
-                'service agreement',
-                'legal agreement',
-                'platform agreement'
-            ];
-            
-            const mentions = [];
-            let context = '';
-            
-            // Find mentions of terms in text
-            for (const phrase of termsPhases) {
-                const index = pageText.indexOf(phrase);
-                if (index > -1) {
-                    // Get surrounding context (up to 50 chars before and after)
-                    const start = Math.max(0, index - 50);
-                    const end = Math.min(pageText.length, index + phrase.length + 50);
-                    context = pageText.substring(start, end);
-                    
-                    mentions.push({
-                        phrase: phrase,
-                        context: context
-                    });
-                }
-            }
-            
-            return mentions;
-        }"""
-        )
-
-        if terms_mentions and len(terms_mentions) > 0:
-            print(f"Found {len(terms_mentions)} terms mentions in content")
-
-            # Look for URLs in the context of these mentions
-            for mention in terms_mentions:
-                print(
-                    f"Terms mention: '{mention['phrase']}' in context: '{mention['context']}'"
-                )
-
-                # Try to find nearby links
-                nearby_links = await page.evaluate(
-                    """(searchPhrase) => {
-                    const allText = document.body.innerText.toLowerCase();
-                    const index = allText.indexOf(searchPhrase.toLowerCase());
-                    if (index === -1) return [];
-                    
-                    // Find the containing element
-                    let element = null;
-                    const walk = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
-                    let node;
-                    
-                    while (node = walk.nextNode()) {
-                        if (node.textContent.toLowerCase().includes(searchPhrase.toLowerCase())) {
-                            element = node.parentElement;
-                            break;
-                        }
-                    }
-                    
-                    if (!element) return [];
-                    
-                    // Look for nearby links (parent, siblings, children)
-                    const searchArea = element.closest('div, section, article, footer') || element.parentElement;
-                    if (!searchArea) return [];
-                    
-                    // Get all links in the search area
-                    const links = Array.from(searchArea.querySelectorAll('a[href]'))
-                        .filter(link => {
-                            const href = link.href.toLowerCase();
-                            return href && 
-                                !href.startsWith('javascript:') && 
-                                !href.startsWith('mailto:') &&
-                                !href.startsWith('tel:') &&
-                                !href.startsWith('#');
-                        })
-                        .map(link => ({
-                            text: link.textContent.trim(),
-                            href: link.href
-                        }));
-                    
-                    return links;
-                }""",
-                    mention["phrase"],
-                )
-
-                if nearby_links and len(nearby_links) > 0:
-                    print(f"Found {len(nearby_links)} links near the terms mention")
-
-                    # Score and sort these links
-                    scored_links = []
-                    for link in nearby_links:
-                        score = 0
-                        text = link["text"].lower() if link["text"] else ""
-                        href = link["href"].lower()
-
-                        # Score based on text
-                        if "terms" in text:
-                            score += 40
-                        if "service" in text:
-                            score += 20
-                        if "use" in text:
-                            score += 15
-                        if "conditions" in text:
-                            score += 15
-
-                        # Score based on URL
-                        if "terms" in href:
-                            score += 30
-                        if "tos" in href:
-                            score += 25
-                        if "legal" in href:
-                            score += 10
-
-                        scored_links.append((link["href"], score, link["text"]))
-
-                    # Sort by score
-                    scored_links.sort(key=lambda x: x[1], reverse=True)
-
-                    if (
-                        scored_links and scored_links[0][1] >= 40
-                    ):  # Good confidence threshold
-                        best_link = scored_links[0][0]
-                        print(
-                            f"Best link from context: {best_link} (score: {scored_links[0][1]}, text: '{scored_links[0][2]}')"
-                        )
-
-                        # Try to navigate to verify
-                        try:
-                            await page.goto(
-                                best_link, timeout=10000, wait_until="domcontentloaded"
-                            )
-                            is_terms_page = await page.evaluate(
-                                """() => {
-                                const text = document.body.innerText.toLowerCase();
-                                const strongTermMatchers = [
-                                    'terms of service', 
-                                    'terms of use', 
-                                    'terms and conditions',
-                                    'accept these terms', 
-                                    'agree to these terms',
-                                    'legally binding',
-                                    'your use of this website',
-                                    'this agreement',
-                                    'these terms govern'
-                                ];
-                                
-                                return strongTermMatchers.some(term => text.includes(term));
-                            }"""
-                            )
-
-                            if is_terms_page:
-                                print(
-                                    f"✅ Verified as terms of service page: {page.url}"
-                                )
-                                return page.url, page, unverified_result
-                            else:
-                                if not unverified_result:
-                                    unverified_result = best_link
-                        except Exception as e:
-                            print(f"Error navigating to link from context: {e}")
-
-        return None, page, unverified_result
-    except Exception as e:
-        print(f"Error in landing page analysis: {e}")
-        return None, page, unverified_result
-
-
-async def verify_is_terms_page(page):
-    """Verify if the current page is a terms of service page."""
-    try:
-        page_title = await page.title()
-        page_url = page.url
-
-        # Initial checks on title and URL
-        title_lower = page_title.lower()
-        url_lower = page_url.lower()
+        if links is None:
+            links = await take_link_snapshot(page)
 
-        print("🔍 Performing thorough page verification...")
-
-        # Define indicators
-        title_indicators = [
-            "terms",
-            "conditions",
-            "tos",
+        # Look for text patterns that might indicate terms of service info
+        terms_phrases = [
             "terms of service",
-            "terms and conditions",
-            "legal",
-            "agreement",
-            "user agreement",
             "terms of use",
-            "legal terms",
-            "terms & conditions",
-            "service agreement",
-        ]
-
-        strong_indicators = [
-            "terms of service",
             "terms and conditions",
             "user agreement",
-            "conditions of use",
-            "terms of use",
+            "service agreement",
             "legal agreement",
+            "platform agreement",
         ]
 
-        url_indicators = [
-            "/terms",
-            "/tos",
-            "/terms-of-service",
-            "/terms-and-conditions",
-            "/legal/terms",
-            "/legal",
-            "/user-agreement",
-            "/terms-of-use",
-            "terms.html",
-            "tos.html",
-            "conditions.html",
-            "agreement.html",
-            "legal.html",
-        ]
-
-        # Check for presence of indicators
-        strong_indicator = any(
-            indicator in title_lower for indicator in strong_indicators
-        )
-        title_indicator = any(
-            indicator in title_lower for indicator in title_indicators
-        )
-        url_indicator = any(indicator in url_lower for indicator in url_indicators)
-
-        # Extract text content
-        content = await page.evaluate(
-            """() => {
-            return document.body.innerText;
-        }"""
-        )
-
-        content_lower = content.lower()
-        content_length = len(content)
-
-        # Check for legal sections and phrases
-        legal_sections = 0
-        legal_phrases = 0
-
-        section_patterns = [
-            "general terms",
-            "acceptance of terms",
-            "modifications to terms",
-            "user responsibilities",
-            "account registration",
-            "user conduct",
-            "intellectual property",
-            "copyright",
-            "trademark",
-            "disclaimer",
-            "limitation of liability",
-            "indemnification",
-            "termination",
-            "governing law",
-            "dispute resolution",
-            "arbitration",
-            "class action waiver",
-            "severability",
-            "entire agreement",
-            "contact information",
-            "privacy policy",
-            "data collection",
-            "third party rights",
-            "force majeure",
-            "assignment",
-            "changes to service",
-            "user content",
-            "prohibited activities",
-            "warranties",
-            "representations",
-            "compliance with laws",
-            "electronic communications",
-            "modification of service",
-            "fees and payments",
-            "refund policy",
-            "cancellation policy",
-        ]
-
-        legal_phrase_patterns = [
-            "by using this site",
-            "by accessing this website",
-            "please read these terms",
-            "please read carefully",
-            "agree to be bound",
-            "constitutes your acceptance",
-            "reserve the right to change",
-            "at our sole discretion",
-            "you acknowledge and agree",
-            "without prior notice",
-            "shall not be liable",
-            "disclaim any warranties",
-            "as is and as available",
-            "limitation of liability",
-            "indemnify and hold harmless",
-            "jurisdiction and venue",
-            "class action waiver",
-            "binding arbitration",
-            "no warranty of any kind",
-            "exclusive remedy",
-            "subject to these terms",
-            "constitute acceptance",
-            "terminate your account",
-            "all rights reserved",
-            "hereby grant",
-            "represent and warrant",
-            "we may modify",
-            "applicable law",
-        ]
+        for phrase in terms_phrases:
+            # Links sharing a block with the mention (parent, siblings, children)
+            nearby_links = links_near_phrase(links, phrase)
+            if not nearby_links:
+                continue
+            print(f"Found {len(nearby_links)} links near the terms mention '{phrase}'")
 
-        # Check for legal headings
-        legal_headings = await page.evaluate(
-            """() => {
-            const headings = Array.from(document.querySelectorAll('h1, h2, h3, h4, h5, h6, strong, b'));
-            const legalHeadingPatterns = [
-                "terms", "conditions", "agreement", "disclaimer", "liability", 
-                "rights", "privacy", "policy", "warranty", "remedies", 
-                "arbitration", "termination", "law", "jurisdiction", "indemnification",
-                "intellectual property", "copyright", "trademark", "user", "account",
-                "governing law", "dispute", "refund", "cancellation", "payments"
-            ];
-            
-            return headings.some(h => {
-                const text = h.innerText.toLowerCase();
-                return legalHeadingPatterns.some(pattern => text.includes(pattern));
-            });
-        }"""
-        )
+            # Score and sort these links
+            scored_links = []
+            for link in nearby_links:
+                score = 0
+                text = link["text"].lower() if link["text"] else ""
+                href = link["href"].lower()
 
-        # Count legal sections and phrases
-        for pattern in section_patterns:
-            if pattern in content_lower:
-                legal_sections += 1
-
-        for pattern in legal_phrase_patterns:
-            if pattern in content_lower:
-                legal_phrases += 1
-
-        # Check for negative indicators that suggest it's not a terms page
-        negative_indicators = [
-            "sign in",
-            "sign up",
-            "login",
-            "register",
-            "create account",
-            "add to cart",
-            "shopping cart",
-            "checkout",
-            "buy now",
-            "password",
-            "email address",
-            "payment",
-            "credit card",
-            "shipping",
-            "delivery",
-            "order status",
-            "my account",
-            "track order",
-            "return policy",
-        ]
+                # Score based on text
+                if "terms" in text:
+                    score += 40
+                if "service" in text:
+                    score += 20
+                if "use" in text:
+                    score += 15
+                if "conditions" in text:
+                    score += 15
+
+                # Score based on URL
+                if "terms" in href:
+                    score += 30
+                if "tos" in href:
+                    score += 25
+                if "legal" in href:
+                    score += 10
 
-        has_negative_indicators = any(
-            indicator in content_lower and indicator not in ["return policy"]
-            for indicator in negative_indicators
-        )
+                scored_links.append((link["href"], score, link["text"]))
 
-        # Determine if this is a terms page
-        minimum_text_length = 1000  # Minimum content length for a terms page
-        minimum_legal_sections = 3  # Minimum number of legal sections required
-
-        minimum_text_present = content_length >= minimum_text_length
-        minimum_sections_present = legal_sections >= minimum_legal_sections
-
-        # Calculate confidence score (0-100)
-        confidence_score = 0
-
-        # Base score from indicators
-        if strong_indicator:
-            confidence_score += 30
-        if title_indicator:
-            confidence_score += 20
-        if url_indicator:
-            confidence_score += 15
-
-        # Content-based scoring
-        confidence_score += min(
-            20, legal_sections * 3
-        )  # Up to 20 points for legal sections
-        confidence_score += min(
-            15, legal_phrases * 2
-        )  # Up to 15 points for legal phrases
-
-        if legal_headings:
-            confidence_score += 10
-
-        # Length bonus
-        if content_length > 5000:
-            confidence_score += 5
-
-        # Additional title-based scoring for common terms page titles
-        common_tos_titles = [
-            "conditions of use",
-            "terms of service",
-            "user agreement",
-            "terms and conditions",
-        ]
-        if any(title in title_lower for title in common_tos_titles):
-            confidence_score += 10
+            # Sort by score
+            scored_links.sort(key=lambda x: x[1], reverse=True)
 
-        # Penalties
-        if has_negative_indicators:
-            # Reduce penalty impact if we have strong title indicators and legal content
             if (
-                any(title in title_lower for title in common_tos_titles)
-                and legal_sections >= 5
-            ):
-                confidence_score -= 10  # Reduced penalty
-            else:
-                confidence_score -= 20
-
-        if not minimum_text_present:
-            confidence_score -= 30
-
-        if not minimum_sections_present:
-            confidence_score -= 20
-
-        # Cap the score
-        confidence_score = max(0, min(100, confidence_score))
-
-        # Determine if this is a terms page
-        # A page is considered a terms page if it has a high confidence score
-        is_terms_page = confidence_score >= 75
-
-        # For pages with strong indicators in title but slightly lower scores,
-        # be more lenient to avoid missing valid ToS pages
-        if not is_terms_page and confidence_score >= 65:
-            # Check if the title contains very strong ToS indicators
-            very_strong_title_indicators = [
-                "conditions of use",
-                "terms of service",
-                "user agreement",
-                "terms and conditions",
-            ]
-            if any(
-                indicator in title_lower for indicator in very_strong_title_indicators
-            ):
-                if legal_sections >= 5 or legal_phrases >= 3:
-                    is_terms_page = True
-                    print(
-                        f"✅ Special consideration: High confidence title with legal content (Score: {confidence_score}/100)"
-                    )
+                scored_links and scored_links[0][1] >= 40
+            ):  # Good confidence threshold
+                best_link = scored_links[0][0]
+                print(
+                    f"Best link from context: {best_link} (score: {scored_links[0][1]}, text: '{scored_links[0][2]}')"
+                )
 
-        # Print verification results
-        print(f"📊 Page verification results:")
-        print(f"  Title: {title_lower}...")
-        print(f"  URL: {url_lower}")
-        print(f"  Confidence Score: {confidence_score}/100")
-        print(f"  Strong Indicators: {strong_indicator}")
-        print(f"  Title Indicators: {title_indicator}")
-        print(f"  URL Indicators: {url_indicator}")
-        print(f"  Legal Sections: {legal_sections}")
-        print(f"  Legal Phrases: {legal_phrases}")
-        print(f"  Has Legal Headings: {legal_headings}")
-        print(f"  Content Length: {content_length} chars")
-        print(f"  Has Negative Indicators: {has_negative_indicators}")
-
-        if is_terms_page:
-            print(
-                f"✅ VERIFIED: This appears to be a Terms of Service page (Score: {confidence_score}/100)"
-            )
-        else:
-            print(
-                f"❌ NOT VERIFIED: Does not appear to be a Terms of Service page (Score: {confidence_score}/100)"
-            )
+                # Try to navigate to verify
+                try:
+                    await page.goto(
+                        best_link, timeout=10000, wait_until="domcontentloaded"
+                    )
+                    is_terms_page = await page.evaluate(
+                        """() => {
+                        const text = document.body.innerText.toLowerCase();
+                        const strongTermMatchers = [
+                            'terms of service', 
+                            'terms of use', 
+                            'terms and conditions',
+                            'accept these terms', 
+                            'agree to these terms',
+                            'legally binding',
+                            'your use of this website',
+                            'this agreement',
+                            'these terms govern'
+                        ];
+                        
+                        return strongTermMatchers.some(term => text.includes(term));
+                    }"""
+                    )
 
-        # Return detailed verification results
-        return {
-            "isTermsPage": is_terms_page,
-            "confidence": confidence_score,
-            "title": page_title,
-            "url": page_url,
-            "strongIndicator": strong_indicator,
-            "titleIndicator": title_indicator,
-            "urlIndicator": url_indicator,
-            "legalSectionCount": legal_sections,
-            "legalPhraseCount": legal_phrases,
-            "hasLegalHeadings": legal_headings,
-            "contentLength": content_length,
-            "minimumTextPresent": minimum_text_present,
-            "minimumSectionsPresent": minimum_sections_present,
-            "hasNegativeIndicators": has_negative_indicators,
-        }
+                    if is_terms_page:
+                        print(
+                            f"✅ Verified as terms of service page: {page.url}"
+                        )
+                        return page.url, page, unverified_result
+                    else:
+                        if not unverified_result:
+                            unverified_result = best_link
+                except Exception as e:
+                    print(f"Error navigating to link from context: {e}")
 
+        return None, page, unverified_result
     except Exception as e:
-        print(f"Error during page verification: {e}")
-        return {"isTermsPage": False, "confidence": 0, "error": str(e)}
+        print(f"Error in landing page analysis: {e}")
+        return None, page, unverified_result
 
 
+# Paths that often contain terms of service, and what each adds to a URL's score
+TOS_PATH_PATTERN_SCORES = {
+    "/terms": 100,
+    "/tos": 120,
+    "/terms-of-service": 150,
+    "/terms-of-use": 140,
+    "/terms-and-conditions": 130,
+    "/legal": 100,
+    "/legal/terms": 120,
+    "/legal/user-agreement": 120,
+    "/user-agreement": 110,
+    "/customer-agreement": 110,
+    "/agreement": 90,
+    "/policies": 80,
+    "/legal/policies": 90,
+    "/policies/terms": 100,
+    "/about/terms": 100,
+    "/about/legal": 90,
+}
+TOS_PATH_MATCHER = PhraseMatcher(TOS_PATH_PATTERN_SCORES)
+
+
+@functools.lru_cache(maxsize=4096)
 def score_tos_url_by_path_specificity(url):
     """
     Score a URL based on how likely it is to be a ToS page.
@@ -2691,30 +2203,8 @@ def score_tos_url_by_path_specificity(url):
     path = parsed_url.path.strip('/')
     path_parts = path.split('/')
     
-    # Check for paths that often contain terms of service
-    path_patterns = [
-        ('/terms', 100),
-        ('/tos', 120),
-        ('/terms-of-service', 150),
-        ('/terms-of-use', 140),
-        ('/terms-and-conditions', 130),
-        ('/legal', 100),
-        ('/legal/terms', 120),
-        ('/legal/user-agreement', 120),
-        ('/user-agreement', 110),
-        ('/customer-agreement', 110),
-        ('/agreement', 90),
-        ('/policies', 80),
-        ('/legal/policies', 90),
-        ('/policies/terms', 100),
-        ('/about/terms', 100),
-        ('/about/legal', 90)
-    ]
-    
-    # Score URL based on path patterns
-    for pattern, pattern_score in path_patterns:
-        if pattern in url:
-            score += pattern_score
+    # Score URL based on paths that often contain terms of service
+    score += sum(TOS_PATH_PATTERN_SCORES[pattern] for pattern in TOS_PATH_MATCHER.find(url))
     
     # NEW: Give higher scores for policy-specific domains/subdomains
     # If hostname contains policy-related keywords
@@ -2790,6 +2280,7 @@ def score_tos_url_by_path_specificity(url):
     
     return score
 
+@search_cache.cached("tos", "yahoo")
 async def yahoo_search_fallback(query, page):
     """
     Search for ToS using Yahoo as a fallback method.
@@ -2991,6 +2482,7 @@ async def yahoo_search_fallback(query, page):
         return None
 
 
+@search_cache.cached("tos", "bing")
 async def bing_search_fallback(query, page):
     """
     Search for ToS using Bing as a fallback method.
@@ -3230,6 +2722,7 @@ async def bing_search_fallback(query, page):
 
 
 
+@search_cache.cached("tos", "duckduckgo")
 async def duckduckgo_search_fallback(search_query, page):
     """Search for terms of service using DuckDuckGo with a lighter implementation."""
     try:
@@ -3380,7 +2873,7 @@ def prefer_main_domain(links, main_domain):
     main_links = [l for l in links if is_main_domain(l)]
     return main_links if main_links else links
 
-async def find_user_customer_terms_links(page):
+async def find_user_customer_terms_links(page, links=None):
     """
     Specially look for user/customer terms or agreement links with highest priority.
     This function is designed to find links specifically related to user or customer terms.
@@ -3388,40 +2881,8 @@ async def find_user_customer_terms_links(page):
     try:
         logger.info("Searching for user/customer terms links with HIGHEST PRIORITY...")
         
-        # Evaluate the page for user/customer terms links
-        links = await page.evaluate("""() => {
-            // Find all anchor elements with href attributes
-            const allLinks = Array.from(document.querySelectorAll('a[href]')).filter(link => 
-                link.href && link.href.trim() !== '' && 
-                !link.href.startsWith('javascript:') &&
-                !link.href.includes('mailto:') &&
-                !link.href.includes('tel:')
-            );
-            
-            // Extract relevant info from each link
-            return allLinks.map(link => ({
-                element: link,
-                text: link.textContent.trim(),
-                href: link.href,
-                id: link.id || '',
-                classes: link.className || '',
-                // Check if element contains "user" or "customer" and "terms" or "agreement"
-                isUserTerms: (
-                    (link.textContent.toLowerCase().includes('user') || 
-                     link.textContent.toLowerCase().includes('customer')) &&
-                    (link.textContent.toLowerCase().includes('terms') || 
-                     link.textContent.toLowerCase().includes('agreement') ||
-                     link.textContent.toLowerCase().includes('conditions'))
-                ),
-                isUserTermsHref: (
-                    (link.href.toLowerCase().includes('user') || 
-                     link.href.toLowerCase().includes('customer')) &&
-                    (link.href.toLowerCase().includes('terms') || 
-                     link.href.toLowerCase().includes('agreement') ||
-                     link.href.toLowerCase().includes('conditions'))
-                )
-            }));
-        }""")
+        if links is None:
+            links = await take_link_snapshot(page)
         
         # Filter for user/customer terms links
         user_terms_links = []
@@ -3459,19 +2920,21 @@ async def find_user_customer_terms_links(page):
             elif ('user' in link_href or 'customer' in link_href) and ('terms' in link_href or 'agreement' in link_href):
                 score += 130 # Was 65
             
-            # Additional score for links in the footer (common location for ToS)
-            if link_info.get('isUserTerms', False) or link_info.get('isUserTermsHref', False):
+            # Bonus when text or URL pairs user/customer with terms/agreement/conditions
+            is_user_terms = (
+                ('user' in link_text or 'customer' in link_text) and
+                ('terms' in link_text or 'agreement' in link_text or 'conditions' in link_text)
+            )
+            is_user_terms_href = (
+                ('user' in link_href or 'customer' in link_href) and
+                ('terms' in link_href or 'agreement' in link_href or 'conditions' in link_href)
+            )
+            if is_user_terms or is_user_terms_href:
                 score += 50 # Bonus for matching both conditions
             
             # Only include links with a minimum score - REDUCED THRESHOLD
             if score >= 40: # Was 65
-                try:
-                    link = await page.querySelector(f'a[href="{link_info["href"]}"]')
-                    if link:
-                        user_terms_links.append({"link": link, "text": link_text, "href": link_href, "score": score})
-                except Exception as e:
-                    logger.error(f"Error finding link element: {e}")
-                    continue
+                user_terms_links.append({"text": link_text, "href": link_info['href'], "score": score})
         
         # Sort by score
         scored_links = sorted(user_terms_links, key=lambda x: x["score"], reverse=True)
@@ -3482,15 +2945,14 @@ async def find_user_customer_terms_links(page):
         
         # Try the highest scoring links
         for scored_link in scored_links[:3]:  # Try the top 3 links
-            link = scored_link["link"]
             href = scored_link["href"]
             text = scored_link["text"]
             score = scored_link["score"]
             
             logger.info(f"Trying HIGHEST PRIORITY user/customer terms link: {text} - {href} (Score: {score})")
             try:
-                success = await click_and_wait_for_navigation(page, link, timeout=3000) # Reduced timeout
-                if success:
+                response = await navigate_page(page, href, timeout=3000, wait_until="domcontentloaded") # Reduced timeout
+                if response and response.ok:
                     logger.info(f"Successfully navigated to USER/CUSTOMER terms link: {page.url}")
                     return page.url
             except Exception as e:
@@ -3505,31 +2967,12 @@ async def find_user_customer_terms_links(page):
         
         # Fallback to basic search if no links found with scoring method
         logger.info("No user/customer terms links found with high scoring, trying basic search...")
-        fallback_links = await page.evaluate("""
-            () => {
-                const userTermsLinks = [];
-                document.querySelectorAll('a[href]').forEach(link => {
-                    const text = link.textContent.trim().toLowerCase();
-                    const href = link.href;
-                    
-                    // Much broader matching for fallback
-                    if ((text.includes('terms') || text.includes('agreement') || text.includes('conditions')) &&
-                        href && href.trim() !== '' && 
-                        !href.startsWith('javascript:') &&
-                        !href.includes('mailto:') &&
-                        !href.includes('tel:')) {
-                        
-                        userTermsLinks.push({
-                            href: href,
-                            text: text
-                        });
-                    }
-                });
-                return userTermsLinks;
-            }
-        """)
+        fallback_links = [
+            link for link in links
+            if any(word in link['text'].lower() for word in ('terms', 'agreement', 'conditions'))
+        ]
         
-        if fallback_links and len(fallback_links) > 0:
+        if fallback_links:
             logger.info(f"Found basic terms link as fallback: {fallback_links[0]['text']} - {fallback_links[0]['href']}")
             return fallback_links[0]['href']
         
@@ -3944,9 +3387,10 @@ async def find_tos_via_html_inspection(url: str) -> str:
         URL to ToS page if found, None otherwise
     """
     try:
-        # Set up browser to inspect HTML
-        playwright = await async_playwright().start()
-        browser, browser_context, page, _ = await setup_browser(playwright)
+        # Lease a browser context to inspect HTML
+        lease = await browser_pool.acquire_lease("tos_html_inspection")
+        page = lease.page
+        page.set_default_timeout(15000)
         
         try:
             # Navigate to the URL with reduced timeout for better performance
@@ -4084,19 +3528,140 @@ async def find_tos_via_html_inspection(url: str) -> str:
             logger.info("No potential Terms of Service links found during HTML inspection")
             return None
         finally:
-            # Ensure browser resources are cleaned up
-            await browser_context.close()
-            await browser.close()
-            await playwright.stop()
+            # Ensure the leased context is returned to the pool
+            await browser_pool.release_lease(lease)
             
     except Exception as e:
         logger.error(f"Error during HTML inspection: {e}")
         return None
 
 
+# Search fallbacks that race_search_engines can run, by engine name
+SEARCH_ENGINE_FALLBACKS = {
+    "bing": bing_search_fallback,
+    "yahoo": yahoo_search_fallback,
+    "duckduckgo": duckduckgo_search_fallback,
+}
+
+SEARCH_ENGINE_NAMES = {"bing": "Bing", "yahoo": "Yahoo", "duckduckgo": "DuckDuckGo"}
+
+
+def tos_search_query(url):
+    """Search query used by every ToS search fallback for url's site."""
+    domain_name = normalize_domain(url).replace("www.", "")
+    return f"{domain_name} terms of service, terms of use, user agreement, legal terms"
+
+
+async def navigation_failure_search(search_query, page):
+    """
+    Search fallbacks for a site whose landing page can't be used: raced when
+    SEARCH_RACE_ENABLED, otherwise DuckDuckGo, then Yahoo, then Bing.
+    
+    Returns:
+        Tuple of (tos_url, engine), or (None, None)
+    """
+    if settings.SEARCH_RACE_ENABLED:
+        race_url, race_engine, _ = await race_search_engines(search_query, page, ["duckduckgo", "yahoo", "bing"])
+        return race_url, race_engine
+    
+    for engine in ("duckduckgo", "yahoo", "bing"):
+        logger.info(f"Trying {SEARCH_ENGINE_NAMES[engine]} search fallback")
+        result = await SEARCH_ENGINE_FALLBACKS[engine](search_query, page)
+        if result:
+            return result, engine
+    return None, None
+
+
+async def close_extra_page(page):
+    """Close a page opened next to a lease's own page; the context stays leased."""
+    try:
+        await page.close()
+    except Exception as e:
+        logger.warning(f"Error closing search page: {str(e)}")
+
+
+# A raced result scoring above this on score_tos_url_by_path_specificity ends
+# the race (the same bar standard_search_fallback uses to stop after Bing)
+SEARCH_RACE_ACCEPT_SCORE = 50
+
+
+async def race_search_engines(search_query, page, engines):
+    """
+    Run several search fallbacks concurrently and keep the first good answer.
+    
+    The first engine searches on the caller's page; the others open extra
+    pages in the same browser context. They never lease pool slots: the
+    caller already holds one, and waiting on the pool for more would let
+    concurrent discoveries starve each other. As soon as a result scores above
+    SEARCH_RACE_ACCEPT_SCORE on score_tos_url_by_path_specificity the rest
+    are cancelled and awaited. Otherwise the best-scoring result is returned once every
+    engine has answered or SEARCH_RACE_DEADLINE has passed.
+    
+    Args:
+        search_query: Search query string for finding ToS
+        page: Playwright page the first engine may use
+        engines: Engine names in preference order ("bing", "yahoo", "duckduckgo")
+        
+    Returns:
+        Tuple of (best_url, best_engine, search_results_dict)
+    """
+    async def run_engine(engine, own_page):
+        search = SEARCH_ENGINE_FALLBACKS[engine]
+        if own_page is not None:
+            return await search(search_query, own_page)
+        extra_page = await page.context.new_page()
+        try:
+            return await search(search_query, extra_page)
+        finally:
+            await close_extra_page(extra_page)
+    
+    tasks = {
+        asyncio.create_task(run_engine(engine, page if i == 0 else None)): engine
+        for i, engine in enumerate(engines)
+    }
+    search_results = {}
+    best_url = best_engine = None
+    best_score = -1
+    deadline = time.monotonic() + settings.SEARCH_RACE_DEADLINE
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Search race deadline reached, still waiting on: {', '.join(tasks[t] for t in pending)}")
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                engine = tasks[task]
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.warning(f"{engine} search failed during race: {e}")
+                    continue
+                if not result:
+                    continue
+                search_results[engine] = result
+                score = score_tos_url_by_path_specificity(result)
+                logger.info(f"Search race: {engine} returned {result} (score {score})")
+                if score > best_score:
+                    best_url, best_engine, best_score = result, engine, score
+            if best_score > SEARCH_RACE_ACCEPT_SCORE:
+                logger.info(f"Search race won by {best_engine}, cancelling {len(pending)} other engine(s)")
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        # The losers must be off the caller's page, and their extra pages
+        # closed, before the page goes back to the caller and the lease is released
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    return best_url, best_engine, search_results
+
+
 async def standard_search_fallback(search_query, page):
     """
     Runs a standard search approach using Bing as primary with fallbacks to other engines.
+    With SEARCH_RACE_ENABLED the engines run concurrently via race_search_engines.
     
     Args:
         search_query: Search query string for finding ToS
@@ -4114,49 +3679,52 @@ async def standard_search_fallback(search_query, page):
     search_results = {}
     best_url = None
     
-    # Try Bing first
-    try:
-        print("Trying Bing search...")
-        bing_url = await bing_search_fallback(search_query, page)
-        if bing_url:
-            best_url = bing_url
-            search_results["bing"] = bing_url
-            print(f"Found ToS via Bing: {bing_url}")
-            # If we find a good result with Bing, return it immediately
-            if score_tos_url_by_path_specificity(bing_url) > 50:
-                return best_url, search_results, []
-    except Exception as e:
-        print(f"Error in Bing search: {e}")
-    
-    # Try Yahoo if Bing failed or gave a low-quality result
-    if not best_url or score_tos_url_by_path_specificity(best_url) < 30:
+    if settings.SEARCH_RACE_ENABLED:
+        best_url, _, search_results = await race_search_engines(search_query, page, ["bing", "yahoo", "duckduckgo"])
+    else:
+        # Try Bing first
         try:
-            print("Trying Yahoo search...")
-            yahoo_url = await yahoo_search_fallback(search_query, page)
-            if yahoo_url:
-                search_results["yahoo"] = yahoo_url
-                print(f"Found ToS via Yahoo: {yahoo_url}")
-                
-                # Replace our best URL if Yahoo's result is better or if we don't have one yet
-                if not best_url or score_tos_url_by_path_specificity(yahoo_url) > score_tos_url_by_path_specificity(best_url):
-                    best_url = yahoo_url
+            print("Trying Bing search...")
+            bing_url = await bing_search_fallback(search_query, page)
+            if bing_url:
+                best_url = bing_url
+                search_results["bing"] = bing_url
+                print(f"Found ToS via Bing: {bing_url}")
+                # If we find a good result with Bing, return it immediately
+                if score_tos_url_by_path_specificity(bing_url) > 50:
+                    return best_url, search_results, []
         except Exception as e:
-            print(f"Error in Yahoo search: {e}")
+            print(f"Error in Bing search: {e}")
     
-    # Try DuckDuckGo as last resort
-    if not best_url or score_tos_url_by_path_specificity(best_url) < 30:
-        try:
-            print("Trying DuckDuckGo search...")
-            ddg_url = await duckduckgo_search_fallback(search_query, page)
-            if ddg_url:
-                search_results["duckduckgo"] = ddg_url
-                print(f"Found ToS via DuckDuckGo: {ddg_url}")
-                
-                # Replace our best URL if DuckDuckGo's result is better or if we don't have one yet
-                if not best_url or score_tos_url_by_path_specificity(ddg_url) > score_tos_url_by_path_specificity(best_url):
-                    best_url = ddg_url
-        except Exception as e:
-            print(f"Error in DuckDuckGo search: {e}")
+        # Try Yahoo if Bing failed or gave a low-quality result
+        if not best_url or score_tos_url_by_path_specificity(best_url) < 30:
+            try:
+                print("Trying Yahoo search...")
+                yahoo_url = await yahoo_search_fallback(search_query, page)
+                if yahoo_url:
+                    search_results["yahoo"] = yahoo_url
+                    print(f"Found ToS via Yahoo: {yahoo_url}")
+                
+                    # Replace our best URL if Yahoo's result is better or if we don't have one yet
+                    if not best_url or score_tos_url_by_path_specificity(yahoo_url) > score_tos_url_by_path_specificity(best_url):
+                        best_url = yahoo_url
+            except Exception as e:
+                print(f"Error in Yahoo search: {e}")
+    
+        # Try DuckDuckGo as last resort
+        if not best_url or score_tos_url_by_path_specificity(best_url) < 30:
+            try:
+                print("Trying DuckDuckGo search...")
+                ddg_url = await duckduckgo_search_fallback(search_query, page)
+                if ddg_url:
+                    search_results["duckduckgo"] = ddg_url
+                    print(f"Found ToS via DuckDuckGo: {ddg_url}")
+                
+                    # Replace our best URL if DuckDuckGo's result is better or if we don't have one yet
+                    if not best_url or score_tos_url_by_path_specificity(ddg_url) > score_tos_url_by_path_specificity(best_url):
+                        best_url = ddg_url
+            except Exception as e:
+                print(f"Error in DuckDuckGo search: {e}")
     
     # If we found any results
     if best_url:
@@ -0,0 +1,1239 @@
+"""
+Shared Playwright browser pool.
+
+A set of Chromium processes ("shards") is launched at application startup and
+reused by the extraction and discovery endpoints. New leases go to the
+least-loaded healthy shard, and a shard that crashes is relaunched on its own
+without disturbing the others. Callers lease a pre-built browser context
+(stealth script already applied) via ``acquire_lease``/``release_lease``, or a
+bare page via ``get_page``/``release_page``. Released contexts are wiped and
+returned to their shard's idle pool, or recycled after too many uses or when the browser
+grows past its memory budget; the pool is refilled in the background.
+Every lease is timed so pool pressure shows up in ``/debug/status``.
+
+Leases can carry a resource-blocking profile (on by default for discovery,
+opt-in for extraction) that aborts images, fonts, media and known analytics
+hosts; ``navigate_page`` reports what each navigation skipped.
+
+``wait_for_page_ready`` replaces fixed sleeps when BROWSER_FAST_READINESS is
+on: it returns once the DOM stops mutating and the text length plateaus, or
+when the readiness budget runs out.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright, Playwright, Browser, BrowserContext
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Define consistent user agent
+CONSISTENT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+
+# Settings for every pooled context
+POOLED_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1366, "height": 768},
+    "ignore_https_errors": True,
+    "user_agent": CONSISTENT_USER_AGENT,
+    "locale": "en-US",
+    "timezone_id": "America/New_York",
+    "device_scale_factor": 1,
+    "is_mobile": False,
+    "has_touch": False,
+    "extra_http_headers": {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Upgrade-Insecure-Requests": "1",
+        "Connection": "keep-alive",
+    },
+}
+
+# Browser args for a dedicated discovery browser when the shared one is down
+DISCOVERY_BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-infobars",
+    "--window-size=1366,768",
+    "--disable-automation",
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+]
+
+# Comprehensive stealth script to override navigator properties
+STEALTH_INIT_SCRIPT = """
+            () => {
+                // Override webdriver property
+                Object.defineProperty(navigator, 'webdriver', { get: () => false });
+                
+                // Add fake plugins for more human-like fingerprint
+                Object.defineProperty(navigator, 'plugins', {
+                    get: () => [
+                        {
+                            name: 'Chrome PDF Plugin',
+                            description: 'Portable Document Format',
+                            filename: 'internal-pdf-viewer',
+                            length: 1
+                        },
+                        {
+                            name: 'Chrome PDF Viewer',
+                            description: '',
+                            filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai',
+                            length: 1
+                        },
+                        {
+                            name: 'Native Client',
+                            description: '',
+                            filename: 'internal-nacl-plugin',
+                            length: 1
+                        }
+                    ]
+                });
+                
+                // Fix languages
+                Object.defineProperty(navigator, 'languages', {
+                    get: () => ['en-US', 'en']
+                });
+                
+                // Hide automation-related properties
+                const originalQuery = window.navigator.permissions.query;
+                window.navigator.permissions.query = (parameters) => (
+                    parameters.name === 'notifications' ?
+                    Promise.resolve({ state: Notification.permission }) :
+                    originalQuery(parameters)
+                );
+                
+                // Add chrome object if not present
+                if (window.chrome === undefined) {
+                    window.chrome = {
+                        runtime: {},
+                        loadTimes: function() {},
+                        app: {},
+                        csi: function() {},
+                    };
+                }
+                
+                // Prevent iframe detection technique
+                try {
+                    Object.defineProperty(HTMLIFrameElement.prototype, 'contentWindow', {
+                        get: function() {
+                            return window;
+                        }
+                    });
+                } catch (e) {}
+            }
+            """
+
+
+# Resource types that never matter for reading anchors or text
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "texttrack", "manifest"}
+
+# Third-party hosts (and their subdomains) that only add weight to a page load
+BLOCKED_HOST_SUFFIXES = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "optimizely.com",
+    "nr-data.net",
+    "newrelic.com",
+    "fullstory.com",
+    "clarity.ms",
+    "mixpanel.com",
+    "quantserve.com",
+    "scorecardresearch.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+)
+
+# Rough transfer sizes per blocked resource type, used to estimate bytes saved
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 45_000,
+    "media": 500_000,
+    "font": 35_000,
+    "script": 30_000,
+    "texttrack": 5_000,
+    "manifest": 2_000,
+}
+
+
+def is_blocked_host(host: str) -> bool:
+    host = (host or "").lower()
+    return any(host == suffix or host.endswith("." + suffix) for suffix in BLOCKED_HOST_SUFFIXES)
+
+
+def _percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a small sample, 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return round(ordered[index], 1)
+
+
+class ResourceBlocker:
+    """Route handler that aborts non-essential requests and tallies what it skipped."""
+
+    def __init__(self):
+        self.blocked = 0
+        self.bytes_saved = 0
+
+    async def handle(self, route):
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type in BLOCKED_RESOURCE_TYPES or (
+            resource_type != "document" and is_blocked_host(urlparse(request.url).hostname)
+        ):
+            self.blocked += 1
+            self.bytes_saved += ESTIMATED_RESOURCE_BYTES.get(resource_type, 20_000)
+            await route.abort()
+            return
+        await route.continue_()
+
+    def take_counts(self):
+        """Return (requests blocked, estimated bytes saved) since the last call."""
+        counts = (self.blocked, self.bytes_saved)
+        self.blocked = 0
+        self.bytes_saved = 0
+        return counts
+
+
+class NavigationStats:
+    """Navigation timings split by blocking profile, for estimating time saved."""
+
+    def __init__(self, window: int = 200):
+        self.blocked_navigations = 0
+        self.full_navigations = 0
+        self.requests_blocked = 0
+        self.bytes_saved = 0
+        self.blocked_ms = deque(maxlen=window)
+        self.full_ms = deque(maxlen=window)
+
+    def record(self, elapsed_ms: float, blocking: bool, blocked: int = 0, bytes_saved: int = 0):
+        if blocking:
+            self.blocked_navigations += 1
+            self.requests_blocked += blocked
+            self.bytes_saved += bytes_saved
+            self.blocked_ms.append(elapsed_ms)
+        else:
+            self.full_navigations += 1
+            self.full_ms.append(elapsed_ms)
+
+    def estimated_ms_saved(self) -> float | None:
+        """Median full-profile navigation minus median blocked-profile navigation."""
+        if not self.blocked_ms or not self.full_ms:
+            return None
+        return round(_percentile(self.full_ms, 50) - _percentile(self.blocked_ms, 50), 1)
+
+    def snapshot(self) -> dict:
+        return {
+            "blocked_profile_navigations": self.blocked_navigations,
+            "full_profile_navigations": self.full_navigations,
+            "requests_blocked": self.requests_blocked,
+            "estimated_bytes_saved": self.bytes_saved,
+            "blocked_profile_p50_ms": _percentile(self.blocked_ms, 50),
+            "full_profile_p50_ms": _percentile(self.full_ms, 50),
+            "estimated_ms_saved_per_navigation": self.estimated_ms_saved(),
+        }
+
+
+
+class PageReadyStats:
+    """Per-mode page preparation timings (fast readiness vs paced waits)."""
+
+    def __init__(self, window: int = 200):
+        self.timings = {}
+        self.window = window
+        self.budget_exhausted = 0
+
+    def record(self, mode: str, elapsed_ms: float, settled: bool = True):
+        self.timings.setdefault(mode, deque(maxlen=self.window)).append(elapsed_ms)
+        if not settled:
+            self.budget_exhausted += 1
+
+    def snapshot(self) -> dict:
+        result = {
+            mode: {
+                "pages": len(values),
+                "p50_ms": _percentile(values, 50),
+                "p90_ms": _percentile(values, 90),
+            }
+            for mode, values in self.timings.items()
+        }
+        result["budget_exhausted"] = self.budget_exhausted
+        return result
+
+def _read_process_table():
+    """Map pid -> (parent pid, RSS pages) from /proc; None where /proc is unavailable."""
+    if not os.path.isdir("/proc"):
+        return None
+    table = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing paren
+        fields = stat[stat.rfind(")") + 2:].split()
+        table[int(entry)] = (int(fields[1]), int(fields[21]))
+    return table
+
+
+def _descendants(table: dict, root_pid: int) -> list:
+    children = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    found = []
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        found.append(pid)
+        stack.extend(children.get(pid, []))
+    return found
+
+
+def descendant_pids(root_pid: int | None = None) -> set:
+    """Every process below root_pid (default: this process)."""
+    table = _read_process_table()
+    if table is None:
+        return set()
+    return set(_descendants(table, root_pid or os.getpid()))
+
+
+def process_tree_rss_mb(root_pid: int | None = None, include_root: bool = False) -> float | None:
+    """
+    Resident memory in MB of every descendant of root_pid (default: this
+    process, i.e. the Playwright driver and the Chromium processes it
+    spawned). Linux only; None elsewhere.
+    """
+    table = _read_process_table()
+    if table is None:
+        return None
+    root_pid = root_pid or os.getpid()
+    pids = _descendants(table, root_pid)
+    if include_root:
+        if root_pid not in table:
+            return None
+        pids.append(root_pid)
+    total_pages = sum(table[pid][1] for pid in pids if pid in table)
+    return round(total_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+
+
+class LeaseMetrics:
+    """Rolling timing statistics for browser leases, grouped by caller label."""
+
+    def __init__(self, window: int = 200):
+        self.acquired = 0
+        self.released = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.dedicated = 0
+        self.wait_ms = deque(maxlen=window)
+        self.hold_ms = deque(maxlen=window)
+        self.by_label = {}
+
+    def _label(self, label: str) -> dict:
+        if label not in self.by_label:
+            self.by_label[label] = {"leases": 0, "failures": 0, "hold_ms_total": 0.0}
+        return self.by_label[label]
+
+    def record_acquire(self, label: str, wait_ms: float, dedicated: bool = False):
+        self.acquired += 1
+        if dedicated:
+            self.dedicated += 1
+        self.wait_ms.append(wait_ms)
+        self._label(label)["leases"] += 1
+
+    def record_release(self, label: str, hold_ms: float):
+        self.released += 1
+        self.hold_ms.append(hold_ms)
+        self._label(label)["hold_ms_total"] += hold_ms
+
+    def record_failure(self, label: str):
+        self.failures += 1
+        self._label(label)["failures"] += 1
+
+    def record_timeout(self):
+        self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "acquired": self.acquired,
+            "released": self.released,
+            "in_use": self.acquired - self.released,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "dedicated_fallbacks": self.dedicated,
+            "wait_ms": {
+                "p50": _percentile(self.wait_ms, 50),
+                "p95": _percentile(self.wait_ms, 95),
+                "max": round(max(self.wait_ms), 1) if self.wait_ms else 0.0,
+            },
+            "hold_ms": {
+                "p50": _percentile(self.hold_ms, 50),
+                "p95": _percentile(self.hold_ms, 95),
+                "max": round(max(self.hold_ms), 1) if self.hold_ms else 0.0,
+            },
+            "by_label": {
+                label: {
+                    "leases": stats["leases"],
+                    "failures": stats["failures"],
+                    "avg_hold_ms": round(stats["hold_ms_total"] / stats["leases"], 1)
+                    if stats["leases"]
+                    else 0.0,
+                }
+                for label, stats in self.by_label.items()
+            },
+        }
+
+
+class PooledContext:
+    """A pre-built browser context that is wiped and reused between leases."""
+
+    def __init__(self, context: BrowserContext, shard):
+        self.context = context
+        self.shard = shard
+        self.generation = shard.generation
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.visited_origins = set()
+        context.on("page", self._watch_page)
+
+    def is_current(self) -> bool:
+        """False once the shard's browser has died or been relaunched."""
+        return self.shard.healthy and self.generation == self.shard.generation
+
+    def _watch_page(self, page):
+        page.on("framenavigated", self._record_origin)
+
+    def _record_origin(self, frame):
+        parsed = urlparse(frame.url)
+        if parsed.scheme in ("http", "https") and parsed.netloc:
+            self.visited_origins.add(f"{parsed.scheme}://{parsed.netloc}")
+
+
+class BrowserLease:
+    """An isolated browser context and its first page, leased from the pool."""
+
+    def __init__(self, label: str, context: BrowserContext, page, pooled=None, dedicated_browser=None, dedicated_playwright=None):
+        self.label = label
+        self.context = context
+        self.page = page
+        self.pooled = pooled
+        self.blocker = None
+        self.dedicated_browser = dedicated_browser
+        self.dedicated_playwright = dedicated_playwright
+        self.acquired_at = time.monotonic()
+        self.released = False
+
+    @property
+    def dedicated(self) -> bool:
+        return self.dedicated_browser is not None
+
+    def held_ms(self) -> float:
+        return (time.monotonic() - self.acquired_at) * 1000
+
+
+class BrowserShard:
+    """
+    One Chromium process with its own slot budget and idle context pool.
+
+    A shard that crashes or disconnects is relaunched on its own; leases that
+    were running on it fail, leases on every other shard carry on.
+    """
+
+    def __init__(self, index: int, concurrency: int):
+        self.index = index
+        self.concurrency = concurrency
+        self.browser: Browser | None = None
+        self.pid = None  # root Chromium process, when it could be identified
+        self.generation = 0  # bumped on every (re)launch
+        self.in_use = 0
+        self.idle_contexts = deque()
+        self.healthy = False
+        self.draining = False
+        self.restarts = 0
+        self.memory_recycles = 0
+        self.last_rss_mb = None
+        self.last_failure = None
+        self._refill_task = None
+        self._restart_task = None
+
+    @property
+    def load(self) -> float:
+        return self.in_use / self.concurrency if self.concurrency else 1.0
+
+    def get_stats(self) -> dict:
+        return {
+            "index": self.index,
+            "healthy": self.healthy,
+            "draining": self.draining,
+            "generation": self.generation,
+            "in_use": self.in_use,
+            "concurrency": self.concurrency,
+            "idle_contexts": len(self.idle_contexts),
+            "restarts": self.restarts,
+            "memory_recycles": self.memory_recycles,
+            "rss_mb": self.last_rss_mb,
+            "last_failure": self.last_failure,
+        }
+
+
+class PlaywrightManager:
+    def __init__(self, shards: int = 1, shard_concurrency: int = 3):
+        self._launch_lock = asyncio.Lock()
+        self.playwright: Playwright | None = None
+        self.shards = [BrowserShard(i, shard_concurrency) for i in range(max(1, shards))]
+        self.max_instances = sum(shard.concurrency for shard in self.shards)
+        self.semaphore = asyncio.Semaphore(self.max_instances)
+        self.metrics = LeaseMetrics()
+        self.page_leases = {}  # page -> BrowserLease, for get_page/release_page
+        self.contexts_created = 0
+        self.contexts_recycled = 0
+        self._rss_sample = (0.0, None)  # (monotonic time, MB)
+        self.context_blockers = {}  # BrowserContext -> ResourceBlocker
+        self.navigation_stats = NavigationStats()
+        self.ready_stats = PageReadyStats()
+        self.active_pages = set()  # Track active pages to ensure cleanup
+        self.last_cleanup = time.time()
+        self.cleanup_interval = 300  # Clean unused tabs every 5 minutes
+        self.startup_complete = False
+        self.startup_failure = None
+        self._shutting_down = False
+        self.active_leases = set()
+        self.leaked_leases = 0
+        self._watchdog_task = None
+
+    @property
+    def browser(self) -> Browser | None:
+        """Browser of the first healthy shard, for callers that only need one."""
+        for shard in self.shards:
+            if shard.healthy:
+                return shard.browser
+        return None
+
+    @property
+    def idle_contexts(self) -> int:
+        return sum(len(shard.idle_contexts) for shard in self.shards)
+
+    def _browser_args(self) -> list:
+        # Browser launch arguments for containerized environment
+        browser_args = [
+            "--disable-blink-features=AutomationControlled",
+            "--no-sandbox",                        # Required in containerized environments
+            "--disable-dev-shm-usage",            # Overcome limited resource in containers
+            "--disable-gpu",                       # Disable GPU acceleration
+            "--disable-setuid-sandbox",            # Additional sandbox protection
+            "--ignore-certificate-errors",         # Ignore SSL issues
+            "--disable-accelerated-2d-canvas",     # Disable canvas acceleration 
+            "--disable-accelerated-video-decode",  # Disable video acceleration
+            "--disable-web-security"               # Disable web security for testing
+        ]
+        if settings.BROWSER_SINGLE_PROCESS:
+            browser_args.append("--single-process")  # Use single process (helpful in containers)
+        return browser_args
+
+    async def startup(self):
+        """Start the browser shards with improved error handling for containerized environments"""
+        # Don't try to start if we've already failed
+        if self.startup_failure:
+            logger.warning(f"Not attempting browser startup due to previous failure: {self.startup_failure}")
+            raise RuntimeError(f"Browser startup previously failed: {self.startup_failure}")
+        
+        logger.info(f"Launching {len(self.shards)} Playwright browser shard(s)...")
+        try:
+            # Start the Playwright process
+            logger.info("Attempting to start Playwright process...")
+            self.playwright = await async_playwright().start()
+            logger.info("Playwright process started successfully")
+
+            results = await asyncio.gather(
+                *(self._launch_shard(shard) for shard in self.shards),
+                return_exceptions=True,
+            )
+            failures = [r for r in results if isinstance(r, Exception)]
+            if len(failures) == len(self.shards):
+                raise failures[0]
+            for shard, result in zip(self.shards, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Browser shard {shard.index} failed to start: {str(result)}")
+                    shard.last_failure = str(result)
+                    self._schedule_restart(shard)
+
+            # Mark startup as complete
+            self.startup_complete = True
+            logger.info(
+                f"PlaywrightManager ready and operational (headless): "
+                f"{len(self.shards) - len(failures)}/{len(self.shards)} shards, "
+                f"{self.max_instances} slots"
+            )
+            return True
+            
+        except Exception as e:
+            # ---> MODIFIED: Log the full traceback for startup errors
+            logger.error(f"Error during browser startup: {str(e)}", exc_info=True) # Add exc_info=True
+            self.startup_failure = str(e)
+            # Try to clean up any partial initialization
+            await self._cleanup_on_failure()
+            raise
+
+    async def _launch_shard(self, shard: BrowserShard):
+        """Launch (or relaunch) one shard's browser and verify it can open a page."""
+        # Get Chrome executable path from environment if provided
+        chrome_path = os.environ.get("CHROME_PATH", None)
+        logger.info(f"Launching browser shard {shard.index} (executable: {chrome_path if chrome_path else 'Default'})")
+        # Launches are serialised so the new Chromium root process can be
+        # identified by diffing our process tree around the launch
+        async with self._launch_lock:
+            before = descendant_pids()
+            browser = await self.playwright.chromium.launch(
+                headless=True,
+                args=self._browser_args(),
+                executable_path=chrome_path,
+                timeout=60000,  # 60 second timeout for browser launch
+            )
+            spawned = descendant_pids() - before
+        try:
+            # Create test page to verify everything is working
+            context = await browser.new_context()
+            test_page = await context.new_page()
+            await test_page.goto("about:blank")
+            await context.close()
+        except Exception:
+            await browser.close()
+            raise
+
+        shard.browser = browser
+        shard.pid = self._root_pid(spawned)
+        shard.generation += 1
+        shard.healthy = True
+        generation = shard.generation
+        browser.on("disconnected", lambda _: self._on_shard_disconnected(shard, generation))
+        logger.info(f"Browser shard {shard.index} launched (generation {generation})")
+
+    @staticmethod
+    def _root_pid(spawned: set):
+        """The process in a freshly spawned tree whose parent is not part of it."""
+        table = _read_process_table() or {}
+        roots = [pid for pid in spawned if pid in table and table[pid][0] not in spawned]
+        return roots[0] if len(roots) == 1 else None
+
+    def _on_shard_disconnected(self, shard: BrowserShard, generation: int):
+        """Browser process exited or crashed: take the shard out and relaunch it."""
+        if self._shutting_down or generation != shard.generation or not shard.healthy:
+            return
+        logger.error(f"Browser shard {shard.index} disconnected; {shard.in_use} in-flight leases lost")
+        shard.healthy = False
+        shard.last_failure = "disconnected"
+        shard.idle_contexts.clear()  # contexts died with the browser
+        self._schedule_restart(shard)
+
+    def _schedule_restart(self, shard: BrowserShard):
+        if shard._restart_task is None or shard._restart_task.done():
+            shard._restart_task = asyncio.create_task(self._restart_shard(shard))
+
+    async def _restart_shard(self, shard: BrowserShard):
+        """Relaunch a dead shard with exponential backoff until it comes back."""
+        attempt = 0
+        while not self._shutting_down and not shard.healthy:
+            if attempt:
+                await asyncio.sleep(min(2 ** attempt, 60))
+            attempt += 1
+            try:
+                if shard.browser:
+                    try:
+                        await shard.browser.close()
+                    except Exception:
+                        pass
+                await self._launch_shard(shard)
+                shard.restarts += 1
+                logger.info(f"Browser shard {shard.index} restarted (attempt {attempt})")
+                self._schedule_refill(shard)
+            except Exception as e:
+                shard.last_failure = str(e)
+                logger.error(f"Restart of browser shard {shard.index} failed (attempt {attempt}): {str(e)}")
+
+    async def _cleanup_on_failure(self):
+        """Clean up resources after a failed startup"""
+        logger.info("Cleaning up after failed browser startup")
+        try:
+            for shard in self.shards:
+                shard.healthy = False
+                if shard.browser:
+                    await shard.browser.close()
+                    shard.browser = None
+                
+            if self.playwright:
+                await self.playwright.stop()
+                self.playwright = None
+        except Exception as e:
+            logger.error(f"Error during cleanup after failed startup: {str(e)}")
+
+    async def get_page(self, block_resources: bool | None = None):
+        """Get a new browser page with semaphore control and fallback mechanism"""
+        if not self.startup_complete:
+            logger.error("Cannot get page - browser not initialized")
+            raise RuntimeError("Browser not initialized")
+            
+        # Each page gets its own pooled context so cookies never cross requests
+        if block_resources is None:
+            block_resources = settings.EXTRACT_BLOCK_RESOURCES
+        lease = await self.acquire_lease("extract", block_resources=block_resources)
+        page = lease.page
+        self.active_pages.add(page)
+        self.page_leases[page] = lease
+        return page
+
+    async def release_page(self, page):
+        """Release a page back to the pool"""
+        self.active_pages.discard(page)
+        lease = self.page_leases.pop(page, None)
+        if lease:
+            await self.release_lease(lease)
+            return
+        try:
+            await page.close()
+        except Exception as e:
+            logger.error(f"Error closing page: {str(e)}")
+
+    async def cleanup_stale_pages(self):
+        """Close any stale pages left open in idle pooled contexts"""
+        try:
+            logger.info(
+                f"Checking for stale browser pages. Active pages count: {len(self.active_pages)}"
+            )
+            for shard in self.shards:
+                for pooled in list(shard.idle_contexts):
+                    for page in pooled.context.pages:
+                        logger.info("Closing stale browser page")
+                        try:
+                            await page.close()
+                        except Exception as e:
+                            logger.warning(f"Error closing stale page: {str(e)}")
+            self.last_cleanup = time.time()
+        except Exception as e:
+            logger.error(f"Error during stale page cleanup: {str(e)}")
+
+    def is_ready(self) -> bool:
+        """Whether at least one shard is running and can hand out leases."""
+        return self.startup_complete and any(shard.healthy for shard in self.shards)
+
+    async def _acquire_slot(self):
+        """Wait for a free pool slot, bounded by BROWSER_LEASE_TIMEOUT."""
+        try:
+            await asyncio.wait_for(
+                self.semaphore.acquire(), timeout=settings.BROWSER_LEASE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            self.metrics.record_timeout()
+            raise RuntimeError(
+                f"Timed out after {settings.BROWSER_LEASE_TIMEOUT}s waiting for a browser slot"
+            )
+
+    def _pick_shard(self) -> BrowserShard | None:
+        """
+        Least-loaded healthy shard, preferring one with a warm idle context.
+        Draining shards take no new leases.
+        While a shard is down its slots stay in the global budget, so the
+        remaining shards may briefly run above their own concurrency.
+        """
+        healthy = [shard for shard in self.shards if shard.healthy and not shard.draining]
+        if not healthy:
+            return None
+        return min(healthy, key=lambda shard: (shard.load, -len(shard.idle_contexts), shard.index))
+
+    async def acquire_lease(self, label: str = "discovery", block_resources: bool | None = None) -> BrowserLease:
+        """
+        Lease an isolated context and page from the least-loaded browser shard.
+
+        If no shard is running (startup failed or was skipped), a dedicated
+        browser is launched for this lease instead so discovery keeps
+        working; it is torn down again in release_lease.
+
+        block_resources defaults to DISCOVERY_BLOCK_RESOURCES.
+        """
+        if block_resources is None:
+            block_resources = settings.DISCOVERY_BLOCK_RESOURCES
+        wait_started = time.monotonic()
+        if not self.is_ready():
+            logger.warning(f"Shared browser not ready, launching a dedicated browser for '{label}'")
+            lease = await self._launch_dedicated_lease(label)
+            if block_resources:
+                await self._install_blocker(lease)
+            self.metrics.record_acquire(label, (time.monotonic() - wait_started) * 1000, dedicated=True)
+            self.active_leases.add(lease)
+            return lease
+
+        await self._acquire_slot()
+        shard = self._pick_shard()
+        # Every shard may be draining or restarting for a moment; wait for one
+        deadline = wait_started + settings.BROWSER_LEASE_TIMEOUT
+        while shard is None and time.monotonic() < deadline and not self._shutting_down:
+            await asyncio.sleep(0.25)
+            shard = self._pick_shard()
+        if shard is None:
+            self.semaphore.release()
+            self.metrics.record_failure(label)
+            raise RuntimeError("No healthy browser shard available")
+
+        shard.in_use += 1
+        pooled = None
+        try:
+            if shard.idle_contexts:
+                pooled = shard.idle_contexts.popleft()
+            else:
+                pooled = await self._create_pooled_context(shard)
+            pooled.uses += 1
+            lease = BrowserLease(label, pooled.context, None, pooled=pooled)
+            if block_resources:
+                await self._install_blocker(lease)
+            lease.page = await pooled.context.new_page()
+        except Exception as e:
+            shard.in_use -= 1
+            self.semaphore.release()
+            self.metrics.record_failure(label)
+            logger.error(f"Error leasing browser context for '{label}' on shard {shard.index}: {str(e)}")
+            if pooled:
+                self.context_blockers.pop(pooled.context, None)
+                await self._discard_context(pooled)
+            raise
+
+        self.metrics.record_acquire(label, (time.monotonic() - wait_started) * 1000)
+        self.active_leases.add(lease)
+        if len(shard.idle_contexts) < settings.BROWSER_CONTEXT_POOL_SIZE:
+            self._schedule_refill(shard)
+        return lease
+
+    async def _install_blocker(self, lease: BrowserLease):
+        """Route every request of the leased context through a ResourceBlocker."""
+        lease.blocker = ResourceBlocker()
+        await lease.context.route("**/*", lease.blocker.handle)
+        self.context_blockers[lease.context] = lease.blocker
+
+    def blocker_for(self, page):
+        """The ResourceBlocker active on a page's context, if any."""
+        try:
+            return self.context_blockers.get(page.context)
+        except Exception:
+            return None
+
+    async def _launch_dedicated_lease(self, label: str) -> BrowserLease:
+        """Launch a one-off browser for a single lease."""
+        playwright = await async_playwright().start()
+        browser = None
+        try:
+            browser = await playwright.chromium.launch(
+                headless=True,
+                args=DISCOVERY_BROWSER_ARGS,
+                chromium_sandbox=False,
+            )
+            context = await browser.new_context(**POOLED_CONTEXT_OPTIONS)
+            await context.add_init_script(STEALTH_INIT_SCRIPT)
+            page = await context.new_page()
+            return BrowserLease(label, context, page, dedicated_browser=browser, dedicated_playwright=playwright)
+        except Exception:
+            self.metrics.record_failure(label)
+            if browser:
+                await browser.close()
+            await playwright.stop()
+            raise
+
+    async def release_lease(self, lease: BrowserLease, discard: bool = False):
+        """
+        Return a leased context to its shard's idle pool (or recycle it) and
+        free the slot. discard=True closes the context instead of reusing it.
+        """
+        if lease is None or lease.released:
+            return
+        lease.released = True
+        self.active_leases.discard(lease)
+        self.context_blockers.pop(lease.context, None)
+        try:
+            if lease.dedicated:
+                await lease.context.close()
+                await lease.dedicated_browser.close()
+                await lease.dedicated_playwright.stop()
+            else:
+                if discard:
+                    await self._discard_context(lease.pooled)
+                    self._schedule_refill(lease.pooled.shard)
+                else:
+                    if lease.blocker and lease.pooled.is_current():
+                        await lease.context.unroute("**/*", lease.blocker.handle)
+                    await self._return_context(lease.pooled)
+        except Exception as e:
+            logger.warning(f"Error releasing browser lease for '{lease.label}': {str(e)}")
+        finally:
+            if not lease.dedicated:
+                lease.pooled.shard.in_use -= 1
+                self.semaphore.release()
+            self.metrics.record_release(lease.label, lease.held_ms())
+
+    async def _create_pooled_context(self, shard: BrowserShard) -> PooledContext:
+        """Build a context with the stealth script applied once, up front."""
+        context = await shard.browser.new_context(**POOLED_CONTEXT_OPTIONS)
+        try:
+            await context.add_init_script(STEALTH_INIT_SCRIPT)
+        except Exception:
+            await context.close()
+            raise
+        self.contexts_created += 1
+        return PooledContext(context, shard)
+
+    async def _return_context(self, pooled: PooledContext):
+        """Wipe a released context and put it back, or close it if it is due for recycling."""
+        shard = pooled.shard
+        reason = None
+        if not pooled.is_current():
+            reason = "shard restarted"
+        elif pooled.uses >= settings.BROWSER_CONTEXT_MAX_USES:
+            reason = f"reached {pooled.uses} uses"
+        elif self._over_memory_budget():
+            reason = f"browser RSS above {settings.BROWSER_CONTEXT_RECYCLE_RSS_MB}MB"
+        elif len(shard.idle_contexts) >= settings.BROWSER_CONTEXT_POOL_SIZE:
+            reason = "idle pool full"
+
+        if reason is None:
+            try:
+                await self._reset_context(pooled)
+                shard.idle_contexts.append(pooled)
+                return
+            except Exception as e:
+                reason = f"reset failed: {str(e)}"
+
+        logger.info(f"Recycling browser context on shard {shard.index} ({reason})")
+        await self._discard_context(pooled)
+        self._schedule_refill(shard)
+
+    async def _reset_context(self, pooled: PooledContext):
+        """Close leftover pages and clear cookies, permissions and per-origin storage."""
+        for page in list(pooled.context.pages):
+            await page.close()
+        await pooled.context.clear_cookies()
+        await pooled.context.clear_permissions()
+        if pooled.visited_origins:
+            page = await pooled.context.new_page()
+            try:
+                cdp = await pooled.context.new_cdp_session(page)
+                for origin in pooled.visited_origins:
+                    await cdp.send(
+                        "Storage.clearDataForOrigin",
+                        {"origin": origin, "storageTypes": "all"},
+                    )
+                await cdp.detach()
+            finally:
+                await page.close()
+            pooled.visited_origins.clear()
+
+    async def _discard_context(self, pooled: PooledContext):
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            if pooled.is_current():
+                logger.warning(f"Error closing browser context: {str(e)}")
+        self.contexts_recycled += 1
+
+    def _schedule_refill(self, shard: BrowserShard):
+        """Top a shard's idle pool back up without blocking the caller."""
+        if shard._refill_task is None or shard._refill_task.done():
+            shard._refill_task = asyncio.create_task(self._refill_contexts(shard))
+
+    async def _refill_contexts(self, shard: BrowserShard):
+        try:
+            while (
+                not self._shutting_down
+                and shard.healthy
+                and not shard.draining
+                and len(shard.idle_contexts) < settings.BROWSER_CONTEXT_POOL_SIZE
+            ):
+                shard.idle_contexts.append(await self._create_pooled_context(shard))
+        except Exception as e:
+            logger.warning(f"Error refilling context pool of shard {shard.index}: {str(e)}")
+
+    def browser_rss_mb(self) -> float | None:
+        """Driver + Chromium resident memory, sampled at most every 5 seconds."""
+        sampled_at, value = self._rss_sample
+        if time.monotonic() - sampled_at > 5:
+            value = process_tree_rss_mb()
+            self._rss_sample = (time.monotonic(), value)
+        return value
+
+    def _over_memory_budget(self) -> bool:
+        limit = settings.BROWSER_CONTEXT_RECYCLE_RSS_MB
+        if not limit:
+            return False
+        rss = self.browser_rss_mb()
+        return rss is not None and rss > limit
+
+    async def warm_up(self):
+        """
+        Prefill every shard's idle context pool so the first real requests skip
+        context setup. Failures are logged, never raised.
+        """
+        if not self.is_ready():
+            return
+        started = time.monotonic()
+        await asyncio.gather(*(self._refill_contexts(shard) for shard in self.shards))
+        logger.info(
+            f"Browser context pool prefilled with {self.idle_contexts} contexts "
+            f"in {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+
+    def start_watchdog(self):
+        """Start the background health watchdog (idempotent)."""
+        if self._watchdog_task is None or self._watchdog_task.done():
+            self._watchdog_task = asyncio.create_task(self._watchdog_loop())
+
+    async def _watchdog_loop(self):
+        logger.info(f"Browser watchdog running every {settings.BROWSER_WATCHDOG_INTERVAL}s")
+        while not self._shutting_down:
+            await asyncio.sleep(settings.BROWSER_WATCHDOG_INTERVAL)
+            try:
+                await self._watchdog_tick()
+            except Exception as e:
+                logger.error(f"Browser watchdog tick failed: {str(e)}")
+
+    async def _watchdog_tick(self):
+        await self._reap_expired_leases()
+        self._check_shard_memory()
+        if time.time() - self.last_cleanup > self.cleanup_interval:
+            await self.cleanup_stale_pages()
+
+    async def _reap_expired_leases(self):
+        """Force-release leases held past BROWSER_MAX_LEASE_SECONDS so their slots come back."""
+        limit = settings.BROWSER_MAX_LEASE_SECONDS
+        if not limit:
+            return
+        for lease in list(self.active_leases):
+            if lease.held_ms() < limit * 1000:
+                continue
+            self.leaked_leases += 1
+            logger.warning(
+                f"Reclaiming browser lease '{lease.label}' held for {lease.held_ms() / 1000:.0f}s "
+                f"(limit {limit}s)"
+            )
+            for page, page_lease in list(self.page_leases.items()):
+                if page_lease is lease:
+                    self.page_leases.pop(page, None)
+                    self.active_pages.discard(page)
+            # The holder may still be using the context, so never hand it out again
+            await self.release_lease(lease, discard=True)
+
+    def _check_shard_memory(self):
+        """Sample each shard's Chromium RSS and start a drain + recycle when over the limit."""
+        limit = settings.BROWSER_SHARD_MAX_RSS_MB
+        for shard in self.shards:
+            if not shard.healthy or not shard.pid:
+                continue
+            shard.last_rss_mb = process_tree_rss_mb(shard.pid, include_root=True)
+            if (
+                limit
+                and shard.last_rss_mb is not None
+                and shard.last_rss_mb > limit
+                and not shard.draining
+                and (shard._restart_task is None or shard._restart_task.done())
+            ):
+                logger.warning(
+                    f"Browser shard {shard.index} RSS {shard.last_rss_mb}MB exceeds {limit}MB; draining for recycle"
+                )
+                shard._restart_task = asyncio.create_task(self._recycle_shard(shard))
+
+    async def _recycle_shard(self, shard: BrowserShard):
+        """Stop handing out leases on a shard, wait for it to drain, then relaunch it."""
+        generation = shard.generation
+        shard.draining = True
+        try:
+            deadline = time.monotonic() + settings.BROWSER_DRAIN_TIMEOUT
+            while shard.in_use > 0 and time.monotonic() < deadline and not self._shutting_down:
+                await asyncio.sleep(0.5)
+            if self._shutting_down or shard.generation != generation:
+                return
+            if shard.in_use:
+                logger.warning(
+                    f"Browser shard {shard.index} still has {shard.in_use} leases after "
+                    f"{settings.BROWSER_DRAIN_TIMEOUT}s; recycling anyway"
+                )
+            shard.healthy = False
+            shard.idle_contexts.clear()
+            try:
+                await shard.browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing browser shard {shard.index} for recycle: {str(e)}")
+        finally:
+            shard.draining = False
+        shard.memory_recycles += 1
+        await self._restart_shard(shard)
+
+    def get_stats(self) -> dict:
+        """Pool size, shard health, context recycling and lease timing metrics."""
+        return {
+            "ready": self.is_ready(),
+            "max_instances": self.max_instances,
+            "active_pages": len(self.active_pages),
+            "idle_contexts": self.idle_contexts,
+            "contexts_created": self.contexts_created,
+            "contexts_recycled": self.contexts_recycled,
+            "browser_rss_mb": self.browser_rss_mb(),
+            "shards": [shard.get_stats() for shard in self.shards],
+            "watchdog": {
+                "running": self._watchdog_task is not None and not self._watchdog_task.done(),
+                "active_leases": len(self.active_leases),
+                "leaked_leases": self.leaked_leases,
+                "shard_restarts": sum(shard.restarts for shard in self.shards),
+                "memory_recycles": sum(shard.memory_recycles for shard in self.shards),
+            },
+            "leases": self.metrics.snapshot(),
+            "resource_blocking": self.navigation_stats.snapshot(),
+            "page_readiness": self.ready_stats.snapshot(),
+        }
+
+    async def shutdown(self):
+        """Shut down every browser shard"""
+        logger.info("Shutting down Playwright browser...")
+        self._shutting_down = True
+        if self._watchdog_task and not self._watchdog_task.done():
+            self._watchdog_task.cancel()
+        try:
+            # Close all active pages first
+            for page in list(self.active_pages):
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.warning(f"Error closing page during shutdown: {str(e)}")
+            self.active_pages.clear()
+
+            for shard in self.shards:
+                for task in (shard._refill_task, shard._restart_task):
+                    if task and not task.done():
+                        task.cancel()
+                while shard.idle_contexts:
+                    await self._discard_context(shard.idle_contexts.popleft())
+                shard.healthy = False
+                if shard.browser:
+                    await shard.browser.close()
+                    shard.browser = None
+                
+            if self.playwright:
+                await self.playwright.stop()
+                self.playwright = None
+                
+            self.startup_complete = False
+            logger.info("PlaywrightManager shut down.")
+        except Exception as e:
+            logger.error(f"Error during browser shutdown: {str(e)}")
+
+
+# Process-wide pool, started and stopped from app.main
+browser_pool = PlaywrightManager(
+    shards=settings.BROWSER_SHARDS,
+    shard_concurrency=settings.BROWSER_SHARD_CONCURRENCY,
+)
+
+
+async def navigate_page(page, url: str, **goto_kwargs):
+    """
+    page.goto() that records how long the navigation took and, when the page's
+    context has a blocking profile, how many requests and bytes it skipped.
+    """
+    blocker = browser_pool.blocker_for(page)
+    if blocker:
+        blocker.take_counts()  # drop anything counted before this navigation
+    started = time.monotonic()
+    try:
+        return await page.goto(url, **goto_kwargs)
+    finally:
+        elapsed_ms = (time.monotonic() - started) * 1000
+        if blocker:
+            blocked, bytes_saved = blocker.take_counts()
+            browser_pool.navigation_stats.record(elapsed_ms, True, blocked, bytes_saved)
+            logger.info(
+                f"Navigation to {url} took {elapsed_ms:.0f}ms; blocked {blocked} requests "
+                f"(~{bytes_saved // 1024}KB saved)"
+            )
+        else:
+            browser_pool.navigation_stats.record(elapsed_ms, False)
+
+
+# Resolves once the DOM has been quiet for quietMs and the body text length
+# has stopped changing, or when budgetMs runs out
+READINESS_SCRIPT = """
+({ quietMs, budgetMs }) => new Promise(resolve => {
+    const started = performance.now();
+    let lastMutation = started;
+    let mutations = 0;
+    const observer = new MutationObserver(records => {
+        mutations += records.length;
+        lastMutation = performance.now();
+    });
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, characterData: true, attributes: false
+    });
+
+    const textLength = () => (document.body ? document.body.innerText.length : 0);
+    let lastLength = textLength();
+    let stableChecks = 0;
+
+    const check = () => {
+        const now = performance.now();
+        const length = textLength();
+        stableChecks = (length === lastLength && length > 0) ? stableChecks + 1 : 0;
+        lastLength = length;
+
+        const quiet = now - lastMutation >= quietMs;
+        const plateau = stableChecks >= 2;
+        const outOfTime = now - started >= budgetMs;
+        if ((quiet && plateau) || outOfTime) {
+            observer.disconnect();
+            resolve({
+                settled: quiet && plateau,
+                elapsedMs: Math.round(now - started),
+                textLength: length,
+                mutations: mutations
+            });
+        } else {
+            setTimeout(check, Math.max(50, Math.min(quietMs / 2, 250)));
+        }
+    };
+    check();
+})
+"""
+
+
+async def wait_for_page_ready(page, budget_ms: float = None, quiet_ms: float = None) -> dict:
+    """
+    Wait until the page stops changing: no DOM mutations for quiet_ms and a
+    plateau in body text length, capped at budget_ms. Replaces fixed sleeps
+    when BROWSER_FAST_READINESS is on. Never raises; returns the in-page
+    result (settled, elapsedMs, textLength, mutations).
+    """
+    budget_ms = settings.BROWSER_READY_BUDGET_MS if budget_ms is None else budget_ms
+    quiet_ms = settings.BROWSER_READY_QUIET_MS if quiet_ms is None else quiet_ms
+    if budget_ms <= 0:
+        return {"settled": False, "elapsedMs": 0, "textLength": 0, "mutations": 0}
+    try:
+        return await asyncio.wait_for(
+            page.evaluate(READINESS_SCRIPT, {"quietMs": quiet_ms, "budgetMs": budget_ms}),
+            timeout=budget_ms / 1000 + 1,
+        )
+    except Exception as e:
+        logger.debug(f"Readiness wait ended early: {e}")
+        return {"settled": False, "elapsedMs": budget_ms, "textLength": 0, "mutations": 0}
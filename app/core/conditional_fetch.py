@@ -0,0 +1,165 @@
+"""
+Change detection for already analysed documents.
+
+Each stored document is backed by a row in ``url_validators`` holding the
+``ETag``, ``Last-Modified`` and content hash of the version of its
+retrieved URL that was analysed. ``revalidate`` re-fetches the URL with
+``If-None-Match`` / ``If-Modified-Since``: a ``304``, or a ``200`` whose
+body hashes the same, means the document hasn't changed, and
+reanalysis can skip extraction, text analysis and the LLM summaries and
+just bump timestamps.
+
+Validators are taken from fetches the extraction pipeline already makes:
+``remember_fetch`` keeps the headers and hash of every page fetched over
+HTTP for a while, and ``record_analyzed`` persists them once the analysis
+of that URL has been saved. A record therefore always describes the
+analysed version, never a later fetch. Pages that only the browser could
+extract (``mark_browser_extracted``) get no record and are always
+re-extracted.
+
+Once text has been extracted, ``text_fingerprint`` catches what the HTTP
+validators can't (browser-only pages, markup or tracking changes around
+the same text): each document stores the fingerprint of the text it was
+analysed from, and text with the same fingerprint needs no new analysis.
+"""
+
+import hashlib
+import logging
+import time
+import unicodedata
+
+from app.core.config import settings
+from app.core.http_client import fetch
+from app.core.memory_cache import MemoryCache
+from app.crud.url_validator import url_validator_crud
+
+logger = logging.getLogger(__name__)
+
+# Fetches remembered until their analysis is saved: url -> [etag, last_modified, content_hash],
+# or BROWSER_EXTRACTED once the browser had to extract the url
+_recent_fetches = MemoryCache(
+    "recent_fetches",
+    ttl=settings.EXTRACT_CACHE_TTL,
+    max_bytes=settings.RECENT_FETCHES_MAX_BYTES,
+    max_entries=settings.RECENT_FETCHES_MAX_ENTRIES,
+)
+
+
+BROWSER_EXTRACTED = "browser"
+
+
+def content_hash(content):
+    """Hash of a response body, as stored in url_validators.content_hash."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def text_fingerprint(text):
+    """
+    Hash of extracted text ignoring case, Unicode form and whitespace, as
+    stored in documents.content_fingerprint.
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def remember_fetch(urls, headers, content):
+    """
+    Keep the validators of a response an HTTP extractor got its text from,
+    under each of urls (requested and final URL).
+    """
+    if not settings.CONDITIONAL_REFETCH_ENABLED:
+        return
+    entry = [headers.get("ETag"), headers.get("Last-Modified"), content_hash(content)]
+    for url in dict.fromkeys(urls):
+        _recent_fetches.put(url, entry)
+
+
+def mark_browser_extracted(urls):
+    """Note that the browser extracted urls, so their analysis must not keep validators."""
+    if not settings.CONDITIONAL_REFETCH_ENABLED:
+        return
+    for url in urls:
+        _recent_fetches.put(url, BROWSER_EXTRACTED)
+
+
+async def record_analyzed(url):
+    """
+    Persist the remembered validators of url once its analysis is saved.
+    If the browser extracted it, drop an older record so it can't vouch for
+    this analysis. With nothing remembered (the text came from the
+    extraction cache, possibly another worker's) the record is left as it
+    is. Never raises.
+    """
+    if not settings.CONDITIONAL_REFETCH_ENABLED:
+        return
+    entry = _recent_fetches.get(url)
+    if entry is None:
+        return
+    try:
+        if entry == BROWSER_EXTRACTED:
+            await url_validator_crud.remove(url_validator_crud.entry_id(url))
+            return
+        etag, last_modified, body_hash = entry
+        await url_validator_crud.upsert(url, etag, last_modified, body_hash)
+    except Exception as e:
+        logger.warning(f"Could not record validators for {url}: {e}")
+
+
+class Revalidation:
+    """Outcome of revalidate(): unchanged, plus why ("not_modified", "same_content", "changed", ...)."""
+
+    def __init__(self, unchanged, reason, status_code=None):
+        self.unchanged = unchanged
+        self.reason = reason
+        self.status_code = status_code
+
+    def __repr__(self):
+        return f"Revalidation(unchanged={self.unchanged}, reason={self.reason!r}, status={self.status_code})"
+
+
+async def revalidate(url):
+    """
+    Conditionally re-fetch url against its stored validators. Never raises;
+    anything but a confirmed 304 or identical body counts as changed.
+    """
+    if not settings.CONDITIONAL_REFETCH_ENABLED:
+        return Revalidation(False, "disabled")
+    try:
+        stored = await url_validator_crud.get_for_url(url)
+    except Exception as e:
+        logger.warning(f"Could not load validators for {url}: {e}")
+        return Revalidation(False, "no_validators")
+    if not stored:
+        return Revalidation(False, "no_validators")
+
+    headers = {}
+    if stored["etag"]:
+        headers["If-None-Match"] = stored["etag"]
+    if stored["last_modified"]:
+        headers["If-Modified-Since"] = stored["last_modified"]
+
+    started = time.monotonic()
+    try:
+        response, body = await fetch(url, headers=headers)
+    except Exception as e:
+        logger.info(f"Conditional re-fetch of {url} failed: {e}")
+        return Revalidation(False, "fetch_failed")
+    elapsed_ms = (time.monotonic() - started) * 1000
+
+    if response.status_code == 304:
+        result = Revalidation(True, "not_modified", 304)
+    elif response.status_code < 400 and stored["content_hash"] == content_hash(body):
+        result = Revalidation(True, "same_content", response.status_code)
+    else:
+        # Not remembered: the validators recorded must come from the fetch the analysis used
+        result = Revalidation(False, "changed", response.status_code)
+    logger.info(f"Revalidated {url} in {elapsed_ms:.0f}ms: {result}")
+
+    if result.unchanged:
+        try:
+            await url_validator_crud.mark_checked(
+                url, response.headers.get("ETag"), response.headers.get("Last-Modified")
+            )
+        except Exception as e:
+            logger.warning(f"Could not update validators for {url}: {e}")
+    return result
@@ -35,6 +35,115 @@ class Settings(BaseSettings):
     ZAI_API_KEY: Optional[str] = None
     ZAI_BASE_URL: str = "https://api.z.ai/api/coding/paas/v4"
     ZAI_MODEL: str = "GLM-4.5-Air"
+
+    # Shared browser pool (app.core.browser)
+    BROWSER_SHARDS: int = 1  # independent Chromium processes
+    BROWSER_SHARD_CONCURRENCY: int = 3  # concurrent leases per shard
+    BROWSER_SINGLE_PROCESS: bool = True  # pass --single-process to each shard
+    BROWSER_POOL_WARMUP: bool = True  # prefill the context pool during startup
+    BROWSER_LEASE_TIMEOUT: float = 30.0  # seconds to wait for a free slot
+    BROWSER_CONTEXT_POOL_SIZE: int = 3  # idle contexts kept ready per shard
+    BROWSER_CONTEXT_MAX_USES: int = 20  # recycle a context after this many leases
+    BROWSER_CONTEXT_RECYCLE_RSS_MB: int = 1500  # recycle instead of reuse above this; 0 disables
+    DISCOVERY_BLOCK_RESOURCES: bool = True  # abort images/fonts/media/trackers on discovery pages
+    EXTRACT_BLOCK_RESOURCES: bool = False  # same profile for full-text extraction pages
+    BROWSER_WATCHDOG_INTERVAL: float = 15.0  # seconds between health checks
+    BROWSER_SHARD_MAX_RSS_MB: int = 2000  # drain and relaunch a shard above this; 0 disables
+    BROWSER_DRAIN_TIMEOUT: float = 60.0  # max wait for in-flight leases before a recycle
+    BROWSER_MAX_LEASE_SECONDS: float = 300.0  # reclaim leases held longer; 0 disables
+    BROWSER_FAST_READINESS: bool = False  # mutation-quiescence waits instead of fixed sleeps
+    BROWSER_READY_BUDGET_MS: int = 10000  # hard per-page latency budget in fast mode
+    BROWSER_READY_QUIET_MS: int = 500  # DOM quiet period that counts as settled
+
+    # Shared async HTTP client (app.core.http_client)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100  # open connections across all hosts
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 40  # idle connections kept for reuse
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept
+    HTTP_CLIENT_PER_HOST: int = 8  # requests in flight per host
+    HTTP_CLIENT_HTTP2: bool = False  # negotiate HTTP/2 (needs the h2 package)
+    HTTP_CLIENT_TIMEOUT: float = 15.0  # default read/write/pool timeout in seconds
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0  # seconds to establish a connection
+    HTTP_CLIENT_CONNECT_RETRIES: int = 1  # retries of failed connection attempts only
+    HTTP_CLIENT_MAX_BODY_BYTES: int = 20_000_000  # fetch() stops reading a body after this
+    HTTP_CLIENT_DNS_TTL: int = 300  # seconds a resolved host is reused
+    HTTP_CLIENT_DNS_MAX_ENTRIES: int = 2048  # DNS cache is reset past this many hosts
+
+    # HTTP-first discovery tier (app.core.http_discovery)
+    HTTP_DISCOVERY_ENABLED: bool = True  # try a plain HTTP fetch before the browser
+    HTTP_DISCOVERY_TIMEOUT: float = 8.0  # seconds for the landing page fetch
+    HTTP_DISCOVERY_MAX_BYTES: int = 2_000_000  # stop reading the body after this
+    HTTP_DISCOVERY_MIN_TEXT_CHARS: int = 400  # less visible text than this = JS-rendered
+    HTTP_DISCOVERY_TOS_MIN_SCORE: int = 100  # score_tos_link needed to skip the browser
+    HTTP_DISCOVERY_PP_MIN_SCORE: int = 100  # score_privacy_link needed to skip the browser
+    HTTP_PROBE_ENABLED: bool = True  # probe well-known legal paths alongside the fetch
+    HTTP_PROBE_PER_HOST: int = 4  # concurrent probes per host
+    HTTP_PROBE_TIMEOUT: float = 5.0  # seconds per probe
+    HTTP_PROBE_MAX_BYTES: int = 65536  # bytes read for the content check
+    SITEMAP_DISCOVERY_ENABLED: bool = True  # look for legal pages in robots.txt/sitemap.xml (app.core.sitemap_discovery)
+    SITEMAP_TIMEOUT: float = 6.0  # seconds per robots.txt/sitemap request
+    SITEMAP_TOTAL_TIMEOUT: float = 8.0  # seconds for the whole stage (robots.txt and every file), within the discovery deadline
+    SITEMAP_LATE_WAIT: float = 1.5  # seconds the sitemap stage may still take once the other HTTP stages have missed
+    SITEMAP_MAX_BYTES: int = 5_000_000  # decompressed sitemap bytes read per discovery
+    SITEMAP_MAX_URLS: int = 50_000  # sitemap entries read per discovery
+    SITEMAP_MAX_FILES: int = 4  # sitemap files (including indexes) fetched per discovery
+    SITEMAP_MAX_CANDIDATES: int = 50  # matching URLs kept for scoring
+    PAGE_VERIFY_HTTP_ENABLED: bool = True  # verify candidate pages over HTTP; browser only for JS shells (app.core.page_verification)
+    PAGE_VERIFY_CONCURRENCY: int = 8  # candidate pages fetched at once
+    PAGE_VERIFY_CACHE_TTL: int = 6 * 3600  # seconds a verdict is reused per URL
+    PAGE_VERIFY_CACHE_MAX_ENTRIES: int = 5000  # least recently used verdicts are evicted past this
+    PAGE_VERIFY_CACHE_MAX_BYTES: int = 5_000_000  # bytes of cached verdicts kept in memory
+    PAGE_VERIFY_TOS_TOP_K: int = 3  # top-scored ToS links checked before one is accepted
+    PAGE_VERIFY_TOS_TIMEOUT: float = 1.0  # seconds that check may take; the top link wins after it
+    STORE_FAST_PATH_ENABLED: bool = True  # read App Store / Play Store listings over HTTP (app.core.store_pages)
+    STORE_INFO_CACHE_TTL: int = 24 * 3600  # seconds a listing's details are reused per app ID
+    STORE_INFO_NEGATIVE_TTL: int = 3600  # seconds a listing with nothing usable is remembered
+    STORE_INFO_CACHE_MAX_ENTRIES: int = 2000  # least recently used listings are evicted past this
+    STORE_INFO_CACHE_MAX_BYTES: int = 2_000_000  # bytes of cached listing details kept in memory
+
+    # In-process result caches (app.core.memory_cache)
+    MEMORY_CACHE_COMPRESS_MIN_BYTES: int = 4096  # zlib-compress stored values from this size; 0 disables
+    EXTRACT_CACHE_TTL: int = 3600  # seconds an extraction result is reused
+    EXTRACT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # total size of cached extraction results
+    EXTRACT_CACHE_MAX_ENTRIES: int = 500  # least recently used results are evicted past this
+    SUMMARY_CACHE_TTL: int = 24 * 3600  # seconds an LLM summary of identical text is reused; 0 disables
+    SUMMARY_CACHE_MAX_BYTES: int = 8 * 1024 * 1024  # total size of cached summaries
+
+    # Conditional re-fetch of analysed documents (app.core.conditional_fetch)
+    CONDITIONAL_REFETCH_ENABLED: bool = True  # skip reanalysis when the retrieved URL answers 304 or the same content
+    RECENT_FETCHES_MAX_ENTRIES: int = 2000  # fetches whose validators are kept until their analysis is saved
+    RECENT_FETCHES_MAX_BYTES: int = 1_000_000  # bytes of those validators kept in memory
+
+    # Cross-worker cache tier in an UNLOGGED Postgres table (app.core.shared_cache)
+    SHARED_CACHE_ENABLED: bool = True  # back the extract and summary caches with Postgres
+    SHARED_CACHE_READ_BATCH_MS: int = 5  # lookups within this window share one SELECT
+    SHARED_CACHE_READ_TIMEOUT: float = 0.5  # seconds before a shared lookup counts as a miss
+    SHARED_CACHE_FLUSH_INTERVAL: float = 1.0  # seconds between write-behind flushes
+    SHARED_CACHE_FLUSH_BATCH: int = 200  # flush early once this many writes are queued
+    SHARED_CACHE_SWEEP_INTERVAL: int = 300  # seconds between expiry/size sweeps
+    SHARED_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # table is trimmed to this many value bytes
+    SHARED_CACHE_MAX_VALUE_BYTES: int = 2 * 1024 * 1024  # larger values stay process-local
+
+    # Per-domain discovery cache (app.core.discovery_cache)
+    DISCOVERY_CACHE_ENABLED: bool = True  # answer find_tos/find_privacy_policy from Postgres
+    DISCOVERY_CACHE_TTL: int = 7 * 24 * 3600  # seconds a found URL is trusted
+    DISCOVERY_CACHE_NEGATIVE_TTL: int = 12 * 3600  # seconds a "not found" is trusted
+    DISCOVERY_CACHE_MIN_CONFIDENCE: float = 0.5  # results below this are not cached
+
+    # Search-engine fallback cache (app.core.search_cache)
+    SEARCH_CACHE_ENABLED: bool = True  # cache results and share in-flight searches
+    SEARCH_CACHE_TTL: int = 6 * 3600  # seconds a found result is reused
+    SEARCH_CACHE_NEGATIVE_TTL: int = 900  # seconds an empty result is reused; 0 disables
+    SEARCH_CACHE_MAX_ENTRIES: int = 2000  # least recently used entries are evicted past this
+    SEARCH_CACHE_MAX_BYTES: int = 2_000_000  # bytes of cached results kept in memory
+    SEARCH_RACE_ENABLED: bool = True  # run the ToS search engines concurrently on extra pages of the request's browser context
+    SEARCH_RACE_DEADLINE: float = 20.0  # seconds before the race settles for the best result so far
+
+    # Discovery planner (app.core.discovery_planner)
+    DISCOVERY_DEADLINE: float = 60.0  # overall budget when the caller sets none
+    DISCOVERY_HISTORY_ENABLED: bool = True  # learn strategy order per domain (app.core.discovery_history)
+    DISCOVERY_HISTORY_SKIP_WINDOW: int = 24 * 3600  # seconds a failing strategy stays deferred
+    DISCOVERY_HISTORY_MIN_ATTEMPTS: int = 2  # misses needed before a strategy is deferred
+
     # BACKEND_CORS_ORIGINS is a comma-separated list of origins
     BACKEND_CORS_ORIGINS: Union[List[str], str] = []
 
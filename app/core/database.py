@@ -4,8 +4,11 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from sqlalchemy import (
+    Boolean,
     Column,
+    Float,
     Integer,
+    LargeBinary,
     MetaData,
     String,
     Table,
@@ -85,6 +88,7 @@ documents = Table(
     Column("hundred_word_summary", Text),
     Column("word_frequencies", JSONB),
     Column("text_mining_metrics", JSONB),
+    Column("content_fingerprint", String(length=64)),  # text_fingerprint() of the analysed text
     Column(
         "created_at",
         TIMESTAMP(timezone=True),
@@ -141,6 +145,72 @@ stats = Table(
     ),
 )
 
+discovery_cache = Table(
+    "discovery_cache",
+    metadata,
+    Column("id", String(length=255), primary_key=True),  # "<registered domain>:<document type>"
+    Column("domain", String(length=255), nullable=False, index=True),
+    Column("document_type", String(length=16), nullable=False),
+    Column("url", Text),  # NULL for a cached "not found"
+    Column("method_used", String(length=64)),
+    Column("confidence", Float, nullable=False, server_default=text("0")),
+    Column("found", Boolean, nullable=False),
+    Column(
+        "discovered_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    Column("expires_at", TIMESTAMP(timezone=True), nullable=False),
+)
+
+discovery_outcomes = Table(
+    "discovery_outcomes",
+    metadata,
+    Column("id", String(length=320), primary_key=True),  # "<domain>:<document type>:<strategy>"
+    Column("domain", String(length=255), nullable=False, index=True),
+    Column("document_type", String(length=16), nullable=False),
+    Column("strategy", String(length=64), nullable=False),
+    Column("attempts", Integer, nullable=False, server_default=text("0")),
+    Column("hits", Integer, nullable=False, server_default=text("0")),
+    Column("typical_ms", Float),
+    Column("last_hit_at", TIMESTAMP(timezone=True)),
+    Column("last_miss_at", TIMESTAMP(timezone=True)),
+    Column(
+        "updated_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        server_onupdate=func.now(),
+    ),
+)
+
+# HTTP validators of the last analysed version of each retrieved URL (app.core.conditional_fetch)
+url_validators = Table(
+    "url_validators",
+    metadata,
+    Column("id", String(length=64), primary_key=True),  # sha256 of the URL
+    Column("url", Text, nullable=False),
+    Column("etag", Text),
+    Column("last_modified", Text),
+    Column("content_hash", String(length=64)),
+    Column("checked_at", TIMESTAMP(timezone=True), nullable=False, server_default=func.now()),
+    Column("changed_at", TIMESTAMP(timezone=True), nullable=False, server_default=func.now()),
+)
+
+# Second tier behind the in-process MemoryCaches (app.core.shared_cache). UNLOGGED:
+# no WAL, so writes are cheap; the table is emptied after a crash, which is fine for a cache.
+shared_cache = Table(
+    "shared_cache",
+    metadata,
+    Column("id", String(length=512), primary_key=True),  # "<cache name>:<key>"
+    Column("value", LargeBinary, nullable=False),  # MemoryCache blob: JSON, maybe zlib-compressed
+    Column("compressed", Boolean, nullable=False),
+    Column("size", Integer, nullable=False),
+    Column("expires_at", TIMESTAMP(timezone=True), nullable=False, index=True),
+    prefixes=["UNLOGGED"],
+)
+
 
 async def ensure_tables_exist() -> None:
     """
@@ -148,6 +218,10 @@ async def ensure_tables_exist() -> None:
     """
     async with async_engine.begin() as conn:
         await conn.run_sync(metadata.create_all)
+        # Columns added after the table was first created
+        await conn.execute(
+            text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_fingerprint VARCHAR(64)")
+        )
 
 
 async def get_document_by_url(
@@ -0,0 +1,173 @@
+"""
+Per-domain cache of ToS / privacy discovery results.
+
+Legal URLs rarely move, so once ``find_tos`` or ``find_privacy_policy`` has
+placed a document for a site the answer is kept in Postgres, keyed by the
+registered domain (``docs.example.co.uk`` and ``www.example.co.uk`` share
+``example.co.uk``, while ``foo.github.io`` and ``bar.github.io`` don't) and
+document type. Definitive "not found" outcomes are
+cached too, for a shorter time, so hopeless sites don't relaunch the whole
+browser and search-engine pipeline on every request.
+
+The cache never fails a request: database errors are logged and treated as
+a miss.
+"""
+
+import logging
+from urllib.parse import urlparse
+
+import tldextract
+
+from app.core.config import settings
+from app.crud.discovery_cache import discovery_cache_crud
+
+logger = logging.getLogger(__name__)
+
+# Bundled public-suffix snapshot only; never fetch the list at runtime. Private
+# suffixes (github.io, vercel.app, myshopify.com, ...) count, so each tenant of
+# a hosting platform is its own domain
+_extract_domain = tldextract.TLDExtract(suffix_list_urls=(), include_psl_private_domains=True)
+
+# Store listings share their host across every app, so the registered domain
+# says nothing about the app; they are left to the store-specific code
+STORE_HOSTS = ("apps.apple.com", "itunes.apple.com", "play.google.com")
+
+# Failure outcomes that mean the pipeline ran to completion and found nothing.
+# Errors and timeouts are not cached.
+NEGATIVE_CACHE_METHODS = {"all_methods_failed", "all_search_failed", "navigation_failure"}
+
+
+def registered_domain(url):
+    """
+    Registered domain of url (eTLD+1), lowercased, or None for URLs that
+    can't be keyed (invalid, IP addresses, store listings).
+    """
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return None
+    if not host or host in STORE_HOSTS:
+        return None
+    extracted = _extract_domain(host)
+    if not extracted.domain or not extracted.suffix:
+        return None
+    return f"{extracted.domain}.{extracted.suffix}"
+
+
+def method_confidence(method_used):
+    """Rough confidence (0-1) in a discovery result, judged by how it was found."""
+    method = (method_used or "").lower()
+    if "unverified" in method or "error" in method:
+        return 0.3
+    if "search" in method:
+        return 0.6
+    if method in ("path_probe", "http_link_scan", "sitemap", "user_customer_terms", "user_customer_privacy",
+                  "user_customer_supreme_priority", "footer_title_match", "multiple_confirmation"):
+        return 0.9
+    return 0.75
+
+
+class DiscoveryCacheStats:
+    """Hit/miss counters for /debug/status."""
+
+    def __init__(self):
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def snapshot(self):
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "enabled": settings.DISCOVERY_CACHE_ENABLED,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 3) if lookups else None,
+        }
+
+
+discovery_cache_stats = DiscoveryCacheStats()
+
+
+async def lookup_discovery(url, document_type):
+    """
+    Cached discovery result for url's domain, or None on a miss.
+
+    A hit is a dict with url (None for a cached "not found"), method_used,
+    confidence and discovered_at.
+    """
+    if not settings.DISCOVERY_CACHE_ENABLED:
+        return None
+    domain = registered_domain(url)
+    if not domain:
+        return None
+
+    try:
+        entry = await discovery_cache_crud.get_fresh(domain, document_type)
+    except Exception as e:
+        logger.warning(f"Discovery cache lookup failed for {domain}: {e}")
+        discovery_cache_stats.errors += 1
+        return None
+
+    if not entry:
+        discovery_cache_stats.misses += 1
+        return None
+    if entry["found"]:
+        discovery_cache_stats.hits += 1
+    else:
+        discovery_cache_stats.negative_hits += 1
+    logger.info(
+        f"Discovery cache hit for {domain} ({document_type}): "
+        f"{entry['url'] or 'not found'} via {entry['method_used']}"
+    )
+    return entry
+
+
+async def store_discovery(url, document_type, found_url, method_used):
+    """
+    Remember a discovery outcome for url's domain. Successful results are
+    kept for DISCOVERY_CACHE_TTL if they are confident enough; definitive
+    failures for DISCOVERY_CACHE_NEGATIVE_TTL; anything else is skipped.
+    """
+    if not settings.DISCOVERY_CACHE_ENABLED:
+        return
+    domain = registered_domain(url)
+    if not domain:
+        return
+
+    if found_url:
+        confidence = method_confidence(method_used)
+        if confidence < settings.DISCOVERY_CACHE_MIN_CONFIDENCE:
+            return
+        ttl = settings.DISCOVERY_CACHE_TTL
+    elif method_used in NEGATIVE_CACHE_METHODS:
+        confidence = 0.0
+        ttl = settings.DISCOVERY_CACHE_NEGATIVE_TTL
+    else:
+        return
+
+    try:
+        await discovery_cache_crud.upsert(domain, document_type, found_url, method_used, confidence, ttl)
+        discovery_cache_stats.writes += 1
+    except Exception as e:
+        logger.warning(f"Could not cache discovery result for {domain}: {e}")
+        discovery_cache_stats.errors += 1
+
+
+async def invalidate_discovery(url_or_domain, document_type=None):
+    """
+    Drop cached results for a domain (given as a URL or a bare host).
+    Returns (domain, number of entries removed).
+    """
+    target = url_or_domain if "://" in url_or_domain else f"https://{url_or_domain}"
+    domain = registered_domain(target)
+    if not domain:
+        return None, 0
+
+    removed = await discovery_cache_crud.invalidate(domain, document_type)
+    logger.info(f"Invalidated {removed} discovery cache entries for {domain}")
+    return domain, removed
@@ -0,0 +1,111 @@
+"""
+Per-domain memory of which discovery strategies work.
+
+Every strategy attempt made for a domain is recorded in Postgres
+(``discovery_outcomes``): attempts, hits, typical latency and when it last
+hit or missed. The next discovery for that domain uses the record to:
+
+* try strategies that found the document for this domain before first;
+* push strategies that keep failing for it (no hit ever, a miss within
+  DISCOVERY_HISTORY_SKIP_WINDOW) to the end, so they only run when
+  everything else missed;
+* take shortcuts around whole tiers, e.g. skip the HTTP tier for a
+  JS-rendered site, or search straight away for a site whose landing page
+  never loads.
+
+Without a record (or with the history disabled or unreachable) the full
+default chain runs unchanged.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.discovery_cache import registered_domain
+from app.crud.discovery_outcome import discovery_outcome_crud
+
+logger = logging.getLogger(__name__)
+
+
+class DomainHistory:
+    """Outcome records for one domain and document type, plus outcomes still to be saved."""
+
+    def __init__(self, domain, doc_type, records=None):
+        self.domain = domain
+        self.doc_type = doc_type
+        self.records = {record["strategy"]: record for record in (records or [])}
+        self.pending = []
+
+    def hits(self, name):
+        record = self.records.get(name)
+        return record["hits"] if record else 0
+
+    def should_defer(self, name):
+        """True if name has never worked for this domain and failed recently, repeatedly."""
+        record = self.records.get(name)
+        if not record or record["hits"] > 0:
+            return False
+        if record["attempts"] < settings.DISCOVERY_HISTORY_MIN_ATTEMPTS or not record["last_miss_at"]:
+            return False
+        window = timedelta(seconds=settings.DISCOVERY_HISTORY_SKIP_WINDOW)
+        return record["last_miss_at"] > datetime.now(timezone.utc) - window
+
+    def order(self, names):
+        """
+        Learned order for the given strategy names (in default priority
+        order): past hits first, most reliable first; then untried or mixed
+        strategies in default order; deferred strategies last.
+        """
+        preferred = [name for name in names if self.hits(name) > 0]
+        preferred.sort(key=lambda name: -self.hits(name) / self.records[name]["attempts"])
+        deferred = [name for name in names if self.should_defer(name)]
+        rest = [name for name in names if name not in preferred and name not in deferred]
+        return preferred + rest + deferred
+
+    def record(self, name, elapsed_ms, hit):
+        """Queue one outcome; elapsed_ms is None for attempts that were cut short."""
+        if self.domain:
+            self.pending.append((name, elapsed_ms, hit))
+
+    async def save(self):
+        """Write queued outcomes. Never raises."""
+        if not self.pending or not settings.DISCOVERY_HISTORY_ENABLED:
+            return
+        outcomes, self.pending = self.pending, []
+        try:
+            await discovery_outcome_crud.record_many(self.domain, self.doc_type, outcomes)
+        except Exception as e:
+            logger.warning(f"Could not save discovery outcomes for {self.domain}: {e}")
+
+    def describe(self, names):
+        """Learned ordering of names, deferred strategies and per-strategy records."""
+        return {
+            "order": self.order(names),
+            "deferred": [name for name in self.records if self.should_defer(name)],
+            "strategies": {
+                name: {
+                    "attempts": record["attempts"],
+                    "hits": record["hits"],
+                    "typical_ms": round(record["typical_ms"]) if record["typical_ms"] is not None else None,
+                    "last_hit_at": record["last_hit_at"].isoformat() if record["last_hit_at"] else None,
+                    "last_miss_at": record["last_miss_at"].isoformat() if record["last_miss_at"] else None,
+                }
+                for name, record in self.records.items()
+            },
+        }
+
+
+async def load_domain_history(url, doc_type):
+    """History for url's registered domain; empty (default behaviour) when unavailable."""
+    domain = registered_domain(url)
+    if not domain or not settings.DISCOVERY_HISTORY_ENABLED:
+        return DomainHistory(None, doc_type)
+    try:
+        records = await discovery_outcome_crud.get_for_domain(domain, doc_type)
+    except Exception as e:
+        logger.warning(f"Could not load discovery history for {domain}: {e}")
+        records = []
+    history = DomainHistory(domain, doc_type, records)
+    if records:
+        logger.info(f"Discovery history for {domain} ({doc_type}): {len(records)} strategies on record")
+    return history
@@ -0,0 +1,283 @@
+"""
+Deadline-aware scheduling of discovery strategies.
+
+The ToS pipeline used to run its strategies as a fixed chain, and callers
+such as ``extract_text`` wrapped the whole chain in ``asyncio.wait_for``, so
+a slow early step starved the later ones and a timeout threw away whatever
+had been found. ``DiscoveryPlanner`` runs the same strategies against an
+absolute deadline instead:
+
+* strategies that only read the link snapshot, or bring their own pooled
+  page, run concurrently; strategies that drive the shared page run one at
+  a time;
+* each page-bound strategy gets a time slice sized from its recorded
+  latency and hit rate (``strategy_stats``), and is cancelled when the
+  slice runs out;
+* results are accepted in priority order, so a fast low-priority hit never
+  beats a higher-priority strategy that is still running;
+* when the deadline passes, the best result found so far is returned.
+
+Callers set the deadline for everything they await with
+``discovery_budget(seconds)``; without one, DISCOVERY_DEADLINE applies.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() deadline for the discovery running in this context
+_discovery_deadline = contextvars.ContextVar("discovery_deadline", default=None)
+
+# Smallest slice worth starting a page-bound strategy with
+MIN_SLICE_MS = 750
+
+# Slices are this multiple of a strategy's typical latency
+SLICE_SLACK = 2.0
+
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.2
+
+# How often the scheduler re-checks whether an off-page strategy should start
+SCHEDULER_TICK = 0.25
+
+
+@contextmanager
+def discovery_budget(seconds: float):
+    """Give all discovery awaited inside the block an overall deadline of `seconds` from now."""
+    token = _discovery_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _discovery_deadline.reset(token)
+
+
+def current_deadline() -> float:
+    """The deadline set by discovery_budget, or DISCOVERY_DEADLINE from now."""
+    deadline = _discovery_deadline.get()
+    if deadline is None:
+        deadline = time.monotonic() + settings.DISCOVERY_DEADLINE
+    return deadline
+
+
+class StrategyStats:
+    """Attempts, hits, timeouts and typical latency per (document type, strategy)."""
+
+    def __init__(self):
+        self.records = {}
+
+    def _record_for(self, doc_type: str, name: str) -> dict:
+        return self.records.setdefault(
+            (doc_type, name),
+            {"attempts": 0, "hits": 0, "timeouts": 0, "ewma_ms": None},
+        )
+
+    def record(self, doc_type: str, name: str, elapsed_ms: float, hit: bool, timed_out: bool = False):
+        record = self._record_for(doc_type, name)
+        record["attempts"] += 1
+        if hit:
+            record["hits"] += 1
+        if timed_out:
+            record["timeouts"] += 1
+        else:
+            # A timeout says the strategy is at least this slow, not how slow it is
+            if record["ewma_ms"] is None:
+                record["ewma_ms"] = elapsed_ms
+            else:
+                record["ewma_ms"] += LATENCY_EWMA_ALPHA * (elapsed_ms - record["ewma_ms"])
+
+    def expected_ms(self, doc_type: str, name: str, default_ms: float) -> float:
+        record = self.records.get((doc_type, name))
+        if not record or record["ewma_ms"] is None:
+            return default_ms
+        return record["ewma_ms"]
+
+    def hit_rate(self, doc_type: str, name: str) -> float:
+        """Observed hit rate, optimistic (0.5) until a strategy has a few attempts."""
+        record = self.records.get((doc_type, name))
+        if not record or record["attempts"] < 5:
+            return 0.5
+        return record["hits"] / record["attempts"]
+
+    def snapshot(self) -> dict:
+        result = {}
+        for (doc_type, name), record in sorted(self.records.items()):
+            result.setdefault(doc_type, {})[name] = {
+                "attempts": record["attempts"],
+                "hits": record["hits"],
+                "timeouts": record["timeouts"],
+                "hit_rate": round(record["hits"] / record["attempts"], 3) if record["attempts"] else None,
+                "typical_ms": round(record["ewma_ms"]) if record["ewma_ms"] is not None else None,
+            }
+        return result
+
+
+strategy_stats = StrategyStats()
+
+
+class Strategy:
+    """
+    One discovery strategy. `run` is an async callable returning a URL or
+    None. `uses_page` strategies drive the shared page and never overlap;
+    the others may run alongside them. `default_ms` seeds the latency
+    estimate until real timings have been recorded.
+    """
+
+    def __init__(self, name: str, run, uses_page: bool = True, default_ms: float = 3000):
+        self.name = name
+        self.run = run
+        self.uses_page = uses_page
+        self.default_ms = default_ms
+
+
+class DiscoveryPlanner:
+    """
+    Run strategies (given in priority order) until one is accepted or the
+    deadline passes. Strategies can also `offer` a fallback candidate (for
+    instance an unverified link) which is used if nothing better turns up.
+
+    With a DomainHistory the strategies are reordered from what worked for
+    the domain before, and every attempt is queued on it for saving.
+    """
+
+    def __init__(self, doc_type: str, strategies, deadline: float | None = None, history=None):
+        self.doc_type = doc_type
+        self.strategies = list(strategies)
+        self.history = history
+        if history is not None:
+            by_name = {strategy.name: strategy for strategy in self.strategies}
+            self.strategies = [by_name[name] for name in history.order(list(by_name))]
+        self.deadline = deadline if deadline is not None else current_deadline()
+        self.results = {}  # name -> URL or None once a strategy has finished
+        self.fallback = None  # (url, source) offered by a strategy
+        self.timed_out = False
+
+    def offer(self, url, source):
+        """Remember a lower-confidence candidate; the first one offered is kept."""
+        if url and not self.fallback:
+            self.fallback = (url, source)
+
+    def slice_ms(self, strategy: Strategy, remaining_ms: float) -> float:
+        """Time allowed for one strategy: its typical latency with slack, scaled by hit rate."""
+        expected = strategy_stats.expected_ms(self.doc_type, strategy.name, strategy.default_ms)
+        hit_rate = strategy_stats.hit_rate(self.doc_type, strategy.name)
+        return min(remaining_ms, max(MIN_SLICE_MS, expected * SLICE_SLACK * (0.5 + hit_rate)))
+
+    def _should_start_off_page(self, strategy: Strategy, remaining_ms: float, pending_page) -> bool:
+        """
+        Start an off-page strategy now if it is cheap, if no page-bound
+        strategy ahead of it is still pending, or if waiting for those would
+        leave it too little time.
+        """
+        expected = strategy_stats.expected_ms(self.doc_type, strategy.name, strategy.default_ms)
+        if expected <= MIN_SLICE_MS:
+            return True
+        position = self.strategies.index(strategy)
+        ahead = [s for s in pending_page if self.strategies.index(s) < position]
+        if not ahead:
+            return True
+        ahead_ms = sum(strategy_stats.expected_ms(self.doc_type, s.name, s.default_ms) for s in ahead)
+        return remaining_ms - ahead_ms < expected * SLICE_SLACK
+
+    def _accepted(self):
+        """The highest-priority result, once every strategy ahead of it has finished."""
+        for strategy in self.strategies:
+            if strategy.name not in self.results:
+                return None
+            if self.results[strategy.name]:
+                return self.results[strategy.name], strategy.name
+        return None
+
+    def _best_available(self):
+        for strategy in self.strategies:
+            if self.results.get(strategy.name):
+                return self.results[strategy.name], strategy.name
+        return None
+
+    async def _timed(self, strategy: Strategy, timeout_s: float):
+        started = time.monotonic()
+        url = None
+        timed_out = False
+        try:
+            url = await asyncio.wait_for(strategy.run(), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            timed_out = True
+            logger.info(f"Strategy {strategy.name} ran out of its {timeout_s:.1f}s slice")
+        except Exception as e:
+            logger.warning(f"Strategy {strategy.name} failed: {e}")
+        elapsed_ms = (time.monotonic() - started) * 1000
+        strategy_stats.record(self.doc_type, strategy.name, elapsed_ms, bool(url), timed_out)
+        if self.history is not None:
+            self.history.record(strategy.name, None if timed_out else elapsed_ms, bool(url))
+        return url
+
+    async def run(self):
+        """
+        Returns (url, strategy_name). The name is None when nothing was
+        found; the fallback candidate, if any, is left in `fallback`.
+        """
+        page_queue = [s for s in self.strategies if s.uses_page]
+        off_page = [s for s in self.strategies if not s.uses_page]
+        running = {}  # task -> strategy
+        page_task = None
+
+        try:
+            while True:
+                accepted = self._accepted()
+                if accepted:
+                    return accepted
+                if len(self.results) == len(self.strategies):
+                    return None, None
+
+                remaining_ms = (self.deadline - time.monotonic()) * 1000
+                if remaining_ms <= 0:
+                    self.timed_out = True
+                    best = self._best_available()
+                    logger.warning(
+                        f"Discovery deadline reached for {self.doc_type}; "
+                        f"returning {'best result so far' if best else 'no result'}"
+                    )
+                    return best or (None, None)
+
+                # One page-bound strategy at a time, each within its slice
+                while page_task is None and page_queue:
+                    strategy = page_queue.pop(0)
+                    slice_ms = self.slice_ms(strategy, remaining_ms)
+                    if slice_ms < MIN_SLICE_MS:
+                        logger.info(f"Skipping {strategy.name}: only {remaining_ms:.0f}ms left")
+                        self.results[strategy.name] = None
+                        continue
+                    page_task = asyncio.create_task(self._timed(strategy, slice_ms / 1000))
+                    running[page_task] = strategy
+
+                pending_page = page_queue + ([running[page_task]] if page_task else [])
+                for strategy in list(off_page):
+                    if self._should_start_off_page(strategy, remaining_ms, pending_page):
+                        off_page.remove(strategy)
+                        task = asyncio.create_task(self._timed(strategy, remaining_ms / 1000))
+                        running[task] = strategy
+
+                if not running:
+                    if off_page:
+                        # Only off-page strategies left that aren't due yet
+                        await asyncio.sleep(min(SCHEDULER_TICK, remaining_ms / 1000))
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=min(SCHEDULER_TICK if off_page else remaining_ms / 1000, remaining_ms / 1000),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    strategy = running.pop(task)
+                    self.results[strategy.name] = task.result()
+                    if task is page_task:
+                        page_task = None
+        finally:
+            for task in running:
+                task.cancel()
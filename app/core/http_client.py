@@ -0,0 +1,315 @@
+"""
+Shared async HTTP client.
+
+Every plain-HTTP fetch in the service (discovery, sitemaps, page
+verification, store listings, text extraction, favicon checks) goes through
+the one ``httpx.AsyncClient`` returned by ``get_http_client``, so the event
+loop never blocks on network I/O and connections are reused across
+requests. The client adds to httpx's own pooling:
+
+* a per-host cap on in-flight requests (HTTP_CLIENT_PER_HOST), held until
+  the response body is closed, so one slow site can't take the whole pool;
+* a DNS cache (HTTP_CLIENT_DNS_TTL), as the discovery tiers hit the same
+  handful of hosts many times within a request;
+* HTTP/2 when HTTP_CLIENT_HTTP2 is set and the ``h2`` package is installed;
+* one timeout and connect-retry policy (HTTP_CLIENT_TIMEOUT,
+  HTTP_CLIENT_CONNECT_TIMEOUT, HTTP_CLIENT_CONNECT_RETRIES). Only failed
+  connection attempts are retried, so no request is ever sent twice.
+
+``fetch`` streams a body up to a byte limit for callers that want the whole
+(bounded) response at once.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from contextlib import contextmanager
+
+import httpcore
+import httpx
+
+from app.core.browser import CONSISTENT_USER_AGENT
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": CONSISTENT_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+try:
+    import h2  # noqa: F401  (enables httpx's HTTP/2 support)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _is_ip_address(host):
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class CachingResolverBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that resolves host names once per
+    HTTP_CLIENT_DNS_TTL and connects to the cached addresses. TLS still
+    verifies and sends SNI for the host name, as httpcore passes it to
+    start_tls separately.
+    """
+
+    def __init__(self):
+        self._backend = httpcore.AnyIOBackend()
+        self._addresses = {}  # (host, port) -> (expires_at, [ip, ...])
+        self.lookups = 0
+        self.hits = 0
+
+    async def _resolve(self, host, port):
+        key = (host, port)
+        entry = self._addresses.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        self.lookups += 1
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if len(self._addresses) >= settings.HTTP_CLIENT_DNS_MAX_ENTRIES:
+            self._addresses.clear()
+        self._addresses[key] = (time.monotonic() + settings.HTTP_CLIENT_DNS_TTL, addresses)
+        return addresses
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        if _is_ip_address(host):
+            return await self._backend.connect_tcp(host, port, timeout, local_address, socket_options)
+        try:
+            addresses = await asyncio.wait_for(self._resolve(host, port), timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {e}") from e
+
+        error = httpcore.ConnectError(f"No addresses for {host}")
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        # Every cached address failed: the record may be stale
+        self._addresses.pop((host, port), None)
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds):
+        await self._backend.sleep(seconds)
+
+
+# httpcore errors as the httpx errors callers catch, most specific first
+HTTPCORE_ERRORS = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextmanager
+def _httpx_errors():
+    try:
+        yield
+    except Exception as e:
+        for core_error, httpx_error in HTTPCORE_ERRORS:
+            if isinstance(e, core_error):
+                raise httpx_error(str(e)) from e
+        raise
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body from the pool that frees its host slot when closed."""
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        with _httpx_errors():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self):
+        try:
+            with _httpx_errors():
+                await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport over an httpcore connection pool using
+    CachingResolverBackend, with at most HTTP_CLIENT_PER_HOST requests in
+    flight per host. It builds its one pool itself, as httpx's own transport
+    takes no network backend.
+    """
+
+    def __init__(self, http2, limits, retries):
+        self.http2 = http2
+        self.resolver = CachingResolverBackend()
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http2=http2,
+            retries=retries,
+            network_backend=self.resolver,
+        )
+        self._hosts = {}  # host -> [semaphore, users]
+
+    async def _enter_host(self, host):
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = [asyncio.Semaphore(settings.HTTP_CLIENT_PER_HOST), 0]
+        entry[1] += 1
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            self._leave_host(host, acquired=False)
+            raise
+
+    def _leave_host(self, host, acquired=True):
+        entry = self._hosts[host]
+        if acquired:
+            entry[0].release()
+        entry[1] -= 1
+        if entry[1] == 0:
+            # Hosts are forgotten once idle, so the table stays small
+            del self._hosts[host]
+
+    async def handle_async_request(self, request):
+        host = request.url.host
+        await self._enter_host(host)
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self._leave_host(host)
+
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            with _httpx_errors():
+                core_response = await self._pool.handle_async_request(core_request)
+        except BaseException:
+            release()
+            raise
+        return httpx.Response(
+            status_code=core_response.status,
+            headers=core_response.headers,
+            stream=_ReleasingStream(core_response.stream, release),
+            extensions=core_response.extensions,
+        )
+
+    async def aclose(self):
+        await self._pool.aclose()
+
+    def snapshot(self):
+        return {
+            "hosts_in_flight": len(self._hosts),
+            "dns_lookups": self.resolver.lookups,
+            "dns_cache_hits": self.resolver.hits,
+        }
+
+
+_http_client = None
+_transport = None
+
+
+def get_http_client():
+    """The shared AsyncClient (created on first use)."""
+    global _http_client, _transport
+    if _http_client is None or _http_client.is_closed:
+        http2 = settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE
+        if settings.HTTP_CLIENT_HTTP2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP_CLIENT_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        )
+        _transport = PooledTransport(http2=http2, limits=limits, retries=settings.HTTP_CLIENT_CONNECT_RETRIES)
+        _http_client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT, connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT),
+            transport=_transport,
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client, _transport
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    _transport = None
+
+
+async def fetch(url, headers=None, timeout=None, max_bytes=None):
+    """
+    GET url and read its body, stopping after max_bytes
+    (HTTP_CLIENT_MAX_BODY_BYTES by default). Returns (response, body); the
+    response is closed, its status, headers and final URL still readable.
+    Raises httpx errors on network failure.
+    """
+    max_bytes = max_bytes or settings.HTTP_CLIENT_MAX_BODY_BYTES
+    client = get_http_client()
+    kwargs = {"headers": headers}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    async with client.stream("GET", url, **kwargs) as response:
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                logger.info(f"Body of {url} truncated at {size} bytes")
+                break
+    return response, b"".join(chunks)
+
+
+def client_snapshot():
+    """Pool and DNS cache counters for /debug/status."""
+    if _transport is None:
+        return {"open": False}
+    return {"open": True, "http2": _transport.http2, **_transport.snapshot()}
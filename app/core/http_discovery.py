@@ -0,0 +1,382 @@
+"""
+HTTP-first discovery tier.
+
+Most legal links sit in server-rendered footers, so the landing page is first
+fetched over plain async HTTP and its anchors are parsed without a browser.
+``parse_anchors`` produces entries in the same shape as
+``app.core.link_snapshot.take_link_snapshot`` so the same scorers run on
+both. Pages that look JS-rendered are left to the browser tier.
+``probe_paths`` checks the conventional legal paths concurrently alongside that
+fetch. ``discovery_stats`` records how many discovery requests were served
+without Chromium.
+"""
+
+import asyncio
+import logging
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.link_snapshot import MAX_CONTEXT_CHARS
+
+logger = logging.getLogger(__name__)
+
+# Elements that never have a closing tag
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+}
+
+# Elements whose text is never rendered
+HIDDEN_TEXT_ELEMENTS = {"script", "style", "noscript", "template", "svg"}
+
+# Same containers as link_snapshot.CONTEXT_SELECTOR
+CONTEXT_ELEMENTS = {"p", "li", "div", "section", "article", "footer"}
+
+# Markers of a client-rendered app shell
+JS_SHELL_MARKERS = (
+    "enable javascript",
+    "javascript is required",
+    "javascript to run this app",
+    '<div id="root"></div>',
+    '<div id="app"></div>',
+    "<app-root></app-root>",
+)
+
+# Fewer anchors than this and the page is treated as a JS shell
+MIN_STATIC_ANCHORS = 5
+
+
+class _Element:
+    __slots__ = ("tag", "tos_footer", "privacy_footer", "nav", "text", "anchors")
+
+    def __init__(self, tag, tos_footer, privacy_footer, nav):
+        self.tag = tag
+        self.tos_footer = tos_footer
+        self.privacy_footer = privacy_footer
+        self.nav = nav
+        self.text = [] if tag in CONTEXT_ELEMENTS else None
+        self.anchors = []
+
+
+class AnchorCollector(HTMLParser):
+    """
+    Streaming anchor extractor. Tracks the open-element stack so each anchor
+    gets the same footer/nav flags and surrounding text as a browser snapshot.
+    """
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.stack = []
+        self.links = []
+        self.text_chars = 0
+        self._anchor = None
+        self._hidden_depth = 0
+
+    @staticmethod
+    def _flags(tag, attrs):
+        element_id = (attrs.get("id") or "").lower()
+        classes = (attrs.get("class") or "").lower()
+        class_list = classes.split()
+        tos_footer = tag == "footer" or "foot" in element_id or "foot" in classes
+        privacy_footer = (
+            tag == "footer"
+            or "footer" in element_id
+            or "footer" in classes
+            or element_id == "legal"
+            or any(c in ("legal", "bottom", "links", "nav-bottom", "site-info") for c in class_list)
+        )
+        nav = (
+            tag in ("nav", "header")
+            or attrs.get("role") == "navigation"
+            or "menu" in classes
+            or "navbar" in classes
+        )
+        return tos_footer, privacy_footer, nav
+
+    def handle_starttag(self, tag, attr_list):
+        attrs = dict(attr_list)
+        if tag == "base" and attrs.get("href"):
+            self.base_url = urljoin(self.base_url, attrs["href"])
+        if tag in VOID_ELEMENTS:
+            return
+        if tag in HIDDEN_TEXT_ELEMENTS:
+            self._hidden_depth += 1
+
+        tos_footer, privacy_footer, nav = self._flags(tag, attrs)
+        if self.stack:
+            parent = self.stack[-1]
+            tos_footer = tos_footer or parent.tos_footer
+            privacy_footer = privacy_footer or parent.privacy_footer
+            nav = nav or parent.nav
+        element = _Element(tag, tos_footer, privacy_footer, nav)
+        self.stack.append(element)
+
+        if tag == "a" and attrs.get("href"):
+            raw_href = attrs["href"].strip()
+            lowered = raw_href.lower()
+            if raw_href and not (
+                lowered.startswith("javascript:") or "mailto:" in lowered or "tel:" in lowered
+            ):
+                self._anchor = {
+                    "index": len(self.links),
+                    "href": urljoin(self.base_url, raw_href),
+                    "rawHref": raw_href,
+                    "text": [],
+                    "label": attrs.get("aria-label") or attrs.get("title") or "",
+                    "isFooter": tos_footer,
+                    "inFooterArea": privacy_footer,
+                    "isNav": nav,
+                    "parentText": "",
+                    "visible": "hidden" not in attrs and "display:none" not in (attrs.get("style") or "").replace(" ", ""),
+                }
+                # Surrounding text comes from the nearest container above the anchor
+                for ancestor in reversed(self.stack[:-1]):
+                    if ancestor.text is not None:
+                        ancestor.anchors.append(self._anchor)
+                        break
+                self.links.append(self._anchor)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS:
+            return
+        # Pop up to the matching open tag; ignore stray end tags
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth].tag == tag:
+                break
+        else:
+            return
+        while len(self.stack) > depth:
+            self._close(self.stack.pop())
+
+    def handle_data(self, data):
+        if self._hidden_depth:
+            return
+        stripped = data.strip()
+        if not stripped:
+            return
+        self.text_chars += len(stripped)
+        if self._anchor is not None:
+            self._anchor["text"].append(stripped)
+        for element in reversed(self.stack):
+            if element.text is not None:
+                if sum(len(t) for t in element.text) < MAX_CONTEXT_CHARS:
+                    element.text.append(stripped)
+                break
+
+    def _close(self, element):
+        if element.tag in HIDDEN_TEXT_ELEMENTS:
+            self._hidden_depth = max(0, self._hidden_depth - 1)
+        if element.tag == "a":
+            self._anchor = None
+        if element.text is not None:
+            text = " ".join(element.text)[:MAX_CONTEXT_CHARS]
+            for anchor in element.anchors:
+                anchor["parentText"] = text
+            # A container's text is also part of its parent container's text
+            for ancestor in reversed(self.stack):
+                if ancestor.text is not None:
+                    if sum(len(t) for t in ancestor.text) < MAX_CONTEXT_CHARS:
+                        ancestor.text.append(text)
+                    break
+
+    def finish(self):
+        self.close()
+        while self.stack:
+            self._close(self.stack.pop())
+        total = max(len(self.links), 1)
+        for link in self.links:
+            text = " ".join(link.pop("text"))
+            label = link.pop("label")
+            link["text"] = text or label
+            # No layout without a browser; document order stands in for position
+            link["pageFraction"] = link["index"] / total
+        return self.links
+
+
+def parse_anchors(html, base_url):
+    """
+    Parse every usable anchor out of an HTML document.
+    Returns (links, visible_text_chars).
+    """
+    collector = AnchorCollector(base_url)
+    try:
+        collector.feed(html)
+    except Exception as e:
+        logger.warning(f"HTML parse error for {base_url}: {e}")
+    links = collector.finish()
+    return links, collector.text_chars
+
+
+def looks_js_rendered(html, links, text_chars):
+    """True when the static HTML is probably an app shell the browser must render."""
+    if len(links) < MIN_STATIC_ANCHORS:
+        return True
+    if text_chars < settings.HTTP_DISCOVERY_MIN_TEXT_CHARS:
+        return True
+    head = html[:20000].lower()
+    return text_chars < 2000 and any(marker in head for marker in JS_SHELL_MARKERS)
+
+
+async def fetch_html(url):
+    """
+    GET url and return (final_url, html), or (None, None) if it isn't a
+    readable HTML page. The body is read up to HTTP_DISCOVERY_MAX_BYTES.
+    """
+    try:
+        client = get_http_client()
+        async with client.stream("GET", url, timeout=settings.HTTP_DISCOVERY_TIMEOUT) as response:
+            if response.status_code >= 400:
+                logger.info(f"HTTP discovery fetch of {url} returned {response.status_code}")
+                return None, None
+            content_type = response.headers.get("content-type", "").lower()
+            if content_type and "html" not in content_type:
+                return None, None
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= settings.HTTP_DISCOVERY_MAX_BYTES:
+                    break
+            encoding = response.encoding or "utf-8"
+            html = b"".join(chunks).decode(encoding, errors="replace")
+            return str(response.url), html
+    except Exception as e:
+        logger.info(f"HTTP discovery fetch of {url} failed: {e}")
+        return None, None
+
+
+async def fetch_static_links(url):
+    """
+    Fetch url over HTTP and parse its anchors.
+
+    Returns (final_url, links, reason): reason is None when the links are
+    usable, otherwise "fetch_failed" or "js_rendered".
+    """
+    started = time.monotonic()
+    final_url, html = await fetch_html(url)
+    if html is None:
+        return None, [], "fetch_failed"
+    links, text_chars = parse_anchors(html, final_url)
+    elapsed_ms = (time.monotonic() - started) * 1000
+    logger.info(
+        f"HTTP discovery: {final_url} -> {len(links)} links, {text_chars} text chars "
+        f"in {elapsed_ms:.0f}ms"
+    )
+    if looks_js_rendered(html, links, text_chars):
+        return final_url, links, "js_rendered"
+    return final_url, links, None
+
+
+def host_variants(url):
+    """The URL's host plus its www/apex counterpart."""
+    parsed = urlparse(url)
+    host = parsed.netloc
+    if not host:
+        return []
+    if host.startswith("www."):
+        return [host, host[4:]]
+    if host.count(".") == 1:
+        return [host, f"www.{host}"]
+    return [host]
+
+
+async def probe_url(url, content_check, semaphore):
+    """
+    GET url (reading at most HTTP_PROBE_MAX_BYTES) and return the final URL
+    if content_check(lowercased_html) passes, else None. Redirects back to the
+    site root count as misses (soft 404s).
+    """
+    async with semaphore:
+        try:
+            client = get_http_client()
+            async with client.stream("GET", url, timeout=settings.HTTP_PROBE_TIMEOUT) as response:
+                if response.status_code >= 400:
+                    return None
+                if urlparse(str(response.url)).path.strip("/") == "":
+                    return None
+                content_type = response.headers.get("content-type", "").lower()
+                if content_type and "html" not in content_type:
+                    return None
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= settings.HTTP_PROBE_MAX_BYTES:
+                        break
+                html = b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
+                if content_check(html.lower()):
+                    return str(response.url)
+        except Exception as e:
+            logger.debug(f"Probe of {url} failed: {e}")
+        return None
+
+
+async def probe_paths(base_url, paths, content_check):
+    """
+    Probe the well-known paths on base_url's host and its www/apex variant
+    concurrently (at most HTTP_PROBE_PER_HOST in flight per host). Returns the
+    first URL that passes content_check; the remaining probes are cancelled.
+    """
+    scheme = urlparse(base_url).scheme or "https"
+    tasks = []
+    for host in host_variants(base_url):
+        semaphore = asyncio.Semaphore(settings.HTTP_PROBE_PER_HOST)
+        for path in paths:
+            tasks.append(asyncio.create_task(probe_url(f"{scheme}://{host}{path}", content_check, semaphore)))
+    if not tasks:
+        return None
+
+    started = time.monotonic()
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            found = await next_done
+            if found:
+                logger.info(
+                    f"Path probe hit for {base_url}: {found} "
+                    f"after {(time.monotonic() - started) * 1000:.0f}ms"
+                )
+                return found
+        return None
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+class DiscoveryTierStats:
+    """Counts which tier served each discovery request, per document type."""
+
+    def __init__(self):
+        self.counts = {}
+
+    def record(self, doc_type, served_by, reason=None):
+        """served_by is "http" or "browser"; reason is the HTTP method used or why the browser was needed."""
+        entry = self.counts.setdefault(
+            doc_type, {"total": 0, "http": 0, "browser": 0, "http_methods": {}, "fallback_reasons": {}}
+        )
+        entry["total"] += 1
+        entry[served_by] += 1
+        if reason:
+            bucket = entry["http_methods"] if served_by == "http" else entry["fallback_reasons"]
+            bucket[reason] = bucket.get(reason, 0) + 1
+
+    def snapshot(self):
+        result = {}
+        for doc_type, entry in self.counts.items():
+            total = entry["total"]
+            result[doc_type] = {
+                **entry,
+                "http_methods": dict(entry["http_methods"]),
+                "fallback_reasons": dict(entry["fallback_reasons"]),
+                "share_without_browser": round(entry["http"] / total, 3) if total else None,
+            }
+        return result
+
+
+discovery_stats = DiscoveryTierStats()
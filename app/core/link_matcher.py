@@ -0,0 +1,118 @@
+"""
+Compiled keyword matching for legal-link scoring.
+
+The ToS and privacy scorers ask the same question dozens of times per link:
+"does this text (or URL) contain phrase X?". Asked one phrase at a time
+with ``in``, a page with thousands of anchors costs tens of thousands of
+interpreted substring checks. ``PhraseMatcher`` compiles a phrase table
+once into a single trie-shaped regex and answers "which phrases does this
+text contain?" in one C-level scan; ``find_many`` does the same for every
+anchor of a page by scanning one joined string.
+
+The result is exact: the set returned is precisely the phrases for which
+``phrase in text`` is true, overlapping matches included, so scorers
+rewritten on top of it produce identical scores.
+
+``scripts/benchmark_link_matcher.py`` times it against the phrase-by-phrase
+checks on synthetic pages.
+"""
+
+import bisect
+import itertools
+import re
+
+# Joins texts in find_many; no phrase contains it, so no match spans two texts
+SEPARATOR = "\n"
+
+
+def _trie_pattern(phrases):
+    """
+    Regex alternation shaped like a trie of phrases. At any position it
+    matches the longest phrase starting there (each node tries to extend
+    before accepting a shorter phrase that ends at it).
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class PhraseMatcher:
+    """Which of a fixed set of phrases occur in a text, in one regex scan."""
+
+    def __init__(self, phrases):
+        self.phrases = frozenset(phrases)
+        if any(not phrase or SEPARATOR in phrase for phrase in self.phrases):
+            raise ValueError("Phrases must be non-empty and must not contain a newline")
+        self.pattern = re.compile(_trie_pattern(self.phrases))
+        # Every phrase present at a position is a prefix of the longest one there
+        self.prefixes = {
+            phrase: frozenset(other for other in self.phrases if phrase.startswith(other))
+            for phrase in self.phrases
+        }
+
+    def find(self, text):
+        """Set of phrases contained in text."""
+        found = set()
+        search = self.pattern.search
+        match = search(text)
+        while match:
+            found |= self.prefixes[match.group()]
+            match = search(text, match.start() + 1)
+        return found
+
+    def find_many(self, texts):
+        """
+        find() for a list of texts, from a single scan over all of them.
+        Returns {index: phrases} for the texts that contain any phrase; on a
+        typical page that is a handful of legal links out of hundreds.
+        """
+        results = {}
+        starts = list(itertools.accumulate((len(text) + len(SEPARATOR) for text in texts), initial=0))
+        joined = SEPARATOR.join(texts)
+
+        search = self.pattern.search
+        match = search(joined)
+        while match:
+            index = bisect.bisect_right(starts, match.start()) - 1
+            found = results.get(index)
+            if found is None:
+                found = results[index] = set()
+            found |= self.prefixes[match.group()]
+            match = search(joined, match.start() + 1)
+        return results
+
+
+class PriorityMatcher:
+    """
+    Highest priority of any phrase in a text, for the exactMatchPriorities /
+    partialMatchPriorities tables (0 if none matches).
+    """
+
+    def __init__(self, *tables):
+        self.priorities = {}
+        for table in tables:
+            for phrase, priority in table.items():
+                self.priorities[phrase] = max(priority, self.priorities.get(phrase, 0))
+        self.matcher = PhraseMatcher(self.priorities)
+
+    def _best(self, found):
+        return max((self.priorities[phrase] for phrase in found), default=0)
+
+    def priority(self, text):
+        return self._best(self.matcher.find((text or "").lower()))
+
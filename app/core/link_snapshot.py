@@ -0,0 +1,146 @@
+"""
+One-call snapshot of the anchors on a loaded page.
+
+Discovery code used to run a separate ``page.evaluate`` (or a locator
+round-trip per link) for every strategy over the same DOM.
+``take_link_snapshot`` collects every usable anchor in a single round-trip,
+with enough layout context (footer/nav ancestry, surrounding text, position,
+visibility) for the ToS and privacy scorers to run entirely in Python.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Containers the ToS scanners have always treated as "footer"
+TOS_FOOTER_SELECTOR = 'footer, [id*="foot"], [class*="foot"]'
+
+# The wider set of bottom-of-page containers the privacy scanner checks
+PRIVACY_FOOTER_SELECTOR = (
+    'footer, .footer, #footer, [class*="footer"], [id*="footer"], '
+    '.legal, #legal, .bottom, .links, .nav-bottom, .site-info'
+)
+
+NAV_SELECTOR = 'nav, header, [role="navigation"], [class*="menu"], [class*="navbar"]'
+
+# Block element whose text counts as a link's surrounding context
+CONTEXT_SELECTOR = 'p, li, div, section, article, footer'
+
+# Cap on the surrounding text kept per link, to keep the payload small
+MAX_CONTEXT_CHARS = 300
+
+LINK_SNAPSHOT_SCRIPT = """
+(opts) => {
+    const pageHeight = Math.max(
+        document.documentElement.scrollHeight,
+        document.body ? document.body.scrollHeight : 0,
+        1
+    );
+    const clean = (value) => (value || '').replace(/\\s+/g, ' ').trim();
+
+    const links = [];
+    document.querySelectorAll('a[href]').forEach((link, index) => {
+        const href = link.href;
+        if (!href || href.trim() === '' ||
+            href.startsWith('javascript:') ||
+            href.includes('mailto:') ||
+            href.includes('tel:')) {
+            return;
+        }
+
+        let text = clean(link.textContent);
+        if (!text) {
+            text = clean(link.getAttribute('aria-label') || link.getAttribute('title'));
+        }
+
+        const rect = link.getBoundingClientRect();
+        const style = window.getComputedStyle(link);
+        const visible = rect.width > 0 && rect.height > 0 &&
+            style.visibility !== 'hidden' && style.display !== 'none';
+        const top = rect.top + window.scrollY;
+
+        const container = link.parentElement ? link.parentElement.closest(opts.context) : null;
+
+        links.push({
+            index: index,
+            href: href,
+            rawHref: link.getAttribute('href') || '',
+            text: text,
+            isFooter: !!link.closest(opts.tosFooter),
+            inFooterArea: !!link.closest(opts.privacyFooter),
+            isNav: !!link.closest(opts.nav),
+            parentText: container ? clean(container.textContent).slice(0, opts.maxContext) : '',
+            top: Math.round(top),
+            left: Math.round(rect.left + window.scrollX),
+            pageFraction: Math.min(1, Math.max(0, top / pageHeight)),
+            visible: visible
+        });
+    });
+    return links;
+}
+"""
+
+
+async def take_link_snapshot(page):
+    """
+    Return one dict per usable anchor on the page, in document order.
+
+    Each entry has href (absolute), rawHref, text, isFooter (ToS footer
+    selectors), inFooterArea (privacy footer selectors), isNav, parentText
+    (text of the nearest block container), top/left (page coordinates),
+    pageFraction (0 = top of page, 1 = bottom) and visible.
+    Returns an empty list if the page can't be evaluated.
+    """
+    try:
+        return await page.evaluate(
+            LINK_SNAPSHOT_SCRIPT,
+            {
+                "tosFooter": TOS_FOOTER_SELECTOR,
+                "privacyFooter": PRIVACY_FOOTER_SELECTOR,
+                "nav": NAV_SELECTOR,
+                "context": CONTEXT_SELECTOR,
+                "maxContext": MAX_CONTEXT_CHARS,
+            },
+        )
+    except Exception as e:
+        logger.warning(f"Could not take link snapshot: {e}")
+        return []
+
+
+def links_in_footer(links, privacy=False):
+    """Snapshot entries inside a footer (ToS selectors, or the privacy set)."""
+    key = "inFooterArea" if privacy else "isFooter"
+    return [link for link in links if link.get(key)]
+
+
+def links_near_phrase(links, phrase):
+    """Snapshot entries whose surrounding block text mentions phrase."""
+    phrase = phrase.lower()
+    return [link for link in links if phrase in link.get("parentText", "").lower()]
+
+
+def weighted_link_score(link, text_score, url_score, weights):
+    """
+    Combine per-signal scores (each roughly 0-100) into one value using a
+    LINK_EVALUATION_WEIGHTS table. Context rewards footer placement and legal
+    wording around the link; position rewards links further down the page.
+    """
+    context_score = 0
+    if link.get("isFooter") or link.get("inFooterArea"):
+        context_score += 60
+    elif link.get("isNav"):
+        context_score += 20
+    parent_text = link.get("parentText", "").lower()
+    if any(word in parent_text for word in ("legal", "terms", "privacy", "copyright", "©")):
+        context_score += 30
+    if link.get("visible"):
+        context_score += 10
+
+    position_score = 100 * link.get("pageFraction", 0)
+
+    return (
+        weights.get("text_match", 0) * text_score
+        + weights.get("url_structure", 0) * min(url_score, 100)
+        + weights.get("context", 0) * context_score
+        + weights.get("position", 0) * position_score
+    )
@@ -0,0 +1,198 @@
+"""
+Byte-bounded in-process LRU cache with TTLs.
+
+``MemoryCache`` is the reusable form of the LRU+TTL caches in this package,
+for values too large to bound by entry count alone (extracted documents,
+LLM summaries). Values are stored as JSON, and compressed with zlib when
+that makes them smaller, so the byte budget counts what is really held and
+callers always get back a private copy. JSON rather than pickle because
+blobs come back from a shared database table: a row that doesn't decode
+is a miss, never code to run. Every operation is O(1) on an
+``OrderedDict``: a hit moves the entry to the end; inserts evict from the
+front (least recently used) until the cache fits its byte and entry
+budgets. Expired entries are dropped when read, and from the front on
+every insert.
+
+Caches created with ``shared=True`` are also backed by the cross-worker
+Postgres tier (``app.core.shared_cache``): ``aget`` falls back to it on a
+local miss and ``put`` queues a write to it. Hits served from the tier
+count as hits (and as ``shared_hits``).
+
+Each cache registers itself so /debug/status can report hits, misses,
+evictions and size for all of them (``memory_cache_snapshots``).
+"""
+
+import json
+import logging
+import sys
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.core.shared_cache import shared_cache_tier, shared_key
+
+logger = logging.getLogger(__name__)
+
+# Per-entry bookkeeping (key, tuple, OrderedDict node) not counted in the blob
+ENTRY_OVERHEAD_BYTES = 200
+
+_caches = {}
+
+
+class MemoryCache:
+    """
+    LRU cache of JSON-serializable values with a TTL, a total-bytes budget
+    and an optional entry cap (tuples come back as lists).
+    ``compress_min_bytes`` is the encoded size from which zlib compression
+    is tried (0 disables it). ``shared`` adds the
+    Postgres tier behind it (use ``aget``).
+    """
+
+    def __init__(self, name, ttl, max_bytes, max_entries=None, compress_min_bytes=None, shared=False):
+        self.name = name
+        self.shared = shared
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.compress_min_bytes = (
+            settings.MEMORY_CACHE_COMPRESS_MIN_BYTES if compress_min_bytes is None else compress_min_bytes
+        )
+        self._entries = OrderedDict()  # key -> (expires_at, compressed, blob, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.compressed = 0
+        self.shared_hits = 0
+        self.rejected = 0
+        _caches[name] = self
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry[3]
+        if entry[1]:
+            self.compressed -= 1
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if entry[0] <= time.monotonic():
+            self._drop(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._decode(entry[1], entry[2])
+
+    async def aget(self, key, default=None):
+        """get(), falling back to the shared Postgres tier on a local miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return self.get(key, default)
+        if not self.shared:
+            return self.get(key, default)
+        row = await shared_cache_tier.get(shared_key(self.name, key))
+        if row is None:
+            return self.get(key, default)
+        compressed, blob, expires_at = row
+        try:
+            value = self._decode(compressed, blob)
+        except (ValueError, zlib.error) as e:
+            # Not something this cache wrote (or an older format): a miss
+            self.rejected += 1
+            logger.warning(f"{self.name} cache: rejected undecodable shared entry for {key!r}: {e}")
+            return self.get(key, default)
+        ttl = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        self.hits += 1
+        self.shared_hits += 1
+        self._store(key, compressed, blob, ttl)
+        return value
+
+    @staticmethod
+    def _decode(compressed, blob):
+        return json.loads(zlib.decompress(blob) if compressed else blob)
+
+    def put(self, key, value, ttl=None):
+        """Store value for ttl seconds (the cache's TTL by default). Returns False if it doesn't fit."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return False
+        blob = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        compressed = False
+        if self.compress_min_bytes and len(blob) >= self.compress_min_bytes:
+            packed = zlib.compress(blob, 1)
+            if len(packed) < len(blob):
+                blob, compressed = packed, True
+        if self.shared:
+            shared_cache_tier.put(shared_key(self.name, key), compressed, blob, ttl)
+        return self._store(key, compressed, blob, ttl)
+
+    def _store(self, key, compressed, blob, ttl):
+        if ttl <= 0:
+            return False
+        size = len(blob) + sys.getsizeof(key) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            logger.info(f"{self.name} cache: {size} byte entry exceeds the whole budget, not cached")
+            return False
+
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl, compressed, blob, size)
+        self.bytes += size
+        if compressed:
+            self.compressed += 1
+        self._evict()
+        return True
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry[0] <= now:
+                self._drop(key)
+                self.expirations += 1
+            elif self.bytes > self.max_bytes or (self.max_entries and len(self._entries) > self.max_entries):
+                self._drop(key)
+                self.evictions += 1
+            else:
+                break
+
+    def delete(self, key):
+        if key in self._entries:
+            self._drop(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+        self.compressed = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def snapshot(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "compressed_entries": self.compressed,
+            "shared": self.shared,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "rejected": self.rejected,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
+
+
+def memory_cache_snapshots():
+    """snapshot() of every MemoryCache, by name."""
+    return {name: cache.snapshot() for name, cache in _caches.items()}
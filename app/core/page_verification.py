@@ -0,0 +1,569 @@
+"""
+Verification of ToS / privacy candidate pages.
+
+``score_terms_page`` and ``score_privacy_page`` decide whether a page is the
+document we are looking for from its title, URL, headings and visible text.
+The keyword lists are compiled into ``PhraseMatcher`` indexes, so each part
+of the page is scanned once per document type.
+
+``page_verifier`` feeds them pages fetched over the shared async HTTP
+client: ``verify_many`` checks every candidate concurrently in one round
+and caches verdicts per URL for PAGE_VERIFY_CACHE_TTL. Pages whose static
+HTML is a JS app shell (or that can't be fetched) get no verdict, and only
+those are opened in the browser, where ``verify_is_privacy_page`` reads the
+rendered text and calls the same scorer. On the ToS side, find_all_links_js
+checks its top-ranked links with ``verify_many`` before accepting one.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from html.parser import HTMLParser
+
+from app.core.config import settings
+from app.core.http_discovery import HIDDEN_TEXT_ELEMENTS, JS_SHELL_MARKERS, fetch_html
+from app.core.link_matcher import PhraseMatcher
+from app.core.memory_cache import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+# --- Terms of Service -------------------------------------------------------
+
+TERMS_TITLE_INDICATORS = [
+    "terms", "conditions", "tos", "terms of service", "terms and conditions",
+    "legal", "agreement", "user agreement", "terms of use", "legal terms",
+    "terms & conditions", "service agreement",
+]
+
+TERMS_STRONG_INDICATORS = [
+    "terms of service", "terms and conditions", "user agreement",
+    "conditions of use", "terms of use", "legal agreement",
+]
+
+# Titles that earn a bonus, and leniency just below the threshold
+COMMON_TOS_TITLES = [
+    "conditions of use", "terms of service", "user agreement", "terms and conditions",
+]
+
+TERMS_URL_INDICATORS = [
+    "/terms", "/tos", "/terms-of-service", "/terms-and-conditions", "/legal/terms",
+    "/legal", "/user-agreement", "/terms-of-use", "terms.html", "tos.html",
+    "conditions.html", "agreement.html", "legal.html",
+]
+
+TERMS_SECTION_PATTERNS = [
+    "general terms", "acceptance of terms", "modifications to terms",
+    "user responsibilities", "account registration", "user conduct",
+    "intellectual property", "copyright", "trademark", "disclaimer",
+    "limitation of liability", "indemnification", "termination",
+    "governing law", "dispute resolution", "arbitration",
+    "class action waiver", "severability", "entire agreement",
+    "contact information", "privacy policy", "data collection",
+    "third party rights", "force majeure", "assignment", "changes to service",
+    "user content", "prohibited activities", "warranties", "representations",
+    "compliance with laws", "electronic communications",
+    "modification of service", "fees and payments", "refund policy",
+    "cancellation policy",
+]
+
+TERMS_PHRASE_PATTERNS = [
+    "by using this site", "by accessing this website", "please read these terms",
+    "please read carefully", "agree to be bound", "constitutes your acceptance",
+    "reserve the right to change", "at our sole discretion",
+    "you acknowledge and agree", "without prior notice", "shall not be liable",
+    "disclaim any warranties", "as is and as available",
+    "limitation of liability", "indemnify and hold harmless",
+    "jurisdiction and venue", "class action waiver", "binding arbitration",
+    "no warranty of any kind", "exclusive remedy", "subject to these terms",
+    "constitute acceptance", "terminate your account", "all rights reserved",
+    "hereby grant", "represent and warrant", "we may modify", "applicable law",
+]
+
+LEGAL_HEADING_PATTERNS = [
+    "terms", "conditions", "agreement", "disclaimer", "liability",
+    "rights", "privacy", "policy", "warranty", "remedies",
+    "arbitration", "termination", "law", "jurisdiction", "indemnification",
+    "intellectual property", "copyright", "trademark", "user", "account",
+    "governing law", "dispute", "refund", "cancellation", "payments",
+]
+
+# Content that suggests a shop or account page rather than a terms page
+TERMS_NEGATIVE_INDICATORS = [
+    "sign in", "sign up", "login", "register", "create account", "add to cart",
+    "shopping cart", "checkout", "buy now", "password", "email address",
+    "payment", "credit card", "shipping", "delivery", "order status",
+    "my account", "track order",
+]
+
+TERMS_MIN_TEXT_LENGTH = 1000  # Minimum content length for a terms page
+TERMS_MIN_LEGAL_SECTIONS = 3  # Minimum number of legal sections required
+
+TERMS_TITLE_INDEX = PhraseMatcher(TERMS_TITLE_INDICATORS + TERMS_STRONG_INDICATORS + COMMON_TOS_TITLES)
+TERMS_URL_INDEX = PhraseMatcher(TERMS_URL_INDICATORS)
+TERMS_BODY_INDEX = PhraseMatcher(TERMS_SECTION_PATTERNS + TERMS_PHRASE_PATTERNS + TERMS_NEGATIVE_INDICATORS)
+LEGAL_HEADING_INDEX = PhraseMatcher(LEGAL_HEADING_PATTERNS)
+
+# --- Privacy policy ---------------------------------------------------------
+
+USER_PRIVACY_PHRASES = [
+    "user privacy rights", "user data collection", "user data processing",
+    "user consent", "user preferences", "user information",
+]
+
+CUSTOMER_PRIVACY_PHRASES = [
+    "customer privacy rights", "customer data collection", "customer data processing",
+    "customer consent", "customer preferences", "customer information",
+]
+
+PRIVACY_CONTENT_PHRASES = [
+    "information we collect", "data we collect", "personal information",
+    "your rights", "privacy rights", "gdpr", "ccpa", "opt-out",
+    "cookies", "tracking technologies", "third parties",
+    "how we use", "share your information", "contact us",
+    "data retention", "policy updates", "changes to this policy",
+    "delete your data", "access your data",
+]
+
+# Sections a privacy policy usually has
+PRIVACY_SECTION_PATTERN = re.compile(
+    r"collection.*information|use.*information|sharing.*information"
+    r"|cookies.*technologies|your.*rights|contact.*us"
+)
+
+PRIVACY_BODY_INDEX = PhraseMatcher(USER_PRIVACY_PHRASES + CUSTOMER_PRIVACY_PHRASES + PRIVACY_CONTENT_PHRASES)
+
+
+def score_terms_page(title, url, body, headings):
+    """
+    Verdict on a candidate ToS page. body is the visible text, headings the
+    texts of h1-h6/strong/b elements. Returns the ToS verdict dict.
+    """
+    title_lower = (title or "").lower()
+    url_lower = (url or "").lower()
+    content_lower = (body or "").lower()
+    content_length = len(body or "")
+
+    title_found = TERMS_TITLE_INDEX.find(title_lower)
+    strong_indicator = not title_found.isdisjoint(TERMS_STRONG_INDICATORS)
+    title_indicator = not title_found.isdisjoint(TERMS_TITLE_INDICATORS)
+    common_title = not title_found.isdisjoint(COMMON_TOS_TITLES)
+    url_indicator = bool(TERMS_URL_INDEX.find(url_lower))
+
+    body_found = TERMS_BODY_INDEX.find(content_lower)
+    legal_sections = len(body_found.intersection(TERMS_SECTION_PATTERNS))
+    legal_phrases = len(body_found.intersection(TERMS_PHRASE_PATTERNS))
+    has_negative_indicators = not body_found.isdisjoint(TERMS_NEGATIVE_INDICATORS)
+    legal_headings = bool(LEGAL_HEADING_INDEX.find_many([(heading or "").lower() for heading in headings]))
+
+    minimum_text_present = content_length >= TERMS_MIN_TEXT_LENGTH
+    minimum_sections_present = legal_sections >= TERMS_MIN_LEGAL_SECTIONS
+
+    # Calculate confidence score (0-100)
+    confidence_score = 0
+
+    # Base score from indicators
+    if strong_indicator:
+        confidence_score += 30
+    if title_indicator:
+        confidence_score += 20
+    if url_indicator:
+        confidence_score += 15
+
+    # Content-based scoring
+    confidence_score += min(20, legal_sections * 3)  # Up to 20 points for legal sections
+    confidence_score += min(15, legal_phrases * 2)  # Up to 15 points for legal phrases
+
+    if legal_headings:
+        confidence_score += 10
+
+    # Length bonus
+    if content_length > 5000:
+        confidence_score += 5
+
+    # Additional title-based scoring for common terms page titles
+    if common_title:
+        confidence_score += 10
+
+    # Penalties
+    if has_negative_indicators:
+        # Reduce penalty impact if we have strong title indicators and legal content
+        if common_title and legal_sections >= 5:
+            confidence_score -= 10  # Reduced penalty
+        else:
+            confidence_score -= 20
+
+    if not minimum_text_present:
+        confidence_score -= 30
+
+    if not minimum_sections_present:
+        confidence_score -= 20
+
+    # Cap the score
+    confidence_score = max(0, min(100, confidence_score))
+
+    # A page is considered a terms page if it has a high confidence score
+    is_terms_page = confidence_score >= 75
+
+    # For pages with strong indicators in title but slightly lower scores,
+    # be more lenient to avoid missing valid ToS pages
+    special_consideration = False
+    if not is_terms_page and confidence_score >= 65 and common_title:
+        if legal_sections >= 5 or legal_phrases >= 3:
+            is_terms_page = True
+            special_consideration = True
+
+    return {
+        "isTermsPage": is_terms_page,
+        "confidence": confidence_score,
+        "title": title,
+        "url": url,
+        "strongIndicator": strong_indicator,
+        "titleIndicator": title_indicator,
+        "urlIndicator": url_indicator,
+        "legalSectionCount": legal_sections,
+        "legalPhraseCount": legal_phrases,
+        "hasLegalHeadings": legal_headings,
+        "contentLength": content_length,
+        "minimumTextPresent": minimum_text_present,
+        "minimumSectionsPresent": minimum_sections_present,
+        "hasNegativeIndicators": has_negative_indicators,
+        "specialConsideration": special_consideration,
+    }
+
+
+def user_customer_privacy_terms(title_lower, url_lower, body_found):
+    """User and customer privacy evidence in the title, URL and body text."""
+    user_terms = []
+    customer_terms = []
+
+    # User terms in title/URL (supreme priority)
+    if "user privacy notice" in title_lower or "user privacy policy" in title_lower:
+        user_terms.append("user privacy notice/policy in title")
+    elif "user privacy" in title_lower:
+        user_terms.append("user privacy in title")
+    elif "user" in title_lower and "privacy" in title_lower:
+        user_terms.append("user + privacy in title")
+
+    if "user-privacy" in url_lower or "user_privacy" in url_lower:
+        user_terms.append("user-privacy in URL")
+    elif "user" in url_lower and "privacy" in url_lower:
+        user_terms.append("user + privacy in URL")
+
+    # Customer terms in title/URL (high priority)
+    if "customer privacy notice" in title_lower or "customer privacy policy" in title_lower:
+        customer_terms.append("customer privacy notice/policy in title")
+    elif "customer privacy" in title_lower:
+        customer_terms.append("customer privacy in title")
+    elif "customer" in title_lower and "privacy" in title_lower:
+        customer_terms.append("customer + privacy in title")
+
+    if "customer-privacy" in url_lower or "customer_privacy" in url_lower:
+        customer_terms.append("customer-privacy in URL")
+    elif "customer" in url_lower and "privacy" in url_lower:
+        customer_terms.append("customer + privacy in URL")
+
+    # Key phrases in the content (good priority)
+    user_terms += [phrase for phrase in USER_PRIVACY_PHRASES if phrase in body_found]
+    customer_terms += [phrase for phrase in CUSTOMER_PRIVACY_PHRASES if phrase in body_found]
+    return user_terms, customer_terms
+
+
+def score_privacy_page(title, url, body):
+    """
+    Verdict on a candidate privacy policy page from its title, URL and
+    visible text. Returns the verify_is_privacy_page dict.
+    """
+    title_lower = (title or "").lower()
+    url_lower = (url or "").lower()
+    text = (body or "").lower()
+    body_found = PRIVACY_BODY_INDEX.find(text)
+
+    # User or customer terms are strong evidence on their own
+    user_terms, customer_terms = user_customer_privacy_terms(title_lower, url_lower, body_found)
+    if user_terms or customer_terms:
+        # User terms weighted higher
+        total_confidence = min(100, len(user_terms) * 25 + len(customer_terms) * 20)
+        return {
+            "isPrivacyPage": True,
+            "confidence": total_confidence,
+            "reason": "Contains user/customer privacy terms (highest priority)",
+            "userTerms": user_terms,
+            "customerTerms": customer_terms,
+        }
+
+    # Score the title - prioritize "Privacy Notice"
+    title_confidence = 0
+    is_privacy_title = False
+    if "privacy notice" in title_lower:
+        title_confidence = 90
+        is_privacy_title = True
+    elif "privacy policy" in title_lower:
+        title_confidence = 85
+        is_privacy_title = True
+    elif "privacy statement" in title_lower:
+        title_confidence = 80
+        is_privacy_title = True
+    elif "privacy" in title_lower and any(word in title_lower for word in ["information", "data", "personal"]):
+        title_confidence = 75
+        is_privacy_title = True
+    elif "privacy" in title_lower:
+        title_confidence = 70
+        is_privacy_title = True
+    elif "data protection" in title_lower:
+        title_confidence = 65
+        is_privacy_title = True
+    elif "data policy" in title_lower:
+        title_confidence = 60
+        is_privacy_title = True
+
+    # If title is very strong indicator, this is enough for a quick confirmation
+    if title_confidence >= 80:
+        return {
+            "isPrivacyPage": True,
+            "confidence": title_confidence,
+            "reason": f"Strong privacy indicator in title: '{title}'",
+        }
+
+    # URL checks
+    url_confidence = 0
+    if "privacy-notice" in url_lower or "privacy_notice" in url_lower:
+        url_confidence = 60
+    elif "privacy-policy" in url_lower or "privacy_policy" in url_lower:
+        url_confidence = 55
+    elif "privacy-statement" in url_lower or "privacy_statement" in url_lower:
+        url_confidence = 50
+    elif "privacy" in url_lower:
+        url_confidence = 45
+    elif "data-protection" in url_lower or "data_protection" in url_lower:
+        url_confidence = 40
+    elif "data-policy" in url_lower or "data_policy" in url_lower:
+        url_confidence = 35
+
+    # Combined checks for early exit
+    if is_privacy_title and url_confidence >= 45:
+        return {
+            "isPrivacyPage": True,
+            "confidence": min(95, title_confidence + 10),  # Cap at 95
+            "reason": f"Privacy in both title and URL: '{title}'",
+        }
+
+    # Content checks
+    phrase_count = len(body_found.intersection(PRIVACY_CONTENT_PHRASES))
+    has_sections = PRIVACY_SECTION_PATTERN.search(text) is not None
+    # Privacy policies tend to be long, but not too long (to avoid false
+    # positives from long pages)
+    is_privacy_length = 2000 <= len(text) <= 10000
+
+    content_confidence = 0
+    if phrase_count >= 10:
+        content_confidence += 40
+    elif phrase_count >= 7:
+        content_confidence += 30
+    elif phrase_count >= 4:
+        content_confidence += 20
+    elif phrase_count >= 2:
+        content_confidence += 10
+    if has_sections:
+        content_confidence += 15
+    if is_privacy_length:
+        content_confidence += 10
+
+    # Final decision - combine all factors
+    final_confidence = min(100, title_confidence + url_confidence * 0.5 + content_confidence * 0.7)
+
+    is_privacy_page = False
+    reason = ""
+    if final_confidence >= 70:
+        is_privacy_page = True
+        reason = "High confidence from multiple factors"
+    elif title_confidence >= 70:
+        is_privacy_page = True
+        reason = "High confidence from title"
+    elif title_confidence >= 50 and url_confidence >= 50:
+        is_privacy_page = True
+        reason = "Good confidence from title and URL"
+    elif content_confidence >= 50 and (title_confidence > 0 or url_confidence > 0):
+        is_privacy_page = True
+        reason = "Good confidence from content with title/URL indicators"
+
+    return {
+        "isPrivacyPage": is_privacy_page,
+        "confidence": final_confidence,
+        "reason": reason,
+    }
+
+
+# --- Static HTML ------------------------------------------------------------
+
+HEADING_ELEMENTS = {"h1", "h2", "h3", "h4", "h5", "h6", "strong", "b"}
+
+# Elements rendered on their own line (innerText puts line breaks around them)
+BLOCK_ELEMENTS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "main", "nav", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+
+
+class PageTextCollector(HTMLParser):
+    """Title, heading texts and visible body text of an HTML document."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = []
+        self.headings = []
+        self.body = []
+        self._in_title = False
+        self._hidden_depth = 0
+        self._heading_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title":
+            self._in_title = True
+        elif tag in HIDDEN_TEXT_ELEMENTS:
+            self._hidden_depth += 1
+        elif tag in HEADING_ELEMENTS:
+            if not self._heading_depth:
+                self.headings.append([])
+            self._heading_depth += 1
+        if tag in BLOCK_ELEMENTS:
+            self.body.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag in HIDDEN_TEXT_ELEMENTS:
+            self._hidden_depth = max(0, self._hidden_depth - 1)
+        elif tag in HEADING_ELEMENTS:
+            self._heading_depth = max(0, self._heading_depth - 1)
+        if tag in BLOCK_ELEMENTS:
+            self.body.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title.append(data)
+            return
+        if self._hidden_depth:
+            return
+        self.body.append(data)
+        if self._heading_depth:
+            self.headings[-1].append(data)
+
+
+def extract_page_text(html):
+    """(title, headings, body_text) of an HTML document, body whitespace collapsed per line."""
+    collector = PageTextCollector()
+    try:
+        collector.feed(html)
+        collector.close()
+    except Exception as e:
+        logger.debug(f"HTML parse error during page verification: {e}")
+    title = " ".join("".join(collector.title).split())
+    headings = [" ".join("".join(parts).split()) for parts in collector.headings]
+    lines = (" ".join(line.split()) for line in "".join(collector.body).split("\n"))
+    body = "\n".join(line for line in lines if line)
+    return title, [heading for heading in headings if heading], body
+
+
+def looks_like_js_shell(html, body):
+    """True when the static HTML has too little text to judge and the browser must render it."""
+    if len(body) < settings.HTTP_DISCOVERY_MIN_TEXT_CHARS:
+        return True
+    head = html[:20000].lower()
+    return len(body) < 2000 and any(marker in head for marker in JS_SHELL_MARKERS)
+
+
+# --- Verification service ---------------------------------------------------
+
+# Cached for pages that need the browser, so they aren't fetched again
+NEEDS_BROWSER = "needs_browser"
+
+
+class PageVerifier:
+    """
+    HTTP verification of candidate pages with a per-URL verdict cache (a
+    ``MemoryCache``, PAGE_VERIFY_CACHE_TTL). Verdicts are the
+    score_terms_page / score_privacy_page dicts; None means the browser has
+    to decide.
+    """
+
+    def __init__(self):
+        # (doc_type, url) -> verdict or NEEDS_BROWSER
+        self.verdicts = MemoryCache(
+            "page_verdicts",
+            ttl=settings.PAGE_VERIFY_CACHE_TTL,
+            max_bytes=settings.PAGE_VERIFY_CACHE_MAX_BYTES,
+            max_entries=settings.PAGE_VERIFY_CACHE_MAX_ENTRIES,
+        )
+        self.http_verdicts = 0
+        self.js_shells = 0
+        self.fetch_failures = 0
+
+    def clear(self):
+        self.verdicts.clear()
+
+    async def verify(self, url, doc_type):
+        """Verdict for url as a "tos" or "pp" page, or None if the browser must check it."""
+        if not settings.PAGE_VERIFY_HTTP_ENABLED:
+            return None
+        key = (doc_type, url)
+        cached = self.verdicts.get(key)
+        if cached is not None:
+            return None if cached == NEEDS_BROWSER else cached
+
+        final_url, html = await fetch_html(url)
+        if html is None:
+            # Not cached: the failure may be transient
+            self.fetch_failures += 1
+            return None
+
+        title, headings, body = extract_page_text(html)
+        if looks_like_js_shell(html, body):
+            self.js_shells += 1
+            logger.info(f"Candidate {url} is a JS shell, leaving verification to the browser")
+            self.verdicts.put(key, NEEDS_BROWSER)
+            return None
+
+        if doc_type == "tos":
+            verdict = score_terms_page(title, final_url, body, headings)
+        else:
+            verdict = score_privacy_page(title, final_url, body)
+        verdict["verifiedBy"] = "http"
+        self.http_verdicts += 1
+        self.verdicts.put(key, verdict)
+        return verdict
+
+    async def verify_many(self, urls, doc_type):
+        """
+        Verify candidates concurrently (at most PAGE_VERIFY_CONCURRENCY
+        fetches at once). Returns {url: verdict or None}.
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        semaphore = asyncio.Semaphore(settings.PAGE_VERIFY_CONCURRENCY)
+
+        async def bounded(url):
+            async with semaphore:
+                return await self.verify(url, doc_type)
+
+        started = time.monotonic()
+        verdicts = await asyncio.gather(*(bounded(url) for url in urls))
+        results = dict(zip(urls, verdicts))
+        if urls:
+            logger.info(
+                f"HTTP-verified {sum(v is not None for v in verdicts)}/{len(urls)} {doc_type} candidates "
+                f"in {(time.monotonic() - started) * 1000:.0f}ms"
+            )
+        return results
+
+    def snapshot(self):
+        """Verification counters; the verdict cache reports under memory_caches.page_verdicts."""
+        return {
+            "enabled": settings.PAGE_VERIFY_HTTP_ENABLED,
+            "http_verdicts": self.http_verdicts,
+            "js_shells": self.js_shells,
+            "fetch_failures": self.fetch_failures,
+        }
+
+
+page_verifier = PageVerifier()
@@ -0,0 +1,117 @@
+"""
+Cache and single-flight layer for the search-engine fallbacks.
+
+The DuckDuckGo / Yahoo / Bing fallbacks in tos.py and privacy.py drive a
+browser page to a results page on every call, and they are the slowest step
+of discovery. Results are cached in memory per (scope, engine, normalized
+query) with a TTL and byte and entry caps, and concurrent identical searches share
+one in-flight navigation: the first caller searches with its own page, the
+others wait for its answer instead of loading the same results page again.
+"""
+
+import asyncio
+import functools
+import logging
+import re
+from urllib.parse import unquote_plus
+
+from app.core.config import settings
+from app.core.memory_cache import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+# Returned to waiting callers when the leading search died; they then search themselves
+_LEADER_FAILED = object()
+
+# Cache lookup default, as None is a cached "no result"
+_MISSING = object()
+
+
+def normalize_query(query):
+    """Lowercase, URL-decode and collapse whitespace so trivially different queries share an entry."""
+    query = unquote_plus(str(query or "")).lower()
+    return re.sub(r"\s+", " ", query).strip()
+
+
+class SearchResultCache:
+    """
+    LRU of search fallback results (a ``MemoryCache``), plus the table of
+    searches currently in flight. Found URLs live for SEARCH_CACHE_TTL;
+    "no result" answers (often a captcha or empty results page) only for
+    SEARCH_CACHE_NEGATIVE_TTL.
+    """
+
+    def __init__(self):
+        self.results = MemoryCache(
+            "search_results",
+            ttl=settings.SEARCH_CACHE_TTL,
+            max_bytes=settings.SEARCH_CACHE_MAX_BYTES,
+            max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+        )
+        self._inflight = {}  # key -> Future shared by concurrent callers
+        self.shared = 0
+
+    def _put(self, key, result):
+        ttl = settings.SEARCH_CACHE_TTL if result else settings.SEARCH_CACHE_NEGATIVE_TTL
+        self.results.put(key, result, ttl=ttl)
+
+    def clear(self):
+        self.results.clear()
+
+    async def run(self, scope, engine, query, search, *args):
+        """
+        Return search(query, *args), served from the cache or from an
+        identical search already in flight when possible.
+        """
+        if not settings.SEARCH_CACHE_ENABLED:
+            return await search(query, *args)
+
+        key = (scope, engine, normalize_query(query))
+        result = self.results.get(key, _MISSING)
+        if result is not _MISSING:
+            logger.info(f"Search cache hit ({scope}/{engine}): {key[2]!r} -> {result}")
+            return result
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            logger.info(f"Joining in-flight {engine} search for {key[2]!r}")
+            # shield: a waiter being cancelled must not cancel the shared result
+            result = await asyncio.shield(inflight)
+            if result is not _LEADER_FAILED:
+                return result
+            return await search(query, *args)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await search(query, *args)
+        except BaseException:
+            future.set_result(_LEADER_FAILED)
+            raise
+        else:
+            self._put(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def cached(self, scope, engine):
+        """Decorator for an ``async def fallback(query, page)`` search function."""
+        def decorator(search):
+            @functools.wraps(search)
+            async def wrapper(query, *args):
+                return await self.run(scope, engine, query, search, *args)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """In-flight sharing; the result cache reports under memory_caches.search_results."""
+        return {
+            "enabled": settings.SEARCH_CACHE_ENABLED,
+            "in_flight": len(self._inflight),
+            "shared_in_flight": self.shared,
+        }
+
+
+search_cache = SearchResultCache()
@@ -0,0 +1,205 @@
+"""
+Cross-worker cache tier in Postgres.
+
+``MemoryCache`` instances created with ``shared=True`` sit in front of the
+UNLOGGED ``shared_cache`` table, so every worker and node shares their
+entries and a restart doesn't start cold:
+
+* read-through: a local miss asks the table. Lookups arriving within
+  SHARED_CACHE_READ_BATCH_MS of each other go out as one ``SELECT ... IN``,
+  and a read slower than SHARED_CACHE_READ_TIMEOUT counts as a miss, so a
+  slow database never holds up a request;
+* write-behind: puts are queued and written in batched upserts every
+  SHARED_CACHE_FLUSH_INTERVAL (sooner once SHARED_CACHE_FLUSH_BATCH are
+  queued). A later put of the same key replaces the queued one;
+* a sweeper deletes expired rows and trims the table to
+  SHARED_CACHE_MAX_BYTES every SHARED_CACHE_SWEEP_INTERVAL, then notes the
+  table's size for /debug/status.
+
+Rows hold the MemoryCache blob as is (JSON, maybe compressed), so
+nothing is re-encoded between tiers. Any database error is logged and
+treated as a miss.
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.crud.shared_cache import shared_cache_crud
+
+logger = logging.getLogger(__name__)
+
+# Longer keys are hashed to fit the id column
+MAX_READABLE_KEY_CHARS = 200
+
+
+def shared_key(cache_name, key):
+    key = key if isinstance(key, str) else repr(key)
+    if len(key) > MAX_READABLE_KEY_CHARS:
+        key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return f"{cache_name}:{key}"
+
+
+class SharedCacheTier:
+    """Batched read-through / write-behind access to the shared_cache table."""
+
+    def __init__(self):
+        self._reads = {}  # id -> Future shared by every waiter for that id
+        self._read_task = None
+        self._writes = {}  # id -> row, newest put wins
+        self._flush_wakeup = None
+        self._stopping = False
+        self._flush_task = None
+        self._sweep_task = None
+        self._tasks = []
+        self.read_batches = 0
+        self.read_hits = 0
+        self.read_misses = 0
+        self.read_errors = 0
+        self.read_timeouts = 0
+        self.written = 0
+        self.write_errors = 0
+        self.swept = 0
+        self.table_usage = None  # {"entries", "bytes"} as of the last sweep
+
+    @property
+    def enabled(self):
+        return settings.SHARED_CACHE_ENABLED
+
+    # Reads
+
+    async def get(self, entry_id):
+        """(compressed, blob, expires_at) for entry_id, or None."""
+        if not self.enabled:
+            return None
+        future = self._reads.get(entry_id)
+        if future is None:
+            future = self._reads[entry_id] = asyncio.get_running_loop().create_future()
+            if self._read_task is None:
+                self._read_task = asyncio.create_task(self._read_batch())
+        try:
+            # shield: one waiter timing out must not cancel the others' result
+            return await asyncio.wait_for(asyncio.shield(future), settings.SHARED_CACHE_READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.read_timeouts += 1
+            return None
+
+    async def _read_batch(self):
+        await asyncio.sleep(settings.SHARED_CACHE_READ_BATCH_MS / 1000)
+        batch, self._reads = self._reads, {}
+        self._read_task = None
+        self.read_batches += 1
+        try:
+            rows = await shared_cache_crud.get_many(list(batch))
+        except Exception as e:
+            self.read_errors += 1
+            logger.warning(f"Shared cache read of {len(batch)} keys failed: {e}")
+            rows = {}
+        for entry_id, future in batch.items():
+            row = rows.get(entry_id)
+            if row is None:
+                self.read_misses += 1
+            else:
+                self.read_hits += 1
+            if not future.done():
+                future.set_result(row)
+
+    # Writes
+
+    def put(self, entry_id, compressed, blob, ttl):
+        """Queue an upsert; written by the flusher (dropped when it isn't running)."""
+        if not self._tasks or len(blob) > settings.SHARED_CACHE_MAX_VALUE_BYTES:
+            return
+        self._writes[entry_id] = {
+            "id": entry_id,
+            "value": blob,
+            "compressed": compressed,
+            "size": len(blob),
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl),
+        }
+        if len(self._writes) >= settings.SHARED_CACHE_FLUSH_BATCH and self._flush_wakeup is not None:
+            self._flush_wakeup.set()
+
+    async def flush(self):
+        if not self._writes:
+            return
+        batch, self._writes = self._writes, {}
+        try:
+            await shared_cache_crud.put_many(batch.values())
+            self.written += len(batch)
+        except Exception as e:
+            self.write_errors += 1
+            logger.warning(f"Shared cache write of {len(batch)} entries failed, dropped: {e}")
+
+    async def _flusher(self):
+        # Never cancelled: a cancelled put_many would lose the batch in flight
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), settings.SHARED_CACHE_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            await self.flush()
+
+    # Sweeping
+
+    async def sweep(self):
+        try:
+            expired = await shared_cache_crud.delete_expired()
+            trimmed = await shared_cache_crud.trim_to_size(settings.SHARED_CACHE_MAX_BYTES)
+            self.table_usage = await shared_cache_crud.usage()
+        except Exception as e:
+            logger.warning(f"Shared cache sweep failed: {e}")
+            return
+        self.swept += expired + trimmed
+        if expired or trimmed:
+            logger.info(f"Shared cache sweep: {expired} expired, {trimmed} trimmed to the size cap")
+
+    async def _sweeper(self):
+        while True:
+            await asyncio.sleep(settings.SHARED_CACHE_SWEEP_INTERVAL)
+            await self.sweep()
+
+    # Lifecycle
+
+    def start(self):
+        if not self.enabled or self._tasks:
+            return
+        self._flush_wakeup = asyncio.Event()
+        self._stopping = False
+        self._flush_task = asyncio.create_task(self._flusher())
+        self._sweep_task = asyncio.create_task(self._sweeper())
+        self._tasks = [self._flush_task, self._sweep_task]
+        logger.info("Shared cache tier started")
+
+    async def stop(self):
+        if self._tasks:
+            # The flusher finishes the flush it is in and exits; the sweeper can just stop
+            self._stopping = True
+            self._flush_wakeup.set()
+            self._sweep_task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+        # Write what is still queued before the worker exits
+        await self.flush()
+
+    def snapshot(self):
+        return {
+            "enabled": self.enabled,
+            "running": bool(self._tasks),
+            "read_batches": self.read_batches,
+            "read_hits": self.read_hits,
+            "read_misses": self.read_misses,
+            "read_errors": self.read_errors,
+            "read_timeouts": self.read_timeouts,
+            "queued_writes": len(self._writes),
+            "written": self.written,
+            "write_errors": self.write_errors,
+            "swept": self.swept,
+            "table": self.table_usage,
+        }
+
+
+shared_cache_tier = SharedCacheTier()
@@ -0,0 +1,242 @@
+"""
+Sitemap discovery stage of the HTTP tier.
+
+Many sites list their legal pages in ``sitemap.xml``. ``find_sitemap_candidates``
+reads ``robots.txt`` for ``Sitemap:`` entries (falling back to
+``/sitemap.xml``), follows sitemap indexes, and streams each file, gzipped
+or not, through an incremental XML parser so that large sitemaps are never
+held in memory. Page URLs on the site whose path contains one of the given
+path patterns are returned; the caller scores them with the same link
+scorers as the other strategies.
+
+Everything is bounded: decompressed bytes (SITEMAP_MAX_BYTES), entries read
+(SITEMAP_MAX_URLS), sitemap files fetched (SITEMAP_MAX_FILES), candidates
+kept (SITEMAP_MAX_CANDIDATES) and the time the whole stage may take
+(SITEMAP_TOTAL_TIMEOUT, never past the discovery deadline).
+"""
+
+import asyncio
+import logging
+import time
+import zlib
+from urllib.parse import urljoin, urlparse
+from xml.etree import ElementTree
+
+from app.core.config import settings
+from app.core.discovery_planner import current_deadline
+from app.core.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# robots.txt is small; anything past this is ignored
+ROBOTS_MAX_BYTES = 512 * 1024
+
+# Child sitemaps that rarely list legal pages are read last
+LOW_PRIORITY_SITEMAP_WORDS = ("product", "post", "blog", "news", "article", "image", "video", "category", "tag")
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _bare_host(host):
+    host = (host or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def same_site(url, base_url):
+    """True if url is on base_url's host, its www/apex variant or a subdomain."""
+    host = _bare_host(urlparse(url).netloc)
+    base = _bare_host(urlparse(base_url).netloc)
+    return bool(host) and (host == base or host.endswith("." + base))
+
+
+def sitemap_priority(url):
+    """Sort key for child sitemaps: likely homes of static pages first."""
+    lowered = url.lower()
+    return any(word in lowered for word in LOW_PRIORITY_SITEMAP_WORDS)
+
+
+async def robots_sitemaps(base_url):
+    """Sitemap URLs declared in robots.txt, or the conventional /sitemap.xml."""
+    parsed = urlparse(base_url)
+    root = f"{parsed.scheme or 'https'}://{parsed.netloc}"
+    sitemaps = []
+    try:
+        client = get_http_client()
+        async with client.stream("GET", f"{root}/robots.txt", timeout=settings.SITEMAP_TIMEOUT) as response:
+            if response.status_code < 400:
+                body = b""
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= ROBOTS_MAX_BYTES:
+                        break
+                for line in body.decode(response.encoding or "utf-8", errors="replace").splitlines():
+                    key, _, value = line.partition(":")
+                    if key.strip().lower() == "sitemap" and value.strip():
+                        sitemaps.append(urljoin(root, value.strip()))
+    except Exception as e:
+        logger.info(f"Could not read robots.txt for {root}: {e}")
+    if not sitemaps:
+        sitemaps.append(f"{root}/sitemap.xml")
+    # Keep order, drop duplicates
+    return list(dict.fromkeys(sitemaps))
+
+
+class SitemapBudget:
+    """Byte and entry allowance shared by every sitemap file of one discovery."""
+
+    def __init__(self):
+        self.bytes_left = settings.SITEMAP_MAX_BYTES
+        self.urls_left = settings.SITEMAP_MAX_URLS
+        self.files_left = settings.SITEMAP_MAX_FILES
+
+    @property
+    def read_exhausted(self):
+        """No bytes or entries left to read in the current file."""
+        return self.bytes_left <= 0 or self.urls_left <= 0
+
+    @property
+    def exhausted(self):
+        return self.read_exhausted or self.files_left <= 0
+
+
+async def stream_sitemap(url, budget):
+    """
+    Stream one sitemap file. Returns (kind, locs): kind is "urlset" or
+    "sitemapindex" (None if the file isn't a sitemap), locs the <loc> values
+    read before the file or the budget ran out.
+    """
+    budget.files_left -= 1
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    root = None
+    kind = None
+    locs = []
+    decompressor = None
+    first_chunk = True
+
+    def consume(data):
+        nonlocal root, kind
+        parser.feed(data)
+        for event, element in parser.read_events():
+            name = _local_name(element.tag)
+            if event == "start":
+                if root is None:
+                    root, kind = element, name
+                continue
+            if name == "loc" and element.text:
+                locs.append(element.text.strip())
+                budget.urls_left -= 1
+            elif name in ("url", "sitemap") and root is not None:
+                # Entries are done with; keep memory flat on huge files
+                root.clear()
+
+    try:
+        client = get_http_client()
+        async with client.stream("GET", url, timeout=settings.SITEMAP_TIMEOUT) as response:
+            if response.status_code >= 400:
+                logger.info(f"Sitemap {url} returned {response.status_code}")
+                return None, []
+            async for chunk in response.aiter_bytes():
+                if first_chunk:
+                    first_chunk = False
+                    # .xml.gz files come as raw gzip; Content-Encoding gzip is already undone by httpx
+                    if chunk.startswith(GZIP_MAGIC):
+                        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                if decompressor is not None:
+                    # Bound the decompressed size, not just the download
+                    chunk = decompressor.decompress(chunk, max(budget.bytes_left, 0) + 1)
+                budget.bytes_left -= len(chunk)
+                consume(chunk)
+                if kind not in (None, "urlset", "sitemapindex"):
+                    logger.info(f"{url} is not a sitemap (<{kind}>)")
+                    return None, []
+                if budget.read_exhausted:
+                    logger.info(f"Sitemap budget exhausted while reading {url}")
+                    break
+    except ElementTree.ParseError as e:
+        logger.info(f"Sitemap {url} is not valid XML past {len(locs)} entries: {e}")
+    except Exception as e:
+        logger.info(f"Could not read sitemap {url}: {e}")
+    return kind, locs
+
+
+async def find_sitemap_candidates(base_url, patterns):
+    """
+    Page URLs on base_url's site, listed in its sitemaps, whose path contains
+    any of patterns (e.g. TOS_PATH_PATTERNS). Shortest URLs first, as the
+    canonical page usually has the plainest path.
+    """
+    patterns = [pattern.lower() for pattern in patterns]
+    started = time.monotonic()
+    deadline = min(started + settings.SITEMAP_TOTAL_TIMEOUT, current_deadline())
+    budget = SitemapBudget()
+    seen_sitemaps = set()
+    candidates = []
+    entries = 0
+    try:
+        queue = await asyncio.wait_for(robots_sitemaps(base_url), max(deadline - time.monotonic(), 0))
+    except asyncio.TimeoutError:
+        logger.info(f"Sitemap discovery for {base_url}: out of time reading robots.txt")
+        return candidates
+
+    while queue and not budget.exhausted and len(candidates) < settings.SITEMAP_MAX_CANDIDATES:
+        sitemap_url = queue.pop(0)
+        if sitemap_url in seen_sitemaps:
+            continue
+        seen_sitemaps.add(sitemap_url)
+
+        try:
+            kind, locs = await asyncio.wait_for(
+                stream_sitemap(sitemap_url, budget), max(deadline - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            logger.info(f"Sitemap discovery for {base_url}: out of time reading {sitemap_url}")
+            break
+        if kind == "sitemapindex":
+            queue.extend(sorted((loc for loc in locs if loc not in seen_sitemaps), key=sitemap_priority))
+            continue
+        entries += len(locs)
+        for loc in locs:
+            if not same_site(loc, base_url):
+                continue
+            path = urlparse(loc).path.lower()
+            if any(pattern in path for pattern in patterns) and loc not in candidates:
+                candidates.append(loc)
+                if len(candidates) >= settings.SITEMAP_MAX_CANDIDATES:
+                    break
+
+    candidates.sort(key=len)
+    logger.info(
+        f"Sitemap discovery for {base_url}: {len(candidates)} candidates from {entries} entries "
+        f"in {len(seen_sitemaps)} sitemap(s), {(time.monotonic() - started) * 1000:.0f}ms"
+    )
+    return candidates
+
+
+def sitemap_link_entries(urls):
+    """
+    Sitemap URLs as link-snapshot entries for the link scorers. There is no
+    anchor text, so the last path segment stands in for it
+    ("/legal/terms-of-service" reads as "terms of service").
+    """
+    entries = []
+    for index, url in enumerate(urls):
+        segments = [segment for segment in urlparse(url).path.split("/") if segment]
+        slug = segments[-1] if segments else ""
+        slug = slug.rsplit(".", 1)[0] if "." in slug else slug
+        entries.append({
+            "index": index,
+            "href": url,
+            "rawHref": url,
+            "text": slug.replace("-", " ").replace("_", " ").lower(),
+            "isFooter": False,
+            "inFooterArea": False,
+            "isNav": False,
+            "parentText": "",
+            "visible": True,
+            "pageFraction": 0,
+        })
+    return entries
@@ -0,0 +1,214 @@
+"""
+Browser-free adapter for Apple App Store and Google Play listings.
+
+Store pages are server-rendered: the app name and icon are in the JSON-LD
+``SoftwareApplication`` block and OpenGraph tags, and the developer's
+website and privacy policy are plain anchors. ``store_app_info`` reads all
+of it from one HTTP fetch of the listing (Play listings that don't expose
+the privacy link get one more fetch, of the data safety page) and caches
+the result per app ID, so store-URL submissions need no browser before
+discovery moves on to the developer's own site.
+"""
+
+import json
+import logging
+import re
+import time
+from urllib.parse import parse_qs, urlparse
+
+from app.core.config import settings
+from app.core.http_discovery import fetch_html, parse_anchors
+from app.core.memory_cache import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+APP_STORE_ID_PATTERN = re.compile(r"/id(\d+)")
+
+JSON_LD_PATTERN = re.compile(
+    r"<script[^>]+type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL
+)
+
+# Absolute URLs embedded in inline scripts (Play keeps some links only there)
+EMBEDDED_URL_PATTERN = re.compile(r"https?://[^\"'\s<>\\]+")
+
+# Links on these hosts belong to the store, never to the developer
+STORE_HOST_SUFFIXES = ("apple.com", "google.com", "gstatic.com", "googleusercontent.com", "youtube.com")
+
+TITLE_SUFFIXES = (" on the App Store", " - Apps on Google Play", " – Apps on Google Play")
+
+WEBSITE_LINK_TEXTS = ("developer website", "website", "visit website")
+
+
+def store_app_id(url):
+    """("app_store" | "play_store", app_id) for a store listing URL, else None."""
+    parsed = urlparse(url or "")
+    host = parsed.netloc.lower()
+    if host.endswith("apps.apple.com") or host.endswith("itunes.apple.com"):
+        match = APP_STORE_ID_PATTERN.search(parsed.path)
+        return ("app_store", match.group(1)) if match else None
+    if host.endswith("play.google.com") and "/store/apps" in parsed.path:
+        app_id = parse_qs(parsed.query).get("id", [None])[0]
+        return ("play_store", app_id) if app_id else None
+    return None
+
+
+def _is_store_host(url):
+    host = urlparse(url).netloc.lower()
+    return not host or any(host == suffix or host.endswith("." + suffix) for suffix in STORE_HOST_SUFFIXES)
+
+
+def _json_ld_app(html):
+    """The SoftwareApplication / MobileApplication JSON-LD object, if any."""
+    for block in JSON_LD_PATTERN.findall(html):
+        try:
+            data = json.loads(block.strip())
+        except ValueError:
+            continue
+        items = data if isinstance(data, list) else data.get("@graph", [data]) if isinstance(data, dict) else []
+        for item in items:
+            if isinstance(item, dict) and item.get("@type") in ("SoftwareApplication", "MobileApplication"):
+                return item
+    return {}
+
+
+def _meta_content(html, prop):
+    """content of <meta property|name="prop">, attributes in either order."""
+    for pattern in (
+        rf"<meta[^>]+(?:property|name)=[\"']{re.escape(prop)}[\"'][^>]*content=[\"']([^\"']*)[\"']",
+        rf"<meta[^>]+content=[\"']([^\"']*)[\"'][^>]*(?:property|name)=[\"']{re.escape(prop)}[\"']",
+    ):
+        match = re.search(pattern, html, re.IGNORECASE)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _clean_title(title):
+    title = (title or "").strip()
+    for suffix in TITLE_SUFFIXES:
+        if title.endswith(suffix):
+            title = title[: -len(suffix)]
+    return title.strip() or None
+
+
+def _privacy_link(links):
+    """The developer's privacy policy among a store page's anchors."""
+    for link in links:
+        href = link.get("href", "")
+        if "privacy" in f"{link.get('text', '')} {href}".lower() and not _is_store_host(href):
+            return href
+    return None
+
+
+def _website_link(links):
+    for link in links:
+        if link.get("text", "").strip().lower() in WEBSITE_LINK_TEXTS and not _is_store_host(link.get("href", "")):
+            return link["href"]
+    return None
+
+
+def parse_store_page(html, page_url):
+    """Name, icon, developer and links of a store listing from its static HTML."""
+    app = _json_ld_app(html)
+    author = app.get("author") if isinstance(app.get("author"), dict) else {}
+    image = app.get("image")
+    if isinstance(image, list):
+        image = image[0] if image else None
+    if isinstance(image, dict):
+        image = image.get("url")
+
+    links, _ = parse_anchors(html, page_url)
+    developer_website = _website_link(links)
+    if not developer_website and author.get("url") and not _is_store_host(author["url"]):
+        developer_website = author["url"]
+
+    return {
+        "name": _clean_title(app.get("name") or _meta_content(html, "og:title")),
+        "icon_url": image or _meta_content(html, "og:image"),
+        "developer_name": author.get("name"),
+        "developer_website": developer_website,
+        "privacy_url": _privacy_link(links),
+    }
+
+
+def _embedded_privacy_url(html):
+    """A developer privacy URL that only appears inside the page's inline data."""
+    for url in EMBEDDED_URL_PATTERN.findall(html):
+        if "privacy" in url.lower() and not _is_store_host(url):
+            return url
+    return None
+
+
+# (store, app_id) -> store_app_info result; None (nothing usable) is cached for STORE_INFO_NEGATIVE_TTL
+store_info_cache = MemoryCache(
+    "store_info",
+    ttl=settings.STORE_INFO_CACHE_TTL,
+    max_bytes=settings.STORE_INFO_CACHE_MAX_BYTES,
+    max_entries=settings.STORE_INFO_CACHE_MAX_ENTRIES,
+)
+
+# Cache lookup default, as None is a cached "nothing usable"
+_MISSING = object()
+
+
+async def store_app_info(url):
+    """
+    Store listing details for an App Store or Play Store URL, without a
+    browser: {"store", "app_id", "name", "icon_url", "developer_name",
+    "developer_website", "privacy_url"}. None if url isn't a store listing,
+    the adapter is disabled or the page couldn't be read.
+    """
+    if not settings.STORE_FAST_PATH_ENABLED:
+        return None
+    key = store_app_id(url)
+    if not key:
+        return None
+    info = store_info_cache.get(key, _MISSING)
+    if info is not _MISSING:
+        return info
+
+    store, app_id = key
+    if store == "app_store":
+        listing_url = f"https://apps.apple.com/us/app/id{app_id}"
+    else:
+        listing_url = f"https://play.google.com/store/apps/details?id={app_id}&hl=en_US"
+
+    started = time.monotonic()
+    final_url, html = await fetch_html(listing_url)
+    if html is None:
+        logger.info(f"Could not fetch {store} listing {app_id}; leaving it to the browser")
+        # Not cached: the failure may be transient
+        return None
+
+    info = parse_store_page(html, final_url)
+    if store == "play_store" and not info["privacy_url"]:
+        info["privacy_url"] = _embedded_privacy_url(html)
+        if not info["privacy_url"]:
+            # The data safety page always links the developer's policy
+            safety_url, safety_html = await fetch_html(
+                f"https://play.google.com/store/apps/datasafety?id={app_id}&hl=en_US"
+            )
+            if safety_html:
+                safety_links, _ = parse_anchors(safety_html, safety_url)
+                info["privacy_url"] = _privacy_link(safety_links) or _embedded_privacy_url(safety_html)
+
+    info.update({"store": store, "app_id": app_id})
+    if not (info["name"] or info["privacy_url"] or info["developer_website"]):
+        info = None
+    logger.info(
+        f"Store adapter: {store} {app_id} in {(time.monotonic() - started) * 1000:.0f}ms -> "
+        f"{info and {k: info[k] for k in ('name', 'developer_website', 'privacy_url')}}"
+    )
+    store_info_cache.put(key, info, ttl=settings.STORE_INFO_CACHE_TTL if info else settings.STORE_INFO_NEGATIVE_TTL)
+    return info
+
+
+def developer_site(info):
+    """scheme://host of the developer's website, else of their privacy policy, from store_app_info."""
+    if not info:
+        return None
+    for url in (info.get("developer_website"), info.get("privacy_url")):
+        parsed = urlparse(url or "")
+        if parsed.scheme and parsed.netloc:
+            return f"{parsed.scheme}://{parsed.netloc}"
+    return None
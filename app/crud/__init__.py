@@ -1,12 +1,24 @@
 from app.crud.document import DocumentCRUD, document_crud
 from app.crud.submission import SubmissionCRUD, submission_crud
 from app.crud.stats import StatsCRUD, stats_crud
+from app.crud.discovery_cache import DiscoveryCacheCRUD, discovery_cache_crud
+from app.crud.discovery_outcome import DiscoveryOutcomeCRUD, discovery_outcome_crud
+from app.crud.shared_cache import SharedCacheCRUD, shared_cache_crud
+from app.crud.url_validator import UrlValidatorCRUD, url_validator_crud
 
 __all__ = [
     "DocumentCRUD",
     "SubmissionCRUD",
     "StatsCRUD",
+    "DiscoveryCacheCRUD",
+    "DiscoveryOutcomeCRUD",
+    "SharedCacheCRUD",
+    "UrlValidatorCRUD",
     "document_crud",
     "submission_crud",
     "stats_crud",
+    "discovery_cache_crud",
+    "discovery_outcome_crud",
+    "shared_cache_crud",
+    "url_validator_crud",
 ]
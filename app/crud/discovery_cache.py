@@ -0,0 +1,77 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import async_engine, discovery_cache
+from app.crud.base import CRUDBase
+
+logger = logging.getLogger(__name__)
+
+
+class DiscoveryCacheCRUD(CRUDBase):
+    """CRUD helper for the per-domain ToS/privacy discovery cache."""
+
+    def __init__(self) -> None:
+        super().__init__(discovery_cache)
+
+    @staticmethod
+    def entry_id(domain: str, document_type: str) -> str:
+        return f"{domain}:{document_type}"
+
+    async def get_fresh(self, domain: str, document_type: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for domain/document_type unless it has expired."""
+        query = (
+            select(discovery_cache)
+            .where(discovery_cache.c.id == self.entry_id(domain, document_type))
+            .where(discovery_cache.c.expires_at > datetime.now(timezone.utc))
+            .limit(1)
+        )
+        async with async_engine.connect() as conn:
+            result = await conn.execute(query)
+            row = result.fetchone()
+            return dict(row._mapping) if row else None
+
+    async def upsert(
+        self,
+        domain: str,
+        document_type: str,
+        url: Optional[str],
+        method_used: Optional[str],
+        confidence: float,
+        ttl_seconds: int,
+    ) -> None:
+        """Insert or replace the entry for domain/document_type."""
+        now = datetime.now(timezone.utc)
+        values = {
+            "domain": domain,
+            "document_type": document_type,
+            "url": url,
+            "method_used": method_used,
+            "confidence": confidence,
+            "found": bool(url),
+            "discovered_at": now,
+            "expires_at": now + timedelta(seconds=ttl_seconds),
+        }
+        statement = (
+            insert(discovery_cache)
+            .values(id=self.entry_id(domain, document_type), **values)
+            .on_conflict_do_update(index_elements=[discovery_cache.c.id], set_=values)
+        )
+        async with async_engine.begin() as conn:
+            await conn.execute(statement)
+
+    async def invalidate(self, domain: str, document_type: Optional[str] = None) -> int:
+        """Delete the entries for domain (one document type, or both). Returns the count."""
+        statement = delete(discovery_cache).where(discovery_cache.c.domain == domain)
+        if document_type:
+            statement = statement.where(discovery_cache.c.document_type == document_type)
+        statement = statement.returning(discovery_cache.c.id)
+        async with async_engine.begin() as conn:
+            result = await conn.execute(statement)
+            return len(result.fetchall())
+
+
+discovery_cache_crud = DiscoveryCacheCRUD()
@@ -0,0 +1,83 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import async_engine, discovery_outcomes
+from app.crud.base import CRUDBase
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in typical_ms (matches the planner's in-memory average)
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class DiscoveryOutcomeCRUD(CRUDBase):
+    """CRUD helper for per-domain, per-strategy discovery outcomes."""
+
+    def __init__(self) -> None:
+        super().__init__(discovery_outcomes)
+
+    async def get_for_domain(
+        self, domain: str, document_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        query = select(discovery_outcomes).where(discovery_outcomes.c.domain == domain)
+        if document_type:
+            query = query.where(discovery_outcomes.c.document_type == document_type)
+        async with async_engine.connect() as conn:
+            result = await conn.execute(query)
+            return [dict(row._mapping) for row in result.fetchall()]
+
+    async def record_many(
+        self,
+        domain: str,
+        document_type: str,
+        outcomes: Iterable[Tuple[str, Optional[float], bool]],
+    ) -> None:
+        """
+        Add (strategy, elapsed_ms, hit) outcomes in one transaction.
+        elapsed_ms is None when the attempt was cut short and says nothing
+        about the strategy's latency.
+        """
+        now = datetime.now(timezone.utc)
+        table = discovery_outcomes
+        async with async_engine.begin() as conn:
+            for strategy, elapsed_ms, hit in outcomes:
+                typical = table.c.typical_ms
+                if elapsed_ms is not None:
+                    typical = case(
+                        (table.c.typical_ms.is_(None), elapsed_ms),
+                        else_=table.c.typical_ms + LATENCY_EWMA_ALPHA * (elapsed_ms - table.c.typical_ms),
+                    )
+                statement = (
+                    insert(table)
+                    .values(
+                        id=f"{domain}:{document_type}:{strategy}",
+                        domain=domain,
+                        document_type=document_type,
+                        strategy=strategy,
+                        attempts=1,
+                        hits=1 if hit else 0,
+                        typical_ms=elapsed_ms,
+                        last_hit_at=now if hit else None,
+                        last_miss_at=None if hit else now,
+                        updated_at=now,
+                    )
+                    .on_conflict_do_update(
+                        index_elements=[table.c.id],
+                        set_={
+                            "attempts": table.c.attempts + 1,
+                            "hits": table.c.hits + (1 if hit else 0),
+                            "typical_ms": typical,
+                            "last_hit_at": now if hit else table.c.last_hit_at,
+                            "last_miss_at": table.c.last_miss_at if hit else now,
+                            "updated_at": now,
+                        },
+                    )
+                )
+                await conn.execute(statement)
+
+
+discovery_outcome_crud = DiscoveryOutcomeCRUD()
@@ -199,6 +199,7 @@ class DocumentCRUD(CRUDBase):
             'hundred_word_summary',
             'word_frequencies',
             'text_mining_metrics',
+            'content_fingerprint',
             'company_name',
             'logo_url',
         ]:
@@ -246,6 +247,23 @@ class DocumentCRUD(CRUDBase):
 
         return dict(row._mapping)
 
+    async def touch(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Bump updated_at of a document whose source was re-checked and found unchanged."""
+        update_stmt = (
+            update(documents)
+            .where(documents.c.id == doc_id)
+            .values(updated_at=datetime.now(timezone.utc))
+            .returning(*documents.columns)
+        )
+        async with async_engine.begin() as conn:
+            result = await conn.execute(update_stmt)
+            row = result.fetchone()
+
+        if not row:
+            return None
+
+        return dict(row._mapping)
+
     async def create(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:  # type: ignore[override]
         payload = data.copy()
         payload.setdefault('id', str(uuid4()))
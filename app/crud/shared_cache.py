@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import async_engine, shared_cache
+from app.crud.base import CRUDBase
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCacheCRUD(CRUDBase):
+    """CRUD helper for the cross-worker cache table (batched reads and writes)."""
+
+    def __init__(self) -> None:
+        super().__init__(shared_cache)
+
+    async def get_many(self, ids: List[str]) -> Dict[str, Tuple[bool, bytes, datetime]]:
+        """{id: (compressed, value, expires_at)} for the ids that exist and haven't expired."""
+        query = (
+            select(shared_cache.c.id, shared_cache.c.compressed, shared_cache.c.value, shared_cache.c.expires_at)
+            .where(shared_cache.c.id.in_(ids))
+            .where(shared_cache.c.expires_at > datetime.now(timezone.utc))
+        )
+        async with async_engine.connect() as conn:
+            result = await conn.execute(query)
+            return {row.id: (row.compressed, bytes(row.value), row.expires_at) for row in result.fetchall()}
+
+    async def put_many(self, rows: Iterable[Dict]) -> None:
+        """Upsert rows ({id, value, compressed, size, expires_at}) in one statement."""
+        rows = list(rows)
+        if not rows:
+            return
+        statement = insert(shared_cache)
+        statement = statement.on_conflict_do_update(
+            index_elements=[shared_cache.c.id],
+            set_={
+                "value": statement.excluded.value,
+                "compressed": statement.excluded.compressed,
+                "size": statement.excluded.size,
+                "expires_at": statement.excluded.expires_at,
+            },
+        )
+        async with async_engine.begin() as conn:
+            await conn.execute(statement, rows)
+
+    async def delete_expired(self) -> int:
+        statement = (
+            delete(shared_cache)
+            .where(shared_cache.c.expires_at <= datetime.now(timezone.utc))
+            .returning(shared_cache.c.id)
+        )
+        async with async_engine.begin() as conn:
+            result = await conn.execute(statement)
+            return len(result.fetchall())
+
+    async def trim_to_size(self, max_bytes: int) -> int:
+        """Delete the entries closest to expiry until the table holds at most max_bytes."""
+        newest_first = (
+            select(
+                shared_cache.c.id,
+                func.sum(shared_cache.c.size)
+                .over(order_by=(shared_cache.c.expires_at.desc(), shared_cache.c.id))
+                .label("running_bytes"),
+            )
+        ).subquery()
+        statement = (
+            delete(shared_cache)
+            .where(
+                shared_cache.c.id.in_(
+                    select(newest_first.c.id).where(newest_first.c.running_bytes > max_bytes)
+                )
+            )
+            .returning(shared_cache.c.id)
+        )
+        async with async_engine.begin() as conn:
+            result = await conn.execute(statement)
+            return len(result.fetchall())
+
+    async def usage(self) -> Dict[str, int]:
+        query = select(func.count(), func.coalesce(func.sum(shared_cache.c.size), 0))
+        async with async_engine.connect() as conn:
+            result = await conn.execute(query)
+            entries, size = result.fetchone()
+            return {"entries": entries, "bytes": int(size)}
+
+
+shared_cache_crud = SharedCacheCRUD()
@@ -0,0 +1,71 @@
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import async_engine, url_validators
+from app.crud.base import CRUDBase
+
+logger = logging.getLogger(__name__)
+
+
+class UrlValidatorCRUD(CRUDBase):
+    """CRUD helper for per-URL ETag / Last-Modified / content hash records."""
+
+    def __init__(self) -> None:
+        super().__init__(url_validators)
+
+    @staticmethod
+    def entry_id(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    async def get_for_url(self, url: str) -> Optional[Dict[str, Any]]:
+        query = select(url_validators).where(url_validators.c.id == self.entry_id(url)).limit(1)
+        async with async_engine.connect() as conn:
+            result = await conn.execute(query)
+            row = result.fetchone()
+            return dict(row._mapping) if row else None
+
+    async def upsert(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content_hash: Optional[str],
+    ) -> None:
+        """Record the validators of a newly analysed version of url."""
+        now = datetime.now(timezone.utc)
+        values = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash,
+            "checked_at": now,
+            "changed_at": now,
+        }
+        statement = (
+            insert(url_validators)
+            .values(id=self.entry_id(url), **values)
+            .on_conflict_do_update(index_elements=[url_validators.c.id], set_=values)
+        )
+        async with async_engine.begin() as conn:
+            await conn.execute(statement)
+
+    async def mark_checked(
+        self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> None:
+        """Bump checked_at after an unchanged re-fetch, keeping any rotated validators."""
+        values: Dict[str, Any] = {"checked_at": datetime.now(timezone.utc)}
+        if etag:
+            values["etag"] = etag
+        if last_modified:
+            values["last_modified"] = last_modified
+        statement = update(url_validators).where(url_validators.c.id == self.entry_id(url)).values(**values)
+        async with async_engine.begin() as conn:
+            await conn.execute(statement)
+
+
+url_validator_crud = UrlValidatorCRUD()
@@ -9,8 +9,16 @@ import subprocess # For git command execution
 
 # Import the API routers
 from app.api.v1.api import api_router, test_router
-# ---> ADDED: Import the Playwright Manager
-from app.api.v1.endpoints.extract import auth_manager 
+# ---> ADDED: Import the shared Playwright browser pool
+from app.core.browser import browser_pool
+from app.core.discovery_cache import discovery_cache_stats
+from app.core.discovery_planner import strategy_stats
+from app.core.http_client import client_snapshot, close_http_client
+from app.core.http_discovery import discovery_stats
+from app.core.memory_cache import memory_cache_snapshots
+from app.core.shared_cache import shared_cache_tier
+from app.core.page_verification import page_verifier
+from app.core.search_cache import search_cache
 
 # Import settings
 from app.core.config import settings
@@ -124,6 +132,7 @@ async def startup_event():
         await ensure_tables_exist()
         database_initialized = True
         logger.info("Database tables verified or created.")
+        shared_cache_tier.start()
     except Exception as e:
         error_msg = f"Database table creation failed: {str(e)}"
         logger.error(error_msg, exc_info=True)
@@ -133,20 +142,23 @@ async def startup_event():
     logger.info("STEP 3: Initializing Playwright...")
     try:
         # Start Playwright with a timeout
-        await asyncio.wait_for(auth_manager.startup(), timeout=90.0) # 90 second timeout
+        await asyncio.wait_for(browser_pool.startup(), timeout=90.0) # 90 second timeout
         logger.info("Playwright startup successful.")
         playwright_initialized = True
+        if settings.BROWSER_POOL_WARMUP:
+            await browser_pool.warm_up()
+        browser_pool.start_watchdog()
     except asyncio.TimeoutError:
         error_msg = "Playwright startup timed out after 90 seconds."
         logger.error(error_msg)
         startup_errors.append(error_msg)
-        auth_manager.startup_failure = "Startup timed out"
+        browser_pool.startup_failure = "Startup timed out"
     except Exception as e:
         error_msg = f"Playwright initialization failed: {str(e)}"
         logger.error(error_msg, exc_info=True)
         startup_errors.append(error_msg)
-        if not auth_manager.startup_failure:
-            auth_manager.startup_failure = str(e)
+        if not browser_pool.startup_failure:
+            browser_pool.startup_failure = str(e)
     
     # Log summary of startup status
     logger.info("===== STARTUP SUMMARY =====")
@@ -162,8 +174,10 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Application shutdown: Shutting down services...")
-    await auth_manager.shutdown()
+    await browser_pool.shutdown()
     logger.info("Playwright shut down complete.")
+    await shared_cache_tier.stop()
+    await close_http_client()
 
 # Set up CORS middleware with explicit origins
 app.add_middleware(
@@ -225,8 +239,17 @@ async def debug_status():
             },
             "playwright": {
                 "status": "ready" if playwright_initialized else "not_ready",
-                "startup_failure": auth_manager.startup_failure if hasattr(auth_manager, "startup_failure") else None
-            }
+                "startup_failure": browser_pool.startup_failure if hasattr(browser_pool, "startup_failure") else None,
+                "pool": browser_pool.get_stats()
+            },
+            "http_client": client_snapshot(),
+            "discovery": discovery_stats.snapshot(),
+            "discovery_cache": discovery_cache_stats.snapshot(),
+            "search_cache": search_cache.snapshot(),
+            "page_verification": page_verifier.snapshot(),
+            "memory_caches": memory_cache_snapshots(),
+            "shared_cache": shared_cache_tier.snapshot(),
+            "discovery_strategies": strategy_stats.snapshot()
         },
         "startup_errors": startup_errors
     }
@@ -57,6 +57,7 @@ class CrawlPrivacyResponse(BaseModel):
 class ReanalyzeTosRequest(BaseModel):
     document_id: str
     url: Optional[str] = None  # Optional new URL to use for extraction
+    force: bool = False  # Reanalyze even if the page is unchanged since the last analysis
     
 class ReanalyzeTosResponse(CrawlTosResponse):
     pass
@@ -64,6 +65,7 @@ class ReanalyzeTosResponse(CrawlTosResponse):
 class ReanalyzePrivacyRequest(BaseModel):
     document_id: str
     url: Optional[str] = None  # Optional new URL to use for extraction
+    force: bool = False  # Reanalyze even if the page is unchanged since the last analysis
     
 class ReanalyzePrivacyResponse(CrawlPrivacyResponse):
     pass 
\ No newline at end of file
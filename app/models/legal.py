@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class LegalRequest(BaseModel):
+    url: str
+
+class LegalResponse(BaseModel):
+    url: str
+    tos_url: Optional[str] = None
+    pp_url: Optional[str] = None
+    success: bool
+    message: str
+    tos_method_used: Optional[str] = None
+    pp_method_used: Optional[str] = None
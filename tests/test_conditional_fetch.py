@@ -0,0 +1,146 @@
+import httpx
+import pytest
+
+from app.core import conditional_fetch
+from app.core.conditional_fetch import (
+    content_hash,
+    mark_browser_extracted,
+    record_analyzed,
+    remember_fetch,
+    revalidate,
+    text_fingerprint,
+)
+from app.core.config import settings
+
+
+class FakeURLValidatorCRUD:
+    def __init__(self):
+        self.rows = {}
+        self.checked = []
+
+    def entry_id(self, url):
+        return url
+
+    async def get_for_url(self, url):
+        return self.rows.get(url)
+
+    async def upsert(self, url, etag, last_modified, body_hash):
+        self.rows[url] = {"etag": etag, "last_modified": last_modified, "content_hash": body_hash}
+
+    async def remove(self, entry_id):
+        self.rows.pop(entry_id, None)
+
+    async def mark_checked(self, url, etag, last_modified):
+        self.checked.append((url, etag, last_modified))
+
+
+@pytest.fixture
+def validators(monkeypatch):
+    monkeypatch.setattr(settings, "CONDITIONAL_REFETCH_ENABLED", True)
+    crud = FakeURLValidatorCRUD()
+    monkeypatch.setattr(conditional_fetch, "url_validator_crud", crud)
+    conditional_fetch._recent_fetches.clear()
+    yield crud
+    conditional_fetch._recent_fetches.clear()
+
+
+def respond_with(monkeypatch, status_code, body=b"", headers=None):
+    sent = []
+
+    async def fake_fetch(url, headers=None):
+        sent.append(headers)
+        return httpx.Response(status_code, headers=response_headers), body
+
+    response_headers = headers or {}
+    monkeypatch.setattr(conditional_fetch, "fetch", fake_fetch)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_record_analyzed_persists_remembered_validators(validators):
+    remember_fetch(
+        ["https://example.com/terms", "https://www.example.com/terms"],
+        {"ETag": '"v1"', "Last-Modified": "Tue, 01 Sep 2026 00:00:00 GMT"},
+        b"terms body",
+    )
+    await record_analyzed("https://www.example.com/terms")
+    assert validators.rows["https://www.example.com/terms"] == {
+        "etag": '"v1"',
+        "last_modified": "Tue, 01 Sep 2026 00:00:00 GMT",
+        "content_hash": content_hash(b"terms body"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_record_analyzed_drops_old_record_for_browser_extracted_text(validators):
+    url = "https://example.com/terms"
+    validators.rows[url] = {"etag": '"old"', "last_modified": None, "content_hash": "old"}
+    remember_fetch([url], {}, b"static shell")
+    mark_browser_extracted([url])
+    await record_analyzed(url)
+    assert url not in validators.rows
+
+
+@pytest.mark.asyncio
+async def test_record_analyzed_keeps_record_when_nothing_is_remembered(validators):
+    # e.g. the text came from another worker's extraction cache
+    url = "https://example.com/terms"
+    validators.rows[url] = {"etag": '"v1"', "last_modified": None, "content_hash": "v1"}
+    await record_analyzed(url)
+    assert validators.rows[url]["etag"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_revalidate_not_modified(validators, monkeypatch):
+    url = "https://example.com/terms"
+    validators.rows[url] = {"etag": '"v1"', "last_modified": "yesterday", "content_hash": content_hash(b"a")}
+    sent = respond_with(monkeypatch, 304, headers={"ETag": '"v1"'})
+
+    result = await revalidate(url)
+    assert (result.unchanged, result.reason, result.status_code) == (True, "not_modified", 304)
+    assert sent == [{"If-None-Match": '"v1"', "If-Modified-Since": "yesterday"}]
+    assert validators.checked == [(url, '"v1"', None)]
+
+
+@pytest.mark.asyncio
+async def test_revalidate_same_content(validators, monkeypatch):
+    url = "https://example.com/terms"
+    validators.rows[url] = {"etag": None, "last_modified": None, "content_hash": content_hash(b"same body")}
+    sent = respond_with(monkeypatch, 200, b"same body")
+
+    result = await revalidate(url)
+    assert (result.unchanged, result.reason, result.status_code) == (True, "same_content", 200)
+    assert sent == [{}]
+    assert validators.checked == [(url, None, None)]
+
+
+@pytest.mark.asyncio
+async def test_revalidate_changed(validators, monkeypatch):
+    url = "https://example.com/terms"
+    validators.rows[url] = {"etag": '"v1"', "last_modified": None, "content_hash": content_hash(b"old body")}
+    respond_with(monkeypatch, 200, b"new body", {"ETag": '"v2"'})
+
+    result = await revalidate(url)
+    assert (result.unchanged, result.reason, result.status_code) == (False, "changed", 200)
+    assert validators.checked == []
+    # The new validators aren't remembered: only the analysed fetch may be recorded
+    await record_analyzed(url)
+    assert validators.rows[url]["etag"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_revalidate_without_validators(validators, monkeypatch):
+    sent = respond_with(monkeypatch, 304)
+    result = await revalidate("https://example.com/never-analysed")
+    assert (result.unchanged, result.reason) == (False, "no_validators")
+    assert sent == []
+
+
+def test_text_fingerprint_ignores_case_unicode_form_and_whitespace():
+    fingerprint = text_fingerprint("Terms of Service\n\n1. Caf\u00e9 rules")
+    assert text_fingerprint("  terms OF  service 1.\tCafe\u0301 Rules ") == fingerprint
+    assert text_fingerprint("TERMS of\u00a0Service 1. CAF\u00c9 rules") == fingerprint
+    assert text_fingerprint("terms of service\r\n1. caf\u00e9 rules\n") == fingerprint
+    assert text_fingerprint("Terms of Service 1. Cafe rules") != fingerprint
+    assert text_fingerprint(None) == text_fingerprint("") == text_fingerprint(" \n ")
+    assert len(fingerprint) == 64
@@ -0,0 +1,61 @@
+import pytest
+
+from app.api.v1.endpoints import crawl
+from app.models.crawl import CrawlPrivacyRequest, CrawlTosRequest
+
+STORED = {
+    "id": "doc-1",
+    "retrieved_url": "https://example.com/legal/terms",
+    "one_sentence_summary": "One sentence.",
+    "hundred_word_summary": "A hundred words.",
+    "word_frequencies": '[{"word": "data", "count": 3, "percentage": 0.1}]',
+    "text_mining_metrics": {"word_count": 30},
+    "company_name": "Example",
+    "logo_url": "https://example.com/logo.png",
+}
+
+
+class FakeDocumentCRUD:
+    def __init__(self):
+        self.lookups = []
+        self.viewed = []
+
+    async def get_by_url_and_type(self, url, document_type):
+        self.lookups.append((url, document_type))
+        return STORED
+
+    async def increment_views(self, doc_id):
+        self.viewed.append(doc_id)
+
+
+@pytest.fixture
+def documents(monkeypatch):
+    crud = FakeDocumentCRUD()
+    monkeypatch.setattr(crawl, "document_crud", crud)
+
+    async def must_not_search(url):
+        raise AssertionError(f"searched for {url}")
+
+    monkeypatch.setattr(crawl, "find_tos_url", must_not_search)
+    monkeypatch.setattr(crawl, "find_privacy_policy_url", must_not_search)
+    return crud
+
+
+@pytest.mark.asyncio
+async def test_repeat_tos_crawl_returns_the_stored_document(documents):
+    response = await crawl.crawl_tos(CrawlTosRequest(url="https://example.com"))
+    assert (response.document_id, response.tos_url, response.success) == (
+        "doc-1", "https://example.com/legal/terms", False
+    )
+    assert [item.word for item in response.word_frequencies] == ["data"]
+    assert response.text_mining.word_count == 30
+    assert documents.lookups == [("https://example.com", "tos")]
+    assert documents.viewed == ["doc-1"]
+
+
+@pytest.mark.asyncio
+async def test_repeat_pp_crawl_returns_the_stored_document(documents):
+    response = await crawl.crawl_pp(CrawlPrivacyRequest(url="https://example.com"))
+    assert (response.document_id, response.pp_url) == ("doc-1", "https://example.com/legal/terms")
+    assert documents.lookups == [("https://example.com", "pp")]
+    assert documents.viewed == ["doc-1"]
@@ -0,0 +1,87 @@
+import pytest
+
+from app.core import discovery_cache
+from app.core.config import settings
+from app.core.discovery_cache import lookup_discovery, registered_domain, store_discovery
+
+
+class FakeDiscoveryCacheCRUD:
+    def __init__(self):
+        self.rows = {}
+
+    async def get_fresh(self, domain, document_type):
+        return self.rows.get((domain, document_type))
+
+    async def upsert(self, domain, document_type, url, method_used, confidence, ttl):
+        self.rows[(domain, document_type)] = {
+            "url": url,
+            "found": url is not None,
+            "method_used": method_used,
+            "confidence": confidence,
+            "ttl": ttl,
+        }
+
+
+@pytest.fixture
+def crud(monkeypatch):
+    fake = FakeDiscoveryCacheCRUD()
+    monkeypatch.setattr(discovery_cache, "discovery_cache_crud", fake)
+    monkeypatch.setattr(settings, "DISCOVERY_CACHE_ENABLED", True)
+    return fake
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://www.example.com/terms", "example.com"),
+        ("https://docs.example.co.uk/", "example.co.uk"),
+        ("https://EXAMPLE.com", "example.com"),
+        ("https://192.168.0.1/privacy", None),
+        ("https://apps.apple.com/us/app/id123", None),
+        ("not a url", None),
+    ],
+)
+def test_registered_domain(url, expected):
+    assert registered_domain(url) == expected
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("https://foo.github.io/terms", "https://bar.github.io/terms"),
+        ("https://one.vercel.app", "https://two.vercel.app"),
+        ("https://shop-a.myshopify.com", "https://shop-b.myshopify.com"),
+    ],
+)
+def test_platform_tenants_get_their_own_domain(first, second):
+    assert registered_domain(first) != registered_domain(second)
+    assert registered_domain("https://www.foo.github.io") == registered_domain("https://foo.github.io")
+
+
+@pytest.mark.asyncio
+async def test_tenants_of_one_platform_do_not_share_entries(crud):
+    await store_discovery("https://foo.github.io", "tos", "https://foo.github.io/terms", "path_probe")
+
+    assert (await lookup_discovery("https://bar.github.io", "tos")) is None
+    hit = await lookup_discovery("https://www.foo.github.io/about", "tos")
+    assert hit["url"] == "https://foo.github.io/terms"
+
+
+@pytest.mark.asyncio
+async def test_definitive_failures_are_cached_for_the_negative_ttl(crud):
+    await store_discovery("https://example.com", "pp", None, "all_methods_failed")
+
+    row = crud.rows[("example.com", "pp")]
+    assert row["found"] is False
+    assert row["ttl"] == settings.DISCOVERY_CACHE_NEGATIVE_TTL
+    hit = await lookup_discovery("https://www.example.com", "pp")
+    assert hit["url"] is None
+
+
+@pytest.mark.asyncio
+async def test_errors_and_low_confidence_results_are_not_cached(crud, monkeypatch):
+    monkeypatch.setattr(settings, "DISCOVERY_CACHE_MIN_CONFIDENCE", 0.5)
+    await store_discovery("https://example.com", "tos", None, "timeout")
+    await store_discovery("https://example.org", "tos", "https://example.org/tos", "search_unverified")
+
+    assert crud.rows == {}
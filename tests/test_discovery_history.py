@@ -0,0 +1,110 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import discovery_history, discovery_planner
+from app.core.config import settings
+from app.core.discovery_history import DomainHistory, load_domain_history
+from app.core.discovery_planner import DiscoveryPlanner, Strategy, StrategyStats
+
+NOW = datetime.now(timezone.utc)
+
+
+def record(strategy, attempts, hits, last_miss_at=None):
+    return {
+        "strategy": strategy,
+        "attempts": attempts,
+        "hits": hits,
+        "typical_ms": 1200.0,
+        "last_hit_at": NOW if hits else None,
+        "last_miss_at": last_miss_at,
+    }
+
+
+class FakeDiscoveryOutcomeCRUD:
+    def __init__(self, records=None, fail=False):
+        self.records = records or []
+        self.fail = fail
+        self.saved = []
+
+    async def get_for_domain(self, domain, document_type=None):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        return self.records
+
+    async def record_many(self, domain, document_type, outcomes):
+        self.saved.append((domain, document_type, list(outcomes)))
+
+
+@pytest.fixture
+def outcome_crud(monkeypatch):
+    monkeypatch.setattr(settings, "DISCOVERY_HISTORY_ENABLED", True)
+    crud = FakeDiscoveryOutcomeCRUD()
+    monkeypatch.setattr(discovery_history, "discovery_outcome_crud", crud)
+    return crud
+
+
+def test_order_puts_reliable_hits_first_and_recent_repeated_misses_last():
+    history = DomainHistory("example.com", "tos", [
+        record("footer", 4, 1),
+        record("http", 3, 3),
+        record("sitemap", 5, 0, last_miss_at=NOW - timedelta(hours=1)),
+        record("search", 5, 0, last_miss_at=NOW - timedelta(seconds=settings.DISCOVERY_HISTORY_SKIP_WINDOW + 60)),
+        record("nav", 1, 0, last_miss_at=NOW),
+    ])
+    names = ["sitemap", "nav", "footer", "http", "search", "common_paths"]
+    # http (3/3) before footer (1/4); untried and mixed strategies keep the default order
+    assert history.order(names) == ["http", "footer", "nav", "search", "common_paths", "sitemap"]
+    assert history.describe(names)["deferred"] == ["sitemap"]
+
+
+def test_empty_history_keeps_default_order():
+    names = ["sitemap", "nav", "footer"]
+    assert DomainHistory("example.com", "tos").order(names) == names
+
+
+@pytest.mark.asyncio
+async def test_planner_runs_strategies_in_learned_order(monkeypatch):
+    monkeypatch.setattr(discovery_planner, "strategy_stats", StrategyStats())
+    history = DomainHistory("example.com", "tos", [record("search", 2, 2), record("footer", 3, 0, NOW)])
+    calls = []
+
+    def strategy(name, url=None):
+        async def run():
+            calls.append(name)
+            return url
+        return Strategy(name, run)
+
+    planner = DiscoveryPlanner(
+        "tos",
+        [strategy("footer", "https://example.com/terms"), strategy("nav"), strategy("search", "https://example.com/tos")],
+        deadline=time.monotonic() + 10,
+        history=history,
+    )
+    assert [s.name for s in planner.strategies] == ["search", "nav", "footer"]
+    assert await planner.run() == ("https://example.com/tos", "search")
+    assert calls == ["search"]
+    assert [(name, hit) for name, _, hit in history.pending] == [("search", True)]
+
+
+@pytest.mark.asyncio
+async def test_outcomes_are_saved_for_the_registered_domain(outcome_crud):
+    outcome_crud.records = [record("http", 1, 1)]
+    history = await load_domain_history("https://www.shop.example.co.uk/terms", "tos")
+    assert history.domain == "example.co.uk"
+    assert history.hits("http") == 1
+
+    history.record("http", 850.0, True)
+    history.record("search", None, False)
+    await history.save()
+    await history.save()
+    assert outcome_crud.saved == [("example.co.uk", "tos", [("http", 850.0, True), ("search", None, False)])]
+
+
+@pytest.mark.asyncio
+async def test_unavailable_history_falls_back_to_defaults(outcome_crud):
+    outcome_crud.fail = True
+    history = await load_domain_history("https://example.com/", "pp")
+    assert history.domain == "example.com" and history.records == {}
+    assert history.order(["a", "b"]) == ["a", "b"]
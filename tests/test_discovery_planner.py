@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import discovery_planner
+from app.core.discovery_planner import DiscoveryPlanner, Strategy, StrategyStats, current_deadline, discovery_budget
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    stats = StrategyStats()
+    monkeypatch.setattr(discovery_planner, "strategy_stats", stats)
+    return stats
+
+
+def strategy(name, url=None, delay=0.0, uses_page=False, default_ms=3000, log=None):
+    async def run():
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        return url
+    return Strategy(name, run, uses_page=uses_page, default_ms=default_ms)
+
+
+async def settle():
+    """Let strategies the planner cancelled finish cancelling."""
+    others = asyncio.all_tasks() - {asyncio.current_task()}
+    await asyncio.gather(*others, return_exceptions=True)
+
+
+def test_discovery_budget_sets_the_deadline():
+    with discovery_budget(5):
+        assert 4 < current_deadline() - time.monotonic() <= 5
+    assert current_deadline() - time.monotonic() > 5
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_result_wins_over_faster_one():
+    planner = DiscoveryPlanner(
+        "tos",
+        [strategy("slow", "https://example.com/terms", delay=0.2), strategy("fast", "https://example.com/legal")],
+        deadline=time.monotonic() + 5,
+    )
+    assert await planner.run() == ("https://example.com/terms", "slow")
+    assert planner.results == {"slow": "https://example.com/terms", "fast": "https://example.com/legal"}
+
+
+@pytest.mark.asyncio
+async def test_deadline_returns_best_result_so_far():
+    planner = DiscoveryPlanner(
+        "tos",
+        [strategy("hangs", "https://example.com/terms", delay=30), strategy("fast", "https://example.com/legal")],
+        deadline=time.monotonic() + 0.5,
+    )
+    started = time.monotonic()
+    assert await planner.run() == ("https://example.com/legal", "fast")
+    assert planner.timed_out
+    assert time.monotonic() - started < 1.5
+    await settle()
+
+
+@pytest.mark.asyncio
+async def test_nothing_found_leaves_the_first_fallback():
+    planner = DiscoveryPlanner("pp", [], deadline=time.monotonic() + 5)
+
+    async def offers():
+        planner.offer("https://example.com/privacy", "unverified_link")
+        planner.offer("https://example.com/other", "search")
+        return None
+
+    planner.strategies = [Strategy("offers", offers, uses_page=False), strategy("misses")]
+    assert await planner.run() == (None, None)
+    assert planner.fallback == ("https://example.com/privacy", "unverified_link")
+    assert not planner.timed_out
+
+
+@pytest.mark.asyncio
+async def test_page_strategies_run_one_at_a_time(fresh_stats):
+    log = []
+    planner = DiscoveryPlanner(
+        "tos",
+        [
+            strategy("first", delay=0.05, uses_page=True, log=log),
+            strategy("second", delay=0.05, uses_page=True, log=log),
+            strategy("third", "https://example.com/terms", uses_page=True, log=log),
+        ],
+        deadline=time.monotonic() + 5,
+    )
+    assert await planner.run() == ("https://example.com/terms", "third")
+    assert log == [
+        ("start", "first"), ("end", "first"),
+        ("start", "second"), ("end", "second"),
+        ("start", "third"), ("end", "third"),
+    ]
+    assert fresh_stats.snapshot()["tos"]["third"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_page_strategy_is_cut_off_at_its_slice(fresh_stats):
+    planner = DiscoveryPlanner(
+        "tos",
+        [
+            strategy("stuck", "https://example.com/terms", delay=30, uses_page=True, default_ms=100),
+            strategy("next", "https://example.com/legal", uses_page=True),
+        ],
+        deadline=time.monotonic() + 10,
+    )
+    started = time.monotonic()
+    assert await planner.run() == ("https://example.com/legal", "next")
+    assert time.monotonic() - started < discovery_planner.MIN_SLICE_MS / 1000 + 0.5
+    assert fresh_stats.snapshot()["tos"]["stuck"]["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_page_strategy_is_skipped_without_time_for_a_slice():
+    planner = DiscoveryPlanner(
+        "tos",
+        [strategy("page", "https://example.com/terms", uses_page=True)],
+        deadline=time.monotonic() + 0.3,
+    )
+    assert await planner.run() == (None, None)
+    assert planner.results == {"page": None}
@@ -0,0 +1,90 @@
+import asyncio
+import socket
+from types import SimpleNamespace
+
+import httpcore
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.core import http_client
+from app.core.config import settings
+from app.core.http_client import PooledTransport
+
+LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=5)
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Local HTTP/1.1 server answering every request with its path, slowly."""
+    active = 0
+    peak = 0
+
+    async def handle(reader, writer):
+        nonlocal active, peak
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = head.split(b" ")[1]
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.05)
+                active -= 1
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(path), path))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    srv = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+    yield SimpleNamespace(url=f"http://127.0.0.1:{port}", peak=lambda: peak)
+    srv.close()
+
+
+def test_transport_builds_a_single_pool(monkeypatch):
+    pools = []
+    real_pool = httpcore.AsyncConnectionPool
+
+    def counting_pool(*args, **kwargs):
+        pools.append(kwargs)
+        return real_pool(*args, **kwargs)
+
+    monkeypatch.setattr(httpcore, "AsyncConnectionPool", counting_pool)
+    transport = PooledTransport(http2=False, limits=LIMITS, retries=1)
+    assert len(pools) == 1
+    assert pools[0]["network_backend"] is transport.resolver
+    assert pools[0]["max_connections"] == 10 and pools[0]["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_per_host_are_capped_and_released(server, monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_CLIENT_PER_HOST", 2)
+    transport = PooledTransport(http2=False, limits=LIMITS, retries=0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        responses = await asyncio.gather(*(client.get(f"{server.url}/page{i}") for i in range(6)))
+        assert [response.text for response in responses] == [f"/page{i}" for i in range(6)]
+        assert server.peak() == 2
+        assert transport.snapshot()["hosts_in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_are_httpx_errors():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    transport = PooledTransport(http2=False, limits=LIMITS, retries=0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get(f"http://127.0.0.1:{port}/")
+    assert transport.snapshot()["hosts_in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_reads_through_the_shared_client(server):
+    await http_client.close_http_client()
+    try:
+        response, body = await http_client.fetch(f"{server.url}/terms")
+        assert (response.status_code, body) == (200, b"/terms")
+        assert http_client.client_snapshot()["open"]
+    finally:
+        await http_client.close_http_client()
@@ -0,0 +1,89 @@
+from app.core.http_discovery import looks_js_rendered, parse_anchors
+
+PAGE = """
+<html><head><base href="https://www.example.com/en/"><script>var a = "<a href='/x'>x</a>";</script></head>
+<body>
+<header><nav class="navbar"><a href="/products">Products</a><a href="about">About</a></nav></header>
+<main>
+  <p>Read our <a href="legal/terms">Terms of Service</a> before you start.</p>
+  <a href="javascript:void(0)">Menu</a>
+  <a href="mailto:hello@example.com">Mail us</a>
+  <a href="/hidden" style="display: none">Hidden</a>
+  <a href="/icon" aria-label="Home page"><img src="/logo.png"></a>
+</main>
+<div id="legal">
+  <div class="site-footer"><a href="https://www.example.com/privacy">Privacy Policy</a></div>
+</div>
+<footer><ul><li>Copyright <a href="/tos">Terms</a></li></ul></footer>
+</body></html>
+"""
+
+
+def by_text(links):
+    return {link["text"]: link for link in links}
+
+
+def test_anchor_collector_resolves_and_filters_anchors():
+    links, _ = parse_anchors(PAGE, "https://example.com/")
+    assert [link["href"] for link in links] == [
+        "https://www.example.com/products",
+        "https://www.example.com/en/about",
+        "https://www.example.com/en/legal/terms",
+        "https://www.example.com/hidden",
+        "https://www.example.com/icon",
+        "https://www.example.com/privacy",
+        "https://www.example.com/tos",
+    ]
+    assert [link["index"] for link in links] == list(range(7))
+    assert [link["pageFraction"] for link in links] == [index / 7 for index in range(7)]
+    links = by_text(links)
+    assert links["Home page"]["rawHref"] == "/icon"
+    assert not links["Hidden"]["visible"] and links["Products"]["visible"]
+
+
+def test_anchor_collector_flags_match_the_browser_snapshot():
+    links = by_text(parse_anchors(PAGE, "https://example.com/")[0])
+    flags = {text: (link["isFooter"], link["inFooterArea"], link["isNav"]) for text, link in links.items()}
+    assert flags["Products"] == (False, False, True)
+    assert flags["Terms of Service"] == (False, False, False)
+    # id="legal" is a footer area for privacy scoring; class "site-footer" is a footer for both
+    assert flags["Privacy Policy"] == (True, True, False)
+    assert flags["Terms"] == (True, True, False)
+
+
+def test_anchor_collector_records_surrounding_text():
+    links, text_chars = parse_anchors(PAGE, "https://example.com/")
+    links = by_text(links)
+    assert links["Terms of Service"]["parentText"] == "Read our Terms of Service before you start."
+    assert links["Terms"]["parentText"] == "Copyright Terms"
+    # Script contents are neither text nor anchors
+    assert text_chars == len("ProductsAboutRead ourTerms of Servicebefore you start.MenuMail usHidden"
+                             "Privacy PolicyCopyrightTerms")
+
+
+def test_parse_anchors_survives_broken_markup():
+    links, _ = parse_anchors("<div><a href='/terms'>Terms</span></div></a><p>unclosed <a href=/pp>Privacy", "https://e.com")
+    assert [(link["href"], link["text"]) for link in links] == [
+        ("https://e.com/terms", "Terms"),
+        ("https://e.com/pp", "Privacy"),
+    ]
+
+
+def test_looks_js_rendered():
+    article = "<p>" + "Plenty of server-rendered text about the company. " * 50 + "</p>"
+    anchors = "".join(f'<a href="/page{i}">Page {i}</a>' for i in range(8))
+
+    server_rendered = f"<html><body>{anchors}{article}</body></html>"
+    assert not looks_js_rendered(server_rendered, *parse_anchors(server_rendered, "https://e.com"))
+
+    few_links = f"<html><body><a href='/a'>A</a>{article}</body></html>"
+    assert looks_js_rendered(few_links, *parse_anchors(few_links, "https://e.com"))
+
+    little_text = f"<html><body>{anchors}</body></html>"
+    assert looks_js_rendered(little_text, *parse_anchors(little_text, "https://e.com"))
+
+    short_text = "<p>" + "Some text. " * 60 + "</p>"
+    shell = f'<html><body><noscript>You need to enable JavaScript</noscript>{anchors}{short_text}</body></html>'
+    assert looks_js_rendered(shell, *parse_anchors(shell, "https://e.com"))
+    without_marker = f"<html><body>{anchors}{short_text}</body></html>"
+    assert not looks_js_rendered(without_marker, *parse_anchors(without_marker, "https://e.com"))
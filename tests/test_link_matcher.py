@@ -0,0 +1,196 @@
+import itertools
+
+import pytest
+
+from app.api.v1.endpoints import privacy, tos
+from app.core.link_matcher import PhraseMatcher, PriorityMatcher
+
+# Link texts and URLs of a fixed test page; every combination is scored
+LINK_TEXTS = [
+    "", "Home", "Terms", "Terms of Service", "TERMS OF USE", "User Agreement", "Customer Terms",
+    "Terms & Conditions", "Legal", "Legal Terms and Conditions", "Conditions of Use", "Agreement",
+    "Privacy", "Privacy Policy", " privacy notice ", "User Privacy Notice", "user privacy policy",
+    "Customer Privacy Notice", "customer privacy policy", "Your Privacy Statement", "Data Policy",
+    "data protection", "Data Privacy", "User data and privacy policy", "Customer privacy choices",
+    "Cookie settings", "Storytelling",
+]
+LINK_URLS = [
+    "", "https://example.com/", "https://example.com/terms", "https://example.com/terms-of-service",
+    "https://example.com/TOS", "https://example.com/legal/terms-of-use", "https://example.com/tou.html",
+    "https://example.com/terms-and-conditions", "https://example.com/user-agreement",
+    "https://example.com/privacy", "https://example.com/privacy/", "https://example.com/legal/privacy-policy",
+    "https://example.com/user-privacy-notice", "https://example.com/user_privacy_policy",
+    "https://example.com/customer-privacy-notice", "https://example.com/customer_privacy",
+    "https://example.com/user/privacy", "https://example.com/customer/settings/privacy",
+    "https://example.com/privacy_statement", "https://example.com/data-privacy",
+    "https://example.com/datapolicy", "https://example.com/gdpr", "https://example.com/stories",
+]
+LINKS = [
+    {"text": text, "href": href, "isFooter": footer, "inFooterArea": footer}
+    for (text, href), footer in zip(itertools.product(LINK_TEXTS, LINK_URLS), itertools.cycle((False, True, False)))
+]
+
+
+# score_tos_link and score_privacy_link as they were written, one phrase check
+# at a time, before the phrase tables were compiled into PhraseMatchers
+def phrase_loop_tos_score(href, text, is_footer=False):
+    text = (text or "").lower()
+    href_lower = (href or "").lower()
+    score = 0
+    for phrase, points in (
+        ("user agreement", 150), ("customer agreement", 150), ("user terms", 140), ("customer terms", 140),
+        ("terms of use", 140), ("terms of service", 130), ("terms and conditions", 120),
+        ("terms & conditions", 120), ("conditions of use", 110), ("legal terms", 100),
+        ("terms", 90), ("legal", 80), ("agreement", 70), ("conditions", 60),
+    ):
+        if phrase in text:
+            score += points
+    if "terms-of-service" in href_lower or "tos" in href_lower:
+        score += 50
+    if "terms-of-use" in href_lower or "tou" in href_lower:
+        score += 50
+    if "terms-and-conditions" in href_lower:
+        score += 40
+    if "legal/terms" in href_lower:
+        score += 40
+    if "agreement" in href_lower:
+        score += 30
+    if is_footer:
+        score *= 1.2
+    return score
+
+
+def phrase_loop_privacy_score(href, text, in_footer=False):
+    text = (text or "").strip().lower()
+    href = (href or "").lower()
+    patterns = privacy.PRIVACY_LINK_PATTERNS + privacy.USER_CUSTOMER_PRIVACY_PATTERNS
+    if not any(term in text or term in href for term in patterns):
+        return 0
+
+    score = 0
+    if text in ("user privacy notice", "user privacy policy"):
+        score += 250
+    elif "user privacy notice" in text:
+        score += 240
+    elif "user privacy policy" in text:
+        score += 230
+    elif "user privacy" in text:
+        score += 220
+    elif text in ("customer privacy notice", "customer privacy policy"):
+        score += 210
+    elif "customer privacy notice" in text:
+        score += 200
+    elif "customer privacy" in text:
+        score += 190
+    elif "user" in text and "privacy policy" in text:
+        score += 180
+    elif "customer" in text and "privacy policy" in text:
+        score += 170
+    elif text in ("privacy policy", "privacy notice"):
+        score += 120
+    elif "privacy policy" in text or "privacy notice" in text:
+        score += 110
+    elif "privacy" in text and "statement" in text:
+        score += 105
+    elif "data policy" in text:
+        score += 100
+    elif "privacy" in text:
+        score += 90
+    elif text in ("data protection", "data privacy"):
+        score += 80
+    elif "data protection" in text or "data privacy" in text:
+        score += 70
+
+    if "user-privacy-notice" in href or "user_privacy_notice" in href:
+        score += 120
+    elif "user-privacy-policy" in href or "user_privacy_policy" in href:
+        score += 110
+    elif "user-privacy" in href or "user_privacy" in href:
+        score += 100
+    elif "customer-privacy-notice" in href or "customer_privacy_notice" in href:
+        score += 95
+    elif "customer-privacy" in href or "customer_privacy" in href:
+        score += 90
+    elif "user" in href and "privacy" in href:
+        score += 85
+    elif "customer" in href and "privacy" in href:
+        score += 80
+    elif any(p in href for p in ("privacy-policy", "privacy-notice", "privacy_policy", "privacy_notice")):
+        score += 70
+    elif "privacy-statement" in href or "privacy_statement" in href:
+        score += 65
+    elif "data-privacy" in href or "data_privacy" in href:
+        score += 65
+    elif "/privacy/" in href or "/datapolicy/" in href:
+        score += 60
+    elif "/privacy" in href or "/datapolicy" in href:
+        score += 55
+    elif "gdpr" in href or "ccpa" in href:
+        score += 50
+
+    if in_footer:
+        score += 20
+    if "/legal/" in href:
+        score += 15
+    return score
+
+
+def phrase_loop_priority(text, exact_priorities, partial_priorities):
+    text = (text or "").lower()
+    best = 0
+    for table in (exact_priorities, partial_priorities):
+        for phrase, priority in table.items():
+            if phrase in text and priority > best:
+                best = priority
+    return best
+
+
+def test_find_is_exactly_the_contained_phrases():
+    phrases = ["terms", "terms of use", "use", "of", "se", "privacy policy", "policy"]
+    matcher = PhraseMatcher(phrases)
+    for text in ["", "terms of use", "our terms of use and privacy policy", "abuse", "termsterms", "policy-terms"]:
+        assert matcher.find(text) == {phrase for phrase in phrases if phrase in text}
+
+
+def test_find_many_reports_matches_per_text():
+    matcher = PhraseMatcher(["terms", "privacy"])
+    texts = ["home", "terms", "", "privacy terms", "term", "s"]
+    assert matcher.find_many(texts) == {1: {"terms"}, 3: {"privacy", "terms"}}
+    # No match spans the boundary between two texts
+    assert matcher.find_many(["ter", "ms"]) == {}
+
+
+@pytest.mark.parametrize("phrases", [["terms", ""], ["terms\nof use"]])
+def test_rejects_empty_and_multiline_phrases(phrases):
+    with pytest.raises(ValueError):
+        PhraseMatcher(phrases)
+
+
+def test_score_tos_link_matches_phrase_loops():
+    for link in LINKS:
+        expected = phrase_loop_tos_score(link["href"], link["text"], link["isFooter"])
+        assert tos.score_tos_link(link["href"], link["text"], link["isFooter"]) == expected, link
+    assert tos.score_tos_links(LINKS) == [
+        phrase_loop_tos_score(link["href"], link["text"], link["isFooter"]) for link in LINKS
+    ]
+    assert tos.score_tos_links(LINKS, footer_boost=False) == [
+        phrase_loop_tos_score(link["href"], link["text"]) for link in LINKS
+    ]
+
+
+def test_score_privacy_link_matches_phrase_loops():
+    for link in LINKS:
+        expected = phrase_loop_privacy_score(link["href"], link["text"], link["inFooterArea"])
+        assert privacy.score_privacy_link(link["href"], link["text"], link["inFooterArea"]) == expected, link
+    assert privacy.score_privacy_links(LINKS) == [
+        phrase_loop_privacy_score(link["href"], link["text"], link["inFooterArea"]) for link in LINKS
+    ]
+
+
+@pytest.mark.parametrize("module", [tos, privacy], ids=["tos", "privacy"])
+def test_priority_matcher_matches_phrase_loops(module):
+    matcher = PriorityMatcher(module.exactMatchPriorities, module.partialMatchPriorities)
+    for text in LINK_TEXTS + [None]:
+        assert matcher.priority(text) == phrase_loop_priority(
+            text, module.exactMatchPriorities, module.partialMatchPriorities
+        )
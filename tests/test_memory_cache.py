@@ -0,0 +1,163 @@
+import json
+import zlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import memory_cache
+from app.core.memory_cache import MemoryCache
+
+
+class FakeSharedTier:
+    def __init__(self):
+        self.rows = {}
+
+    async def get(self, entry_id):
+        return self.rows.get(entry_id)
+
+    def put(self, entry_id, compressed, blob, ttl):
+        self.rows[entry_id] = (compressed, blob, datetime.now(timezone.utc) + timedelta(seconds=ttl))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(memory_cache, "time", fake)
+    return fake
+
+
+def entry_size(cache, key):
+    return cache._entries[key][3]
+
+
+@pytest.fixture
+def tier(monkeypatch):
+    fake = FakeSharedTier()
+    monkeypatch.setattr(memory_cache, "shared_cache_tier", fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_shared_hits_count_towards_the_hit_rate(tier):
+    writer = MemoryCache("test_shared_writer", ttl=60, max_bytes=100_000, shared=True)
+    writer.put("key", {"text": "hello"})
+    # Another worker: same cache name, empty local tier
+    reader = MemoryCache("test_shared_writer", ttl=60, max_bytes=100_000, shared=True)
+
+    assert await reader.aget("key") == {"text": "hello"}
+    assert await reader.aget("missing") is None
+
+    snapshot = reader.snapshot()
+    assert (snapshot["hits"], snapshot["shared_hits"], snapshot["misses"]) == (1, 1, 1)
+    assert snapshot["hit_rate"] == 0.5
+    # The shared hit was copied into the local tier
+    assert reader.get("key") == {"text": "hello"}
+
+
+@pytest.mark.asyncio
+async def test_undecodable_shared_rows_are_misses(tier):
+    cache = MemoryCache("test_shared_reject", ttl=60, max_bytes=100_000, shared=True)
+    expires = datetime.now(timezone.utc) + timedelta(seconds=60)
+    # A pickle payload, as a hostile or stale row would hold
+    tier.rows["test_shared_reject:pickled"] = (False, b"\x80\x04\x95\x05\x00\x00\x00\x00\x00\x00\x00\x8c\x01x\x94.", expires)
+    tier.rows["test_shared_reject:garbage"] = (True, b"not zlib", expires)
+
+    assert await cache.aget("pickled") is None
+    assert await cache.aget("garbage") is None
+    assert cache.rejected == 2
+    assert cache.hits == 0
+    assert len(cache) == 0
+
+
+def test_values_are_stored_as_json():
+    cache = MemoryCache("test_json", ttl=60, max_bytes=100_000, compress_min_bytes=0)
+    cache.put("key", {"a": [1, 2], "b": None})
+
+    _, compressed, blob, _ = cache._entries["key"]
+    assert not compressed
+    assert json.loads(blob) == {"a": [1, 2], "b": None}
+
+
+def test_large_values_are_compressed():
+    cache = MemoryCache("test_compress", ttl=60, max_bytes=1_000_000, compress_min_bytes=100)
+    value = {"text": "terms of service " * 1000}
+    cache.put("key", value)
+
+    _, compressed, blob, _ = cache._entries["key"]
+    assert compressed
+    assert json.loads(zlib.decompress(blob)) == value
+    assert cache.get("key") == value
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = MemoryCache("test_ttl", ttl=60, max_bytes=100_000)
+    cache.put("default", "a")
+    cache.put("short", "b", ttl=10)
+    assert not cache.put("never", "c", ttl=0)
+
+    clock.now += 30
+    assert cache.get("short") is None
+    assert cache.get("default") == "a"
+    clock.now += 30
+    assert cache.get("default", "gone") == "gone"
+
+    assert (cache.hits, cache.misses, cache.expirations) == (1, 2, 2)
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_byte_budget_evicts_least_recently_used(clock):
+    probe = MemoryCache("test_probe", ttl=60, max_bytes=100_000)
+    probe.put("k1", "x" * 100)
+    size = entry_size(probe, "k1")
+
+    cache = MemoryCache("test_bytes", ttl=60, max_bytes=size * 3)
+    for key in ("k1", "k2", "k3"):
+        assert cache.put(key, "x" * 100)
+    assert cache.bytes == size * 3
+    cache.get("k1")
+    cache.put("k4", "x" * 100)
+
+    assert "k2" not in cache._entries
+    assert list(cache._entries) == ["k3", "k1", "k4"]
+    assert cache.evictions == 1 and cache.bytes == size * 3
+
+
+def test_expired_entries_go_before_live_ones(clock):
+    probe = MemoryCache("test_probe", ttl=60, max_bytes=100_000)
+    probe.put("k1", "x" * 100)
+    size = entry_size(probe, "k1")
+
+    cache = MemoryCache("test_expire_first", ttl=60, max_bytes=size * 2)
+    cache.put("k1", "x" * 100, ttl=5)
+    cache.put("k2", "x" * 100)
+    clock.now += 10
+    cache.put("k3", "x" * 100)
+    assert list(cache._entries) == ["k2", "k3"]
+    assert (cache.expirations, cache.evictions) == (1, 0)
+
+
+def test_entry_cap_and_oversized_values(clock):
+    cache = MemoryCache("test_entries", ttl=60, max_bytes=2_000, max_entries=2, compress_min_bytes=0)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    assert list(cache._entries) == ["b", "c"]
+
+    assert not cache.put("big", "x" * 5_000)
+    assert "big" not in cache._entries and len(cache) == 2
+
+    # Replacing a key doesn't count it twice
+    cache.put("c", "updated")
+    assert cache.get("c") == "updated"
+    assert cache.bytes == sum(entry[3] for entry in cache._entries.values())
+
+    cache.delete("b")
+    cache.clear()
+    assert (len(cache), cache.bytes) == (0, 0)
@@ -0,0 +1,178 @@
+import pytest
+
+from app.core import page_verification
+from app.core.config import settings
+from app.core.page_verification import (
+    PageVerifier,
+    extract_page_text,
+    looks_like_js_shell,
+    score_privacy_page,
+    score_terms_page,
+)
+
+TOS_SECTIONS = (
+    "1. Acceptance of Terms\nBy using this site you agree to be bound by these terms. Please read these terms carefully.\n"
+    "2. User Conduct\nYou acknowledge and agree that we may modify the service at our sole discretion without prior notice.\n"
+    "3. Intellectual Property\nAll rights reserved. Copyright and trademark notices apply.\n"
+    "4. Disclaimer\nThe service is provided as is and as available, with no warranty of any kind.\n"
+    "5. Limitation of Liability\nWe shall not be liable for any damages. You agree to indemnify and hold harmless the company.\n"
+    "6. Termination\nWe may terminate your account at any time.\n"
+    "7. Governing Law\nApplicable law and jurisdiction and venue are set out here. Binding arbitration and class action waiver apply.\n"
+    "8. Severability\nIf any provision is unenforceable, the rest remains. This is the entire agreement.\n"
+)
+FILLER = "These provisions describe how the service may be used by everyone who visits. " * 20
+
+TERMS = [
+    # title, url, body, headings
+    ("Terms of Service - Example", "https://example.com/terms-of-service", TOS_SECTIONS + FILLER * 3,
+     ["Acceptance of Terms", "Limitation of Liability"]),
+    ("Conditions of Use", "https://shop.example.com/gp/help?nodeId=508088", TOS_SECTIONS + FILLER + " sign in to your account ",
+     ["Conditions of Use"]),
+    ("Legal", "https://example.com/legal", TOS_SECTIONS, ["Legal"]),
+    ("Terms and Conditions", "https://example.com/tc", "Acceptance of terms. Termination. Governing law. Disclaimer. Copyright. " + FILLER,
+     []),
+    ("Sign in", "https://example.com/login", "Sign in\nEmail address\nPassword\nForgot your password? Create account",
+     ["Sign in"]),
+    ("Your cart", "https://example.com/cart", "Shopping cart\nCheckout\nAdd to cart\n" + FILLER, ["Cart"]),
+    ("Blog - Ten tips", "https://example.com/blog/tips", FILLER * 2 + " copyright 2024 all rights reserved", ["Ten tips"]),
+    ("User Agreement", "https://example.com/user-agreement", TOS_SECTIONS + FILLER * 5 + " my account ",
+     ["User Agreement", "Governing Law"]),
+]
+
+PP_SECTIONS = (
+    "Information we collect\nWe collect personal information you give us and data we collect automatically.\n"
+    "How we use your information\nHow we use it, and when we share your information with third parties.\n"
+    "Cookies and tracking technologies\nWe use cookies and tracking technologies. You can opt-out.\n"
+    "Your rights\nUnder the GDPR and CCPA you have privacy rights: access your data, delete your data.\n"
+    "Data retention\nWe keep data only as long as needed. Changes to this policy will be posted.\n"
+    "Contact us\nContact us with questions.\n"
+)
+
+PRIVACY = [
+    # title, url, body
+    ("Privacy Notice | Example", "https://example.com/privacy", PP_SECTIONS),
+    ("Privacy Policy", "https://example.com/legal/pp", PP_SECTIONS + FILLER),
+    ("Privacy", "https://example.com/privacy-policy", PP_SECTIONS),
+    ("Data Protection", "https://example.com/dp", PP_SECTIONS + FILLER * 2),
+    ("Legal", "https://example.com/legal/data-policy", PP_SECTIONS + FILLER * 2),
+    ("User Privacy Notice", "https://example.com/user-privacy", "We describe user data collection here."),
+    ("Help", "https://example.com/help/customer_privacy", "Customer information and customer consent. " + FILLER),
+    ("About us", "https://example.com/about", "Contact us. " + FILLER),
+    ("Newsletter", "https://example.com/news", "Your rights as a reader. Cookies. " + FILLER * 3),
+    ("Privacy Center", "https://example.com/center", "Personal information and your data explained."),
+]
+
+# Verdicts of the browser verifiers (verify_is_terms_page /
+# verify_is_privacy_page with their in-page JavaScript) on the pages above,
+# recorded before the rules moved to the shared scorers:
+# (isTermsPage, confidence, legalSectionCount, legalPhraseCount, hasLegalHeadings, hasNegativeIndicators)
+BROWSER_TERMS_VERDICTS = [
+    (True, 100, 13, 18, True, False),
+    (True, 95, 13, 18, True, True),
+    (False, 40, 13, 18, False, False),
+    (True, 75, 5, 0, False, False),
+    (False, 0, 0, 0, False, True),
+    (False, 0, 0, 0, False, True),
+    (False, 0, 1, 1, False, False),
+    (True, 100, 13, 18, True, True),
+]
+
+# (isPrivacyPage, confidence, reason)
+BROWSER_PRIVACY_VERDICTS = [
+    (True, 90, "Strong privacy indicator in title: 'Privacy Notice | Example'"),
+    (True, 85, "Strong privacy indicator in title: 'Privacy Policy'"),
+    (True, 80, "Privacy in both title and URL: 'Privacy'"),
+    (True, 100, "High confidence from multiple factors"),
+    (True, 63.0, "Good confidence from content with title/URL indicators"),
+    (True, 75, "Contains user/customer privacy terms (highest priority)"),
+    (True, 60, "Contains user/customer privacy terms (highest priority)"),
+    (False, 10.5, ""),
+    (False, 24.5, ""),
+    (True, 70.0, "High confidence from multiple factors"),
+]
+
+
+@pytest.mark.parametrize("page, expected", zip(TERMS, BROWSER_TERMS_VERDICTS), ids=[p[0] for p in TERMS])
+def test_score_terms_page_matches_the_browser_verifier(page, expected):
+    title, url, body, headings = page
+    verdict = score_terms_page(title, url, body, headings)
+    assert (
+        verdict["isTermsPage"],
+        verdict["confidence"],
+        verdict["legalSectionCount"],
+        verdict["legalPhraseCount"],
+        verdict["hasLegalHeadings"],
+        verdict["hasNegativeIndicators"],
+    ) == expected
+
+
+@pytest.mark.parametrize("page, expected", zip(PRIVACY, BROWSER_PRIVACY_VERDICTS), ids=[p[0] for p in PRIVACY])
+def test_score_privacy_page_matches_the_browser_verifier(page, expected):
+    verdict = score_privacy_page(*page)
+    assert (verdict["isPrivacyPage"], verdict["confidence"], verdict["reason"]) == expected
+
+
+def test_extract_page_text_skips_hidden_elements():
+    html = (
+        "<html><head><title> Terms  of Service </title><style>.x{}</style></head>"
+        "<body><script>var terms = 1;</script><h1>Terms</h1><p>Please read\n  carefully.</p>"
+        "<div>Second <b>block</b></div></body></html>"
+    )
+    title, headings, body = extract_page_text(html)
+    assert title == "Terms of Service"
+    assert headings == ["Terms", "block"]
+    assert "var terms" not in body and ".x{}" not in body
+    assert body.splitlines() == ["Terms", "Please read", "carefully.", "Second block"]
+
+
+def test_looks_like_js_shell():
+    shell = '<html><body><div id="root"></div><script src="/static/js/main.js"></script></body></html>'
+    assert looks_like_js_shell(shell, extract_page_text(shell)[2])
+    page = f"<html><body><p>{FILLER}</p></body></html>"
+    assert not looks_like_js_shell(page, extract_page_text(page)[2])
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    monkeypatch.setattr(settings, "PAGE_VERIFY_HTTP_ENABLED", True)
+    pages = {}
+    fetched = []
+
+    async def fake_fetch_html(url):
+        fetched.append(url)
+        html = pages.get(url)
+        return (url, html) if html is not None else (url, None)
+
+    monkeypatch.setattr(page_verification, "fetch_html", fake_fetch_html)
+    verifier = PageVerifier()
+    verifier.pages, verifier.fetched = pages, fetched
+    return verifier
+
+
+@pytest.mark.asyncio
+async def test_verifier_caches_verdicts_and_js_shells(verifier):
+    terms_url = "https://example.com/terms-of-service"
+    shell_url = "https://example.com/app"
+    verifier.pages[terms_url] = (
+        f"<html><head><title>Terms of Service</title></head><body><h2>Termination</h2>"
+        f"<p>{TOS_SECTIONS}{FILLER}</p></body></html>"
+    )
+    verifier.pages[shell_url] = '<html><body><div id="root"></div></body></html>'
+
+    first = await verifier.verify_many([terms_url, shell_url, terms_url], "tos")
+    again = await verifier.verify_many([terms_url, shell_url], "tos")
+
+    assert first[terms_url]["isTermsPage"] and first[terms_url]["verifiedBy"] == "http"
+    assert first[shell_url] is None and again[shell_url] is None
+    assert again[terms_url] == first[terms_url]
+    assert verifier.fetched == [terms_url, shell_url]
+    assert verifier.snapshot()["js_shells"] == 1
+
+
+@pytest.mark.asyncio
+async def test_verifier_does_not_cache_fetch_failures(verifier):
+    url = "https://example.com/privacy"
+    assert await verifier.verify(url, "pp") is None
+    assert await verifier.verify(url, "pp") is None
+    assert verifier.fetched == [url, url]
+    assert verifier.snapshot()["fetch_failures"] == 2
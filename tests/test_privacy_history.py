@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints import legal, privacy
+from app.core.discovery_history import DomainHistory
+from app.models.privacy import PrivacyRequest
+
+NOW = datetime.now(timezone.utc)
+
+
+def failing(name, attempts=3):
+    return {
+        "strategy": name,
+        "attempts": attempts,
+        "hits": 0,
+        "typical_ms": 1200.0,
+        "last_hit_at": None,
+        "last_miss_at": NOW,
+    }
+
+
+@pytest.fixture
+def no_store(monkeypatch):
+    async def store_app_info(url):
+        return None
+    monkeypatch.setattr(privacy, "store_app_info", store_app_info)
+
+
+@pytest.mark.asyncio
+async def test_http_tier_outcome_is_recorded(monkeypatch, no_store):
+    async def http_first_discovery(url, doc_type):
+        return "https://example.com/privacy", "http_html"
+    monkeypatch.setattr(legal, "http_first_discovery", http_first_discovery)
+
+    history = DomainHistory("example.com", "pp")
+    response = await privacy.discover_privacy_policy(PrivacyRequest(url="https://example.com"), history)
+
+    assert response.pp_url == "https://example.com/privacy"
+    assert [(name, hit) for name, _, hit in history.pending] == [("http_tier", True)]
+
+
+@pytest.mark.asyncio
+async def test_deferred_http_tier_is_skipped(monkeypatch, no_store):
+    async def http_first_discovery(url, doc_type):
+        raise AssertionError("deferred HTTP tier was run")
+
+    async def acquire_lease(purpose):
+        raise RuntimeError("no browser here")
+
+    async def release_lease(lease):
+        pass
+
+    monkeypatch.setattr(legal, "http_first_discovery", http_first_discovery)
+    monkeypatch.setattr(
+        privacy, "browser_pool", SimpleNamespace(acquire_lease=acquire_lease, release_lease=release_lease)
+    )
+
+    history = DomainHistory("example.com", "pp", [failing("http_tier")])
+    response = await privacy.discover_privacy_policy(PrivacyRequest(url="https://example.com"), history)
+
+    assert not response.success
+    assert history.pending == []
+
+
+@pytest.mark.asyncio
+async def test_strategies_endpoint_shows_privacy_steps(monkeypatch):
+    async def load_domain_history(url, doc_type):
+        return DomainHistory("example.com", doc_type, [failing("search_engine")])
+    monkeypatch.setattr(legal, "load_domain_history", load_domain_history)
+
+    result = await legal.get_learned_strategies(domain="example.com", document_type="pp")
+
+    assert result["document_type"] == "pp"
+    assert result["deferred"] == ["search_engine"]
+    assert result["order"] == [name for name in legal.PP_STEP_NAMES if name != "search_engine"]
+
+    tos = await legal.get_learned_strategies(domain="example.com", document_type="tos")
+    assert tos["order"][-1] == "search_engine"
+
+    with pytest.raises(HTTPException):
+        await legal.get_learned_strategies(domain="example.com", document_type="cookies")
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.search_cache import SearchResultCache, normalize_query
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    return SearchResultCache()
+
+
+def test_normalize_query():
+    assert normalize_query("Example.com+Terms%20of  Service ") == "example.com terms of service"
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_per_normalized_query(cache):
+    calls = []
+
+    async def search(query, page):
+        calls.append(query)
+        return "https://example.com/terms"
+
+    assert await cache.run("tos", "bing", "Example terms", search, None) == "https://example.com/terms"
+    assert await cache.run("tos", "bing", "example   TERMS", search, None) == "https://example.com/terms"
+    assert await cache.run("pp", "bing", "example terms", search, None) == "https://example.com/terms"
+    assert len(calls) == 2  # the "pp" scope has its own entry
+
+
+@pytest.mark.asyncio
+async def test_no_result_is_cached_for_the_negative_ttl_only(cache, monkeypatch):
+    calls = []
+
+    async def search(query, page):
+        calls.append(query)
+        return None
+
+    monkeypatch.setattr(settings, "SEARCH_CACHE_NEGATIVE_TTL", 900)
+    assert await cache.run("tos", "yahoo", "q", search, None) is None
+    assert await cache.run("tos", "yahoo", "q", search, None) is None
+    assert len(calls) == 1
+
+    monkeypatch.setattr(settings, "SEARCH_CACHE_NEGATIVE_TTL", 0)
+    assert await cache.run("tos", "yahoo", "other", search, None) is None
+    assert await cache.run("tos", "yahoo", "other", search, None) is None
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_call(cache):
+    calls = []
+    release = asyncio.Event()
+
+    async def search(query, page):
+        calls.append(page)
+        await release.wait()
+        return "https://example.com/terms"
+
+    tasks = [asyncio.create_task(cache.run("tos", "bing", "q", search, page)) for page in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["https://example.com/terms"] * 5
+    assert calls == [0]
+    assert cache.snapshot()["shared_in_flight"] == 4
+    assert cache.snapshot()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_search_themselves_when_the_leader_fails(cache):
+    calls = []
+    release = asyncio.Event()
+
+    async def search(query, page):
+        calls.append(page)
+        if page == "leader":
+            await release.wait()
+            raise RuntimeError("page crashed")
+        return "https://example.com/terms"
+
+    leader = asyncio.create_task(cache.run("tos", "bing", "q", search, "leader"))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.run("tos", "bing", "q", search, "waiter"))
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(RuntimeError):
+        await leader
+    assert await waiter == "https://example.com/terms"
+    assert calls == ["leader", "waiter"]
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_searches(cache, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", False)
+    calls = []
+
+    async def search(query, page):
+        calls.append(query)
+        return "https://example.com/terms"
+
+    await cache.run("tos", "bing", "q", search, None)
+    await cache.run("tos", "bing", "q", search, None)
+    assert len(calls) == 2
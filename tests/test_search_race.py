@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.api.v1.endpoints import tos
+from app.api.v1.endpoints.tos import race_search_engines
+
+
+class FakePage:
+    def __init__(self, context, name):
+        self.context = context
+        self.name = name
+        self.closed = False
+        self.busy = False
+
+    async def close(self):
+        await asyncio.sleep(0.01)
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage(self, f"extra{len(self.pages)}")
+        self.pages.append(page)
+        return page
+
+
+def engine(result, delay):
+    async def search(query, page):
+        page.busy = True
+        try:
+            await asyncio.sleep(delay)
+            return result
+        finally:
+            # Unwinding a navigation takes a moment too
+            await asyncio.sleep(0.01)
+            page.busy = False
+    return search
+
+
+@pytest.mark.asyncio
+async def test_race_settles_losers_before_returning(monkeypatch):
+    monkeypatch.setattr(tos, "SEARCH_ENGINE_FALLBACKS", {
+        "bing": engine("https://example.com/about", 5),
+        "yahoo": engine("https://example.com/terms-of-service", 0.01),
+        "duckduckgo": engine(None, 5),
+    })
+    context = FakeContext()
+    page = FakePage(context, "own")
+
+    url, winner, results = await race_search_engines("example terms", page, ["bing", "yahoo", "duckduckgo"])
+
+    assert (url, winner) == ("https://example.com/terms-of-service", "yahoo")
+    assert results == {"yahoo": "https://example.com/terms-of-service"}
+    # The caller's page is free again and every extra page is closed
+    assert not page.busy and not page.closed
+    assert [extra.closed for extra in context.pages] == [True, True]
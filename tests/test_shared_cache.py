@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.core import shared_cache
+from app.core.config import settings
+from app.core.shared_cache import SharedCacheTier
+
+
+class SlowSharedCacheCRUD:
+    def __init__(self):
+        self.rows = {}
+        self.writing = asyncio.Event()
+
+    async def put_many(self, rows):
+        rows = list(rows)
+        self.writing.set()
+        await asyncio.sleep(0.05)
+        for row in rows:
+            self.rows[row["id"]] = row["value"]
+
+
+@pytest.fixture
+def crud(monkeypatch):
+    monkeypatch.setattr(settings, "SHARED_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "SHARED_CACHE_FLUSH_BATCH", 2)
+    fake = SlowSharedCacheCRUD()
+    monkeypatch.setattr(shared_cache, "shared_cache_crud", fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_stop_finishes_the_flush_in_progress(crud):
+    tier = SharedCacheTier()
+    tier.start()
+    tier.put("a", False, b"1", 60)
+    tier.put("b", False, b"2", 60)
+    await crud.writing.wait()
+    # Queued while the first batch is being written
+    tier.put("c", False, b"3", 60)
+
+    await tier.stop()
+    assert crud.rows == {"a": b"1", "b": b"2", "c": b"3"}
+    assert tier.written == 3
+    assert not tier.snapshot()["running"]
+
+
+@pytest.mark.asyncio
+async def test_puts_are_dropped_when_not_running(crud):
+    tier = SharedCacheTier()
+    tier.put("a", False, b"1", 60)
+    await tier.stop()
+    assert crud.rows == {}
@@ -0,0 +1,155 @@
+import gzip
+
+import httpx
+import pytest
+
+from app.core import sitemap_discovery
+from app.core.config import settings
+from app.core.sitemap_discovery import SitemapBudget, find_sitemap_candidates, stream_sitemap
+
+URLS = [f"https://example.com/page-{i}" for i in range(40)]
+
+
+def urlset(*urls):
+    entries = "".join(f"<url><loc>{url}</loc><lastmod>2026-01-01</lastmod></url>" for url in urls)
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+
+
+def sitemapindex(*urls):
+    entries = "".join(f"<sitemap><loc>{url}</loc></sitemap>" for url in urls)
+    return (
+        f'<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"{entries}</sitemapindex>"
+    )
+
+
+class Site:
+    """Serves {url: body} through the shared client, 64 bytes per chunk; records every URL requested."""
+
+    def __init__(self):
+        self.pages = {}
+        self.requested = []
+
+    def handle(self, request):
+        url = str(request.url)
+        self.requested.append(url)
+        body = self.pages.get(url)
+        if body is None:
+            return httpx.Response(404)
+        if isinstance(body, str):
+            body = body.encode()
+
+        async def chunks():
+            for start in range(0, len(body), 64):
+                yield body[start:start + 64]
+
+        return httpx.Response(200, content=chunks())
+
+
+@pytest.fixture
+def site(monkeypatch):
+    site = Site()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(site.handle))
+    monkeypatch.setattr(sitemap_discovery, "get_http_client", lambda: client)
+    return site
+
+
+@pytest.mark.asyncio
+async def test_stream_sitemap_reads_urlsets_and_indexes(site):
+    site.pages["https://example.com/sitemap.xml"] = urlset(*URLS[:3])
+    site.pages["https://example.com/index.xml"] = sitemapindex("https://example.com/a.xml", "https://example.com/b.xml")
+    site.pages["https://example.com/page.html"] = "<html><body>Not a sitemap</body></html>"
+
+    budget = SitemapBudget()
+    assert await stream_sitemap("https://example.com/sitemap.xml", budget) == ("urlset", URLS[:3])
+    assert await stream_sitemap("https://example.com/index.xml", budget) == (
+        "sitemapindex",
+        ["https://example.com/a.xml", "https://example.com/b.xml"],
+    )
+    assert await stream_sitemap("https://example.com/page.html", budget) == (None, [])
+    assert await stream_sitemap("https://example.com/missing.xml", budget) == (None, [])
+    assert budget.files_left == settings.SITEMAP_MAX_FILES - 4
+    assert budget.urls_left == settings.SITEMAP_MAX_URLS - 5
+
+
+@pytest.mark.asyncio
+async def test_stream_sitemap_decompresses_gzip_files(site):
+    site.pages["https://example.com/sitemap.xml.gz"] = gzip.compress(urlset(*URLS).encode())
+    assert await stream_sitemap("https://example.com/sitemap.xml.gz", SitemapBudget()) == ("urlset", URLS)
+
+
+@pytest.mark.asyncio
+async def test_stream_sitemap_stops_at_the_entry_budget(site, monkeypatch):
+    monkeypatch.setattr(settings, "SITEMAP_MAX_URLS", 10)
+    site.pages["https://example.com/sitemap.xml"] = urlset(*URLS)
+    budget = SitemapBudget()
+    kind, locs = await stream_sitemap("https://example.com/sitemap.xml", budget)
+    assert kind == "urlset"
+    # Reading stops within the chunk that used up the budget
+    assert 10 <= len(locs) < 12 and locs == URLS[:len(locs)]
+    assert budget.exhausted
+
+
+@pytest.mark.asyncio
+async def test_stream_sitemap_bounds_decompressed_bytes(site, monkeypatch):
+    monkeypatch.setattr(settings, "SITEMAP_MAX_BYTES", 1000)
+    body = urlset(*URLS).encode()
+    site.pages["https://example.com/sitemap.xml.gz"] = gzip.compress(body)
+    budget = SitemapBudget()
+    kind, locs = await stream_sitemap("https://example.com/sitemap.xml.gz", budget)
+    assert kind == "urlset"
+    assert 0 < len(locs) < len(URLS) and locs == URLS[:len(locs)]
+    # No more than one byte past the allowance is ever decompressed
+    assert budget.bytes_left >= -1
+
+
+@pytest.mark.asyncio
+async def test_find_sitemap_candidates_follows_robots_and_indexes(site):
+    site.pages["https://example.com/robots.txt"] = (
+        "User-agent: *\nDisallow: /admin\nSitemap: https://example.com/sitemap_index.xml.gz\n"
+    )
+    site.pages["https://example.com/sitemap_index.xml.gz"] = gzip.compress(sitemapindex(
+        "https://example.com/sitemap-products.xml",
+        "https://example.com/sitemap-pages.xml",
+    ).encode())
+    site.pages["https://example.com/sitemap-pages.xml"] = urlset(
+        "https://example.com/about",
+        "https://www.example.com/legal/terms-of-service",
+        "https://example.com/terms",
+        "https://other.com/terms",
+        "https://help.example.com/articles/terms-and-conditions",
+    )
+    site.pages["https://example.com/sitemap-products.xml"] = urlset("https://example.com/products/terms-mug")
+
+    candidates = await find_sitemap_candidates("https://example.com/", ["terms"])
+    assert candidates == [
+        "https://example.com/terms",
+        "https://example.com/products/terms-mug",
+        "https://www.example.com/legal/terms-of-service",
+        "https://help.example.com/articles/terms-and-conditions",
+    ]
+    assert site.requested == [
+        "https://example.com/robots.txt",
+        "https://example.com/sitemap_index.xml.gz",
+        "https://example.com/sitemap-pages.xml",
+        "https://example.com/sitemap-products.xml",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_find_sitemap_candidates_respects_the_file_budget(site, monkeypatch):
+    monkeypatch.setattr(settings, "SITEMAP_MAX_FILES", 2)
+    site.pages["https://example.com/sitemap.xml"] = sitemapindex(
+        "https://example.com/a.xml", "https://example.com/b.xml", "https://example.com/c.xml"
+    )
+    for name in "abc":
+        site.pages[f"https://example.com/{name}.xml"] = urlset(f"https://example.com/{name}/privacy")
+
+    candidates = await find_sitemap_candidates("https://example.com", ["privacy"])
+    assert candidates == ["https://example.com/a/privacy"]
+    # No robots.txt: the conventional location is tried
+    assert site.requested == [
+        "https://example.com/robots.txt",
+        "https://example.com/sitemap.xml",
+        "https://example.com/a.xml",
+    ]
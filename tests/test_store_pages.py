@@ -0,0 +1,82 @@
+import pytest
+
+from app.core import store_pages
+from app.core.config import settings
+from app.core.store_pages import developer_site, store_app_id, store_app_info
+
+LISTING = """
+<html><head>
+<meta property="og:title" content="Example Notes on the App Store">
+<script type="application/ld+json">
+{"@type": "SoftwareApplication", "name": "Example Notes", "image": "https://is1.example.com/icon.png",
+ "author": {"@type": "Organization", "name": "Example Inc.", "url": "https://apps.apple.com/developer/id1"}}
+</script>
+</head><body>
+<a href="https://www.example.com/">Developer Website</a>
+<a href="https://www.example.com/privacy">Privacy Policy</a>
+<a href="https://www.apple.com/legal/privacy/">Apple Privacy</a>
+</body></html>
+"""
+
+
+@pytest.fixture
+def listings(monkeypatch):
+    monkeypatch.setattr(settings, "STORE_FAST_PATH_ENABLED", True)
+    store_pages.store_info_cache.clear()
+    pages = {}
+    fetched = []
+
+    async def fake_fetch_html(url):
+        fetched.append(url)
+        return url, pages.get(url)
+
+    monkeypatch.setattr(store_pages, "fetch_html", fake_fetch_html)
+    yield pages, fetched
+    store_pages.store_info_cache.clear()
+
+
+def test_store_app_id():
+    assert store_app_id("https://apps.apple.com/us/app/example-notes/id123456?mt=8") == ("app_store", "123456")
+    assert store_app_id("https://play.google.com/store/apps/details?id=com.example.notes&hl=en") == (
+        "play_store",
+        "com.example.notes",
+    )
+    assert store_app_id("https://play.google.com/store/search?q=notes") is None
+    assert store_app_id("https://example.com/id123") is None
+
+
+@pytest.mark.asyncio
+async def test_listing_details_are_read_and_cached(listings):
+    pages, fetched = listings
+    pages["https://apps.apple.com/us/app/id123456"] = LISTING
+    url = "https://apps.apple.com/gb/app/example-notes/id123456"
+
+    info = await store_app_info(url)
+    assert await store_app_info(url) == info
+    assert fetched == ["https://apps.apple.com/us/app/id123456"]
+    assert info == {
+        "name": "Example Notes",
+        "icon_url": "https://is1.example.com/icon.png",
+        "developer_name": "Example Inc.",
+        "developer_website": "https://www.example.com/",
+        "privacy_url": "https://www.example.com/privacy",
+        "store": "app_store",
+        "app_id": "123456",
+    }
+    assert developer_site(info) == "https://www.example.com"
+
+
+@pytest.mark.asyncio
+async def test_unusable_listing_is_cached_but_fetch_failure_is_not(listings):
+    pages, fetched = listings
+    pages["https://apps.apple.com/us/app/id1"] = "<html><body>Nothing here</body></html>"
+
+    assert await store_app_info("https://apps.apple.com/us/app/id1") is None
+    assert await store_app_info("https://apps.apple.com/us/app/id1") is None
+    assert await store_app_info("https://apps.apple.com/us/app/id2") is None
+    assert await store_app_info("https://apps.apple.com/us/app/id2") is None
+    assert fetched == [
+        "https://apps.apple.com/us/app/id1",
+        "https://apps.apple.com/us/app/id2",
+        "https://apps.apple.com/us/app/id2",
+    ]
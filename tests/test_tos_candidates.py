@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.api.v1.endpoints import tos
+from app.api.v1.endpoints.tos import prefer_verified_terms
+from app.core.config import settings
+
+RANKED = [
+    "https://example.com/legal",
+    "https://example.com/terms",
+    "https://example.com/help/terms",
+    "https://example.com/terms-archive",
+]
+
+
+class FakeVerifier:
+    def __init__(self, verdicts, delay=0):
+        self.verdicts = verdicts
+        self.delay = delay
+        self.calls = []
+
+    async def verify_many(self, urls, doc_type):
+        self.calls.append((list(urls), doc_type))
+        await asyncio.sleep(self.delay)
+        return {url: self.verdicts.get(url) for url in urls}
+
+
+def terms(is_terms):
+    return {"isTermsPage": is_terms, "confidence": 80 if is_terms else 10}
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    def install(verdicts, delay=0):
+        fake = FakeVerifier(verdicts, delay)
+        monkeypatch.setattr(tos, "page_verifier", fake)
+        return fake
+    return install
+
+
+@pytest.mark.asyncio
+async def test_verified_link_beats_higher_scored_one(verifier):
+    fake = verifier({RANKED[0]: terms(False), RANKED[1]: terms(True), RANKED[2]: terms(True)})
+    assert await prefer_verified_terms(RANKED) == RANKED[1]
+    assert fake.calls == [(RANKED[:settings.PAGE_VERIFY_TOS_TOP_K], "tos")]
+
+
+@pytest.mark.asyncio
+async def test_top_link_kept_without_a_positive_verdict(verifier):
+    # None = JS shell or fetch failure: no evidence against the ranking
+    verifier({RANKED[0]: None, RANKED[1]: terms(False)})
+    assert await prefer_verified_terms(RANKED) == RANKED[0]
+
+
+@pytest.mark.asyncio
+async def test_single_candidate_is_not_fetched(verifier):
+    fake = verifier({})
+    assert await prefer_verified_terms(RANKED[:1]) == RANKED[0]
+    assert await prefer_verified_terms([]) is None
+    assert fake.calls == []
+
+
+@pytest.mark.asyncio
+async def test_slow_verification_falls_back_to_top_link(verifier, monkeypatch):
+    monkeypatch.setattr(settings, "PAGE_VERIFY_TOS_TIMEOUT", 0.05)
+    verifier({RANKED[1]: terms(True)}, delay=1)
+    assert await prefer_verified_terms(RANKED) == RANKED[0]